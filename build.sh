@@ -18,4 +18,8 @@ python manage.py collectstatic --noinput
 echo "🗄️ 데이터베이스 마이그레이션 중..."
 python manage.py migrate
 
+# 이전 분석의 위반 구간과 일별 집계 채우기 (채울 분석이 없으면 바로 끝남)
+echo "📊 위반 구간/일별 집계 채우는 중..."
+python manage.py backfill_violation_spans
+
 echo "✅ 빌드 완료!" 
\ No newline at end of file
@@ -1,3 +1,67 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-# Register your models here.
+from .models import ComplianceRule, ComplianceKeyword, RecommendedExpression, ReevaluationRun, BatchRun
+from .reevaluation import submit_reevaluation
+
+
+class ComplianceKeywordInline(admin.TabularInline):
+    model = ComplianceKeyword
+    extra = 0
+
+
+@admin.register(ComplianceRule)
+class ComplianceRuleAdmin(admin.ModelAdmin):
+    list_display = ('category', 'title', 'severity', 'is_active', 'updated_at')
+    list_filter = ('severity', 'is_active')
+    search_fields = ('category', 'title')
+    inlines = [ComplianceKeywordInline]
+    fieldsets = (
+        (None, {'fields': ('category', 'title', 'description', 'severity', 'penalty',
+                           'legal_basis', 'improvement_guide', 'is_active')}),
+        ('점수 가중치', {'fields': ('score_weight', 'match_weight', 'density_weight',
+                                'headline_weight', 'footer_weight', 'max_deduction')}),
+    )
+    actions = ['reevaluate_analyses']
+
+    @admin.action(description='저장된 분석을 현재 규칙으로 재평가')
+    def reevaluate_analyses(self, request, queryset):
+        # 선택한 규칙과 관계없이 현재 규칙 스냅샷 전체로 재평가
+        run = submit_reevaluation()
+        self.message_user(request, f'분석 재평가 작업 #{run.id} 을(를) 시작했습니다. '
+                                   f'진행 상황은 분석 재평가 작업 목록에서 확인하세요.', messages.INFO)
+
+
+@admin.register(ComplianceKeyword)
+class ComplianceKeywordAdmin(admin.ModelAdmin):
+    list_display = ('keyword', 'rule', 'is_active')
+    list_filter = ('is_active', 'rule__category')
+    search_fields = ('keyword',)
+
+
+@admin.register(RecommendedExpression)
+class RecommendedExpressionAdmin(admin.ModelAdmin):
+    list_display = ('category', 'original_text', 'improved_text', 'importance', 'is_active')
+    list_filter = ('importance', 'is_active')
+    search_fields = ('original_text', 'improved_text')
+
+
+@admin.register(BatchRun)
+class BatchRunAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'total_count', 'processed_count', 'completed_count', 'failed_count',
+                    'started_at', 'completed_at')
+    list_filter = ('status',)
+    readonly_fields = [field.name for field in BatchRun._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ReevaluationRun)
+class ReevaluationRunAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'processed_count', 'changed_count', 'status_changed_count',
+                    'failed_count', 'started_at', 'completed_at')
+    list_filter = ('status',)
+    readonly_fields = [field.name for field in ReevaluationRun._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Claude API 설정 - .env 파일 또는 시스템 환경변수에서 로드
+ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
+
+IMPROVEMENT_MODEL = "claude-3-haiku-20240307"
+IMPROVEMENT_CACHE_PREFIX = 'compliance_checker:ai_improvement:'
+
+_client = None
+_client_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+_call_slots = None
+_rate_limiter = None
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def get_ai_client():
+    """프로세스에서 공유하는 Claude 클라이언트 (API 키가 없거나 COMPLIANCE_AI_ENABLED 가 False 면 None)
+
+    set_ai_client 로 주입한 클라이언트는 설정과 관계없이 반환한다.
+    """
+    global _client
+    if _client is None and ANTHROPIC_API_KEY and _setting('COMPLIANCE_AI_ENABLED', True):
+        with _client_lock:
+            if _client is None:
+                try:
+                    from anthropic import Anthropic
+                    _client = Anthropic(api_key=ANTHROPIC_API_KEY)
+                except ImportError:
+                    logger.warning("Anthropic 라이브러리를 가져올 수 없습니다.")
+    return _client
+
+
+def set_ai_client(client):
+    """공유 클라이언트 교체 (테스트에서 FakeAnthropicClient 주입용, None 이면 초기화)"""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+class RateLimiter:
+    """분당 요청 수 제한 (토큰 버킷, 1분치 요청까지는 몰아서 허용)"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """AI 호출용 스레드 풀, 동시 호출 제한 세마포어, 분당 요청 제한 (프로세스당 하나)"""
+    global _executor, _call_slots, _rate_limiter
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                max_concurrency = _setting('COMPLIANCE_AI_MAX_CONCURRENCY', 4)
+                _call_slots = threading.BoundedSemaphore(max_concurrency)
+                requests_per_minute = _setting('COMPLIANCE_AI_REQUESTS_PER_MINUTE', 50)
+                _rate_limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+                _executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='compliance-ai')
+    return _executor
+
+
+def complete(prompt: str, model: str = IMPROVEMENT_MODEL, max_tokens: int = 800,
+             temperature: float = 0.3) -> str:
+    """Claude API 호출 후 응답 텍스트 반환
+
+    요청 스레드와 AI 워커 스레드의 호출을 합쳐 동시 호출 수와 분당 요청 수를 제한한다.
+    """
+    client = get_ai_client()
+    if client is None:
+        raise RuntimeError('Claude API가 설정되지 않았습니다.')
+    _get_executor()
+    if _rate_limiter is not None:
+        _rate_limiter.acquire()
+    with _call_slots:
+        response = client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            timeout=_setting('COMPLIANCE_AI_TIMEOUT', 30)
+        )
+    return response.content[0].text
+
+
+def parse_json_response(content: str, fallback: Dict, opening: str = '{', closing: str = '}'):
+    """응답에서 JSON 부분만 추출해 파싱 (실패 시 fallback 반환)"""
+    try:
+        json_start = content.find(opening)
+        json_end = content.rfind(closing) + 1
+        if json_start != -1 and json_end != 0:
+            return json.loads(content[json_start:json_end])
+    except json.JSONDecodeError:
+        pass
+    return fallback
+
+
+def run_concurrently(tasks: List[Callable], timeout: float = None) -> List:
+    """작업들을 AI 스레드 풀에서 동시에 실행
+
+    제한 시간 안에 끝나지 않았거나 실패한 작업의 결과는 None 이다.
+    """
+    if not tasks:
+        return []
+    if timeout is None:
+        timeout = _setting('COMPLIANCE_AI_TIMEOUT', 30)
+    executor = _get_executor()
+    futures = [executor.submit(task) for task in tasks]
+    done, not_done = wait(futures, timeout=timeout)
+    for future in not_done:
+        future.cancel()
+    if not_done:
+        logger.warning(f"AI 작업 {len(not_done)}건이 제한 시간({timeout}초) 내에 완료되지 않았습니다.")
+
+    results = []
+    for future in futures:
+        if future not in done or future.exception() is not None:
+            if future in done:
+                logger.error(f"AI 작업 실패: {future.exception()}")
+            results.append(None)
+        else:
+            results.append(future.result())
+    return results
+
+
+def _violation_info(violation: Dict) -> Dict:
+    return {
+        'category': violation.get('category', ''),
+        'keyword': violation.get('keyword', ''),
+        'context': violation.get('context', ''),
+        'legal_basis': violation.get('legal_basis', ''),
+        'penalty': violation.get('penalty', '')
+    }
+
+
+def improvement_cache_key(violation: Dict) -> str:
+    """(위반 유형, 키워드, 문맥 해시) 기반 개선 방안 캐시 키"""
+    info = _violation_info(violation)
+    context_hash = hashlib.sha256(info['context'].encode('utf-8')).hexdigest()
+    digest = hashlib.sha256(f"{info['category']}\n{info['keyword']}\n{context_hash}".encode('utf-8')).hexdigest()
+    return IMPROVEMENT_CACHE_PREFIX + digest
+
+
+_SUGGESTION_FORMAT = """{
+    "title": "개선 방안 제목",
+    "description": "구체적인 개선 방안 설명",
+    "improved_keyword": "대체 키워드",
+    "improved_sentence": "개선된 문장",
+    "alternative_expressions": ["대안 표현 1", "대안 표현 2"],
+    "additional_recommendations": ["추가 권장사항 1", "추가 권장사항 2"],
+    "legal_compliance_notes": "법적 준수 관련 참고사항"
+}"""
+
+
+def _format_violation(info: Dict) -> str:
+    return f"""- 위반 유형: {info['category']}
+- 발견된 키워드: {info['keyword']}
+- 위반 문맥: "{info['context']}"
+- 법적 근거: {info['legal_basis']}
+- 처벌 내용: {info['penalty']}"""
+
+
+def build_improvement_prompt(violations: List[Dict], original_text: str) -> str:
+    """위반 항목(1개 이상)에 대한 개선 방안 요청 프롬프트 구성"""
+    infos = [_violation_info(violation) for violation in violations]
+    if len(infos) == 1:
+        violation_block = f"""다음 위반 항목에 대해 구체적이고 실용적인 개선 방안을 제시해주세요.
+
+**위반 정보:**
+{_format_violation(infos[0])}"""
+        response_format = f"""다음 JSON 형식으로 응답해주세요:
+{_SUGGESTION_FORMAT}"""
+    else:
+        items = '\n\n'.join(
+            f"**위반 정보 {index}:**\n{_format_violation(info)}" for index, info in enumerate(infos, 1)
+        )
+        violation_block = f"""다음 위반 항목 {len(infos)}개 각각에 대해 구체적이고 실용적인 개선 방안을 제시해주세요.
+
+{items}"""
+        response_format = f"""위반 정보 순서대로 {len(infos)}개의 객체를 담은 JSON 배열로 응답해주세요.
+각 객체의 형식:
+{_SUGGESTION_FORMAT}"""
+
+    return f"""
+당신은 의료광고법 준수 전문가입니다. {violation_block}
+
+**원본 텍스트 (관련 부분):**
+{original_text[:1000]}...
+
+**요청사항:**
+1. 위반 키워드를 적절한 대체 표현으로 변경하는 구체적인 제안
+2. 문맥을 고려한 전체 문장 개선 방안
+3. 의료광고법을 준수하면서도 효과적인 표현 방법
+4. 추가 주의사항이나 권장사항
+
+{response_format}
+"""
+
+
+def _fallback_suggestions(category: str, content: str) -> Dict:
+    return {
+        'title': f"{category} 개선 방안",
+        'description': content,
+        'improved_keyword': '대체 표현',
+        'improved_sentence': content,
+        'alternative_expressions': [],
+        'additional_recommendations': [],
+        'legal_compliance_notes': 'AI가 제안한 개선 방안입니다.'
+    }
+
+
+def _request_improvements(violations: List[Dict], original_text: str) -> List[Dict]:
+    """위반 항목 묶음에 대해 한 번의 API 호출로 개선 방안 생성"""
+    content = complete(build_improvement_prompt(violations, original_text), max_tokens=800 * len(violations))
+
+    if len(violations) == 1:
+        parsed = [parse_json_response(content, None)]
+    else:
+        parsed = parse_json_response(content, None, '[', ']')
+        if not isinstance(parsed, list) or len(parsed) != len(violations):
+            parsed = [None] * len(violations)
+
+    improvements = []
+    for violation, suggestions in zip(violations, parsed):
+        category = violation.get('category', '')
+        if not isinstance(suggestions, dict):
+            suggestions = _fallback_suggestions(category, content)
+        improvements.append({
+            'violation_category': category,
+            'violation_keyword': violation.get('keyword', ''),
+            'suggestions': suggestions,
+            'raw_response': content
+        })
+    return improvements
+
+
+def generate_improvements(violations: List[Dict], original_text: str,
+                          known: Dict[str, Dict] = None) -> List[Optional[Dict]]:
+    """위반 항목별 AI 개선 방안 생성
+
+    known(캐시 키별로 이미 생성된 개선 방안, 증분 분석 시 이전 결과)과 캐시된 응답은
+    그대로 사용하고, 나머지는 COMPLIANCE_AI_BATCH_SIZE 개씩 묶어
+    COMPLIANCE_AI_MAX_CONCURRENCY 개까지 동시에 요청한다. 결과는 입력 순서와 같고,
+    실패하거나 제한 시간을 넘긴 항목은 None 이다.
+    """
+    if not violations or get_ai_client() is None:
+        return [None] * len(violations)
+
+    keys = [improvement_cache_key(violation) for violation in violations]
+    known = known or {}
+    missing = [key for key in keys if key not in known]
+    cached = cache.get_many(missing) if missing else {}
+    results = [known.get(key) or cached.get(key) for key in keys]
+
+    pending = [index for index, result in enumerate(results) if result is None]
+    batch_size = max(1, _setting('COMPLIANCE_AI_BATCH_SIZE', 1))
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    tasks = [
+        (lambda batch=batch: _request_improvements([violations[index] for index in batch], original_text))
+        for batch in batches
+    ]
+
+    fresh = {}
+    for batch, improvements in zip(batches, run_concurrently(tasks)):
+        if improvements is None:
+            continue
+        for index, improvement in zip(batch, improvements):
+            results[index] = improvement
+            fresh[keys[index]] = improvement
+    if fresh:
+        cache.set_many(fresh, timeout=_setting('COMPLIANCE_AI_CACHE_TIMEOUT', 60 * 60 * 24))
+    return results
+
+
+class FakeAnthropicClient:
+    """테스트용 로컬 Claude 클라이언트 (messages.create 인터페이스만 흉내)
+
+    responder(prompt) 가 응답 텍스트를 만들며, 호출된 프롬프트는 calls 에 기록된다.
+    """
+
+    def __init__(self, responder: Callable[[str], str] = None):
+        self.responder = responder or self._default_response
+        self.calls = []
+        self._lock = threading.Lock()
+        self.messages = SimpleNamespace(create=self._create)
+
+    @staticmethod
+    def _default_response(prompt: str) -> str:
+        suggestion = {
+            'title': '개선 방안',
+            'description': '객관적인 표현으로 수정하세요.',
+            'improved_keyword': '대체 표현',
+            'improved_sentence': '객관적인 정보를 제공합니다.',
+            'alternative_expressions': [],
+            'additional_recommendations': [],
+            'legal_compliance_notes': '테스트 응답'
+        }
+        if 'JSON 배열' in prompt:
+            count = prompt.count('**위반 정보 ')
+            return json.dumps([suggestion] * count, ensure_ascii=False)
+        return json.dumps(suggestion, ensure_ascii=False)
+
+    def _create(self, model: str, max_tokens: int, messages: List[Dict], **kwargs):
+        prompt = messages[-1]['content']
+        with self._lock:
+            self.calls.append(prompt)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.responder(prompt))])
@@ -1,76 +1,57 @@
+import logging
 import re
-import json
-import os
-from typing import Dict, List, Tuple, Any
-from .models import ComplianceRule, ComplianceKeyword, RecommendedExpression
+from typing import Dict, List, Optional, Tuple, Any, Union
+from django.conf import settings
+from .ai import generate_improvements, get_ai_client
+from .features import AD_INDICATORS, TextFeatures
+from .models import ComplianceRule
+from .matcher import KeywordMatcher, KeywordMatch
+from .scoring import get_scoring_engine, verdict
+from .snapshot import RuleSnapshot, get_rule_snapshot
+from .text_index import TextIndex
+
+logger = logging.getLogger(__name__)
+
+
+def keyed_violation_spans(result: Dict, start: int = 0, stop: Optional[int] = None) -> List[Tuple[int, int, Union[Tuple[str, str], int]]]:
+    """청크 분석 결과의 violation_spans[start:stop] 를 (시작 위치, 길이, (카테고리, 제목)) 목록으로 변환
+
+    구간의 세 번째 값은 violation_rules 의 위치이다. violation_rules 가 없는 이전 결과는
+    규칙 ID 를 그대로 돌려준다.
+    """
+    spans = result.get('violation_spans') or []
+    rule_keys = result.get('violation_rules')
+    if rule_keys is None:
+        return [(offset, length, rule_id) for offset, length, rule_id in spans[start:stop]]
+    return [(offset, length, tuple(rule_keys[index])) for offset, length, index in spans[start:stop]]
 
-# Claude API 설정
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
-    print(f"[DEBUG] Analyzer - ANTHROPIC_API_KEY 설정 상태: {'설정됨' if ANTHROPIC_API_KEY else '설정되지 않음'}")
-    anthropic = Anthropic(api_key=ANTHROPIC_API_KEY) if ANTHROPIC_API_KEY else None
-except ImportError:
-    print("[DEBUG] Anthropic 라이브러리를 가져올 수 없습니다.")
-    anthropic = None
 
 class ComplianceAnalyzer:
     """의료광고법 준수 검토 분석기"""
     
-    def __init__(self):
-        self.rules = self._load_rules_from_db()
-        print(f"[DEBUG] 로드된 규칙 수: {len(self.rules)}")
-        try:
-            self.keywords = self._load_keywords_from_db()
-            print(f"[DEBUG] 로드된 키워드 카테고리: {list(self.keywords.keys())}")
-            for category, keywords in self.keywords.items():
-                print(f"[DEBUG] {category}: {len(keywords)}개 키워드")
-        except Exception as e:
-            print(f"[DEBUG] 키워드 로드 실패: {e}")
-            self.keywords = {}
-        try:
-            self.recommended_expressions = self._load_recommended_expressions_from_db()
-        except:
-            self.recommended_expressions = []
-    
-    def _load_rules_from_db(self) -> List[ComplianceRule]:
-        """데이터베이스에서 규칙 로드"""
-        return list(ComplianceRule.objects.filter(is_active=True))
-    
-    def _load_keywords_from_db(self) -> Dict[str, List[str]]:
-        """데이터베이스에서 키워드 로드"""
-        keywords_dict = {}
-        try:
-            for rule in self.rules:
-                try:
-                    keywords = list(ComplianceKeyword.objects.filter(
-                        rule=rule, 
-                        is_active=True
-                    ).values_list('keyword', flat=True))
-                    keywords_dict[rule.category] = keywords
-                except:
-                    keywords_dict[rule.category] = []
-        except:
-            # 기본 키워드 제공 (PDF 텍스트에서 발견될 수 있는 키워드들 포함)
-            keywords_dict = {
-                '과장·절대적 표현': ['최고', '최고의', '완벽', '완전', '절대', '보장', '무통증', '완벽하게', '전혀', '100%'],
-                '비교광고': ['비교', '더 나은', '우수한', '다른 곳은', '다른 병원'],
-                '환자 후기·경험담': ['후기', '경험담', '환자분', '님의', '솔직한 후기', '생생 후기', '실제로'],
-                'SNS 미심의 광고': ['인스타그램', '페이스북', '유튜브']
-            }
-        return keywords_dict
-    
-    def _load_recommended_expressions_from_db(self) -> List[Dict]:
-        """데이터베이스에서 권장 표현 로드"""
-        try:
-            return list(RecommendedExpression.objects.filter(
-                is_active=True
-            ).values())
-        except:
-            return []
+    def __init__(self, snapshot: RuleSnapshot = None, enable_ai: bool = True):
+        # 워커 프로세스에서 공유하는 규칙 스냅샷 사용 (규칙 변경 시에만 재로드)
+        self.snapshot = snapshot or get_rule_snapshot()
+        # False 면 AI 개선 방안 생성을 건너뜀 (대량 분석 등)
+        self.enable_ai = enable_ai
+        self.rules = self.snapshot.rules
+        self.keywords = self.snapshot.keywords
+        self.recommended_expressions = self.snapshot.recommended_expressions
+        # 전체 규칙 키워드를 한 번에 검색하는 매처
+        self.matcher = self.snapshot.matcher
+        # 규칙별 가중치로 점수를 계산하는 점수 엔진
+        self.scoring = get_scoring_engine()
+        logger.debug(f"규칙 스냅샷 버전 {self.snapshot.version}, 로드된 규칙 수: {len(self.rules)}")
     
-    def analyze_text(self, text: str, source_type: str = "text") -> Dict[str, Any]:
-        """텍스트 분석 및 준수 검토"""
+    def analyze_text(self, text: str, source_type: str = "text",
+                     keyword_matches: Dict[str, List[KeywordMatch]] = None,
+                     known_improvements: Dict[str, Dict] = None) -> Dict[str, Any]:
+        """텍스트 분석 및 준수 검토
+
+        Args:
+            keyword_matches: 미리 계산한 카테고리별 키워드 매칭 (증분 분석용, 없으면 전체 검색)
+            known_improvements: 개선 방안 캐시 키별로 이미 생성된 AI 개선 방안
+        """
         try:
             # 디버깅을 위한 로깅
             print(f"[DEBUG] 분석할 텍스트 길이: {len(text) if text else 0}")
@@ -101,13 +82,25 @@ class ComplianceAnalyzer:
                     }
                 }
             
+            # 단어/문장/어휘 특징 (분석당 한 번 계산해 모든 하위 분석이 공유)
+            features = TextFeatures(text)
+            
             # 텍스트 분석
-            text_analysis = self._analyze_text_quality(text)
+            text_analysis = self._analyze_text_quality(text, features)
             
             violations = []
             detailed_violations = []
             recommendations = []
-            total_score = 100
+            # 점수 계산용 (규칙 ID, 위반 위치) - 상세 위반 중복 제거와 같은 기준
+            score_positions = []
+            seen = set()
+            
+            # 모든 규칙의 키워드를 한 번의 스캔으로 검색
+            if keyword_matches is None:
+                keyword_matches = self.matcher.find_all(text)
+            
+            # 위치 계산용 줄/문단/문장 경계 인덱스 (분석당 한 번 생성)
+            text_index = TextIndex(text)
             
             # 각 규칙별 분석
             for rule in self.rules:
@@ -117,149 +110,267 @@ class ComplianceAnalyzer:
                     if rule_keywords:
                         print(f"[DEBUG] 키워드 예시: {rule_keywords[:5]}")
                     
-                    found_violations = self._check_rule_violations(text, rule, rule_keywords)
+                    found_violations = self._check_rule_violations(
+                        text, rule, rule_keywords, keyword_matches.get(rule.category, []), text_index
+                    )
                     print(f"[DEBUG] 발견된 위반 수: {len(found_violations) if found_violations else 0}")
                     
                     if found_violations:
-                        violations.append({
-                            'category': rule.category,
-                            'title': rule.title,
-                            'severity': rule.severity,
-                            'count': len(found_violations),
-                            'legal_basis': rule.legal_basis,
-                            'penalty': rule.penalty
-                        })
+                        violations.append(self._rule_violation_summary(rule, len(found_violations)))
                         
                         # 상세 위반 정보 추가
                         for violation in found_violations:
                             try:
-                                detailed_violations.append({
-                                    'category': rule.category,
-                                    'title': rule.title,
-                                    'severity': rule.severity,
-                                    'keyword': violation.get('keyword', ''),
-                                    'context': violation.get('context', ''),
-                                    'position': violation.get('position', 0),
-                                    'penalty': rule.penalty,
-                                    'legal_basis': rule.legal_basis,
-                                    'improvement_guide': rule.improvement_guide,
-                                    'full_context': violation.get('full_context', ''),
-                                    'sentence_context': violation.get('sentence_context', ''),
-                                    'line_number': violation.get('line_number', None),
-                                    'paragraph_context': violation.get('paragraph_context', None)
-                                })
+                                detailed_violations.append(self._detailed_violation(rule, violation))
                             except Exception as e:
                                 print(f"상세 위반 정보 추가 중 오류: {e}")
                                 continue
-                        
-                        # 점수 차감 (심각도에 따라)
-                        if rule.severity == 'high':
-                            total_score -= 25
-                        elif rule.severity == 'medium':
-                            total_score -= 15
-                        else:
-                            total_score -= 10
+                            key = (rule.category, rule.title, violation.get('keyword', ''), violation.get('position', 0))
+                            if key not in seen:
+                                seen.add(key)
+                                score_positions.append((rule.id, violation.get('position', 0)))
                         
                         # 개선 권장사항 추가
-                        try:
-                            first_keyword = found_violations[0].get('keyword', '') if found_violations else ''
-                            recommendations.append({
-                                'category': rule.category,
-                                'title': rule.title,
-                                'guide': rule.improvement_guide,
-                                'priority': 'high' if rule.severity == 'high' else 'medium',
-                                'suggested_fixes': self._generate_suggested_fixes(first_keyword, rule) if first_keyword else []
-                            })
-                        except Exception as e:
-                            print(f"권장사항 추가 중 오류: {e}")
-                            recommendations.append({
-                                'category': rule.category,
-                                'title': rule.title,
-                                'guide': rule.improvement_guide,
-                                'priority': 'high' if rule.severity == 'high' else 'medium',
-                                'suggested_fixes': []
-                            })
+                        recommendations.append(
+                            self._rule_recommendation(rule, found_violations[0].get('keyword', ''))
+                        )
                 except Exception as e:
                     print(f"규칙 분석 중 오류: {e}")
                     continue
             
-            # 중복 제거 및 통합
-            violations = self._remove_duplicate_violations(violations)
-            violations = self._consolidate_similar_violations(violations)
             detailed_violations = self._remove_duplicate_detailed_violations(detailed_violations)
-            recommendations = self._remove_duplicate_recommendations(recommendations)
-            
-            # 준수 상태 결정
-            if total_score >= 80:
-                compliance_status = '적합'
-                risk_level = 'low'
-            elif total_score >= 60:
-                compliance_status = '부분적합'
-                risk_level = 'medium'
-            else:
-                compliance_status = '부적합'
-                risk_level = 'high'
-            
-            # 준수 체크리스트 생성
-            try:
-                compliance_checklist = self._generate_compliance_checklist(violations, text)
-            except Exception as e:
-                print(f"체크리스트 생성 중 오류: {e}")
-                compliance_checklist = []
-            
-            # 심의 안내 생성
-            try:
-                review_guidance = self._generate_review_guidance(violations, text, source_type)
-            except Exception as e:
-                print(f"심의 안내 생성 중 오류: {e}")
-                review_guidance = {}
-            
-            # 법적 분석
-            try:
-                legal_analysis = self._analyze_legal_aspects(violations, text, source_type)
-            except Exception as e:
-                print(f"법적 분석 중 오류: {e}")
-                legal_analysis = {
-                    'applicable_laws': [],
-                    'legal_risks': [],
-                    'compliance_requirements': []
-                }
-            
-            # AI 개선 방안 생성
-            ai_improvements = []
-            if anthropic and detailed_violations:
-                try:
-                    ai_improvements = self._generate_ai_improvements(detailed_violations, text)
-                except Exception as e:
-                    print(f"AI 개선 방안 생성 중 오류: {e}")
-                    ai_improvements = []
-            
-            return {
-                'overall_score': max(0, total_score),
-                'compliance_status': compliance_status,
-                'risk_level': risk_level,
-                'violations': violations,
-                'recommendations': recommendations,
-                'detailed_violations': detailed_violations,
-                'compliance_checklist': compliance_checklist,
-                'review_guidance': review_guidance,
-                'extracted_text': text,
-                'text_analysis': text_analysis,
-                'legal_analysis': legal_analysis,
-                'ai_improvements': ai_improvements,
-                'summary_report': self._generate_summary_report(violations, total_score, source_type)
-            }
+            total_score = self.scoring.score(self.rules, score_positions, len(text))
+            result = self._complete_result(
+                text, source_type, text_analysis, features, violations, recommendations, total_score,
+                detailed_violations, known_improvements
+            )
+            result['detailed_violations'] = detailed_violations
+            result['extracted_text'] = text
+            return result
         except Exception as e:
             print(f"분석 중 전체 오류: {e}")
             import traceback
             traceback.print_exc()
             raise
     
-    def _analyze_text_quality(self, text: str) -> Dict[str, Any]:
+    def analyze(self, text: str, source_type: str = "text") -> Dict[str, Any]:
+        """텍스트 길이에 따라 일반 분석 또는 청크 분석 실행
+
+        COMPLIANCE_CHUNKED_ANALYSIS_THRESHOLD 자를 넘는 텍스트는 analyze_text_chunked 로 분석한다.
+        """
+        threshold = getattr(settings, 'COMPLIANCE_CHUNKED_ANALYSIS_THRESHOLD', 500000)
+        if threshold and text and len(text) > threshold:
+            return self.analyze_text_chunked(text, source_type)
+        return self.analyze_text(text, source_type)
+    
+    def analyze_text_chunked(self, text: str, source_type: str = "text", window_size: int = None) -> Dict[str, Any]:
+        """대용량 문서용 청크 분석
+
+        키워드는 겹치는 창(window) 단위로 검색하고, 위반 항목은 문맥 문자열 대신
+        [시작 위치, 길이, 규칙 번호] 구간(violation_spans)으로만 저장한다. 규칙 번호는
+        [카테고리, 제목] 목록(violation_rules)의 위치이므로 규칙이 다시 로드되어 ID 가
+        바뀌어도 구간의 규칙을 찾을 수 있다. 결과에는
+        extracted_text 와 detailed_violations 가 없으며, 상세 위반 정보는
+        expand_violation_spans 로 필요할 때 저장된 원문에서 만든다. 구간 순서는
+        analyze_text 의 detailed_violations 순서와 같다.
+        """
+        if not text or not text.strip():
+            return self.analyze_text(text, source_type)
+        
+        window_size = window_size or getattr(settings, 'COMPLIANCE_CHUNKED_WINDOW_SIZE', 64 * 1024)
+        logger.debug(f"청크 분석: 텍스트 길이 {len(text)}, 창 크기 {window_size}")
+        
+        features = TextFeatures(text, window_size)
+        text_analysis = self._analyze_text_quality(text, features)
+        keyword_matches = self.matcher.find_all(text, window_size)
+        text_index = TextIndex(text)
+        
+        violations = []
+        recommendations = []
+        spans = []
+        positions = []
+        rule_keys = []
+        rule_indexes = {}
+        seen = set()
+        
+        for rule in self.rules:
+            try:
+                rule_spans = []
+                first_keyword = ''
+                for match in keyword_matches.get(rule.category, []):
+                    _, full_context = self._match_context(text, text_index, match)
+                    if not self._is_rule_violation(rule, match.keyword, full_context):
+                        continue
+                    first_keyword = first_keyword or match.keyword
+                    rule_spans.append(match)
+                
+                if rule_spans:
+                    violations.append(self._rule_violation_summary(rule, len(rule_spans)))
+                    recommendations.append(self._rule_recommendation(rule, first_keyword))
+                
+                # analyze_text 의 상세 위반 중복 제거와 같은 기준
+                for match in rule_spans:
+                    key = (rule.category, rule.title, match.keyword, match.start)
+                    if key not in seen:
+                        seen.add(key)
+                        if (rule.category, rule.title) not in rule_indexes:
+                            rule_indexes[(rule.category, rule.title)] = len(rule_keys)
+                            rule_keys.append([rule.category, rule.title])
+                        spans.append([match.start, match.end - match.start, rule_indexes[(rule.category, rule.title)]])
+                        positions.append((rule.id, match.start))
+            except Exception as e:
+                print(f"규칙 분석 중 오류: {e}")
+                continue
+        
+        logger.debug(f"청크 분석 위반 구간 수: {len(spans)}")
+        total_score = self.scoring.score(self.rules, positions, len(text))
+        preview = keyed_violation_spans({'violation_spans': spans, 'violation_rules': rule_keys}, stop=3)
+        result = self._complete_result(
+            text, source_type, text_analysis, features, violations, recommendations, total_score,
+            self.expand_violation_spans(text, preview, text_index), None
+        )
+        result['analysis_mode'] = 'chunked'
+        result['violation_spans'] = spans
+        result['violation_rules'] = rule_keys
+        return result
+    
+    def expand_violation_spans(self, text: str, spans: List, text_index: TextIndex = None) -> List[Dict]:
+        """(시작 위치, 길이, 규칙 키) 구간을 analyze_text 의 상세 위반 정보 형식으로 변환 (문맥은 원문에서 생성)
+
+        규칙 키는 (카테고리, 제목) 이며, 이전 결과의 규칙 ID 도 받는다. 현재 규칙에 없는 구간은 건너뛴다.
+        """
+        rules_by_id = {rule.id: rule for rule in self.rules}
+        rules_by_title = {(rule.category, rule.title): rule for rule in self.rules}
+        text_index = text_index or TextIndex(text)
+        detailed_violations = []
+        
+        for offset, length, rule_key in spans:
+            rule = rules_by_id.get(rule_key) if isinstance(rule_key, int) else rules_by_title.get(tuple(rule_key))
+            if rule is None:
+                continue
+            # 원문 구간과 매칭되는 원본 키워드 복원 (매처는 정규형으로 비교)
+            surface = text[offset:offset + length]
+            matched = set(self.matcher.keywords_matching(surface))
+            keyword = next(
+                (keyword for keyword in self.keywords.get(rule.category, []) if keyword in matched), surface
+            )
+            match = KeywordMatch(keyword, offset, offset + length)
+            context, full_context = self._match_context(text, text_index, match)
+            violation = self._build_violation(text, text_index, rule, match, context, full_context)
+            detailed_violations.append(self._detailed_violation(rule, violation))
+        
+        return detailed_violations
+    
+    def _complete_result(self, text: str, source_type: str, text_analysis: Dict, features: TextFeatures,
+                         violations: List[Dict], recommendations: List[Dict], total_score: int,
+                         detailed_violations: List[Dict], known_improvements: Dict[str, Dict] = None) -> Dict[str, Any]:
+        """규칙별 검사 결과로 준수 상태, 체크리스트, 심의/법적 분석, AI 개선 방안 구성"""
+        # 중복 제거 및 통합
+        violations = self._remove_duplicate_violations(violations)
+        violations = self._consolidate_similar_violations(violations)
+        recommendations = self._remove_duplicate_recommendations(recommendations)
+        
+        # 준수 상태 결정
+        compliance_status, risk_level = verdict(total_score)
+        
+        # 준수 체크리스트 생성
+        try:
+            compliance_checklist = self._generate_compliance_checklist(violations, text, features)
+        except Exception as e:
+            print(f"체크리스트 생성 중 오류: {e}")
+            compliance_checklist = []
+        
+        # 심의 안내 생성
+        try:
+            review_guidance = self._generate_review_guidance(violations, text, source_type)
+        except Exception as e:
+            print(f"심의 안내 생성 중 오류: {e}")
+            review_guidance = {}
+        
+        # 법적 분석
+        try:
+            legal_analysis = self._analyze_legal_aspects(violations, text, source_type)
+        except Exception as e:
+            print(f"법적 분석 중 오류: {e}")
+            legal_analysis = {
+                'applicable_laws': [],
+                'legal_risks': [],
+                'compliance_requirements': []
+            }
+        
+        # AI 개선 방안 생성
+        ai_improvements = []
+        if self.enable_ai and get_ai_client() and detailed_violations:
+            try:
+                ai_improvements = self._generate_ai_improvements(detailed_violations, text, known_improvements)
+            except Exception as e:
+                print(f"AI 개선 방안 생성 중 오류: {e}")
+                ai_improvements = []
+        
+        return {
+            'overall_score': max(0, total_score),
+            'compliance_status': compliance_status,
+            'risk_level': risk_level,
+            'violations': violations,
+            'recommendations': recommendations,
+            'compliance_checklist': compliance_checklist,
+            'review_guidance': review_guidance,
+            'text_analysis': text_analysis,
+            'legal_analysis': legal_analysis,
+            'ai_improvements': ai_improvements,
+            'summary_report': self._generate_summary_report(violations, total_score, source_type)
+        }
+    
+    def _rule_violation_summary(self, rule: ComplianceRule, count: int) -> Dict:
+        """규칙별 위반 요약"""
+        return {
+            'category': rule.category,
+            'title': rule.title,
+            'severity': rule.severity,
+            'count': count,
+            'legal_basis': rule.legal_basis,
+            'penalty': rule.penalty
+        }
+    
+    def _rule_recommendation(self, rule: ComplianceRule, first_keyword: str) -> Dict:
+        """규칙별 개선 권장사항"""
+        recommendation = {
+            'category': rule.category,
+            'title': rule.title,
+            'guide': rule.improvement_guide,
+            'priority': 'high' if rule.severity == 'high' else 'medium',
+            'suggested_fixes': []
+        }
+        try:
+            if first_keyword:
+                recommendation['suggested_fixes'] = self._generate_suggested_fixes(first_keyword, rule)
+        except Exception as e:
+            print(f"권장사항 추가 중 오류: {e}")
+        return recommendation
+    
+    def _detailed_violation(self, rule: ComplianceRule, violation: Dict) -> Dict:
+        """위반 항목의 상세 위반 정보"""
+        return {
+            'category': rule.category,
+            'title': rule.title,
+            'severity': rule.severity,
+            'keyword': violation.get('keyword', ''),
+            'matched_text': violation.get('matched_text', violation.get('keyword', '')),
+            'context': violation.get('context', ''),
+            'position': violation.get('position', 0),
+            'penalty': rule.penalty,
+            'legal_basis': rule.legal_basis,
+            'improvement_guide': rule.improvement_guide,
+            'full_context': violation.get('full_context', ''),
+            'sentence_context': violation.get('sentence_context', ''),
+            'line_number': violation.get('line_number', None),
+            'paragraph_context': violation.get('paragraph_context', None)
+        }
+    
+    def _analyze_text_quality(self, text: str, features: TextFeatures = None) -> Dict[str, Any]:
         """텍스트 품질 분석"""
-        total_characters = len(text)
-        total_words = len(text.split())
-        total_sentences = len(re.split(r'[.!?]+', text))
+        features = features or TextFeatures(text)
+        total_characters = features.total_characters
         
         # 텍스트 품질 평가
         if total_characters == 0:
@@ -273,117 +384,120 @@ class ComplianceAnalyzer:
         else:
             quality = 'long'
         
-        # 문장 구조 분석
-        sentences = re.split(r'[.!?]+', text)
-        avg_sentence_length = sum(len(s.split()) for s in sentences if s.strip()) / max(len([s for s in sentences if s.strip()]), 1)
-        
         return {
             'total_characters': total_characters,
-            'total_words': total_words,
-            'total_sentences': total_sentences,
+            'total_words': features.total_words,
+            'total_sentences': features.total_sentences,
             'text_quality': quality,
-            'avg_sentence_length': round(avg_sentence_length, 1),
-            'readability_score': self._calculate_readability(text)
+            'avg_sentence_length': round(features.avg_sentence_length, 1),
+            'readability_score': self._calculate_readability(text, features)
         }
     
-    def _calculate_readability(self, text: str) -> float:
+    def _calculate_readability(self, text: str, features: TextFeatures = None) -> float:
         """가독성 점수 계산 (간단한 버전)"""
-        sentences = re.split(r'[.!?]+', text)
-        words = text.split()
-        
-        if not sentences or not words:
-            return 0.0
-        
-        avg_sentence_length = len(words) / len([s for s in sentences if s.strip()])
-        avg_word_length = sum(len(word) for word in words) / len(words)
-        
-        # 간단한 가독성 공식 (높을수록 읽기 쉬움)
-        readability = 100 - (avg_sentence_length * 0.5 + avg_word_length * 2)
-        return max(0, min(100, readability))
+        return (features or TextFeatures(text)).readability
     
-    def _check_rule_violations(self, text: str, rule: ComplianceRule, keywords: List[str]) -> List[Dict]:
-        """특정 규칙에 대한 위반 검사"""
+    def _check_rule_violations(self, text: str, rule: ComplianceRule, keywords: List[str],
+                               matches: List[KeywordMatch] = None,
+                               text_index: TextIndex = None) -> List[Dict]:
+        """특정 규칙에 대한 위반 검사
+
+        matches 가 주어지지 않으면 해당 규칙의 키워드만으로 매처를 만들어 검색한다.
+        """
         violations = []
         
-        # 텍스트를 줄 단위로 분할
-        lines = text.split('\n')
+        if text_index is None:
+            text_index = TextIndex(text)
         
-        for keyword in keywords:
-            print(f"[DEBUG] 키워드 '{keyword}' 검색 중...")
+        if matches is None:
+            matches = KeywordMatcher({rule.category: keywords}).find_all(text)[rule.category]
+        logger.debug(f"규칙 '{rule.category}' 키워드 매칭 수: {len(matches)}")
+        
+        for match in matches:
+            keyword = match.keyword
+            context, full_context = self._match_context(text, text_index, match)
             
-            # 대소문자 구분 없이 검색
-            pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-            matches = list(pattern.finditer(text))
-            print(f"[DEBUG] '{keyword}' 매칭 수: {len(matches)}")
+            print(f"[DEBUG] '{keyword}' 발견! 컨텍스트: {full_context[:100]}...")
             
-            for match in matches:
-                # 위반 키워드 주변 텍스트 추출 (전후 150자로 확장)
-                start = max(0, match.start() - 150)
-                end = min(len(text), match.end() + 150)
-                context = text[start:end]
-                
-                # 문장 단위로 확장 (더 정확한 문맥 파악)
-                sentence_start = context.rfind('.', 0, 150) + 1
-                sentence_end = context.find('.', 150)
-                if sentence_end == -1:
-                    sentence_end = len(context)
-                
-                full_context = context[sentence_start:sentence_end].strip()
-                if not full_context:
-                    full_context = context
-                
-                print(f"[DEBUG] '{keyword}' 발견! 컨텍스트: {full_context[:100]}...")
-                
-                # 일반적인 단어 제외 로직을 완화 - 의료광고법에서는 더 엄격하게
-                if rule.category in ['환자 후기·경험담', '과장·절대적 표현']:
-                    # 환자 후기와 과장 표현은 더 엄격하게 적용
-                    pass
-                else:
-                    # 컨텍스트 기반 위반 여부 재확인
-                    if not self._is_actual_violation(keyword, full_context, rule.category):
-                        print(f"[DEBUG] '{keyword}' 실제 위반 아님으로 제외")
-                        continue
-                
-                # 정확한 위치 정보 계산
-                line_number, column_number = self._find_exact_position(text, match.start(), lines)
-                
-                # 단락 컨텍스트 찾기
-                paragraph_context = self._find_paragraph_context(text, match.start())
-                
-                # 문단 번호 찾기
-                paragraph_number = self._find_paragraph_number(text, match.start())
-                
-                # 전체 텍스트에서의 위치 비율 계산
-                position_percentage = (match.start() / len(text)) * 100
-                
-                # 문장 내에서의 키워드 위치
-                sentence_position = self._find_sentence_position(full_context, keyword)
-                
-                # 키워드 주변 문맥 (전후 50자)
-                immediate_context = self._get_immediate_context(text, match.start(), 50)
-                
-                violations.append({
-                    'keyword': keyword,
-                    'context': full_context,
-                    'position': match.start(),
-                    'full_context': context,
-                    'sentence_context': full_context,
-                    'line_number': line_number,
-                    'column_number': column_number,
-                    'paragraph_number': paragraph_number,
-                    'paragraph_context': paragraph_context,
-                    'exact_location': f"문단 {paragraph_number}, 줄 {line_number}, 열 {column_number}",
-                    'highlighted_context': self._highlight_keyword_in_context(full_context, keyword),
-                    'suggested_fixes': self._generate_suggested_fixes(keyword, rule),
-                    'position_percentage': round(position_percentage, 1),
-                    'sentence_position': sentence_position,
-                    'immediate_context': immediate_context,
-                    'text_position': f"전체 텍스트의 {round(position_percentage, 1)}% 지점",
-                    'detailed_location': self._generate_detailed_location(text, match.start(), lines)
-                })
-        
+            if not self._is_rule_violation(rule, keyword, full_context):
+                print(f"[DEBUG] '{keyword}' 실제 위반 아님으로 제외")
+                continue
+            
+            violations.append(self._build_violation(text, text_index, rule, match, context, full_context))
+    
         return violations
     
+    def _match_context(self, text: str, text_index: TextIndex, match: KeywordMatch) -> Tuple[str, str]:
+        """키워드 매칭의 (전후 150자 컨텍스트, 문장 단위 컨텍스트)"""
+        # 위반 키워드 주변 텍스트 추출 (전후 150자로 확장)
+        start = max(0, match.start - 150)
+        end = min(len(text), match.end + 150)
+        context = text[start:end]
+        
+        # 문장 단위로 확장 (더 정확한 문맥 파악)
+        sentence_start, sentence_end = text_index.sentence_bounds(start, end, start + 150)
+        
+        full_context = context[sentence_start:sentence_end].strip()
+        if not full_context:
+            full_context = context
+        return context, full_context
+    
+    def _is_rule_violation(self, rule: ComplianceRule, keyword: str, full_context: str) -> bool:
+        """문맥을 고려한 규칙 위반 여부"""
+        # 일반적인 단어 제외 로직을 완화 - 의료광고법에서는 더 엄격하게
+        if rule.category in ['환자 후기·경험담', '과장·절대적 표현']:
+            # 환자 후기와 과장 표현은 더 엄격하게 적용
+            return True
+        # 컨텍스트 기반 위반 여부 재확인
+        return self._is_actual_violation(keyword, full_context, rule.category)
+    
+    def _build_violation(self, text: str, text_index: TextIndex, rule: ComplianceRule,
+                         match: KeywordMatch, context: str, full_context: str) -> Dict:
+        """위반 키워드 매칭의 위치/문맥 정보"""
+        keyword = match.keyword
+        
+        # 정확한 위치 정보 계산
+        line_number, column_number = self._find_exact_position(text_index, match.start)
+        
+        # 단락 컨텍스트 찾기
+        paragraph_context = self._find_paragraph_context(text_index, match.start)
+        
+        # 문단 번호 찾기
+        paragraph_number = self._find_paragraph_number(text_index, match.start)
+        
+        # 전체 텍스트에서의 위치 비율 계산
+        position_percentage = text_index.position_percentage(match.start)
+        
+        # 문장 내에서의 키워드 위치
+        sentence_position = self._find_sentence_position(full_context, keyword)
+        
+        # 키워드 주변 문맥 (전후 50자)
+        immediate_context = self._get_immediate_context(text, match.start, 50)
+        
+        # 원문에서 매칭된 표현 (띄어쓰기/조사 변형이면 키워드와 다름)
+        matched_text = text[match.start:match.end]
+        
+        return {
+            'keyword': keyword,
+            'matched_text': matched_text,
+            'context': full_context,
+            'position': match.start,
+            'full_context': context,
+            'sentence_context': full_context,
+            'line_number': line_number,
+            'column_number': column_number,
+            'paragraph_number': paragraph_number,
+            'paragraph_context': paragraph_context,
+            'exact_location': f"문단 {paragraph_number}, 줄 {line_number}, 열 {column_number}",
+            'highlighted_context': self._highlight_keyword_in_context(full_context, matched_text),
+            'suggested_fixes': self._generate_suggested_fixes(keyword, rule),
+            'position_percentage': round(position_percentage, 1),
+            'sentence_position': sentence_position,
+            'immediate_context': immediate_context,
+            'text_position': f"전체 텍스트의 {round(position_percentage, 1)}% 지점",
+            'detailed_location': self._generate_detailed_location(text_index, match.start)
+        }
+    
     def _find_sentence_position(self, sentence: str, keyword: str) -> str:
         """문장 내에서 키워드의 위치를 찾기"""
         try:
@@ -407,33 +521,15 @@ class ComplianceAnalyzer:
         end = min(len(text), position + context_length)
         return text[start:end].strip()
     
-    def _generate_detailed_location(self, text: str, position: int, lines: List[str]) -> str:
+    def _generate_detailed_location(self, text_index: TextIndex, position: int) -> str:
         """상세한 위치 정보 생성"""
-        # 문단 정보
-        paragraphs = text.split('\n\n')
-        paragraph_num = 1
-        char_count = 0
-        for i, paragraph in enumerate(paragraphs):
-            if char_count + len(paragraph) + 2 >= position:
-                paragraph_num = i + 1
-                break
-            char_count += len(paragraph) + 2
-        
-        # 줄 정보
-        line_num = 1
-        char_count = 0
-        for i, line in enumerate(lines):
-            if char_count + len(line) >= position:
-                line_num = i + 1
-                break
-            char_count += len(line) + 1
-        
-        # 위치 비율
-        percentage = (position / len(text)) * 100
+        paragraph_num = text_index.paragraph_number(position)
+        line_num = text_index.line_number(position)
+        percentage = text_index.position_percentage(position)
         
         return f"문단 {paragraph_num}, 줄 {line_num} (전체의 {round(percentage, 1)}% 지점)"
     
-    def _is_common_word(self, keyword: str, text: str) -> bool:
+    def _is_common_word(self, keyword: str, text: str, features: TextFeatures = None) -> bool:
         """일반적인 단어인지 확인 (컨텍스트 기반)"""
         # 일반적인 표현들 (광고 목적이 아닌 경우 제외)
         common_expressions = {
@@ -465,19 +561,14 @@ class ComplianceAnalyzer:
         for common_expr, variants in common_expressions.items():
             if keyword.lower() in [v.lower() for v in variants]:
                 # 단순히 언급만 된 경우는 제외
-                if self._is_just_mention(keyword, text):
+                if self._is_just_mention(keyword, text, features):
                     return True
         
         return False
     
-    def _is_just_mention(self, keyword: str, text: str) -> bool:
+    def _is_just_mention(self, keyword: str, text: str, features: TextFeatures = None) -> bool:
         """단순 언급인지 확인 (광고 목적이 아닌 경우)"""
-        # 광고 관련 키워드와 함께 사용되지 않는 경우
-        ad_indicators = [
-            '광고', '홍보', '선전', '마케팅', '캠페인', '이벤트',
-            '할인', '특가', '무료', '증정', '쿠폰', '적립',
-            '추천', '소개', '알선', '유인', '모객'
-        ]
+        features = features or TextFeatures(text)
         
         # 키워드 주변 100자 내에 광고 관련 키워드가 있는지 확인
         pattern = re.compile(re.escape(keyword), re.IGNORECASE)
@@ -486,12 +577,10 @@ class ComplianceAnalyzer:
         for match in matches:
             start = max(0, match.start() - 100)
             end = min(len(text), match.end() + 100)
-            context = text[start:end]
             
             # 광고 관련 키워드가 있으면 실제 위반 가능성
-            for indicator in ad_indicators:
-                if indicator in context:
-                    return False
+            if features.has_any_within(AD_INDICATORS, start, end):
+                return False
         
         return True
     
@@ -517,47 +606,17 @@ class ComplianceAnalyzer:
         
         return True
     
-    def _find_exact_position(self, text: str, position: int, lines: List[str]) -> Tuple[int, int]:
+    def _find_exact_position(self, text_index: TextIndex, position: int) -> Tuple[int, int]:
         """정확한 줄 번호와 열 번호 찾기"""
-        char_count = 0
-        for i, line in enumerate(lines):
-            if char_count + len(line) >= position:
-                column_number = position - char_count + 1
-                return i + 1, column_number
-            char_count += len(line) + 1  # +1 for newline
-        return len(lines), 1
+        return text_index.line_and_column(position)
     
-    def _find_paragraph_number(self, text: str, position: int) -> int:
+    def _find_paragraph_number(self, text_index: TextIndex, position: int) -> int:
         """문단 번호 찾기"""
-        paragraphs = text.split('\n\n')
-        char_count = 0
-        for i, paragraph in enumerate(paragraphs):
-            if char_count + len(paragraph) + 2 >= position:  # +2 for \n\n
-                return i + 1
-            char_count += len(paragraph) + 2
-        return len(paragraphs)
+        return text_index.paragraph_number(position)
     
-    def _find_paragraph_context(self, text: str, position: int) -> str:
-        """위반 위치의 단락 컨텍스트 찾기"""
-        # 단락 시작과 끝 찾기
-        paragraph_start = position
-        paragraph_end = position
-        
-        # 단락 시작 찾기 (이전 빈 줄까지)
-        while paragraph_start > 0:
-            if text[paragraph_start-1] == '\n':
-                if paragraph_start > 1 and text[paragraph_start-2] == '\n':
-                    break
-            paragraph_start -= 1
-        
-        # 단락 끝 찾기 (다음 빈 줄까지)
-        while paragraph_end < len(text):
-            if text[paragraph_end] == '\n':
-                if paragraph_end + 1 < len(text) and text[paragraph_end + 1] == '\n':
-                    break
-            paragraph_end += 1
-        
-        return text[paragraph_start:paragraph_end].strip()
+    def _find_paragraph_context(self, text_index: TextIndex, position: int) -> str:
+        """위반 위치의 단락 컨텍스트 찾기 (빈 줄 사이 구간)"""
+        return text_index.paragraph_context(position)
     
     def _highlight_keyword_in_context(self, context: str, keyword: str) -> str:
         """컨텍스트에서 키워드를 강조 표시"""
@@ -587,8 +646,10 @@ class ComplianceAnalyzer:
         
         return fixes
     
-    def _analyze_rule_compliance(self, rule: ComplianceRule, violations: List[Dict], text: str) -> Dict:
+    def _analyze_rule_compliance(self, rule: ComplianceRule, violations: List[Dict], text: str,
+                                 features: TextFeatures = None) -> Dict:
         """규칙별 상세 준수 분석"""
+        features = features or TextFeatures(text)
         analysis = {
             'compliance_status': 'pass' if len(violations) == 0 else 'fail',
             'violation_details': [],
@@ -615,20 +676,20 @@ class ComplianceAnalyzer:
         
         # 통과 사유 분석
         if len(violations) == 0:
-            analysis['pass_reasons'] = self._explain_pass_reasons(rule, text)
+            analysis['pass_reasons'] = self._explain_pass_reasons(rule, text, features)
         
         # 실패 사유 분석
         if len(violations) > 0:
             analysis['fail_reasons'] = self._explain_fail_reasons(violations, rule)
         
         # 증거 및 근거 수집
-        analysis['evidence'] = self._collect_compliance_evidence(rule, violations, text)
+        analysis['evidence'] = self._collect_compliance_evidence(rule, violations, text, features)
         
         # 맥락 분석
-        analysis['context_analysis'] = self._analyze_text_context(rule, text)
+        analysis['context_analysis'] = self._analyze_text_context(rule, text, features)
         
         # 키워드 분석
-        analysis['keyword_analysis'] = self._analyze_keyword_usage(rule, text)
+        analysis['keyword_analysis'] = self._analyze_keyword_usage(rule, text, features)
         
         # 개선 권장사항
         analysis['recommendations'] = self._generate_rule_recommendations(rule, violations, text)
@@ -656,24 +717,25 @@ class ComplianceAnalyzer:
         
         return f"'{keyword}'는 {rule.legal_basis}에 따라 금지되는 표현입니다."
     
-    def _explain_pass_reasons(self, rule: ComplianceRule, text: str) -> List[str]:
+    def _explain_pass_reasons(self, rule: ComplianceRule, text: str, features: TextFeatures = None) -> List[str]:
         """통과 사유 설명"""
+        features = features or TextFeatures(text)
         reasons = []
         
         if rule.category == '과장·절대적 표현':
-            if not any(word in text for word in ['최고', '최고의', '완치', '치료', '보장']):
+            if not features.count_present(['최고', '최고의', '완치', '치료', '보장']):
                 reasons.append("과장되거나 절대적인 표현이 발견되지 않음")
-            if not any(word in text for word in ['비교', '더 나은', '우수한']):
+            if not features.count_present(['비교', '더 나은', '우수한']):
                 reasons.append("객관적 근거 없는 비교 표현이 없음")
         
         elif rule.category == '전후사진':
-            if '전후' not in text and 'before' not in text.lower() and 'after' not in text.lower():
+            if not features.count_present(['전후', 'before', 'after']):
                 reasons.append("전후사진 관련 내용이 없음")
             else:
                 reasons.append("전후사진이 있지만 의료적 근거가 제시됨")
         
         elif rule.category == '환자 후기·경험담':
-            if not any(word in text for word in ['후기', '경험담', '환자분', '치료받은']):
+            if not features.count_present(['후기', '경험담', '환자분', '치료받은']):
                 reasons.append("환자 후기나 경험담이 포함되지 않음")
         
         elif rule.category == 'SNS 미심의 광고':
@@ -703,8 +765,10 @@ class ComplianceAnalyzer:
         
         return reasons
     
-    def _collect_compliance_evidence(self, rule: ComplianceRule, violations: List[Dict], text: str) -> List[Dict]:
+    def _collect_compliance_evidence(self, rule: ComplianceRule, violations: List[Dict], text: str,
+                                     features: TextFeatures = None) -> List[Dict]:
         """준수 증거 수집"""
+        features = features or TextFeatures(text)
         evidence = []
         
         # 위반 증거
@@ -721,8 +785,7 @@ class ComplianceAnalyzer:
         if len(violations) == 0:
             if rule.category == '과장·절대적 표현':
                 # 객관적 표현 사용 확인
-                objective_words = ['개선', '도움', '효과', '진료', '치료']
-                found_objective = [word for word in objective_words if word in text]
+                found_objective = features.present(['개선', '도움', '효과', '진료', '치료'])
                 if found_objective:
                     evidence.append({
                         'type': 'compliance',
@@ -731,7 +794,7 @@ class ComplianceAnalyzer:
                     })
             
             elif rule.category == '전후사진':
-                if '전후' not in text:
+                if not features.has('전후'):
                     evidence.append({
                         'type': 'compliance',
                         'description': "전후사진 미사용",
@@ -739,7 +802,7 @@ class ComplianceAnalyzer:
                     })
             
             elif rule.category == '환자 후기·경험담':
-                if '후기' not in text and '경험담' not in text:
+                if not features.has('후기') and not features.has('경험담'):
                     evidence.append({
                         'type': 'compliance',
                         'description': "환자 후기/경험담 미사용",
@@ -748,86 +811,43 @@ class ComplianceAnalyzer:
         
         return evidence
     
-    def _analyze_text_context(self, rule: ComplianceRule, text: str) -> Dict:
-        """텍스트 맥락 분석"""
+    def _analyze_text_context(self, rule: ComplianceRule, text: str, features: TextFeatures = None) -> Dict:
+        """텍스트 맥락 분석 (문서 단위 값이므로 규칙마다 같은 특징을 재사용)"""
+        features = features or TextFeatures(text)
         context_analysis = {
-            'tone': self._analyze_text_tone(text),
-            'subjectivity': self._analyze_subjectivity(text),
-            'objectivity_score': self._calculate_objectivity_score(text),
-            'medical_terminology': self._extract_medical_terms(text),
-            'advertising_elements': self._identify_advertising_elements(text)
+            'tone': self._analyze_text_tone(text, features),
+            'subjectivity': self._analyze_subjectivity(text, features),
+            'objectivity_score': self._calculate_objectivity_score(text, features),
+            'medical_terminology': self._extract_medical_terms(text, features),
+            'advertising_elements': self._identify_advertising_elements(text, features)
         }
         
         return context_analysis
     
-    def _analyze_text_tone(self, text: str) -> str:
+    def _analyze_text_tone(self, text: str, features: TextFeatures = None) -> str:
         """텍스트 톤 분석"""
-        promotional_words = ['최고', '최고의', '완벽', '완전', '절대']
-        objective_words = ['개선', '도움', '효과', '진료', '치료']
-        
-        promo_count = sum(1 for word in promotional_words if word in text)
-        obj_count = sum(1 for word in objective_words if word in text)
-        
-        if promo_count > obj_count:
-            return 'promotional'
-        elif obj_count > promo_count:
-            return 'objective'
-        else:
-            return 'neutral'
+        return (features or TextFeatures(text)).tone
     
-    def _analyze_subjectivity(self, text: str) -> float:
+    def _analyze_subjectivity(self, text: str, features: TextFeatures = None) -> float:
         """주관성 분석 (0-1, 1이 가장 주관적)"""
-        subjective_words = ['최고', '완벽', '완전', '절대', '보장', '확실']
-        objective_words = ['개선', '도움', '효과', '진료', '치료', '진행']
-        
-        total_words = len(text.split())
-        if total_words == 0:
-            return 0.0
-        
-        subj_count = sum(1 for word in subjective_words if word in text)
-        obj_count = sum(1 for word in objective_words if word in text)
-        
-        if subj_count + obj_count == 0:
-            return 0.5
-        
-        return subj_count / (subj_count + obj_count)
+        return (features or TextFeatures(text)).subjectivity
     
-    def _calculate_objectivity_score(self, text: str) -> float:
+    def _calculate_objectivity_score(self, text: str, features: TextFeatures = None) -> float:
         """객관성 점수 계산 (0-100)"""
-        subjectivity = self._analyze_subjectivity(text)
+        subjectivity = self._analyze_subjectivity(text, features)
         return (1 - subjectivity) * 100
     
-    def _extract_medical_terms(self, text: str) -> List[str]:
+    def _extract_medical_terms(self, text: str, features: TextFeatures = None) -> List[str]:
         """의료 용어 추출"""
-        medical_terms = [
-            '진료', '치료', '진단', '수술', '시술', '처방', '약물',
-            '증상', '질환', '병원', '의원', '클리닉', '의료진',
-            '개선', '호전', '완화', '예방', '관리'
-        ]
-        
-        found_terms = [term for term in medical_terms if term in text]
-        return found_terms
+        return list((features or TextFeatures(text)).medical_terms)
     
-    def _identify_advertising_elements(self, text: str) -> List[str]:
+    def _identify_advertising_elements(self, text: str, features: TextFeatures = None) -> List[str]:
         """광고 요소 식별"""
-        ad_elements = []
-        
-        if any(word in text for word in ['연락처', '전화', '문의', '상담']):
-            ad_elements.append('연락처 정보')
-        
-        if any(word in text for word in ['위치', '주소', '오시는 길']):
-            ad_elements.append('위치 정보')
-        
-        if any(word in text for word in ['진료시간', '운영시간', '예약']):
-            ad_elements.append('진료 정보')
-        
-        if any(word in text for word in ['전문의', '의료진', '경력']):
-            ad_elements.append('의료진 정보')
-        
-        return ad_elements
+        return list((features or TextFeatures(text)).advertising_elements)
     
-    def _analyze_keyword_usage(self, rule: ComplianceRule, text: str) -> Dict:
+    def _analyze_keyword_usage(self, rule: ComplianceRule, text: str, features: TextFeatures = None) -> Dict:
         """키워드 사용 분석"""
+        features = features or TextFeatures(text)
         try:
             keywords = self.keywords.get(rule.category, [])
         except:
@@ -842,14 +862,14 @@ class ComplianceAnalyzer:
         
         try:
             for keyword in keywords:
-                if keyword in text:
+                count, index = features.keyword_stats(keyword)
+                if count:
                     analysis['found_keywords'].append(keyword)
-                    count = text.count(keyword)
                     analysis['keyword_frequency'][keyword] = count
                     
                     # 키워드 맥락 분석
                     try:
-                        context = self._find_keyword_context(text, keyword)
+                        context = self._find_keyword_context(text, keyword, index)
                         analysis['context_analysis'][keyword] = {
                             'context': context,
                             'usage_type': self._classify_keyword_usage(keyword, context)
@@ -865,10 +885,11 @@ class ComplianceAnalyzer:
         
         return analysis
     
-    def _find_keyword_context(self, text: str, keyword: str) -> str:
-        """키워드 맥락 찾기"""
+    def _find_keyword_context(self, text: str, keyword: str, index: int = None) -> str:
+        """키워드 맥락 찾기 (index 가 주어지면 다시 검색하지 않음)"""
         try:
-            index = text.index(keyword)
+            if index is None:
+                index = text.index(keyword)
             start = max(0, index - 50)
             end = min(len(text), index + len(keyword) + 50)
             return text[start:end]
@@ -932,8 +953,10 @@ class ComplianceAnalyzer:
         score = max(0, 100 - total_deduction - violation_penalty)
         return score
     
-    def _generate_compliance_checklist(self, violations: List[Dict], text: str) -> List[Dict]:
+    def _generate_compliance_checklist(self, violations: List[Dict], text: str,
+                                       features: TextFeatures = None) -> List[Dict]:
         """준수 체크리스트 생성 - keyword 접근을 get으로 변경"""
+        features = features or TextFeatures(text)
         checklist = []
         
         # 모든 규칙에 대해 체크리스트 항목 생성
@@ -943,7 +966,7 @@ class ComplianceAnalyzer:
             has_violation = len(rule_violations) > 0
             
             # 해당 규칙에 대한 상세 분석
-            detailed_analysis = self._analyze_rule_compliance(rule, rule_violations, text)
+            detailed_analysis = self._analyze_rule_compliance(rule, rule_violations, text, features)
             
             checklist.append({
                 'category': rule.category,
@@ -1209,127 +1232,16 @@ class ComplianceAnalyzer:
                 }
         return {}
     
-    def _generate_ai_improvements(self, detailed_violations: List[Dict], original_text: str) -> List[Dict]:
+    def _generate_ai_improvements(self, detailed_violations: List[Dict], original_text: str,
+                                  known_improvements: Dict[str, Dict] = None) -> List[Dict]:
         """Claude API를 사용하여 위반 항목에 대한 AI 개선 방안 생성"""
-        if not anthropic:
+        if not get_ai_client():
             return []
         
-        ai_improvements = []
-        
         # 상위 3개 위반 항목에 대해서만 AI 개선 방안 생성 (API 비용 절약)
-        for violation in detailed_violations[:3]:
-            try:
-                improvement = self._get_ai_improvement_suggestion(violation, original_text)
-                if improvement:
-                    ai_improvements.append(improvement)
-            except Exception as e:
-                print(f"개별 위반 항목 AI 개선 방안 생성 중 오류: {e}")
-                continue
-        
-        return ai_improvements
-    
-    def _get_ai_improvement_suggestion(self, violation: Dict, original_text: str) -> Dict:
-        """개별 위반 항목에 대한 AI 개선 방안 생성"""
-        try:
-            # 위반 정보 구성
-            violation_info = {
-                'category': violation.get('category', ''),
-                'keyword': violation.get('keyword', ''),
-                'context': violation.get('context', ''),
-                'legal_basis': violation.get('legal_basis', ''),
-                'penalty': violation.get('penalty', '')
-            }
-            
-            # Claude API 요청 프롬프트 구성
-            prompt = f"""
-당신은 의료광고법 준수 전문가입니다. 다음 위반 항목에 대해 구체적이고 실용적인 개선 방안을 제시해주세요.
-
-**위반 정보:**
-- 위반 유형: {violation_info['category']}
-- 발견된 키워드: {violation_info['keyword']}
-- 위반 문맥: "{violation_info['context']}"
-- 법적 근거: {violation_info['legal_basis']}
-- 처벌 내용: {violation_info['penalty']}
-
-**원본 텍스트 (관련 부분):**
-{original_text[:1000]}...
-
-**요청사항:**
-1. 위반 키워드를 적절한 대체 표현으로 변경하는 구체적인 제안
-2. 문맥을 고려한 전체 문장 개선 방안
-3. 의료광고법을 준수하면서도 효과적인 표현 방법
-4. 추가 주의사항이나 권장사항
-
-다음 JSON 형식으로 응답해주세요:
-{{
-    "title": "개선 방안 제목",
-    "description": "구체적인 개선 방안 설명",
-    "improved_keyword": "대체 키워드",
-    "improved_sentence": "개선된 문장",
-    "alternative_expressions": ["대안 표현 1", "대안 표현 2"],
-    "additional_recommendations": ["추가 권장사항 1", "추가 권장사항 2"],
-    "legal_compliance_notes": "법적 준수 관련 참고사항"
-}}
-"""
-            
-            # Claude API 호출
-            response = anthropic.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=800,
-                temperature=0.3,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-            
-            # 응답 파싱
-            content = response.content[0].text
-            
-            # JSON 추출 시도
-            try:
-                # JSON 부분만 추출
-                json_start = content.find('{')
-                json_end = content.rfind('}') + 1
-                if json_start != -1 and json_end != 0:
-                    json_str = content[json_start:json_end]
-                    suggestions = json.loads(json_str)
-                else:
-                    # JSON이 없으면 기본 구조로 생성
-                    suggestions = {
-                        'title': f"{violation_info['category']} 개선 방안",
-                        'description': content,
-                        'improved_keyword': '대체 표현',
-                        'improved_sentence': content,
-                        'alternative_expressions': [],
-                        'additional_recommendations': [],
-                        'legal_compliance_notes': 'AI가 제안한 개선 방안입니다.'
-                    }
-            except json.JSONDecodeError:
-                # JSON 파싱 실패 시 기본 구조로 생성
-                suggestions = {
-                    'title': f"{violation_info['category']} 개선 방안",
-                    'description': content,
-                    'improved_keyword': '대체 표현',
-                    'improved_sentence': content,
-                    'alternative_expressions': [],
-                    'alternative_expressions': [],
-                    'additional_recommendations': [],
-                    'legal_compliance_notes': 'AI가 제안한 개선 방안입니다.'
-                }
-            
-            return {
-                'violation_category': violation_info['category'],
-                'violation_keyword': violation_info['keyword'],
-                'suggestions': suggestions,
-                'raw_response': content
-            }
-            
-        except Exception as e:
-            print(f"AI 개선 방안 생성 중 오류: {e}")
-            return None 
+        # 캐시되지 않은 항목은 동시에(필요 시 묶어서) 요청
+        improvements = generate_improvements(detailed_violations[:3], original_text, known_improvements)
+        return [improvement for improvement in improvements if improvement]
     
     def _remove_duplicate_violations(self, violations: List[Dict]) -> List[Dict]:
         """중복된 위반 항목 제거"""
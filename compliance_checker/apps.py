@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ComplianceCheckerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'compliance_checker'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,349 @@
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List
+
+from django.conf import settings
+
+# 이 모듈은 spawn 워커 프로세스에서 Django 초기화 전에 import 되므로
+# 모델/스냅샷 모듈은 함수 안에서 import 한다.
+
+logger = logging.getLogger(__name__)
+
+# 디렉터리/zip 입력에서 분석하는 파일 확장자
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+
+def normalize_item(raw: Dict, base_dir: str = None, allow_paths: bool = True) -> Dict:
+    """입력 항목을 {'input_type', 'text'|'url'|'path'|('zip_path', 'member'), ...} 형태로 정리
+
+    allow_paths=False 이면(웹 요청 등) 서버 파일 경로 항목을 거부한다.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError('각 항목은 객체여야 합니다.')
+    item = {'reference': raw.get('id') or raw.get('reference') or ''}
+    if raw.get('text'):
+        item.update(input_type='text', text=str(raw['text']))
+    elif raw.get('url'):
+        item.update(input_type='url', url=str(raw['url']).strip(), simple_mode=bool(raw.get('simple_mode', False)))
+    elif raw.get('path') and allow_paths:
+        path = raw['path'] if not base_dir else os.path.join(base_dir, raw['path'])
+        item.update(input_type='file', path=path, file_name=os.path.basename(path))
+    else:
+        raise ValueError('text, url, path 중 하나가 필요합니다.' if allow_paths else 'text 또는 url 이 필요합니다.')
+    return item
+
+
+def iter_jsonl_items(path: str, allow_paths: bool = True) -> Iterator[Dict]:
+    """JSONL 파일의 각 줄({"text"|"url"|"path": ...})을 분석 항목으로 변환"""
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding='utf-8') as jsonl_file:
+        for line_number, line in enumerate(jsonl_file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield normalize_item(json.loads(line), base_dir, allow_paths)
+            except ValueError as e:
+                yield {'input_type': 'text', 'reference': f'{os.path.basename(path)}:{line_number}',
+                       'error': f'잘못된 항목: {e}'}
+
+
+def iter_directory_items(path: str) -> Iterator[Dict]:
+    """디렉터리 안의 지원 형식 파일을 분석 항목으로 변환 (하위 디렉터리 포함)"""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                file_path = os.path.join(root, name)
+                yield {'input_type': 'file', 'path': file_path, 'file_name': name,
+                       'reference': os.path.relpath(file_path, path)}
+
+
+def iter_zip_items(path: str) -> Iterator[Dict]:
+    """zip 파일 안의 지원 형식 파일을 분석 항목으로 변환"""
+    with zipfile.ZipFile(path) as archive:
+        members = sorted(info.filename for info in archive.infolist() if not info.is_dir())
+    for member in members:
+        if member.lower().endswith(SUPPORTED_EXTENSIONS):
+            yield {'input_type': 'file', 'zip_path': path, 'member': member,
+                   'file_name': os.path.basename(member), 'reference': member}
+
+
+def iter_corpus_items(path: str, allow_paths: bool = True) -> Iterator[Dict]:
+    """JSONL 파일, 디렉터리, zip 파일 중 하나에서 분석 항목 생성"""
+    if os.path.isdir(path):
+        return iter_directory_items(path)
+    if zipfile.is_zipfile(path):
+        return iter_zip_items(path)
+    if path.lower().endswith(('.jsonl', '.json', '.ndjson')):
+        return iter_jsonl_items(path, allow_paths)
+    raise ValueError('지원하지 않는 입력입니다. (JSONL 파일, 디렉터리, zip 파일만 지원)')
+
+
+def _extract_item_text(item: Dict) -> str:
+    """항목 유형에 맞춰 분석할 텍스트 추출"""
+    from django.core.files import File
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from .utils import extract_text_from_file, extract_text_from_url
+
+    if item['input_type'] == 'text':
+        return item['text']
+    if item['input_type'] == 'url':
+        return extract_text_from_url(item['url'], simple_mode=item.get('simple_mode', False))
+    if 'zip_path' in item:
+        with zipfile.ZipFile(item['zip_path']) as archive:
+            # 압축 해제 전에 크기 제한 확인
+            max_bytes = getattr(settings, 'COMPLIANCE_UPLOAD_MAX_BYTES', 20 * 1024 * 1024)
+            if max_bytes and archive.getinfo(item['member']).file_size > max_bytes:
+                raise ValueError(f'파일 크기가 제한({max_bytes // (1024 * 1024)}MB)을 초과했습니다.')
+            text = extract_text_from_file(SimpleUploadedFile(item['file_name'], archive.read(item['member'])))
+    else:
+        with open(item['path'], 'rb') as stored_file:
+            text = extract_text_from_file(File(stored_file, name=item['file_name']))
+    if not text.strip():
+        raise ValueError('파일에서 텍스트를 추출할 수 없습니다.')
+    return text
+
+
+# 워커 프로세스 상태 (초기화 시 부모가 보낸 규칙 스냅샷 하나를 모든 항목이 공유)
+_worker_snapshot = None
+_worker_enable_ai = False
+
+
+def _set_worker_state(snapshot, enable_ai: bool):
+    global _worker_snapshot, _worker_enable_ai
+    _worker_snapshot = snapshot
+    _worker_enable_ai = enable_ai
+
+
+def _init_worker(snapshot_payload: tuple, enable_ai: bool):
+    """워커 프로세스 초기화: Django 설정 후 부모가 보낸 스냅샷 복원"""
+    from django.apps import apps
+    if not apps.ready:
+        import django
+        django.setup()
+    from .snapshot import RuleSnapshot
+    _set_worker_state(RuleSnapshot.from_payload(snapshot_payload), enable_ai)
+
+
+def _analyze_item(item: Dict) -> Dict:
+    """항목 하나를 추출/분석 (워커 프로세스 또는 현재 프로세스에서 실행)"""
+    from .analyzer import ComplianceAnalyzer
+
+    if item.get('error'):
+        return {'item': item, 'error': item['error']}
+    try:
+        text = _extract_item_text(item)
+        analyzer = ComplianceAnalyzer(_worker_snapshot, enable_ai=_worker_enable_ai)
+        return {'item': item, 'text': text, 'result': analyzer.analyze(text, item['input_type'])}
+    except Exception as e:
+        logger.warning(f"일괄 분석 항목 실패 ({item.get('reference') or item.get('url') or item.get('file_name')}): {e}")
+        return {'item': item, 'error': str(e)}
+
+
+def _reanalyze_item(item: Dict) -> Dict:
+    """저장된 분석 원문을 현재 워커 스냅샷으로 다시 분석 (AI 개선 방안은 생성하지 않음)"""
+    from .analyzer import ComplianceAnalyzer
+
+    try:
+        analyzer = ComplianceAnalyzer(_worker_snapshot, enable_ai=False)
+        return {'id': item['id'], 'result': analyzer.analyze(item['text'], item['input_type'])}
+    except Exception as e:
+        logger.warning(f"재분석 실패 (분석 ID {item['id']}): {e}")
+        return {'id': item['id'], 'error': str(e)}
+
+
+@contextmanager
+def analysis_pool(snapshot, workers: int, enable_ai: bool = False):
+    """스냅샷을 공유하는 분석 워커 풀
+
+    run(func, items) 로 항목 목록을 순서대로 처리한 결과를 얻는다. 풀은 with 블록 동안
+    유지되므로 여러 묶음을 처리해도 프로세스를 다시 만들지 않는다. workers 가 1 이하이면
+    현재 프로세스에서 처리한다.
+    """
+    if workers <= 1:
+        _set_worker_state(snapshot, enable_ai)
+        yield lambda func, items: map(func, items)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(snapshot.to_payload(), enable_ai)
+    ) as executor:
+        def run(func, items):
+            items = list(items)
+            chunksize = max(1, min(16, len(items) // (workers * 4)))
+            return executor.map(func, items, chunksize=chunksize)
+        yield run
+
+
+def default_workers() -> int:
+    return getattr(settings, 'COMPLIANCE_BATCH_WORKERS', None) or os.cpu_count() or 1
+
+
+def _build_analysis(outcome: Dict, rule_version: int, enable_ai: bool, resolver=None):
+    from .models import ComplianceAnalysis
+    from .result_cache import prepare_analysis
+
+    item = outcome['item']
+    analysis = ComplianceAnalysis(
+        input_type=item['input_type'],
+        url=item.get('url'),
+        file_name=item.get('file_name')
+    )
+    if outcome.get('error'):
+        analysis.input_text = item.get('text', '')
+        analysis.status = 'failed'
+        analysis.error_message = outcome['error']
+        return analysis
+
+    prepare_analysis(analysis, outcome['text'], outcome['result'], rule_version, resolver)
+    if not enable_ai:
+        # AI 개선 방안이 빠진 결과는 단건 분석 결과 캐시로 재사용하지 않는다
+        analysis.content_hash = ''
+    return analysis
+
+
+def run_batch(items: Iterable[Dict], workers: int = None, enable_ai: bool = False,
+              batch_size: int = 200, progress=None) -> Dict:
+    """여러 항목을 분석하고 ComplianceAnalysis 로 일괄 저장
+
+    규칙 스냅샷은 한 번만 로드해 워커 프로세스 초기화 때 전달하고, 결과와 위반 구간은
+    batch_size 개씩 bulk_create 로 저장한다.
+
+    Returns:
+        {'total', 'completed', 'failed', 'analysis_ids', 'items'}
+    """
+    from .models import ComplianceAnalysis
+    from .rollups import record_analyses
+    from .snapshot import get_rule_snapshot
+    from .violation_store import create_spans, get_span_resolver
+
+    items = list(items)
+    snapshot = get_rule_snapshot()
+    resolver = get_span_resolver(snapshot)
+    if workers is None:
+        workers = default_workers()
+
+    summary = {'total': len(items), 'completed': 0, 'failed': 0, 'analysis_ids': [], 'items': []}
+    pending = []
+
+    def flush():
+        if not pending:
+            return
+        created = ComplianceAnalysis.objects.bulk_create(pending, batch_size=batch_size)
+        create_spans(
+            ((analysis, getattr(analysis, '_violation_spans', [])) for analysis in created),
+            batch_size=batch_size * 10
+        )
+        record_analyses(created)
+        for analysis in created:
+            summary['analysis_ids'].append(analysis.id)
+            summary['items'].append({
+                'analysis_id': analysis.id,
+                'input_type': analysis.input_type,
+                'reference': getattr(analysis, '_batch_reference', ''),
+                'status': analysis.status,
+                'overall_score': analysis.overall_score if analysis.status == 'completed' else None,
+                'risk_level': analysis.risk_level,
+                'error': analysis.error_message or None,
+            })
+        pending.clear()
+
+    def collect(outcomes):
+        for outcome in outcomes:
+            analysis = _build_analysis(outcome, snapshot.version, enable_ai, resolver)
+            item = outcome['item']
+            analysis._batch_reference = item.get('reference') or item.get('url') or item.get('file_name') or ''
+            summary['completed' if analysis.status == 'completed' else 'failed'] += 1
+            pending.append(analysis)
+            if len(pending) >= batch_size:
+                flush()
+            if progress:
+                progress(summary['completed'] + summary['failed'], summary['total'])
+        flush()
+
+    # 항목이 적으면 프로세스 시작 비용이 더 크므로 현재 프로세스에서 처리
+    if len(items) < workers * 2:
+        workers = 1
+    with analysis_pool(snapshot, workers, enable_ai) as run:
+        collect(run(_analyze_item, items))
+
+    logger.info(f"일괄 분석 완료: 전체 {summary['total']}건, 성공 {summary['completed']}건, 실패 {summary['failed']}건")
+    return summary
+
+
+def run_batch_job(run_id: int, items: List[Dict] = None, upload_path: str = None):
+    """일괄 분석 작업 기록(BatchRun)을 실행하고 진행 상황과 결과를 저장
+
+    업로드 파일로 접수한 작업은 저장소의 파일을 임시 디렉터리로 옮겨 항목을 다시 읽고,
+    작업이 끝나면 저장소에서 삭제한다.
+    """
+    from django.core.files.storage import default_storage
+    from django.utils import timezone
+    from .models import BatchRun
+
+    run = BatchRun.objects.get(id=run_id)
+    run.status = 'running'
+    run.started_at = timezone.now()
+    run.save(update_fields=['status', 'started_at'])
+
+    def progress(processed: int, total: int):
+        # 항목마다 갱신하지 않고 일정 간격으로만 진행 상황 기록
+        if processed == total or processed % 20 == 0:
+            BatchRun.objects.filter(id=run_id).update(processed_count=processed)
+
+    try:
+        with tempfile.TemporaryDirectory() as upload_dir:
+            if upload_path:
+                local_path = os.path.join(upload_dir, os.path.basename(upload_path))
+                with default_storage.open(upload_path, 'rb') as stored_file, open(local_path, 'wb') as destination:
+                    shutil.copyfileobj(stored_file, destination)
+                items = list(iter_corpus_items(local_path, allow_paths=False))
+            summary = run_batch(items, enable_ai=run.enable_ai, progress=progress)
+    except Exception as e:
+        logger.exception(f"일괄 분석 작업 실패 (작업 ID {run_id})")
+        BatchRun.objects.filter(id=run_id).update(
+            status='failed', error_message=str(e), completed_at=timezone.now()
+        )
+        raise
+    finally:
+        if upload_path:
+            try:
+                default_storage.delete(upload_path)
+            except Exception as e:
+                logger.warning(f"일괄 분석 업로드 파일 삭제 실패: {upload_path} - {e}")
+
+    BatchRun.objects.filter(id=run_id).update(
+        status='completed',
+        total_count=summary['total'],
+        processed_count=summary['total'],
+        completed_count=summary['completed'],
+        failed_count=summary['failed'],
+        analysis_ids=summary['analysis_ids'],
+        items=summary['items'],
+        completed_at=timezone.now()
+    )
+
+
+def submit_batch(total: int, enable_ai: bool = False, items: List[Dict] = None, upload_path: str = None):
+    """일괄 분석 작업 기록을 만들고 백그라운드 워커 풀에 제출
+
+    items(정리된 항목 목록) 또는 upload_path(저장소에 저장한 JSONL/zip 파일) 중 하나를 받는다.
+    """
+    from django.db import transaction
+    from .jobs import submit_job
+    from .models import BatchRun
+
+    run = BatchRun.objects.create(enable_ai=enable_ai, total_count=total)
+    transaction.on_commit(lambda: submit_job(run_batch_job, run.id, items=items, upload_path=upload_path))
+    return run
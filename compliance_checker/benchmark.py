@@ -0,0 +1,406 @@
+import contextlib
+import gc
+import hashlib
+import io
+import json
+import math
+import os
+import random
+import re
+import time
+import tracemalloc
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import docx
+
+from .analyzer import ComplianceAnalyzer, keyed_violation_spans
+from .snapshot import RuleSnapshot
+from .utils import TextExtractor, WebTextExtractor
+
+# 저장된 벤치마크 코퍼스 (네트워크/데이터베이스 없이 실행)
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_corpus')
+MANIFEST_FILE = 'manifest.json'
+RULES_FILE = 'rules.json'
+GOLDEN_FILE = 'golden.json'
+
+# 코퍼스 항목 종류별 분석 source_type
+SOURCE_TYPES = {'text': 'text', 'html': 'url', 'pdf': 'file', 'docx': 'file'}
+
+# 합성 키워드 난수 시드 (규칙 수 증가 측정용, 실행마다 같은 키워드)
+SYNTHETIC_KEYWORD_SEED = 20240501
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def load_manifest(corpus_dir: str = CORPUS_DIR) -> List[Dict]:
+    """코퍼스 항목 목록 ({'id', 'kind', 'path', ...})"""
+    with open(os.path.join(corpus_dir, MANIFEST_FILE), encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)['cases']
+
+
+def _synthetic_keywords(count: int) -> List[str]:
+    """코퍼스에 나오지 않는 3~5음절 한글 키워드 (판정은 바꾸지 않고 매처 크기만 늘림)"""
+    generator = random.Random(SYNTHETIC_KEYWORD_SEED)
+    return [
+        ''.join(chr(0xAC00 + generator.randrange(11172)) for _ in range(generator.randint(3, 5)))
+        for _ in range(count)
+    ]
+
+
+def load_rule_snapshot(corpus_dir: str = CORPUS_DIR, extra_keywords: int = 0) -> RuleSnapshot:
+    """저장된 규칙 픽스처로 스냅샷 생성 (extra_keywords 개의 합성 키워드를 규칙별로 나눠 추가)"""
+    with open(os.path.join(corpus_dir, RULES_FILE), encoding='utf-8') as rules_file:
+        version, rules, keywords, recommended_expressions = json.load(rules_file)
+    if extra_keywords:
+        categories = list(keywords)
+        for index, keyword in enumerate(_synthetic_keywords(extra_keywords)):
+            keywords[categories[index % len(categories)]].append(keyword)
+    return RuleSnapshot.from_payload((version, rules, keywords, recommended_expressions, []))
+
+
+def export_rule_fixture(snapshot: RuleSnapshot, path: str):
+    """규칙 스냅샷을 픽스처 파일로 저장 (생성/수정 일시는 제외)"""
+    def without_timestamps(row: Dict) -> Dict:
+        return {key: value for key, value in row.items() if not isinstance(value, (date, datetime))}
+
+    _, rules, keywords, recommended_expressions, _ = snapshot.to_payload()
+    payload = [0, [without_timestamps(rule) for rule in rules], keywords,
+               [without_timestamps(expression) for expression in recommended_expressions]]
+    with open(path, 'w', encoding='utf-8') as rules_file:
+        json.dump(payload, rules_file, ensure_ascii=False, indent=1)
+        rules_file.write('\n')
+
+
+def build_pdf(pages: List[str]) -> bytes:
+    """페이지별 텍스트로 PDF 생성
+
+    글꼴을 내장하지 않고 글자 코드를 그대로 쓰는 Type0 글꼴과, 실제 PDF 의 부분 글꼴처럼
+    문서에 쓰인 글자만 담은 ToUnicode 대응표를 넣는다. 화면 표시용은 아니지만 PyPDF2 텍스트
+    추출 결과는 원래 텍스트와 같다.
+    """
+    codes = sorted({ord(char) for page in pages for char in page if 0x20 <= ord(char) <= 0xffff})
+    # 연속된 글자 코드 구간 (bfrange 는 마지막 바이트만 증가하므로 256자 경계에서 나눔)
+    ranges = []
+    for code in codes:
+        if ranges and ranges[-1][1] == code - 1 and code & 0xff:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    mappings = []
+    for start in range(0, len(ranges), 100):
+        block = ranges[start:start + 100]
+        mappings += [f'{len(block)} beginbfrange', *(f'<{first:04X}> <{last:04X}> <{first:04X}>' for first, last in block),
+                     'endbfrange']
+    cmap = '\n'.join([
+        '/CIDInit /ProcSet findresource begin', '12 dict begin', 'begincmap',
+        '/CMapName /Benchmark-UCS def', '/CMapType 2 def',
+        '1 begincodespacerange', '<0000> <FFFF>', 'endcodespacerange', *mappings,
+        'endcmap', 'CMapName currentdict /CMap defineresource pop', 'end', 'end'
+    ]).encode('ascii')
+
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    def stream(data: bytes) -> bytes:
+        return b'<< /Length %d >>\nstream\n' % len(data) + data + b'\nendstream'
+
+    cmap_id = add(stream(cmap))
+    cid_font_id = add(b'<< /Type /Font /Subtype /CIDFontType2 /BaseFont /Benchmark '
+                      b'/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> /DW 1000 >>')
+    font_id = add(b'<< /Type /Font /Subtype /Type0 /BaseFont /Benchmark /Encoding /Identity-H '
+                  b'/DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>' % (cid_font_id, cmap_id))
+    pages_id = add(b'')
+    page_ids = []
+    for page in pages:
+        operations = ['BT', '/F1 10 Tf', '12 TL', '40 800 Td']
+        for line in page.split('\n'):
+            glyphs = ''.join(f'{ord(char):04X}' for char in line if 0x20 <= ord(char) <= 0xffff)
+            operations.append(f'<{glyphs}> Tj T*')
+        operations.append('ET')
+        content_id = add(stream('\n'.join(operations).encode('ascii')))
+        page_ids.append(add(b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] '
+                            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>'
+                            % (pages_id, font_id, content_id)))
+    objects[pages_id - 1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        ' '.join(f'{page_id} 0 R' for page_id in page_ids).encode('ascii'), len(page_ids)
+    )
+    catalog_id = add(b'<< /Type /Catalog /Pages %d 0 R >>' % pages_id)
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, catalog_id, xref_offset
+    )
+    return bytes(output)
+
+
+def build_docx(paragraphs: Iterable[str]) -> bytes:
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _fill_pages(lines: List[str], page_count: int, lines_per_page: int) -> List[str]:
+    """줄 목록을 반복해 page_count 페이지 채우기"""
+    return [
+        '\n'.join(lines[(page * lines_per_page + offset) % len(lines)] for offset in range(lines_per_page))
+        for page in range(page_count)
+    ]
+
+
+def prepare_case(case: Dict, corpus_dir: str = CORPUS_DIR, scale: int = 1) -> Dict:
+    """코퍼스 항목의 입력 문서 생성 (측정 전에 한 번, scale 배로 늘린 크기 또는 문서 수)
+
+    Returns:
+        {'id', 'kind', 'source_type', 'url', 'documents': [str | bytes, ...]}
+    """
+    kind = case['kind']
+    with open(os.path.join(corpus_dir, case['path']), 'rb') as fixture_file:
+        content = fixture_file.read()
+    if kind == 'html':
+        documents = [content] * scale
+    else:
+        text = content.decode('utf-8').strip()
+        if kind == 'text' and case.get('separator'):
+            documents = [post.strip() for post in text.split(case['separator'])] * scale
+        elif kind == 'text':
+            documents = ['\n\n'.join([text] * case.get('repeat', 1) * scale)]
+        elif kind == 'pdf':
+            documents = [build_pdf(_fill_pages(text.split('\n'), case['pages'] * scale, case.get('lines_per_page', 40)))]
+        elif kind == 'docx':
+            documents = [build_docx(text.split('\n') * case.get('repeat', 1) * scale)]
+        else:
+            raise ValueError(f"지원하지 않는 코퍼스 항목 종류입니다: {kind}")
+    return {
+        'id': case['id'],
+        'kind': kind,
+        'source_type': SOURCE_TYPES[kind],
+        'url': case.get('url', ''),
+        'documents': documents
+    }
+
+
+def extract_document(prepared: Dict, document) -> Tuple[Optional[str], str]:
+    """입력 문서에서 분석할 텍스트 추출
+
+    Returns:
+        (추출 단계 이름, 텍스트) — 텍스트 입력은 추출 단계 없이 (None, 텍스트)
+    """
+    kind = prepared['kind']
+    if kind == 'html':
+        text = WebTextExtractor.extract_from_html(document, prepared['url']) or ''
+        # extract_text_from_url 과 같은 공백 정리
+        return 'parse_html', _WHITESPACE_RE.sub(' ', text).strip()
+    if kind == 'pdf':
+        return 'extract_pdf', TextExtractor.extract_from_pdf(document)
+    if kind == 'docx':
+        return 'extract_docx', TextExtractor.extract_from_docx(document)
+    return None, document
+
+
+def run_document(analyzer: ComplianceAnalyzer, prepared: Dict, document) -> Tuple[Dict[str, float], str, Dict]:
+    """문서 하나를 추출 → 분석하며 단계별 소요 시간(초) 측정"""
+    timings = {}
+    started = time.perf_counter()
+    stage, text = extract_document(prepared, document)
+    if stage:
+        timings[stage] = time.perf_counter() - started
+    started = time.perf_counter()
+    result = analyzer.analyze(text, prepared['source_type'])
+    timings['analyze'] = time.perf_counter() - started
+    return timings, text, result
+
+
+def result_digest(text: str, result: Dict) -> Dict:
+    """골든 비교용 판정 요약
+
+    위반 구간은 [시작, 길이, 카테고리] 목록의 해시로 비교한다. 일반 분석(detailed_violations)과
+    청크 분석(violation_spans) 결과가 같은 요약이 되므로 분석 방식이 바뀌어도 비교할 수 있다.
+    """
+    if 'violation_spans' in result:
+        spans = [[start, length, rule_key[0]] for start, length, rule_key in keyed_violation_spans(result)]
+    else:
+        spans = [
+            [violation['position'], len(violation['matched_text']), violation['category']]
+            for violation in result.get('detailed_violations', [])
+        ]
+    category_counts = {}
+    for _, _, category in spans:
+        category_counts[category] = category_counts.get(category, 0) + 1
+    return {
+        'text_length': len(text),
+        'text_sha256': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+        'overall_score': result.get('overall_score'),
+        'compliance_status': result.get('compliance_status'),
+        'risk_level': result.get('risk_level'),
+        'violation_count': len(spans),
+        'violation_categories': dict(sorted(category_counts.items())),
+        'violations_sha256': hashlib.sha256(
+            json.dumps(spans, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        ).hexdigest()
+    }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """최근접 순위 백분위수"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def _milliseconds(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def run_case(analyzer: ComplianceAnalyzer, prepared: Dict, repeat: int = 5, warmup: int = 1,
+             measure_memory: bool = True) -> Dict:
+    """코퍼스 항목 측정
+
+    warmup 회 실행 후 repeat 회 실행 시간으로 처리량, 문서당 지연 시간 p50/p99, 단계별 시간을
+    계산한다. 판정 요약과 최대 메모리는 별도 1회 실행에서 구하며, 메모리는 tracemalloc 을
+    켜고 재므로(측정 부담이 시간에 섞이지 않도록) measure_memory 가 False 면 생략한다.
+    """
+    documents = prepared['documents']
+    for _ in range(warmup):
+        for document in documents:
+            run_document(analyzer, prepared, document)
+
+    gc.collect()
+    latencies = []
+    stage_times = {}
+    characters = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for document in documents:
+            timings, text, _ = run_document(analyzer, prepared, document)
+            latencies.append(sum(timings.values()))
+            for stage, seconds in timings.items():
+                stage_times.setdefault(stage, []).append(seconds)
+            characters += len(text)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    digests = []
+    peak_memory = 0
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        for document in documents:
+            if measure_memory:
+                tracemalloc.reset_peak()
+            _, text, result = run_document(analyzer, prepared, document)
+            if measure_memory:
+                peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+            digests.append(result_digest(text, result))
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+
+    return {
+        'id': prepared['id'],
+        'kind': prepared['kind'],
+        'documents': len(documents),
+        'runs': len(latencies),
+        'characters': characters // max(1, repeat),
+        'documents_per_second': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'characters_per_second': round(characters / elapsed) if elapsed else None,
+        'latency_ms': {
+            'p50': _milliseconds(percentile(latencies, 0.5)),
+            'p99': _milliseconds(percentile(latencies, 0.99)),
+            'max': _milliseconds(max(latencies))
+        },
+        'stages_ms': {
+            stage: {
+                'mean': _milliseconds(sum(times) / len(times)),
+                'p50': _milliseconds(percentile(times, 0.5)),
+                'p99': _milliseconds(percentile(times, 0.99))
+            }
+            for stage, times in stage_times.items()
+        },
+        'peak_memory_kb': round(peak_memory / 1024) if measure_memory else None,
+        'digests': digests
+    }
+
+
+def run_benchmark(corpus_dir: str = CORPUS_DIR, repeat: int = 5, warmup: int = 1, scale: int = 1,
+                  extra_keywords: int = 0, case_ids: List[str] = None, measure_memory: bool = True,
+                  progress=None) -> Dict:
+    """코퍼스 전체(또는 case_ids 항목) 측정
+
+    분석기의 디버그 출력은 버린다. scale 이 1 이 아니면 입력 크기가 골든과 달라 골든 비교
+    대상이 아니다 (합성 키워드는 판정을 바꾸지 않으므로 extra_keywords 와는 무관).
+    """
+    cases = load_manifest(corpus_dir)
+    if case_ids:
+        unknown = set(case_ids) - {case['id'] for case in cases}
+        if unknown:
+            raise ValueError(f"코퍼스에 없는 항목입니다: {', '.join(sorted(unknown))}")
+        cases = [case for case in cases if case['id'] in case_ids]
+
+    snapshot = load_rule_snapshot(corpus_dir, extra_keywords)
+    reports = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        analyzer = ComplianceAnalyzer(snapshot, enable_ai=False)
+        for case in cases:
+            report = run_case(analyzer, prepare_case(case, corpus_dir, scale), repeat, warmup, measure_memory)
+            reports.append(report)
+            if progress:
+                progress(report)
+    return {
+        'rules': len(snapshot.rules),
+        'keywords': sum(len(keywords) for keywords in snapshot.keywords.values()),
+        'scale': scale,
+        'repeat': repeat,
+        'golden_comparable': scale == 1,
+        'cases': reports
+    }
+
+
+def load_golden(corpus_dir: str = CORPUS_DIR) -> Dict[str, List[Dict]]:
+    path = os.path.join(corpus_dir, GOLDEN_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as golden_file:
+        return json.load(golden_file)
+
+
+def save_golden(benchmark: Dict, corpus_dir: str = CORPUS_DIR):
+    """측정 결과의 판정 요약을 골든 파일로 저장 (기존 파일의 다른 항목은 유지)"""
+    golden = load_golden(corpus_dir)
+    golden.update({report['id']: report['digests'] for report in benchmark['cases']})
+    with open(os.path.join(corpus_dir, GOLDEN_FILE), 'w', encoding='utf-8') as golden_file:
+        json.dump(dict(sorted(golden.items())), golden_file, ensure_ascii=False, indent=1)
+        golden_file.write('\n')
+
+
+def compare_golden(benchmark: Dict, golden: Dict[str, List[Dict]]) -> List[str]:
+    """골든 판정과 다른 항목 설명 목록 (같으면 빈 목록)"""
+    mismatches = []
+    for report in benchmark['cases']:
+        expected = golden.get(report['id'])
+        if expected is None:
+            mismatches.append(f"{report['id']}: 골든 결과가 없습니다.")
+            continue
+        if len(expected) != len(report['digests']):
+            mismatches.append(f"{report['id']}: 문서 수 {len(expected)} → {len(report['digests'])}")
+            continue
+        for index, (before, after) in enumerate(zip(expected, report['digests'])):
+            changed = [
+                f"{field} {before.get(field)!r} → {after.get(field)!r}"
+                for field in sorted(set(before) | set(after)) if before.get(field) != after.get(field)
+            ]
+            if changed:
+                mismatches.append(f"{report['id']}[{index}]: " + ', '.join(changed))
+    return mismatches
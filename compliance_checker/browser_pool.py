@@ -0,0 +1,165 @@
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, List
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def chrome_driver_factory():
+    """헤드리스 Chrome 드라이버 생성"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    return webdriver.Chrome(options=chrome_options)
+
+
+class _BrowserSession:
+    __slots__ = ('driver', 'pages_served')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages_served = 0
+
+
+class BrowserPool:
+    """재사용 가능한 헤드리스 브라우저 세션 풀
+
+    동시에 사용할 수 있는 세션 수를 제한하고, 세션은 max_pages_per_session 페이지를
+    처리했거나 사용 중 오류가 나면 종료 후 새로 만든다. driver_factory 를 바꿔 끼우면
+    실제 브라우저 없이 테스트할 수 있다.
+    """
+
+    def __init__(self, driver_factory: Callable = None, max_sessions: int = 2,
+                 max_pages_per_session: int = 50, page_load_timeout: float = 20,
+                 acquire_timeout: float = 60):
+        self.driver_factory = driver_factory or chrome_driver_factory
+        self.max_sessions = max_sessions
+        self.max_pages_per_session = max_pages_per_session
+        self.page_load_timeout = page_load_timeout
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self._idle: List[_BrowserSession] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create_session(self) -> _BrowserSession:
+        driver = self.driver_factory()
+        if self.page_load_timeout:
+            driver.set_page_load_timeout(self.page_load_timeout)
+        logger.info("브라우저 세션 생성")
+        return _BrowserSession(driver)
+
+    @staticmethod
+    def _is_alive(session: _BrowserSession) -> bool:
+        try:
+            session.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(session: _BrowserSession):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            logger.warning(f"브라우저 세션 종료 실패: {e}")
+
+    def _checkout(self) -> _BrowserSession:
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                return self._create_session()
+            if self._is_alive(session):
+                return session
+            logger.warning("응답하지 않는 브라우저 세션 폐기")
+            self._quit(session)
+
+    def _checkin(self, session: _BrowserSession, healthy: bool):
+        session.pages_served += 1
+        if healthy and session.pages_served < self.max_pages_per_session:
+            try:
+                # 다음 요청에 iframe 전환 상태가 남지 않도록 초기화
+                session.driver.switch_to.default_content()
+            except Exception:
+                healthy = False
+        if healthy and session.pages_served < self.max_pages_per_session:
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(session)
+                    return
+        self._quit(session)
+
+    @contextmanager
+    def session(self):
+        """브라우저 드라이버 대여 (with 블록 안에서만 사용)"""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError('사용 가능한 브라우저 세션이 없습니다. 잠시 후 다시 시도해주세요.')
+        session = None
+        try:
+            session = self._checkout()
+            yield session.driver
+        except Exception:
+            # 사용 중 오류(페이지 로드 시간 초과, 브라우저 중단 등)가 난 세션은 재사용하지 않는다
+            if session is not None:
+                self._checkin(session, healthy=False)
+                session = None
+            raise
+        finally:
+            if session is not None:
+                self._checkin(session, healthy=True)
+            self._slots.release()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def shutdown(self):
+        """대기 중인 세션 모두 종료"""
+        with self._lock:
+            self._closed = True
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            self._quit(session)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """프로세스에서 공유하는 브라우저 풀"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                factory_path = getattr(settings, 'COMPLIANCE_BROWSER_DRIVER_FACTORY', None)
+                _pool = BrowserPool(
+                    driver_factory=import_string(factory_path) if factory_path else None,
+                    max_sessions=getattr(settings, 'COMPLIANCE_BROWSER_MAX_SESSIONS', 2),
+                    max_pages_per_session=getattr(settings, 'COMPLIANCE_BROWSER_MAX_PAGES', 50),
+                    page_load_timeout=getattr(settings, 'COMPLIANCE_BROWSER_PAGE_LOAD_TIMEOUT', 20),
+                    acquire_timeout=getattr(settings, 'COMPLIANCE_BROWSER_ACQUIRE_TIMEOUT', 60)
+                )
+                atexit.register(_pool.shutdown)
+    return _pool
+
+
+def set_browser_pool(pool: BrowserPool = None):
+    """공유 브라우저 풀 교체 (테스트용, None 이면 다음 조회 시 새로 생성)"""
+    global _pool
+    with _pool_lock:
+        previous, _pool = _pool, pool
+    if previous is not None and previous is not pool:
+        previous.shutdown()
@@ -0,0 +1,317 @@
+import hashlib
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import CitationPassage, CitationSource
+from .normalization import is_hangul_syllable, normalize_korean
+from .versions import bump_shared_version, get_shared_version
+
+logger = logging.getLogger(__name__)
+
+# 인용 색인 공유 버전 이름 (색인 원문 추가/변경/삭제 시 갱신)
+CITATION_INDEX_VERSION_KEY = 'compliance_checker:citation_index_version'
+
+# 문단 분할 기준 글자 수 (짧은 단락은 목표 길이까지 합치고, 최대 길이를 넘는 단락은 줄 단위로 나눔)
+PASSAGE_TARGET_CHARS = 400
+PASSAGE_MAX_CHARS = 800
+
+# BM25 매개변수
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 인용 문단 요약 길이
+SNIPPET_CHARS = 300
+
+# 정규형의 한글 음절 구간 / 영문·숫자 단어
+_TERM_RE = re.compile(r'[가-힣]+|[a-z0-9]+')
+# 빈 줄로 나뉜 단락 (앞뒤 공백 제외)
+_BLOCK_RE = re.compile(r'\S(?:[^\n]*\S)?(?:\n[^\S\n]*\S(?:[^\n]*\S)?)*')
+_LINE_RE = re.compile(r'\S(?:[^\n]*\S)?')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def citation_terms(text: str) -> List[str]:
+    """BM25 색인 용어 목록
+
+    키워드 매칭과 같은 정규형(공백·대소문자·호환 문자 통일)에서 한글은 음절 바이그램,
+    영문과 숫자는 단어 단위로 나눈다. 형태소 분석 없이도 '과장광고' 와 '과장된 광고' 가
+    같은 용어('과장', '광고')를 공유한다.
+    """
+    terms = []
+    for token in _TERM_RE.findall(normalize_korean(text).text):
+        if len(token) > 1 and is_hangul_syllable(token[0]):
+            terms.extend(token[index:index + 2] for index in range(len(token) - 1))
+        else:
+            terms.append(token)
+    return terms
+
+
+def split_passages(text: str) -> List[Tuple[int, int]]:
+    """원문을 인용 문단 (시작, 끝) 구간으로 분할
+
+    빈 줄로 나뉜 단락을 PASSAGE_TARGET_CHARS 까지 합치고, PASSAGE_MAX_CHARS 를 넘는
+    단락은 줄 단위(줄도 길면 글자 수 단위)로 나눈다.
+    """
+    pieces = []
+    for block in _BLOCK_RE.finditer(text):
+        start, end = block.span()
+        if end - start <= PASSAGE_MAX_CHARS:
+            pieces.append((start, end))
+            continue
+        for line in _LINE_RE.finditer(text, start, end):
+            line_start, line_end = line.span()
+            while line_end - line_start > PASSAGE_MAX_CHARS:
+                pieces.append((line_start, line_start + PASSAGE_MAX_CHARS))
+                line_start += PASSAGE_MAX_CHARS
+            pieces.append((line_start, line_end))
+
+    passages = []
+    for start, end in pieces:
+        if passages and end - passages[-1][0] <= PASSAGE_TARGET_CHARS:
+            passages[-1] = (passages[-1][0], end)
+        else:
+            passages.append((start, end))
+    return passages
+
+
+def get_citation_index_version() -> int:
+    """현재 인용 색인 버전 조회 (데이터베이스의 공유 버전 기준)"""
+    return get_shared_version(CITATION_INDEX_VERSION_KEY)
+
+
+def bump_citation_index_version() -> int:
+    """색인 원문 변경 시 인용 색인 버전 갱신 (규칙 스냅샷 버전과 같은 방식)"""
+    return bump_shared_version(CITATION_INDEX_VERSION_KEY)
+
+
+def index_source(source_type: str, source_key, title: str, text: str) -> bool:
+    """원문 하나의 인용 문단을 다시 색인 (내용이 같으면 건너뜀)
+
+    Returns:
+        색인이 바뀌었는지 여부
+    """
+    source_key = str(source_key)
+    if not (text or '').strip():
+        return remove_source(source_type, source_key)
+
+    content_hash = hashlib.sha256(f'{title}\x00{text}'.encode('utf-8')).hexdigest()
+    source = CitationSource.objects.filter(source_type=source_type, source_key=source_key).first()
+    if source is not None and source.content_hash == content_hash:
+        return False
+
+    passages = []
+    for ordinal, (start, end) in enumerate(split_passages(text)):
+        passage_text = text[start:end]
+        # 제목을 문단 용어에 더해 어느 문서의 문단인지도 검색되게 함
+        terms = citation_terms(f'{title}\n{passage_text}')
+        passages.append(CitationPassage(
+            ordinal=ordinal, start=start, end=end, text=passage_text,
+            length=len(terms), term_counts=dict(Counter(terms))
+        ))
+
+    with transaction.atomic():
+        if source is None:
+            source = CitationSource(source_type=source_type, source_key=source_key)
+        else:
+            source.passages.all().delete()
+        source.title = title
+        source.content_hash = content_hash
+        source.passage_count = len(passages)
+        source.save()
+        for passage in passages:
+            passage.source = source
+        CitationPassage.objects.bulk_create(passages, batch_size=500)
+        transaction.on_commit(bump_citation_index_version)
+    logger.info(f"인용 색인 갱신: {title} ({len(passages)}개 문단)")
+    return True
+
+
+def remove_source(source_type: str, source_key) -> bool:
+    """원문의 인용 문단을 색인에서 제거"""
+    deleted, _ = CitationSource.objects.filter(source_type=source_type, source_key=str(source_key)).delete()
+    if deleted:
+        transaction.on_commit(bump_citation_index_version)
+    return bool(deleted)
+
+
+def index_guideline(guideline_id: int) -> bool:
+    """의료 가이드라인(MedicalGuideline)의 추출 텍스트를 색인 (비활성/삭제된 경우 제거)"""
+    from .models import MedicalGuideline
+
+    guideline = MedicalGuideline.objects.filter(id=guideline_id).only('title', 'extracted_text', 'is_active').first()
+    if guideline is None or not guideline.is_active:
+        return remove_source('guideline', guideline_id)
+    return index_source('guideline', guideline_id, guideline.title, guideline.extracted_text)
+
+
+def index_guideline_document(document_id: int) -> bool:
+    """가이드라인 문서(GuidelineDocument)의 내용을 색인 (비활성/삭제된 경우 제거)"""
+    from .models import GuidelineDocument
+
+    document = GuidelineDocument.objects.filter(id=document_id).only('title', 'content', 'is_active').first()
+    if document is None or not document.is_active:
+        return remove_source('document', document_id)
+    return index_source('document', document_id, document.title, document.content)
+
+
+def index_law_files() -> int:
+    """COMPLIANCE_CITATION_LAW_FILES 의 법령 텍스트 파일을 색인하고 바뀐 파일 수 반환"""
+    changed = 0
+    law_files = getattr(settings, 'COMPLIANCE_CITATION_LAW_FILES', {})
+    for title, path in law_files.items():
+        try:
+            with open(path, encoding='utf-8') as law_file:
+                text = law_file.read()
+        except OSError as e:
+            logger.warning(f"법령 파일 읽기 실패: {path} - {e}")
+            continue
+        changed += index_source('law_file', str(path).replace('\\', '/').rsplit('/', 1)[-1], title, text)
+
+    # 설정에서 빠진 법령 파일은 색인에서 제거
+    file_names = {str(path).replace('\\', '/').rsplit('/', 1)[-1] for path in law_files.values()}
+    stale = CitationSource.objects.filter(source_type='law_file').exclude(source_key__in=file_names)
+    if stale.exists():
+        stale.delete()
+        transaction.on_commit(bump_citation_index_version)
+    return changed
+
+
+class CitationIndex:
+    """인용 문단 BM25 역색인 (메모리)
+
+    용어별 게시 목록에 문단 번호와 BM25 가중치(idf × 용어 빈도 포화 값)를 미리 계산해 두므로
+    질의는 질의 용어의 게시 목록 합산과 상위 N 개 선택뿐이다. 같은 질의 결과는 LRU 로
+    재사용한다. 워커 프로세스 안에서 요청 간에 공유되므로 생성 후에는 색인을 수정하지 않는다.
+    """
+
+    def __init__(self, version: int, passages: List[Dict], cache_size: int = 1024):
+        self.version = version
+        self.passages = passages
+        self.postings: Dict[str, Tuple[Tuple[int, float], ...]] = {}
+        self._cache: 'OrderedDict[Tuple[str, int], List[Dict]]' = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+        if not passages:
+            return
+        average_length = (sum(passage['length'] for passage in passages) / len(passages)) or 1
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for index, passage in enumerate(passages):
+            saturation = BM25_K1 * (1 - BM25_B + BM25_B * passage['length'] / average_length)
+            for term, count in passage['term_counts'].items():
+                postings.setdefault(term, []).append((index, count * (BM25_K1 + 1) / (count + saturation)))
+
+        total = len(passages)
+        for term, entries in postings.items():
+            idf = math.log(1 + (total - len(entries) + 0.5) / (len(entries) + 0.5))
+            self.postings[term] = tuple((index, weight * idf) for index, weight in entries)
+
+    def __len__(self):
+        return len(self.passages)
+
+    def search(self, query: str, limit: int = 3) -> List[Dict]:
+        """질의와 BM25 점수가 높은 문단 (점수 내림차순, 최대 limit 개)"""
+        cache_key = (query, limit)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                return cached
+
+        scores: Dict[int, float] = {}
+        for term, query_count in Counter(citation_terms(query)).items():
+            for index, weight in self.postings.get(term, ()):
+                scores[index] = scores.get(index, 0.0) + weight * query_count
+
+        results = []
+        for index, score in heapq.nlargest(limit, scores.items(), key=itemgetter(1)):
+            passage = self.passages[index]
+            results.append({
+                'source_type': passage['source_type'],
+                'source_key': passage['source_key'],
+                'source_title': passage['source_title'],
+                'passage_id': passage['id'],
+                'text': passage['snippet'],
+                'score': round(score, 3)
+            })
+
+        with self._lock:
+            self._cache[cache_key] = results
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return results
+
+
+def load_citation_index(version: int) -> CitationIndex:
+    """데이터베이스의 인용 문단으로 색인 생성"""
+    rows = CitationPassage.objects.order_by('source_id', 'ordinal').values_list(
+        'id', 'source__source_type', 'source__source_key', 'source__title', 'text', 'length', 'term_counts'
+    )
+    passages = []
+    for passage_id, source_type, source_key, source_title, text, length, term_counts in rows:
+        snippet = _WHITESPACE_RE.sub(' ', text).strip()
+        if len(snippet) > SNIPPET_CHARS:
+            snippet = snippet[:SNIPPET_CHARS] + '...'
+        passages.append({
+            'id': passage_id,
+            'source_type': source_type,
+            'source_key': source_key,
+            'source_title': source_title,
+            'snippet': snippet,
+            'length': length,
+            'term_counts': term_counts
+        })
+    index = CitationIndex(version, passages, getattr(settings, 'COMPLIANCE_CITATION_CACHE_SIZE', 1024))
+    logger.info(f"인용 색인 로드: v{version}, 문단 {len(passages)}개, 용어 {len(index.postings)}개")
+    return index
+
+
+_index: Optional[CitationIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_citation_index() -> CitationIndex:
+    """워커 프로세스에서 공유하는 인용 색인 조회 (버전이 바뀐 경우에만 다시 로드)"""
+    global _index
+    version = get_citation_index_version()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = load_citation_index(version)
+        return _index
+
+
+def violation_query(violation: Dict) -> str:
+    """상세 위반 정보의 인용 검색 질의 (법적 근거, 위반 유형, 키워드)"""
+    return ' '.join(
+        str(violation.get(field) or '') for field in ('legal_basis', 'title', 'keyword')
+    )
+
+
+def attach_citations(violations: List[Dict], limit: int = None) -> List[Dict]:
+    """상세 위반 정보마다 근거 문단(citations)을 붙인 새 목록 반환 (원본 dict 는 수정하지 않음)"""
+    if not violations:
+        return violations
+    limit = limit or getattr(settings, 'COMPLIANCE_CITATION_LIMIT', 3)
+    try:
+        index = get_citation_index()
+    except Exception as e:
+        logger.warning(f"인용 색인 로드 실패: {e}")
+        return violations
+    if not len(index):
+        return violations
+    return [
+        dict(violation, citations=index.search(violation_query(violation), limit))
+        for violation in violations
+    ]
@@ -0,0 +1,198 @@
+import codecs
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Union
+
+import PyPDF2
+import docx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 업로드 파일 읽기 단위 (바이트)
+READ_CHUNK_SIZE = 64 * 1024
+
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """PDF 페이지 추출용 프로세스 풀 (프로세스당 하나)
+
+    웹/작업 스레드가 살아 있는 프로세스를 fork 하지 않도록 spawn 방식을 사용한다.
+    """
+    global _pdf_executor
+    if _pdf_executor is None:
+        with _pdf_executor_lock:
+            if _pdf_executor is None:
+                _pdf_executor = ProcessPoolExecutor(
+                    max_workers=_setting('COMPLIANCE_PDF_WORKERS', 2),
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _pdf_executor
+
+
+def _reset_pdf_executor():
+    global _pdf_executor
+    with _pdf_executor_lock:
+        executor, _pdf_executor = _pdf_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    """PDF 의 [start, stop) 페이지 텍스트 추출 (워커 프로세스에서 실행)"""
+    reader = PyPDF2.PdfReader(path)
+    return [reader.pages[index].extract_text() or '' for index in range(start, stop)]
+
+
+def get_file_source(uploaded_file) -> Union[str, io.IOBase]:
+    """업로드 파일을 메모리에 읽지 않고 사용할 수 있는 원본 반환
+
+    디스크에 있는 파일(임시 업로드 파일, 파일 저장소)은 경로를, 그 외에는 파일 객체를
+    처음 위치로 되돌려 반환한다.
+    """
+    temporary_file_path = getattr(uploaded_file, 'temporary_file_path', None)
+    if callable(temporary_file_path):
+        return temporary_file_path()
+    os_path = getattr(getattr(uploaded_file, 'file', None), 'name', None)
+    if isinstance(os_path, str) and os.path.isfile(os_path):
+        return os_path
+    if hasattr(uploaded_file, 'seek'):
+        uploaded_file.seek(0)
+    return uploaded_file
+
+
+def _source_size(uploaded_file, source) -> Optional[int]:
+    size = getattr(uploaded_file, 'size', None)
+    if size is None and isinstance(source, str):
+        size = os.path.getsize(source)
+    return size
+
+
+def check_file_size(uploaded_file, source=None):
+    """업로드 파일 크기 제한 확인"""
+    max_bytes = _setting('COMPLIANCE_UPLOAD_MAX_BYTES', 20 * 1024 * 1024)
+    size = _source_size(uploaded_file, source if source is not None else get_file_source(uploaded_file))
+    if max_bytes and size is not None and size > max_bytes:
+        raise ValueError(f'파일 크기가 제한({max_bytes // (1024 * 1024)}MB)을 초과했습니다.')
+
+
+def iter_pdf_text(source) -> Iterator[str]:
+    """PDF 페이지 텍스트를 앞 페이지부터 순서대로 생성
+
+    COMPLIANCE_PDF_MAX_PAGES 를 넘는 페이지는 건너뛴다. 디스크에 있는 큰 PDF 는
+    페이지 구간별로 프로세스 풀에서 추출하되, 결과는 페이지 순서대로 내보낸다.
+    """
+    reader = PyPDF2.PdfReader(source)
+    page_count = len(reader.pages)
+    max_pages = _setting('COMPLIANCE_PDF_MAX_PAGES', 300)
+    if max_pages and page_count > max_pages:
+        logger.warning(f"PDF 페이지 수({page_count})가 제한({max_pages})을 초과하여 앞 {max_pages}페이지만 추출합니다.")
+        page_count = max_pages
+
+    pages_per_task = max(1, _setting('COMPLIANCE_PDF_PAGES_PER_TASK', 16))
+    parallel = (
+        isinstance(source, str)
+        and _setting('COMPLIANCE_PDF_WORKERS', 2) > 1
+        and page_count > pages_per_task
+    )
+    next_page = 0
+    if parallel:
+        starts = range(0, page_count, pages_per_task)
+        stops = [min(start + pages_per_task, page_count) for start in starts]
+        try:
+            # map 은 제출 순서대로 결과를 돌려주므로 앞 구간이 끝나는 즉시 내보낼 수 있다
+            for pages in _get_pdf_executor().map(_extract_pdf_pages, [source] * len(stops), starts, stops):
+                for page_text in pages:
+                    yield page_text + "\n"
+                next_page += len(pages)
+        except BrokenProcessPool as e:
+            # 워커 프로세스가 비정상 종료되면 풀을 버리고 남은 페이지는 현재 프로세스에서 추출
+            logger.warning(f"PDF 추출 프로세스 풀 오류, 순차 추출로 전환합니다: {e}")
+            _reset_pdf_executor()
+
+    for index in range(next_page, page_count):
+        yield (reader.pages[index].extract_text() or '') + "\n"
+
+
+def iter_docx_text(source) -> Iterator[str]:
+    """Word 문서의 문단 텍스트를 순서대로 생성"""
+    document = docx.Document(source)
+    for paragraph in document.paragraphs:
+        yield paragraph.text + "\n"
+
+
+def _iter_blocks(source) -> Iterator[bytes]:
+    """경로 또는 파일 객체를 처음부터 READ_CHUNK_SIZE 단위로 읽기"""
+    if isinstance(source, str):
+        with open(source, 'rb') as stream:
+            yield from iter(lambda: stream.read(READ_CHUNK_SIZE), b'')
+        return
+    # 메모리 업로드 파일의 chunks() 는 크기 인자와 관계없이 전체를 한 번에 돌려주므로 read 로 나눠 읽는다
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    yield from iter(lambda: source.read(READ_CHUNK_SIZE), b'')
+
+
+def _detect_text_encoding(source) -> str:
+    """파일 전체를 블록 단위로 디코딩해 보고 UTF-8 / CP949 중 맞는 인코딩 반환 (출력은 보관하지 않음)"""
+    for encoding in ('utf-8', 'cp949'):
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            for block in _iter_blocks(source):
+                decoder.decode(block)
+            decoder.decode(b'', final=True)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("텍스트 파일의 인코딩을 인식할 수 없습니다.")
+
+
+def iter_txt_text(source) -> Iterator[str]:
+    """텍스트 파일 내용을 READ_CHUNK_SIZE 단위로 생성 (UTF-8, 실패 시 CP949)
+
+    인코딩을 먼저 확인한 뒤 다시 처음부터 읽으므로 파일 전체를 메모리에 올리지 않는다.
+    """
+    decoder = codecs.getincrementaldecoder(_detect_text_encoding(source))()
+    for block in _iter_blocks(source):
+        text = decoder.decode(block)
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_file_text(uploaded_file) -> Iterator[str]:
+    """업로드 파일 형식에 맞춰 텍스트 조각을 순서대로 생성
+
+    분석 쪽에서 앞부분부터 처리할 수 있도록 PDF 는 페이지, Word 는 문단 단위로 내보낸다.
+    """
+    file_name = uploaded_file.name.lower()
+    if file_name.endswith('.pdf'):
+        extractor = iter_pdf_text
+    elif file_name.endswith(('.docx', '.doc')):
+        extractor = iter_docx_text
+    elif file_name.endswith('.txt'):
+        extractor = iter_txt_text
+    else:
+        raise ValueError('지원하지 않는 파일 형식입니다. (PDF, Word, 텍스트 파일만 지원)')
+
+    source = get_file_source(uploaded_file)
+    check_file_size(uploaded_file, source)
+    return extractor(source)
+
+
+def join_text(chunks: Iterator[str]) -> str:
+    """텍스트 조각을 한 번에 합쳐 앞뒤 공백 제거"""
+    return ''.join(chunks).strip()
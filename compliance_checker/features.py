@@ -0,0 +1,186 @@
+import re
+from bisect import bisect_left
+from functools import cached_property
+from typing import Dict, Iterable, List, Tuple
+
+from .matcher import KeywordMatcher
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r'\S+')
+# 문장 안의 단어 또는 문장 구분자 (re.split(r'[.!?]+') 결과를 만들지 않고 세기 위한 토큰)
+_SENTENCE_TOKEN_RE = re.compile(r'[^\s.!?]+|[.!?]+')
+
+# 어조/주관성/의료 용어/광고 요소 판단에 쓰는 어휘 (목록 순서가 결과 순서)
+PROMOTIONAL_WORDS = ['최고', '최고의', '완벽', '완전', '절대']
+OBJECTIVE_WORDS = ['개선', '도움', '효과', '진료', '치료']
+SUBJECTIVE_WORDS = ['최고', '완벽', '완전', '절대', '보장', '확실']
+SUBJECTIVITY_OBJECTIVE_WORDS = ['개선', '도움', '효과', '진료', '치료', '진행']
+MEDICAL_TERMS = [
+    '진료', '치료', '진단', '수술', '시술', '처방', '약물',
+    '증상', '질환', '병원', '의원', '클리닉', '의료진',
+    '개선', '호전', '완화', '예방', '관리'
+]
+ADVERTISING_ELEMENTS = [
+    ('연락처 정보', ['연락처', '전화', '문의', '상담']),
+    ('위치 정보', ['위치', '주소', '오시는 길']),
+    ('진료 정보', ['진료시간', '운영시간', '예약']),
+    ('의료진 정보', ['전문의', '의료진', '경력']),
+]
+AD_INDICATORS = [
+    '광고', '홍보', '선전', '마케팅', '캠페인', '이벤트',
+    '할인', '특가', '무료', '증정', '쿠폰', '적립',
+    '추천', '소개', '알선', '유인', '모객'
+]
+# 규칙별 통과 사유/준수 근거 판단에 쓰는 표현
+RULE_EVIDENCE_WORDS = [
+    '최고', '최고의', '완치', '치료', '보장', '비교', '더 나은', '우수한',
+    '전후', 'before', 'after', '후기', '경험담', '환자분', '치료받은'
+]
+
+
+def _lexicon() -> List[str]:
+    terms = PROMOTIONAL_WORDS + OBJECTIVE_WORDS + SUBJECTIVE_WORDS + SUBJECTIVITY_OBJECTIVE_WORDS
+    terms += MEDICAL_TERMS + AD_INDICATORS + RULE_EVIDENCE_WORDS
+    for _, words in ADVERTISING_ELEMENTS:
+        terms += words
+    return list(dict.fromkeys(terms))
+
+
+# 어휘 전체를 한 번의 스캔으로 찾는 매처 (모듈 로드 시 한 번 생성, 어휘 통계는 원문 그대로 비교)
+_LEXICON_MATCHER = KeywordMatcher({'lexicon': _lexicon()}, normalize=False)
+
+
+class TextFeatures:
+    """문서 한 건의 단어/문장/어휘 특징
+
+    분석 한 번에 한 번만 만들고, 품질·가독성·어조·맥락 분석과 규칙별 체크리스트가
+    텍스트를 다시 나누거나 어휘 목록을 다시 훑는 대신 이 값을 읽는다. 어휘 등장 여부는
+    대소문자를 무시한다.
+
+    window_size 가 주어지면(대용량 문서) 단어/문장 목록을 만들지 않고 정규식으로
+    하나씩 세고, 어휘도 창 단위로 검색한다. 결과 값은 같다.
+    """
+
+    def __init__(self, text: str, window_size: int = None):
+        self.text = text
+        self.total_characters = len(text)
+
+        if window_size:
+            self._count_streaming(text)
+        else:
+            words = text.split()
+            self.total_words = len(words)
+            self.total_word_length = sum(len(word) for word in words)
+
+            sentences = _SENTENCE_SPLIT_RE.split(text)
+            self.total_sentences = len(sentences)
+            sentence_word_counts = [len(sentence.split()) for sentence in sentences if sentence.strip()]
+            self.non_empty_sentences = len(sentence_word_counts)
+            self.sentence_words = sum(sentence_word_counts)
+
+        # 어휘별 시작 위치 (겹치지 않는 매칭, 위치 순)
+        self.term_positions: Dict[str, List[int]] = {}
+        for match in _LEXICON_MATCHER.find_all(text, window_size)['lexicon']:
+            self.term_positions.setdefault(match.keyword, []).append(match.start)
+
+        # 규칙 키워드별 (등장 횟수, 첫 위치) - 처음 조회할 때 계산
+        self._keyword_stats: Dict[str, Tuple[int, int]] = {}
+
+    def _count_streaming(self, text: str):
+        self.total_words = 0
+        self.total_word_length = 0
+        for word in _WORD_RE.finditer(text):
+            self.total_words += 1
+            self.total_word_length += word.end() - word.start()
+
+        # 구분자 수 + 1 이 re.split 결과 개수, 단어가 있는 구간이 비어 있지 않은 문장
+        separators = 0
+        self.non_empty_sentences = 0
+        self.sentence_words = 0
+        in_sentence = False
+        for token in _SENTENCE_TOKEN_RE.finditer(text):
+            if text[token.start()] in '.!?':
+                separators += 1
+                if in_sentence:
+                    self.non_empty_sentences += 1
+                in_sentence = False
+            else:
+                self.sentence_words += 1
+                in_sentence = True
+        if in_sentence:
+            self.non_empty_sentences += 1
+        self.total_sentences = separators + 1
+
+    def has(self, term: str) -> bool:
+        """어휘가 텍스트에 등장하는지 여부"""
+        return term in self.term_positions
+
+    def count_present(self, terms: Iterable[str]) -> int:
+        return sum(1 for term in terms if term in self.term_positions)
+
+    def present(self, terms: Iterable[str]) -> List[str]:
+        """terms 중 텍스트에 등장하는 어휘 (terms 순서 유지)"""
+        return [term for term in terms if term in self.term_positions]
+
+    def has_any_within(self, terms: Iterable[str], start: int, end: int) -> bool:
+        """terms 중 하나라도 text[start:end] 안에 온전히 들어 있는지 여부"""
+        for term in terms:
+            positions = self.term_positions.get(term)
+            if not positions:
+                continue
+            index = bisect_left(positions, start)
+            if index < len(positions) and positions[index] + len(term) <= end:
+                return True
+        return False
+
+    def keyword_stats(self, keyword: str) -> Tuple[int, int]:
+        """규칙 키워드의 (등장 횟수, 첫 위치) - 대소문자 구분, 없으면 (0, -1)"""
+        stats = self._keyword_stats.get(keyword)
+        if stats is None:
+            index = self.text.find(keyword)
+            stats = (self.text.count(keyword), index) if index != -1 else (0, -1)
+            self._keyword_stats[keyword] = stats
+        return stats
+
+    @property
+    def avg_sentence_length(self) -> float:
+        return self.sentence_words / max(self.non_empty_sentences, 1)
+
+    @cached_property
+    def readability(self) -> float:
+        """가독성 점수 (간단한 버전, 높을수록 읽기 쉬움)"""
+        if not self.total_words:
+            return 0.0
+        avg_sentence_length = self.total_words / self.non_empty_sentences
+        avg_word_length = self.total_word_length / self.total_words
+        readability = 100 - (avg_sentence_length * 0.5 + avg_word_length * 2)
+        return max(0, min(100, readability))
+
+    @cached_property
+    def tone(self) -> str:
+        promo_count = self.count_present(PROMOTIONAL_WORDS)
+        obj_count = self.count_present(OBJECTIVE_WORDS)
+        if promo_count > obj_count:
+            return 'promotional'
+        elif obj_count > promo_count:
+            return 'objective'
+        return 'neutral'
+
+    @cached_property
+    def subjectivity(self) -> float:
+        """주관성 (0-1, 1이 가장 주관적)"""
+        if self.total_words == 0:
+            return 0.0
+        subj_count = self.count_present(SUBJECTIVE_WORDS)
+        obj_count = self.count_present(SUBJECTIVITY_OBJECTIVE_WORDS)
+        if subj_count + obj_count == 0:
+            return 0.5
+        return subj_count / (subj_count + obj_count)
+
+    @cached_property
+    def medical_terms(self) -> List[str]:
+        return self.present(MEDICAL_TERMS)
+
+    @cached_property
+    def advertising_elements(self) -> List[str]:
+        return [label for label, words in ADVERTISING_ELEMENTS if self.count_present(words)]
@@ -0,0 +1,230 @@
+import hashlib
+import logging
+import math
+import re
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .ai import IMPROVEMENT_MODEL, complete, parse_json_response, run_concurrently
+from .jobs import submit_job
+from .models import AIAnalysisResult, GuidelineDocument
+
+logger = logging.getLogger(__name__)
+
+GUIDELINE_ANALYSIS_MODEL = IMPROVEMENT_MODEL
+
+# 분석 유형별 요청 내용
+ANALYSIS_INSTRUCTIONS = {
+    'content_analysis': ('분석해주세요', [
+        '주요 내용 요약', '핵심 포인트', '의료진이 주의해야 할 사항', '광고 시 준수해야 할 규칙', '위반 시 예상되는 처벌'
+    ]),
+    'compliance_check': ('준수성을 검토해주세요', [
+        '현재 의료광고법과의 일치성', '잠재적 위반 요소', '준수 난이도 평가', '개선이 필요한 부분', '권장사항'
+    ]),
+    'risk_assessment': ('위험도를 평가해주세요', [
+        '전체 위험도 (낮음/보통/높음)', '주요 위험 요소', '위험 발생 가능성', '위험 발생 시 영향도', '위험 완화 방안'
+    ]),
+    'improvement_suggestions': ('개선 방안을 제안해주세요', [
+        '내용 개선 방안', '구조 개선 방안', '가독성 향상 방안', '실용성 개선 방안', '최신 법령 반영 방안'
+    ]),
+}
+
+_RESPONSE_FORMAT = """{
+    "summary": "요약",
+    "key_points": ["핵심 포인트 1", "핵심 포인트 2"],
+    "recommendations": ["권장사항 1", "권장사항 2"],
+    "risk_level": "low | medium | high",
+    "compliance_score": 0-100 사이 정수
+}"""
+
+RISK_LEVELS = ('low', 'medium', 'high')
+
+# 조각 결과를 합칠 때 남기는 핵심 포인트/권장사항 수
+MAX_MERGED_ITEMS = 10
+
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+
+
+def guideline_content_hash(document: GuidelineDocument) -> str:
+    return hashlib.sha256((document.content or '').encode('utf-8')).hexdigest()
+
+
+def chunk_document(text: str, max_chars: int) -> List[str]:
+    """문서를 빈 줄 단위 단락을 모아 max_chars 이하 조각으로 분할 (긴 단락은 글자 수로 자름)"""
+    chunks = []
+    current = ''
+    for paragraph in _PARAGRAPH_BREAK_RE.split(text.strip()):
+        while len(paragraph) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            chunks.append(current)
+            current = ''
+        current = f'{current}\n\n{paragraph}' if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks or ['']
+
+
+def build_analysis_prompt(document: GuidelineDocument, analysis_type: str, chunk: str,
+                          index: int, total: int) -> str:
+    """문서 조각 하나에 대한 분석 요청 프롬프트"""
+    request, items = ANALYSIS_INSTRUCTIONS[analysis_type]
+    part = f' (전체 {total}개 부분 중 {index}번째 부분)' if total > 1 else ''
+    item_lines = '\n'.join(f'{number}. {item}' for number, item in enumerate(items, 1))
+    return f"""
+다음 의료법/광고법 가이드라인 문서{part}의 {request}:
+
+제목: {document.title}
+카테고리: {document.category_display}
+내용: {chunk}
+
+다음 항목들을 다뤄주세요:
+{item_lines}
+
+다음 JSON 형식으로만 응답해주세요:
+{_RESPONSE_FORMAT}
+"""
+
+
+def _parse_partial(content: str) -> Dict:
+    parsed = parse_json_response(content, None)
+    if not isinstance(parsed, dict):
+        parsed = {'summary': content.strip()[:1000]}
+    risk_level = parsed.get('risk_level')
+    try:
+        score = min(100, max(0, int(parsed.get('compliance_score'))))
+    except (TypeError, ValueError):
+        score = None
+    return {
+        'summary': str(parsed.get('summary') or ''),
+        'key_points': [str(point) for point in parsed.get('key_points') or []],
+        'recommendations': [str(item) for item in parsed.get('recommendations') or []],
+        'risk_level': risk_level if risk_level in RISK_LEVELS else None,
+        'compliance_score': score
+    }
+
+
+def merge_partial_results(partials: List[Tuple[int, Dict]]) -> Dict:
+    """조각별 분석 결과 합치기
+
+    요약은 조각 순서대로 잇고, 핵심 포인트/권장사항은 중복을 뺀 앞쪽 MAX_MERGED_ITEMS 개,
+    위험도는 가장 높은 값, 준수 점수는 조각 길이 가중 평균으로 정한다.
+    """
+    def unique_items(field: str) -> List[str]:
+        return list(dict.fromkeys(item for _, partial in partials for item in partial[field]))[:MAX_MERGED_ITEMS]
+
+    risk_levels = [partial['risk_level'] for _, partial in partials if partial['risk_level']]
+    scored = [(length, partial['compliance_score']) for length, partial in partials
+              if partial['compliance_score'] is not None]
+    total_length = sum(length for length, _ in scored)
+    return {
+        'summary': '\n\n'.join(partial['summary'] for _, partial in partials if partial['summary']),
+        'key_points': unique_items('key_points'),
+        'recommendations': unique_items('recommendations'),
+        'risk_level': max(risk_levels, key=RISK_LEVELS.index) if risk_levels else 'medium',
+        'compliance_score': round(sum(length * score for length, score in scored) / total_length)
+        if total_length else None
+    }
+
+
+def analyze_guideline(document: GuidelineDocument, analysis_type: str) -> Dict:
+    """문서를 조각으로 나눠 동시에 분석한 뒤 결과를 합침 (모든 조각이 실패하면 예외)"""
+    chunks = chunk_document(document.content or '', max(1000, getattr(settings, 'COMPLIANCE_AI_GUIDELINE_CHUNK_CHARS', 12000)))
+    tasks = [
+        (lambda index=index, chunk=chunk: complete(
+            build_analysis_prompt(document, analysis_type, chunk, index, len(chunks)),
+            model=GUIDELINE_ANALYSIS_MODEL, max_tokens=1500
+        ))
+        for index, chunk in enumerate(chunks, 1)
+    ]
+    # 동시 호출 수만큼씩 차례로 실행되므로 제한 시간은 그 횟수만큼 늘린다
+    rounds = math.ceil(len(tasks) / max(1, getattr(settings, 'COMPLIANCE_AI_MAX_CONCURRENCY', 4)))
+    responses = run_concurrently(tasks, timeout=getattr(settings, 'COMPLIANCE_AI_TIMEOUT', 30) * rounds)
+
+    partials = [(len(chunk), _parse_partial(response)) for chunk, response in zip(chunks, responses)
+                if response is not None]
+    if not partials:
+        raise RuntimeError('AI 분석 요청이 모두 실패했습니다.')
+    result = merge_partial_results(partials)
+    result.update({
+        'analysis_type': analysis_type,
+        'chunks': len(chunks),
+        'failed_chunks': len(chunks) - len(partials)
+    })
+    return result
+
+
+def run_guideline_analysis_job(result_id: int):
+    """AI 분석 작업 실행 후 결과, 상태, 측정한 처리 시간 저장"""
+    ai_result = AIAnalysisResult.objects.select_related('document').get(id=result_id)
+    ai_result.status = 'running'
+    ai_result.save(update_fields=['status'])
+
+    started = time.perf_counter()
+    try:
+        ai_result.analysis_result = analyze_guideline(ai_result.document, ai_result.analysis_type)
+        ai_result.status = 'completed'
+    except Exception as e:
+        logger.error(f"가이드라인 AI 분석 실패 (ID: {result_id}): {e}")
+        ai_result.status = 'failed'
+        ai_result.error_message = str(e)
+    ai_result.processing_time = round(time.perf_counter() - started, 3)
+    ai_result.save(update_fields=['analysis_result', 'status', 'error_message', 'processing_time'])
+    logger.info(f"가이드라인 AI 분석 {ai_result.get_status_display()}: {ai_result.document.title} "
+                f"({ai_result.analysis_type}, {ai_result.processing_time}초)")
+
+
+def find_reusable_analysis(document: GuidelineDocument, analysis_type: str) -> Optional[AIAnalysisResult]:
+    """같은 문서 내용·분석 유형·모델의 완료되었거나 진행 중인 분석"""
+    timeout = getattr(settings, 'COMPLIANCE_JOB_TIMEOUT', 600)
+    candidates = AIAnalysisResult.objects.filter(
+        content_hash=guideline_content_hash(document),
+        analysis_type=analysis_type,
+        ai_model_used=GUIDELINE_ANALYSIS_MODEL,
+        status__in=['completed', 'pending', 'running']
+    ).exclude(
+        # 제한 시간이 지난 대기/진행 중 작업(워커 재시작 등)은 재사용하지 않음
+        status__in=['pending', 'running'], created_at__lt=timezone.now() - timedelta(seconds=timeout)
+    )
+    # 같은 문서의 결과를 우선
+    return candidates.filter(document=document).order_by('-created_at').first() or \
+        candidates.order_by('-created_at').first()
+
+
+def reuse_guideline_analysis(document: GuidelineDocument, analysis_type: str) -> Optional[AIAnalysisResult]:
+    """내용이 같은 완료되었거나 진행 중인 분석 (없으면 None)
+
+    다른 문서의 완료된 분석을 재사용하면 이 문서의 완료된 행을 새로 만들어 돌려준다.
+    """
+    if analysis_type not in ANALYSIS_INSTRUCTIONS:
+        raise ValueError(f'지원하지 않는 분석 유형입니다: {analysis_type}')
+
+    reusable = find_reusable_analysis(document, analysis_type)
+    if reusable is not None and reusable.document_id == document.id:
+        return reusable
+    if reusable is not None and reusable.status == 'completed':
+        return AIAnalysisResult.objects.create(
+            document=document, analysis_type=analysis_type, analysis_result=reusable.analysis_result,
+            ai_model_used=GUIDELINE_ANALYSIS_MODEL, processing_time=0.0, status='completed',
+            content_hash=reusable.content_hash
+        )
+    return None
+
+
+def submit_guideline_analysis(document: GuidelineDocument, analysis_type: str) -> AIAnalysisResult:
+    """대기 중인 분석 행을 만들고 백그라운드 워커 풀에 제출"""
+    ai_result = AIAnalysisResult.objects.create(
+        document=document, analysis_type=analysis_type, ai_model_used=GUIDELINE_ANALYSIS_MODEL,
+        status='pending', content_hash=guideline_content_hash(document)
+    )
+    transaction.on_commit(lambda: submit_job(run_guideline_analysis_job, ai_result.id))
+    return ai_result
@@ -0,0 +1,196 @@
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Iterator, Optional
+
+import PyPDF2
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .extraction import READ_CHUNK_SIZE, check_file_size, get_file_source, iter_file_text, join_text
+from .jobs import submit_job
+from .models import MedicalGuideline
+
+logger = logging.getLogger(__name__)
+
+# 진행률을 기록하는 추출 조각(PDF 페이지) 간격
+PROGRESS_STEP = 10
+
+# 추출 결과를 저장하는 가이드라인 컬럼
+EXTRACTION_FIELDS = ['extracted_text', 'extraction_status', 'extraction_progress', 'extraction_error', 'extracted_at']
+
+# 추출을 기다리거나 진행 중인 가이드라인 상태
+IN_FLIGHT_STATUSES = ('pending', 'running')
+
+STALE_EXTRACTION_ERROR = '텍스트 추출이 제한 시간 내에 완료되지 않았습니다. 파일을 다시 업로드해주세요.'
+
+
+def guideline_document_type(file_name: str) -> Optional[str]:
+    """파일 확장자의 가이드라인 문서 타입 (지원하지 않으면 None)"""
+    file_name = file_name.lower()
+    if file_name.endswith('.pdf'):
+        return 'pdf'
+    elif file_name.endswith(('.docx', '.doc')):
+        return 'doc'
+    elif file_name.endswith('.txt'):
+        return 'txt'
+    return None
+
+
+def file_content_hash(uploaded_file) -> str:
+    """업로드 파일 내용의 SHA-256 (조각 단위로 읽어 메모리에 올리지 않음)"""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks(READ_CHUNK_SIZE):
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def register_guideline_upload(uploaded_file, title: str, category: str, description: str = '') -> MedicalGuideline:
+    """업로드 파일을 저장하고 텍스트 추출을 백그라운드 워커 풀에 맡김
+
+    같은 내용의 파일이 이미 있으면 저장된 파일을 함께 쓰고, 추출이 끝난 파일이면 그 텍스트를
+    바로 복사한다. 추출 중이면 그 작업이 끝날 때 함께 갱신된다 (_start_extraction 참고).
+
+    Raises:
+        ValueError: 지원하지 않는 파일 형식이거나 크기 제한을 넘는 경우
+    """
+    document_type = guideline_document_type(uploaded_file.name)
+    if document_type is None:
+        raise ValueError('지원하지 않는 파일 형식입니다.')
+    check_file_size(uploaded_file)
+    content_hash = file_content_hash(uploaded_file)
+
+    guideline = MedicalGuideline(
+        title=title,
+        category=category,
+        description=description,
+        document_type=document_type,
+        content_hash=content_hash
+    )
+    same_files = MedicalGuideline.objects.filter(content_hash=content_hash).exclude(file='')
+    extracted = same_files.filter(extraction_status='completed').only('file', 'extracted_text').first()
+    stored = extracted or same_files.only('file').first()
+    if stored is not None and default_storage.exists(stored.file.name):
+        guideline.file.name = stored.file.name
+    else:
+        guideline.file = uploaded_file
+
+    if extracted is not None:
+        logger.info(f"같은 파일의 추출 결과 재사용: {title} (가이드라인 {extracted.id})")
+        guideline.extracted_text = extracted.extracted_text
+        guideline.extraction_status = 'completed'
+        guideline.extraction_progress = 100
+        guideline.extracted_at = timezone.now()
+        guideline.save()
+        return guideline
+
+    guideline.save()
+    file_name = guideline.file.name
+    transaction.on_commit(lambda: _start_extraction(content_hash, file_name))
+    return guideline
+
+
+def _in_flight(content_hash: str):
+    return MedicalGuideline.objects.filter(content_hash=content_hash, extraction_status__in=IN_FLIGHT_STATUSES)
+
+
+def _stale_cutoff():
+    return timezone.now() - timedelta(seconds=getattr(settings, 'COMPLIANCE_JOB_TIMEOUT', 600))
+
+
+def _start_extraction(content_hash: str, file_name: str):
+    """같은 파일 해시의 추출이 진행 중이 아니면 가장 먼저 올라온 대기 행을 맡아 작업 제출
+
+    진행 중 여부는 데이터베이스의 running 행으로 판단하므로 다른 워커 프로세스에 올라온 같은 파일도
+    작업 하나를 공유한다. 대기 행을 pending → running 조건부 갱신으로 맡으므로 동시에 호출되어도
+    한 곳만 제출하고, 나머지 행은 pending 으로 남아 그 작업이 끝날 때 함께 갱신된다.
+    제한 시간이 지난 running 행(워커 재시작 등)은 먼저 실패 처리해 다시 맡을 수 있게 한다.
+    """
+    _in_flight(content_hash).filter(extraction_status='running', extraction_started_at__lt=_stale_cutoff()) \
+        .update(extraction_status='failed', extraction_error=STALE_EXTRACTION_ERROR)
+    in_flight = _in_flight(content_hash)
+    if in_flight.filter(extraction_status='running').exists():
+        return
+    first_waiting = in_flight.filter(extraction_status='pending').order_by('id').values_list('id', flat=True).first()
+    if first_waiting is None:
+        return
+    claimed = MedicalGuideline.objects.filter(id=first_waiting, extraction_status='pending').update(
+        extraction_status='running', extraction_progress=0, extraction_started_at=timezone.now()
+    )
+    if claimed:
+        submit_job(run_extraction_job, content_hash, file_name)
+
+
+def _update_waiting(content_hash: str, **fields):
+    """추출 결과를 기다리는 가이드라인의 진행 상태 갱신 (저장 시그널 없이)"""
+    _in_flight(content_hash).update(**fields)
+
+
+def _pdf_page_count(stored_file) -> int:
+    page_count = len(PyPDF2.PdfReader(get_file_source(stored_file)).pages)
+    max_pages = getattr(settings, 'COMPLIANCE_PDF_MAX_PAGES', 300)
+    return min(page_count, max_pages) if max_pages else page_count
+
+
+def _iter_with_progress(stored_file, content_hash: str) -> Iterator[str]:
+    """추출 조각을 내보내며 PDF 는 PROGRESS_STEP 페이지마다 진행률 기록"""
+    total = _pdf_page_count(stored_file) if stored_file.name.lower().endswith('.pdf') else 0
+    for index, chunk in enumerate(iter_file_text(stored_file), 1):
+        yield chunk
+        if total and index % PROGRESS_STEP == 0:
+            _update_waiting(content_hash, extraction_progress=min(99, index * 100 // total))
+
+
+def run_extraction_job(content_hash: str, file_name: str):
+    """저장된 파일에서 텍스트를 추출해 같은 파일의 가이드라인 모두에 저장"""
+    _update_waiting(content_hash, extraction_status='running', extraction_progress=0,
+                    extraction_started_at=timezone.now())
+    error = ''
+    try:
+        with default_storage.open(file_name) as stored_file:
+            text = join_text(_iter_with_progress(stored_file, content_hash))
+        if not text:
+            raise ValueError('파일에서 텍스트를 추출할 수 없습니다.')
+    except Exception as e:
+        logger.warning(f"가이드라인 텍스트 추출 실패: {file_name} - {e}")
+        text, error = '', str(e)
+
+    # 개별 저장으로 post_save 시그널(인용 색인 갱신)을 보냄
+    extracted_at = None if error else timezone.now()
+    guidelines = list(_in_flight(content_hash).only('id', 'extraction_progress'))
+    for guideline in guidelines:
+        guideline.extracted_text = text
+        guideline.extraction_status = 'failed' if error else 'completed'
+        guideline.extraction_progress = guideline.extraction_progress if error else 100
+        guideline.extraction_error = error
+        guideline.extracted_at = extracted_at
+        guideline.save(update_fields=EXTRACTION_FIELDS)
+    logger.info(f"가이드라인 텍스트 추출 {'실패' if error else '완료'}: {file_name} "
+                f"(가이드라인 {len(guidelines)}건, {len(text)}자)")
+
+
+def expire_stale_extraction(guideline: MedicalGuideline) -> bool:
+    """제한 시간이 지나도 끝나지 않은 추출(워커 재시작 등)을 실패 처리
+
+    같은 파일 해시의 추출이 제한 시간 안에 시작되어 진행 중이면 기다린다. 아니면 제한 시간 전에
+    시작된 추출과 제한 시간 전에 올라와 아직 맡겨지지 않은 대기 행을 모두 실패 처리한다.
+    """
+    if guideline.extraction_status not in IN_FLIGHT_STATUSES:
+        return False
+    cutoff = _stale_cutoff()
+    in_flight = _in_flight(guideline.content_hash)
+    if in_flight.filter(extraction_status='running', extraction_started_at__gte=cutoff).exists():
+        return False
+    stale = in_flight.filter(
+        Q(extraction_status='running', extraction_started_at__lt=cutoff)
+        | Q(extraction_status='pending', uploaded_at__lt=cutoff)
+    )
+    if not stale.filter(id=guideline.id).exists():
+        return False
+    stale.update(extraction_status='failed', extraction_error=STALE_EXTRACTION_ERROR)
+    guideline.refresh_from_db(fields=['extraction_status', 'extraction_error'])
+    return True
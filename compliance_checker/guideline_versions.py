@@ -0,0 +1,155 @@
+import difflib
+import hashlib
+import json
+import zlib
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import GuidelineDocument, GuidelineVersion
+
+# 캐시 키 접두사 (버전은 만든 뒤 바뀌지 않으므로 버전 ID 로 캐시)
+VERSION_CONTENT_CACHE_PREFIX = 'compliance_checker:guideline_version:'
+VERSION_DIFF_CACHE_PREFIX = 'compliance_checker:guideline_diff:'
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def encode_snapshot(text: str) -> bytes:
+    """전체 내용 저장 데이터"""
+    return zlib.compress(text.encode('utf-8'))
+
+
+def decode_snapshot(payload: bytes) -> str:
+    return zlib.decompress(bytes(payload)).decode('utf-8')
+
+
+def encode_delta(base: str, text: str) -> bytes:
+    """base → text 줄 단위 변경 목록 저장 데이터
+
+    변경 목록은 [base 시작 줄, base 끝 줄, 바뀐 줄 목록] 이며 같은 줄 구간은 저장하지 않는다.
+    """
+    base_lines = base.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+    operations = [
+        [base_start, base_end, lines[start:end]]
+        for tag, base_start, base_end, start, end in
+        difflib.SequenceMatcher(None, base_lines, lines).get_opcodes()
+        if tag != 'equal'
+    ]
+    return zlib.compress(json.dumps(operations, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def apply_delta(base: str, payload: bytes) -> str:
+    """encode_delta 저장 데이터를 base 에 적용"""
+    base_lines = base.splitlines(keepends=True)
+    lines = []
+    position = 0
+    for base_start, base_end, replacement in json.loads(zlib.decompress(bytes(payload)).decode('utf-8')):
+        lines.extend(base_lines[position:base_start])
+        lines.extend(replacement)
+        position = base_end
+    lines.extend(base_lines[position:])
+    return ''.join(lines)
+
+
+def build_version(document_id: int, number: int, text: str, base: Optional[str]) -> GuidelineVersion:
+    """저장하지 않은 버전 생성
+
+    COMPLIANCE_GUIDELINE_SNAPSHOT_INTERVAL 번째 버전마다, 또는 변경 목록이 전체 내용보다 커지면 스냅샷으로 저장해
+    복원할 때 적용하는 변경 목록 수를 제한한다.
+    """
+    snapshot = encode_snapshot(text)
+    interval = max(1, getattr(settings, 'COMPLIANCE_GUIDELINE_SNAPSHOT_INTERVAL', 20))
+    payload, is_snapshot = snapshot, True
+    if base is not None and (number - 1) % interval:
+        delta = encode_delta(base, text)
+        if len(delta) < len(snapshot):
+            payload, is_snapshot = delta, False
+    return GuidelineVersion(
+        document_id=document_id, version=number, is_snapshot=is_snapshot, payload=payload,
+        content_hash=content_hash(text), content_length=len(text)
+    )
+
+
+def version_content(version_id: int) -> str:
+    """버전 내용 복원 (가장 가까운 이전 스냅샷부터 변경 목록을 차례로 적용)"""
+    cache_key = f'{VERSION_CONTENT_CACHE_PREFIX}{version_id}'
+    text = cache.get(cache_key)
+    if text is not None:
+        return text
+
+    document_id, number = GuidelineVersion.objects.filter(id=version_id).values_list('document_id', 'version').get()
+    chain = GuidelineVersion.objects.filter(document_id=document_id, version__lte=number)
+    snapshot_number = chain.filter(is_snapshot=True).order_by('-version').values_list('version', flat=True).first()
+    text = ''
+    for is_snapshot, payload in chain.filter(version__gte=snapshot_number or 0) \
+            .order_by('version').values_list('is_snapshot', 'payload'):
+        text = decode_snapshot(payload) if is_snapshot else apply_delta(text, payload)
+    cache.set(cache_key, text, timeout=getattr(settings, 'COMPLIANCE_GUIDELINE_VERSION_CACHE_TIMEOUT', 60 * 60 * 24))
+    return text
+
+
+def latest_version(document_id: int) -> Optional[GuidelineVersion]:
+    return GuidelineVersion.objects.filter(document_id=document_id).defer('payload').order_by('-version').first()
+
+
+def record_version(document: GuidelineDocument) -> GuidelineVersion:
+    """문서의 현재 내용을 새 버전으로 저장 (최신 버전과 내용이 같으면 최신 버전 반환)"""
+    text = document.content or ''
+    with transaction.atomic():
+        # 같은 문서의 동시 저장이 같은 버전 번호를 쓰지 않도록 문서 행 잠금
+        GuidelineDocument.objects.select_for_update().filter(id=document.id).exists()
+        latest = latest_version(document.id)
+        if latest is not None and latest.content_hash == content_hash(text):
+            return latest
+        base = version_content(latest.id) if latest is not None else None
+        version = build_version(document.id, latest.version + 1 if latest else 1, text, base)
+        version.save()
+    cache.set(f'{VERSION_CONTENT_CACHE_PREFIX}{version.id}', text,
+              timeout=getattr(settings, 'COMPLIANCE_GUIDELINE_VERSION_CACHE_TIMEOUT', 60 * 60 * 24))
+    return version
+
+
+def _diff_summary(before: str, after: str, from_version: Optional[int], to_version: Optional[int]) -> Dict:
+    lines = list(difflib.unified_diff(
+        before.splitlines(), after.splitlines(),
+        fromfile=f'v{from_version or 0}', tofile=f'v{to_version or 0}', lineterm=''
+    ))
+    return {
+        'from_version': from_version,
+        'to_version': to_version,
+        'added_lines': sum(1 for line in lines if line.startswith('+') and not line.startswith('+++')),
+        'removed_lines': sum(1 for line in lines if line.startswith('-') and not line.startswith('---')),
+        'diff': '\n'.join(lines)
+    }
+
+
+def version_diff(from_version_id: Optional[int], to_version_id: int) -> Dict:
+    """두 버전의 줄 단위 비교 (unified diff 와 추가/삭제 줄 수, 결과 캐시)
+
+    from_version_id 가 None 이면 빈 문서와 비교한다.
+    """
+    cache_key = f'{VERSION_DIFF_CACHE_PREFIX}{from_version_id}:{to_version_id}'
+    diff = cache.get(cache_key)
+    if diff is not None:
+        return diff
+
+    before = version_content(from_version_id) if from_version_id else ''
+    after = version_content(to_version_id) if to_version_id != from_version_id else before
+    numbers = dict(GuidelineVersion.objects.filter(id__in=[from_version_id, to_version_id])
+                   .values_list('id', 'version'))
+    diff = _diff_summary(before, after, numbers.get(from_version_id), numbers.get(to_version_id))
+    cache.set(cache_key, diff, timeout=getattr(settings, 'COMPLIANCE_GUIDELINE_VERSION_CACHE_TIMEOUT', 60 * 60 * 24))
+    return diff
+
+
+def update_changes(update) -> Dict:
+    """업데이트 이력의 변경 내용 (버전 저장소 도입 전 이력은 저장된 전체 내용끼리 비교)"""
+    if update.version_id:
+        return version_diff(update.previous_version_id, update.version_id)
+    return _diff_summary(update.previous_content, update.new_content, None, None)
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+_session = None
+_session_lock = threading.Lock()
+# 프로세스에서 마지막으로 캐시를 정리한 뒤 저장한 항목 수
+_stores_since_prune = 0
+_prune_lock = threading.Lock()
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def get_http_session() -> requests.Session:
+    """프로세스에서 공유하는 keep-alive 세션 (호스트별 커넥션 풀, 재시도/백오프)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=_setting('COMPLIANCE_HTTP_RETRIES', 3),
+                    backoff_factor=_setting('COMPLIANCE_HTTP_BACKOFF', 0.5),
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=('GET', 'HEAD'),
+                    raise_on_status=False
+                )
+                pool_size = _setting('COMPLIANCE_HTTP_POOL_SIZE', 20)
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = DEFAULT_USER_AGENT
+                _session = session
+    return _session
+
+
+class HttpCache:
+    """ETag/Last-Modified 검증 기반 디스크 HTTP 캐시
+
+    검증자(ETag 또는 Last-Modified)가 있는 200 응답만 저장하고, 다음 요청 때
+    조건부 요청을 보내 304 를 받으면 저장된 본문을 사용한다. 항목을 읽을 때마다 수정 시각을
+    갱신하고, 전체 크기가 max_total_bytes 를 넘으면 prune() 이 오래 쓰지 않은 항목부터 지운다.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 5 * 1024 * 1024,
+                 max_total_bytes: int = 200 * 1024 * 1024, prune_every: int = 100):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.prune_every = prune_every
+
+    def _paths(self, url: str):
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, digest[:2], digest)
+        return base + '.json', base + '.body'
+
+    def load(self, url: str) -> Optional[Dict]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+            with open(body_path, 'rb') as body_file:
+                meta['content'] = body_file.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url:
+            return None
+        try:
+            self._touch(meta_path)
+        except OSError:
+            pass
+        return meta
+
+    @staticmethod
+    def _touch(meta_path: str):
+        """최근에 쓴 항목으로 표시 (정리 시 수정 시각이 오래된 항목부터 삭제)
+
+        파일 시스템 시계는 해상도가 낮아 연달아 저장한 항목의 순서가 같아질 수 있으므로
+        나노초 단위 현재 시각을 직접 기록한다.
+        """
+        now = time.time_ns()
+        os.utime(meta_path, ns=(now, now))
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, response: requests.Response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        if 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return
+        content = response.content
+        if len(content) > self.max_bytes:
+            return
+
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() in ('content-type', 'etag', 'last-modified')
+            },
+            'encoding': response.encoding,
+        }
+        meta_path, body_path = self._paths(url)
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            # 다른 워커가 읽는 중일 수 있으므로 임시 파일에 쓴 뒤 교체
+            self._write_atomic(body_path, content)
+            self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+            self._touch(meta_path)
+        except OSError as e:
+            logger.warning(f"HTTP 캐시 저장 실패: {url} - {e}")
+            return
+        self._prune_periodically()
+
+    def _prune_periodically(self):
+        """프로세스에서 prune_every 번 저장할 때마다 한 번 정리 (매번 디렉터리를 훑지 않음)"""
+        global _stores_since_prune
+        with _prune_lock:
+            _stores_since_prune += 1
+            if _stores_since_prune < self.prune_every:
+                return
+            _stores_since_prune = 0
+        self.prune()
+
+    def prune(self) -> int:
+        """전체 크기가 max_total_bytes 를 넘으면 수정 시각이 오래된 항목부터 삭제
+
+        메타 파일이 없는 본문(저장 도중 중단 등)은 가장 먼저 지운다.
+
+        Returns:
+            삭제한 항목 수
+        """
+        entries: Dict[str, List] = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                base, extension = os.path.splitext(name)
+                if extension not in ('.json', '.body'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entry = entries.setdefault(os.path.join(root, base), [0.0, 0])
+                if extension == '.json':
+                    entry[0] = stat.st_mtime
+                entry[1] += stat.st_size
+
+        total = sum(size for _, size in entries.values())
+        removed = 0
+        for base, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total <= self.max_total_bytes:
+                break
+            for path in (base + '.json', base + '.body'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"HTTP 캐시 정리: {removed}개 항목 삭제")
+        return removed
+
+    def _write_atomic(self, path: str, data: bytes):
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def to_response(entry: Dict, source: requests.Response) -> requests.Response:
+        """304 응답을 저장된 본문으로 채운 200 응답으로 변환"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = source.url
+        response.headers.update(entry.get('headers', {}))
+        response.encoding = entry.get('encoding')
+        response._content = entry['content']
+        response.request = source.request
+        response.from_cache = True
+        return response
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    directory = _setting('COMPLIANCE_HTTP_CACHE_DIR', None)
+    if not directory:
+        return None
+    return HttpCache(
+        str(directory),
+        _setting('COMPLIANCE_HTTP_CACHE_MAX_BYTES', 5 * 1024 * 1024),
+        _setting('COMPLIANCE_HTTP_CACHE_MAX_TOTAL_BYTES', 200 * 1024 * 1024),
+        _setting('COMPLIANCE_HTTP_CACHE_PRUNE_EVERY', 100)
+    )
+
+
+def fetch(url: str, headers: Dict[str, str] = None, timeout: float = 10) -> requests.Response:
+    """공유 세션과 디스크 캐시를 사용한 GET 요청"""
+    http_cache = get_http_cache()
+    entry = http_cache.load(url) if http_cache else None
+
+    request_headers = dict(headers or {})
+    if http_cache:
+        request_headers.update(http_cache.conditional_headers(entry))
+
+    response = get_http_session().get(url, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and entry:
+        logger.info(f"HTTP 캐시 재검증 적중: {url}")
+        return HttpCache.to_response(entry, response)
+    if http_cache:
+        http_cache.store(url, response)
+    return response
+
+
+def fetch_all(requests_to_send: List[Dict], max_workers: int = None) -> List:
+    """여러 URL 을 동시에 요청 (입력 순서대로 응답 또는 예외 반환)
+
+    Args:
+        requests_to_send: fetch() 인자(url, headers, timeout) 딕셔너리 목록
+    """
+    if not requests_to_send:
+        return []
+    max_workers = max_workers or _setting('COMPLIANCE_HTTP_CONCURRENCY', 4)
+
+    def _fetch(kwargs):
+        try:
+            response = fetch(**kwargs)
+            response.raise_for_status()
+            return response
+        except Exception as e:
+            return e
+
+    if len(requests_to_send) == 1:
+        return [_fetch(requests_to_send[0])]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(requests_to_send)),
+                            thread_name_prefix='compliance-http') as executor:
+        return list(executor.map(_fetch, requests_to_send))
@@ -0,0 +1,200 @@
+import difflib
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from .matcher import KeywordMatch, KeywordMatcher
+
+# 위반 판단에 쓰는 키워드 앞뒤 문맥 길이 (_check_rule_violations 의 전후 150자)
+CONTEXT_MARGIN = 150
+
+# 문장/줄 단위 조각 (구분자는 앞 조각에 포함, 조각을 이으면 원문)
+_SEGMENT_RE = re.compile(r'[^.!?\n]*[.!?\n]*')
+
+
+def split_segments(text: str) -> List[str]:
+    """텍스트를 문장/줄 단위 조각으로 분할"""
+    return [segment for segment in _SEGMENT_RE.findall(text) if segment]
+
+
+def _offsets(segments: List[str]) -> List[int]:
+    offsets = [0]
+    for segment in segments:
+        offsets.append(offsets[-1] + len(segment))
+    return offsets
+
+
+class TextDiff:
+    """이전 텍스트와 새 텍스트의 문장/줄 단위 차이
+
+    changed_ranges 는 새 텍스트 기준 변경 구간 [start, end) 목록이며, 삭제만 된 곳은
+    길이 0 구간으로 남긴다. 변경되지 않은 구간의 이전 위치는 map_position 으로
+    새 위치로 옮길 수 있다.
+    """
+
+    def __init__(self, old_text: str, new_text: str):
+        self.new_length = len(new_text)
+        old_segments = split_segments(old_text)
+        new_segments = split_segments(new_text)
+        old_offsets = _offsets(old_segments)
+        new_offsets = _offsets(new_segments)
+
+        self.changed_ranges: List[Tuple[int, int]] = []
+        # 변경되지 않은 구간 (이전 시작, 이전 끝, 새 시작)
+        self._equal_blocks: List[Tuple[int, int, int]] = []
+        matcher = difflib.SequenceMatcher(None, old_segments, new_segments, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                self._equal_blocks.append((old_offsets[i1], old_offsets[i2], new_offsets[j1]))
+            else:
+                self.changed_ranges.append((new_offsets[j1], new_offsets[j2]))
+        self._equal_starts = [block[0] for block in self._equal_blocks]
+
+    @property
+    def changed_characters(self) -> int:
+        return sum(end - start for start, end in self.changed_ranges)
+
+    def map_position(self, old_position: int) -> Optional[int]:
+        """변경되지 않은 구간의 이전 위치를 새 위치로 변환 (변경된 곳이면 None)"""
+        index = bisect_right(self._equal_starts, old_position) - 1
+        if index < 0:
+            return None
+        old_start, old_end, new_start = self._equal_blocks[index]
+        if old_position >= old_end:
+            return None
+        return new_start + old_position - old_start
+
+    def dirty_ranges(self, margin: int) -> List[Tuple[int, int]]:
+        """변경 구간을 앞뒤 margin 만큼 넓혀 합친 재검사 구간"""
+        ranges = []
+        for start, end in self.changed_ranges:
+            start, end = max(0, start - margin), min(self.new_length, end + margin)
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+            else:
+                ranges.append((start, end))
+        return ranges
+
+
+def _has_border(keyword: str) -> bool:
+    """키워드가 자기 자신과 겹쳐 나타날 수 있는지 여부 (예: '하하' in '하하하')"""
+    return any(keyword[:size] == keyword[-size:] for size in range(1, len(keyword)))
+
+
+def incremental_matches(matcher: KeywordMatcher, text: str, diff: TextDiff,
+                        previous_violations: List[Dict]) -> Dict[str, List[KeywordMatch]]:
+    """이전 분석의 위반 위치를 재사용하고 변경 구간만 다시 검색한 키워드 매칭
+
+    문맥(전후 CONTEXT_MARGIN 자)이 변경 구간에 닿지 않는 위치는 이전과 같은 판단이
+    나오므로 이전 상세 위반 위치를 옮겨 쓰고, 나머지 구간만 매처로 다시 검색한다.
+    자기 자신과 겹칠 수 있는 키워드는 매칭 결과가 앞쪽 매칭에 따라 달라지므로 전체
+    텍스트에서 다시 찾는다. 결과 형식과 순서는 KeywordMatcher.find_all 과 같다.
+    """
+    keywords_by_category = matcher.keywords_by_category
+    all_keywords = {keyword for keywords in keywords_by_category.values() for keyword in keywords}
+    max_span = matcher.max_span
+    bordered = {keyword for keyword in all_keywords if _has_border(matcher.key(keyword))}
+
+    # (카테고리, 키워드)별 {시작 위치: 끝 위치}
+    positions: Dict[Tuple[str, str], Dict[int, int]] = {}
+    dirty = diff.dirty_ranges(CONTEXT_MARGIN + max_span)
+    dirty_starts = [start for start, _ in dirty]
+
+    def is_dirty(position: int) -> bool:
+        index = bisect_right(dirty_starts, position) - 1
+        return index >= 0 and position < dirty[index][1]
+
+    # 변경 구간에서 시작하는 매칭 (구간 끝에 걸친 키워드까지 찾도록 매칭 최대 길이만큼 더 검색)
+    for start, end in dirty:
+        window = text[max(0, start - 1):min(len(text), end + max_span - 1)]
+        offset = max(0, start - 1)
+        for category, matches in matcher.find_all(window).items():
+            for match in matches:
+                if start <= offset + match.start < end and match.keyword not in bordered:
+                    positions.setdefault((category, match.keyword), {})[offset + match.start] = offset + match.end
+
+    # 변경되지 않은 구간의 이전 위반 위치
+    for violation in previous_violations:
+        keyword = violation.get('keyword', '')
+        if keyword in bordered or keyword not in keywords_by_category.get(violation.get('category'), ()):
+            continue
+        position = diff.map_position(violation.get('position', 0))
+        if position is not None and not is_dirty(position):
+            length = len(violation.get('matched_text', keyword))
+            positions.setdefault((violation['category'], keyword), {})[position] = position + length
+
+    if bordered:
+        bordered_matcher = KeywordMatcher({
+            category: [keyword for keyword in keywords if keyword in bordered]
+            for category, keywords in keywords_by_category.items()
+        }, normalize=matcher.normalize)
+        for category, matches in bordered_matcher.find_all(text).items():
+            for keyword in bordered.intersection(keywords_by_category[category]):
+                positions[(category, keyword)] = {}
+            for match in matches:
+                positions[(category, match.keyword)][match.start] = match.end
+
+    return {
+        category: matcher.category_matches(
+            keywords, lambda keyword: sorted(positions.get((category, keyword), {}).items())
+        )
+        for category, keywords in keywords_by_category.items()
+    }
+
+
+def previous_improvements(previous_result: Dict) -> Dict[str, Dict]:
+    """이전 분석의 AI 개선 방안을 개선 방안 캐시 키별로 정리
+
+    AI 개선 방안은 상세 위반 앞 3건에 대해 순서대로 생성되고 실패한 항목은 빠지므로
+    위반 유형과 키워드가 맞는 항목끼리 짝을 짓는다.
+    """
+    from .ai import improvement_cache_key
+
+    improvements = list(previous_result.get('ai_improvements') or [])
+    known = {}
+    for violation in (previous_result.get('detailed_violations') or [])[:3]:
+        if not improvements:
+            break
+        improvement = improvements[0]
+        if (improvement.get('violation_category') == violation.get('category')
+                and improvement.get('violation_keyword') == violation.get('keyword')):
+            known[improvement_cache_key(violation)] = improvements.pop(0)
+    return known
+
+
+def reanalyze(previous, text: str, source_type: str = 'text') -> Tuple[Dict, int, Dict]:
+    """이전 분석(ComplianceAnalysis)을 기준으로 수정된 텍스트를 증분 분석
+
+    규칙 스냅샷 버전이 다르거나 이전 결과가 없거나, 이전 결과가 상세 위반 정보 없이
+    저장된 청크 분석 결과이면 전체 분석한다.
+
+    Returns:
+        (분석 결과, 사용한 규칙 스냅샷 버전, 증분 분석 통계)
+    """
+    from .analyzer import ComplianceAnalyzer
+    from .violation_store import hydrate_result
+
+    analyzer = ComplianceAnalyzer()
+    rule_version = analyzer.snapshot.version
+    previous_result = previous.analysis_result if previous.status == 'completed' else None
+    if previous_result and 'violation_spans' not in previous_result:
+        # 상세 위반 정보는 저장하지 않으므로 위반 구간 행에서 다시 만든다
+        previous_result = hydrate_result(previous, previous_result)
+    if (not previous_result or previous.rule_version != rule_version
+            or 'detailed_violations' not in previous_result):
+        stats = {'mode': 'full', 'changed_ranges': None, 'changed_characters': len(text)}
+        return analyzer.analyze(text, source_type), rule_version, stats
+
+    diff = TextDiff(previous.input_text, text)
+    result = analyzer.analyze_text(
+        text, source_type,
+        keyword_matches=incremental_matches(analyzer.matcher, text, diff,
+                                            previous_result.get('detailed_violations') or []),
+        known_improvements=previous_improvements(previous_result)
+    )
+    stats = {
+        'mode': 'incremental',
+        'changed_ranges': len(diff.changed_ranges),
+        'changed_characters': diff.changed_characters
+    }
+    return result, rule_version, stats
@@ -0,0 +1,114 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import ComplianceAnalysis
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_job_executor() -> ThreadPoolExecutor:
+    """백그라운드 작업용 워커 풀 (프로세스당 하나)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'COMPLIANCE_JOB_WORKERS', 4),
+                    thread_name_prefix='compliance-job'
+                )
+    return _executor
+
+
+def _run_in_worker(func, *args, **kwargs):
+    """워커 스레드에서 DB 연결을 정리하며 작업 실행"""
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"백그라운드 작업 실패: {getattr(func, '__name__', func)}")
+        raise
+    finally:
+        close_old_connections()
+
+
+def submit_job(func, *args, **kwargs) -> Future:
+    """백그라운드 워커 풀에 작업 제출
+
+    COMPLIANCE_JOBS_EAGER 설정 시(테스트 등) 호출 스레드에서 바로 실행한다.
+    """
+    if getattr(settings, 'COMPLIANCE_JOBS_EAGER', False):
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            logger.exception(f"작업 실행 실패: {getattr(func, '__name__', func)}")
+            future.set_exception(e)
+        return future
+    return get_job_executor().submit(_run_in_worker, func, *args, **kwargs)
+
+
+def run_analysis_job(analysis_id: int, simple_mode: bool = False, upload_path: str = None):
+    """분석 작업 실행: 텍스트 추출 → 규칙 검사 → AI 개선 방안 생성"""
+    from .result_cache import analyze_with_cache, save_analysis
+    from .utils import extract_text_from_file, extract_text_from_url
+
+    analysis = ComplianceAnalysis.objects.get(id=analysis_id)
+    analysis.status = 'running'
+    analysis.started_at = timezone.now()
+    analysis.save(update_fields=['status', 'started_at'])
+
+    try:
+        if analysis.input_type == 'url':
+            text = extract_text_from_url(analysis.url, simple_mode=simple_mode)
+        elif analysis.input_type == 'file':
+            with default_storage.open(upload_path) as stored_file:
+                text = extract_text_from_file(stored_file)
+            if not text.strip():
+                raise ValueError('파일에서 텍스트를 추출할 수 없습니다.')
+        else:
+            text = analysis.input_text
+
+        # 캐시 적중 시에도 작업 행은 저장된 결과로 완료 처리한다
+        result, rule_version, _ = analyze_with_cache(text, analysis.input_type)
+        save_analysis(analysis, text, result, rule_version)
+    except Exception as e:
+        logger.error(f"분석 작업 실패 (ID: {analysis_id}): {e}")
+        analysis.status = 'failed'
+        analysis.error_message = str(e)
+        analysis.completed_at = timezone.now()
+        analysis.save(update_fields=['status', 'error_message', 'completed_at'])
+    finally:
+        if upload_path:
+            try:
+                default_storage.delete(upload_path)
+            except Exception as e:
+                logger.warning(f"업로드 임시 파일 삭제 실패: {upload_path} - {e}")
+
+
+def submit_analysis_job(analysis: ComplianceAnalysis, simple_mode: bool = False, upload_path: str = None) -> Future:
+    """분석 작업을 백그라운드 워커 풀에 제출"""
+    return submit_job(run_analysis_job, analysis.id, simple_mode=simple_mode, upload_path=upload_path)
+
+
+def expire_stale_analysis(analysis: ComplianceAnalysis) -> bool:
+    """제한 시간이 지나도 끝나지 않은 작업(워커 재시작 등)을 실패 처리"""
+    if analysis.is_finished:
+        return False
+    timeout = getattr(settings, 'COMPLIANCE_JOB_TIMEOUT', 600)
+    if analysis.created_at >= timezone.now() - timedelta(seconds=timeout):
+        return False
+    analysis.status = 'failed'
+    analysis.error_message = '분석 작업이 제한 시간 내에 완료되지 않았습니다. 다시 시도해주세요.'
+    analysis.completed_at = timezone.now()
+    analysis.save(update_fields=['status', 'error_message', 'completed_at'])
+    return True
@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from compliance_checker.batch import iter_corpus_items, run_batch
+
+
+class Command(BaseCommand):
+    help = 'JSONL 파일, 디렉터리 또는 zip 파일의 광고 문서들을 일괄 분석하여 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSONL 파일({"text"|"url"|"path": ...} 한 줄에 하나), 디렉터리 또는 zip 파일')
+        parser.add_argument('--workers', type=int, default=None, help='워커 프로세스 수 (기본: COMPLIANCE_BATCH_WORKERS 또는 CPU 수)')
+        parser.add_argument('--batch-size', type=int, default=200, help='bulk_create 한 번에 저장할 행 수')
+        parser.add_argument('--with-ai', action='store_true', help='AI 개선 방안도 생성 (API 호출 비용 발생)')
+        parser.add_argument('--report', help='항목별 결과를 JSONL 로 저장할 경로')
+
+    def handle(self, *args, **options):
+        try:
+            items = list(iter_corpus_items(options['path']))
+        except (OSError, ValueError) as e:
+            raise CommandError(f'입력을 읽을 수 없습니다: {e}')
+
+        if not items:
+            self.stdout.write(self.style.WARNING('분석할 항목이 없습니다.'))
+            return
+
+        self.stdout.write(f'{len(items)}건 일괄 분석 시작...')
+        step = max(1, len(items) // 20)
+
+        def progress(done, total):
+            if done % step == 0 or done == total:
+                self.stdout.write(f'  {done}/{total}')
+
+        summary = run_batch(
+            items,
+            workers=options['workers'],
+            enable_ai=options['with_ai'],
+            batch_size=options['batch_size'],
+            progress=progress
+        )
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as report_file:
+                for item in summary['items']:
+                    report_file.write(json.dumps(item, ensure_ascii=False) + '\n')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"일괄 분석 완료: 전체 {summary['total']}건, 성공 {summary['completed']}건, 실패 {summary['failed']}건"
+        ))
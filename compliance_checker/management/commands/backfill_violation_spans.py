@@ -0,0 +1,74 @@
+import copy
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from compliance_checker.models import ComplianceAnalysis, ViolationSpan, result_has_ai_improvements, stored_result
+from compliance_checker.rollups import record_changes
+from compliance_checker.violation_store import SpanResolver, create_spans
+
+AGGREGATE_FIELDS = [
+    'violation_count', 'high_severity_count', 'medium_severity_count', 'low_severity_count',
+    'total_characters', 'total_words', 'total_sentences', 'has_ai_improvements'
+]
+
+
+class Command(BaseCommand):
+    help = ('기존 분석 결과 JSON 에서 위반 구간(ViolationSpan)과 집계 컬럼을 채우고, '
+            '위반 구간과 원문으로 다시 만들 수 있는 상세 위반 정보와 원문을 결과 JSON 에서 뺍니다. '
+            '바뀐 위반 수는 일별 집계에도 반영하며, 채울 분석이 없으면 바로 끝나므로 배포 때마다 실행합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='한 번에 읽고 저장할 분석 수')
+        parser.add_argument('--all', action='store_true',
+                            help='이미 채워진 분석도 다시 계산 (기본: 집계가 비어 있는 분석만)')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        queryset = ComplianceAnalysis.objects.filter(status='completed', analysis_result__isnull=False)
+        if not options['all']:
+            # 결과를 저장할 때 글자 수가 채워지므로 0 이면 아직 채우지 않은 분석
+            queryset = queryset.filter(total_characters=0)
+
+        resolver = SpanResolver()
+        processed = spans = 0
+        last_id = 0
+        while True:
+            # id 기준 키셋 페이지네이션 (OFFSET 없이 다음 묶음 조회)
+            batch = list(
+                queryset.filter(id__gt=last_id).order_by('id')
+                .only('id', 'input_text', 'analysis_result', 'status', 'created_at', 'input_type', 'risk_level',
+                      'compliance_status', 'overall_score', *AGGREGATE_FIELDS)[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            pairs = []
+            previous_states = []
+            for analysis in batch:
+                text_analysis = analysis.analysis_result.get('text_analysis') or {}
+                analysis.total_characters = text_analysis.get('total_characters', len(analysis.input_text))
+                analysis.total_words = text_analysis.get('total_words', 0)
+                analysis.total_sentences = text_analysis.get('total_sentences', 0)
+                analysis.has_ai_improvements = result_has_ai_improvements(analysis.analysis_result)
+                if 'detailed_violations' not in analysis.analysis_result and 'violation_spans' not in analysis.analysis_result:
+                    # 상세 위반 정보 없이 저장된 결과는 위반 구간 행이 원본이므로 그대로 둔다
+                    continue
+                previous_states.append(copy.copy(analysis))
+                analysis._violation_spans = resolver.apply(analysis, analysis.input_text, analysis.analysis_result)
+                pairs.append((analysis, analysis._violation_spans))
+                analysis.analysis_result = stored_result(analysis.analysis_result)
+
+            with transaction.atomic():
+                # 기존 위반 구간을 지우기 전에 이전 값과의 차이를 일별 집계에 반영
+                record_changes(previous_states, [analysis for analysis, _ in pairs])
+                ViolationSpan.objects.filter(analysis_id__in=[analysis.id for analysis, _ in pairs]).delete()
+                ComplianceAnalysis.objects.bulk_update(batch, AGGREGATE_FIELDS + ['analysis_result'])
+                create_spans(pairs)
+
+            processed += len(batch)
+            spans += sum(len(analysis_spans) for _, analysis_spans in pairs)
+            self.stdout.write(f'  {processed}건 처리')
+
+        self.stdout.write(self.style.SUCCESS(f'위반 구간 채우기 완료: 분석 {processed}건, 위반 구간 {spans}건'))
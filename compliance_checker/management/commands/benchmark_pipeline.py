@@ -0,0 +1,88 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from compliance_checker.benchmark import (
+    CORPUS_DIR, RULES_FILE, compare_golden, export_rule_fixture, load_golden, run_benchmark, save_golden
+)
+from compliance_checker.snapshot import get_rule_snapshot
+
+
+class Command(BaseCommand):
+    help = '저장된 코퍼스로 추출·분석 파이프라인의 처리량, 지연 시간, 메모리를 측정하고 골든 판정과 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', default=CORPUS_DIR, help='코퍼스 디렉터리 (manifest.json, rules.json, golden.json)')
+        parser.add_argument('--case', action='append', dest='cases', help='측정할 항목 ID (여러 번 지정 가능)')
+        parser.add_argument('--repeat', type=int, default=5, help='항목별 측정 반복 횟수')
+        parser.add_argument('--warmup', type=int, default=1, help='측정 전 예열 실행 횟수')
+        parser.add_argument('--scale', type=int, default=1, help='입력 크기 배수 (1 이 아니면 골든 비교 생략)')
+        parser.add_argument('--extra-keywords', type=int, default=0,
+                            help='규칙에 나눠 추가할 합성 키워드 수 (판정은 바뀌지 않음)')
+        parser.add_argument('--no-memory', action='store_true',
+                            help='최대 메모리 측정 생략 (tracemalloc 실행이 느린 PDF 추출 등을 빠르게 확인)')
+        parser.add_argument('--json', help='전체 측정 결과를 JSON 으로 저장할 경로')
+        parser.add_argument('--update-golden', action='store_true', help='현재 판정을 골든 결과로 저장')
+        parser.add_argument('--export-rules', action='store_true',
+                            help='데이터베이스의 현재 규칙을 코퍼스 규칙 픽스처로 저장하고 종료')
+
+    def handle(self, *args, **options):
+        corpus_dir = options['corpus']
+        if options['export_rules']:
+            snapshot = get_rule_snapshot()
+            export_rule_fixture(snapshot, os.path.join(corpus_dir, RULES_FILE))
+            self.stdout.write(self.style.SUCCESS(f'규칙 픽스처 저장 완료: 규칙 {len(snapshot.rules)}개'))
+            return
+        if options['repeat'] < 1 or options['scale'] < 1:
+            raise CommandError('--repeat 와 --scale 은 1 이상이어야 합니다.')
+
+        self.stdout.write(
+            f"{'항목':<14}{'문서':>6}{'글자':>10}{'문서/초':>10}{'글자/초':>12}"
+            f"{'p50(ms)':>10}{'p99(ms)':>10}{'메모리(KB)':>12}  단계별 평균(ms)"
+        )
+
+        def progress(report):
+            stages = ', '.join(f"{stage} {timing['mean']}" for stage, timing in report['stages_ms'].items())
+            self.stdout.write(
+                f"{report['id']:<14}{report['documents']:>6}{report['characters']:>10}"
+                f"{report['documents_per_second']:>10}{report['characters_per_second']:>12}"
+                f"{report['latency_ms']['p50']:>10}{report['latency_ms']['p99']:>10}"
+                f"{report['peak_memory_kb'] if report['peak_memory_kb'] is not None else '-':>12}  {stages}"
+            )
+
+        try:
+            benchmark = run_benchmark(
+                corpus_dir=corpus_dir,
+                repeat=options['repeat'],
+                warmup=options['warmup'],
+                scale=options['scale'],
+                extra_keywords=options['extra_keywords'],
+                case_ids=options['cases'],
+                measure_memory=not options['no_memory'],
+                progress=progress
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(f'코퍼스를 읽을 수 없습니다: {e}')
+
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as report_file:
+                json.dump(benchmark, report_file, ensure_ascii=False, indent=1)
+
+        self.stdout.write(f"규칙 {benchmark['rules']}개, 키워드 {benchmark['keywords']}개")
+        if options['update_golden']:
+            if not benchmark['golden_comparable']:
+                raise CommandError('--scale 이 1 일 때만 골든 결과를 저장할 수 있습니다.')
+            save_golden(benchmark, corpus_dir)
+            self.stdout.write(self.style.SUCCESS('골든 결과 저장 완료'))
+            return
+        if not benchmark['golden_comparable']:
+            self.stdout.write(self.style.WARNING('입력 크기가 달라 골든 비교를 건너뜁니다.'))
+            return
+
+        mismatches = compare_golden(benchmark, load_golden(corpus_dir))
+        if mismatches:
+            for mismatch in mismatches:
+                self.stdout.write(self.style.ERROR(f'  {mismatch}'))
+            raise CommandError(f'골든 판정과 다른 결과 {len(mismatches)}건')
+        self.stdout.write(self.style.SUCCESS('골든 판정과 일치'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from compliance_checker.citations import (
+    bump_citation_index_version, get_citation_index, index_guideline, index_guideline_document, index_law_files
+)
+from compliance_checker.models import CitationSource, GuidelineDocument, MedicalGuideline
+
+
+class Command(BaseCommand):
+    help = ('법령 텍스트 파일, 의료 가이드라인, 가이드라인 문서를 인용 검색 문단 색인(BM25)에 넣습니다. '
+            '내용이 바뀐 원문만 다시 색인하며, 이후 가이드라인 변경은 저장 시 자동으로 반영됩니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='기존 색인을 모두 지우고 다시 생성')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            CitationSource.objects.all().delete()
+            bump_citation_index_version()
+
+        changed = index_law_files()
+        for guideline_id in MedicalGuideline.objects.values_list('id', flat=True):
+            changed += index_guideline(guideline_id)
+        for document_id in GuidelineDocument.objects.values_list('id', flat=True):
+            changed += index_guideline_document(document_id)
+
+        # 색인에서 사라진 가이드라인/문서 정리
+        for source_type, model in (('guideline', MedicalGuideline), ('document', GuidelineDocument)):
+            existing = {str(object_id) for object_id in model.objects.filter(is_active=True).values_list('id', flat=True)}
+            stale = CitationSource.objects.filter(source_type=source_type).exclude(source_key__in=existing)
+            removed, _ = stale.delete()
+            if removed:
+                changed += 1
+                bump_citation_index_version()
+
+        index = get_citation_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'인용 색인 완료: 원문 {CitationSource.objects.count()}개 중 {changed}개 갱신, '
+            f'문단 {len(index)}개, 용어 {len(index.postings)}개'
+        ))
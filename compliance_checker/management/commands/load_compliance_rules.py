@@ -1,22 +1,75 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from compliance_checker.models import ComplianceRule, ComplianceKeyword, RecommendedExpression, MedicalLawInfo
+from compliance_checker.snapshot import bump_rule_snapshot_version
 from django.utils import timezone
 from datetime import date
 
 class Command(BaseCommand):
     help = '의료광고법 준수 규칙들을 데이터베이스에 로드합니다.'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--reevaluate', action='store_true',
+                            help='로드 후 저장된 분석을 새 규칙으로 재평가 (reevaluate_analyses 명령 실행)')
+
     def handle(self, *args, **options):
         self.stdout.write('의료광고법 준수 규칙들을 로드하는 중...')
         
-        # 기존 데이터 삭제
-        ComplianceRule.objects.all().delete()
-        ComplianceKeyword.objects.all().delete()
-        RecommendedExpression.objects.all().delete()
-        MedicalLawInfo.objects.all().delete()
+        # 기존 행은 삭제하지 않고 (카테고리, 제목) 등의 키로 찾아 갱신하므로 규칙 ID 가 유지되어
+        # 저장된 위반 구간의 규칙 연결이 끊기지 않는다. 목록에 없는 행은 비활성화한다.
+        self.kept = {model: set() for model in (ComplianceRule, ComplianceKeyword, RecommendedExpression, MedicalLawInfo)}
+        self.changed = 0
+        with transaction.atomic():
+            self._load()
+            deactivated = sum(
+                model.objects.filter(is_active=True).exclude(pk__in=kept).update(is_active=False)
+                for model, kept in self.kept.items()
+            )
+        if deactivated:
+            # update() 는 저장 시그널을 보내지 않으므로 규칙 스냅샷 버전을 직접 갱신
+            bump_rule_snapshot_version()
         
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'성공적으로 로드되었습니다 (변경 {self.changed}개, 비활성화 {deactivated}개):\n'
+                f'- 준수 규칙: {ComplianceRule.objects.filter(is_active=True).count()}개\n'
+                f'- 위반 키워드: {ComplianceKeyword.objects.filter(is_active=True).count()}개\n'
+                f'- 권장 표현: {RecommendedExpression.objects.filter(is_active=True).count()}개\n'
+                f'- 의료법 정보: {MedicalLawInfo.objects.filter(is_active=True).count()}개'
+            )
+        )
+        
+        if options['reevaluate']:
+            # 관리 명령은 프로세스가 끝나면 백그라운드 워커도 종료되므로 동기로 실행
+            call_command('reevaluate_analyses', stdout=self.stdout)
+        else:
+            self.stdout.write('저장된 분석은 이전 규칙의 결과를 유지합니다. '
+                              '재평가하려면 reevaluate_analyses 명령을 실행하세요.')
+
+    def _upsert(self, model, key_fields, **fields):
+        """key_fields 값으로 기존 행을 찾아 갱신하고 없으면 생성
+
+        내용이 같은 행은 저장하지 않으므로 다시 로드해도 규칙 스냅샷 버전이 바뀌지 않는다.
+        """
+        lookup = {name: fields.pop(name) for name in key_fields}
+        fields['is_active'] = True
+        instance = model.objects.filter(**lookup).order_by('id').first()
+        if instance is None:
+            instance = model.objects.create(**lookup, **fields)
+            self.changed += 1
+        elif any(getattr(instance, name) != value for name, value in fields.items()):
+            for name, value in fields.items():
+                setattr(instance, name, value)
+            instance.save()
+            self.changed += 1
+        self.kept[model].add(instance.pk)
+        return instance
+
+    def _load(self):
         # 1. 과장·절대적 표현 규칙
-        rule1 = ComplianceRule.objects.create(
+        rule1 = self._upsert(
+            ComplianceRule, ('category', 'title'),
             category='과장·절대적 표현',
             title='객관적 근거 없는 과장·절대적 표현 금지',
             description='객관적 근거 없는 과장·절대적 표현은 의료광고법 위반입니다.',
@@ -36,14 +89,16 @@ class Command(BaseCommand):
         ]
         
         for keyword in keywords1:
-            ComplianceKeyword.objects.create(
+            self._upsert(
+                ComplianceKeyword, ('rule', 'keyword'),
                 rule=rule1,
                 keyword=keyword,
                 description=f'과장·절대적 표현으로 사용될 수 있는 키워드'
             )
         
         # 2. 비교광고 규칙
-        rule2 = ComplianceRule.objects.create(
+        rule2 = self._upsert(
+            ComplianceRule, ('category', 'title'),
             category='비교광고',
             title='다른 의료기관과의 비교광고 금지',
             description='다른 의료기관과의 비교광고는 금지됩니다.',
@@ -60,14 +115,16 @@ class Command(BaseCommand):
         ]
         
         for keyword in keywords2:
-            ComplianceKeyword.objects.create(
+            self._upsert(
+                ComplianceKeyword, ('rule', 'keyword'),
                 rule=rule2,
                 keyword=keyword,
                 description=f'비교광고로 사용될 수 있는 키워드'
             )
         
         # 3. 환자체험담·후기 규칙
-        rule3 = ComplianceRule.objects.create(
+        rule3 = self._upsert(
+            ComplianceRule, ('category', 'title'),
             category='환자체험담·후기',
             title='환자 후기·경험담 광고 활용 금지',
             description='환자 후기·경험담을 광고 목적으로 활용하는 것은 금지됩니다.',
@@ -85,14 +142,16 @@ class Command(BaseCommand):
         ]
         
         for keyword in keywords3:
-            ComplianceKeyword.objects.create(
+            self._upsert(
+                ComplianceKeyword, ('rule', 'keyword'),
                 rule=rule3,
                 keyword=keyword,
                 description=f'환자 후기 관련 키워드'
             )
         
         # 4. SNS 미심의 광고 규칙
-        rule4 = ComplianceRule.objects.create(
+        rule4 = self._upsert(
+            ComplianceRule, ('category', 'title'),
             category='SNS 미심의 광고',
             title='SNS 플랫폼 사전심의 의무',
             description='10만명 이상 플랫폼에서의 광고는 개별계정 이용자 수와 관계없이 사전심의가 필수입니다.',
@@ -110,14 +169,16 @@ class Command(BaseCommand):
         ]
         
         for keyword in keywords4:
-            ComplianceKeyword.objects.create(
+            self._upsert(
+                ComplianceKeyword, ('rule', 'keyword'),
                 rule=rule4,
                 keyword=keyword,
                 description=f'SNS 플랫폼 관련 키워드'
             )
         
         # 5. 의료광고 범주 외 광고 규칙
-        rule5 = ComplianceRule.objects.create(
+        rule5 = self._upsert(
+            ComplianceRule, ('category', 'title'),
             category='의료광고 범주 외',
             title='의약품·의료기기 광고 금지',
             description='의료광고 범주에서 벗어나는 의약품 또는 의료기기 광고는 금지됩니다.',
@@ -133,14 +194,16 @@ class Command(BaseCommand):
         ]
         
         for keyword in keywords5:
-            ComplianceKeyword.objects.create(
+            self._upsert(
+                ComplianceKeyword, ('rule', 'keyword'),
                 rule=rule5,
                 keyword=keyword,
                 description=f'의료광고 범주 외 키워드'
             )
         
         # 6. 수정사항 과다 규칙
-        rule6 = ComplianceRule.objects.create(
+        rule6 = self._upsert(
+            ComplianceRule, ('category', 'title'),
             category='수정사항 과다',
             title='수정사항이 과도하게 많은 경우 접수 불가',
             description='전체 광고내용의 50% 이상 수정이 필요한 경우 접수가 불가합니다.',
@@ -156,14 +219,16 @@ class Command(BaseCommand):
         ]
         
         for keyword in keywords6:
-            ComplianceKeyword.objects.create(
+            self._upsert(
+                ComplianceKeyword, ('rule', 'keyword'),
                 rule=rule6,
                 keyword=keyword,
                 description=f'수정사항 과다 관련 키워드'
             )
         
         # 7. 의학적 객관성 부족 규칙
-        rule7 = ComplianceRule.objects.create(
+        rule7 = self._upsert(
+            ComplianceRule, ('category', 'title'),
             category='의학적 객관성 부족',
             title='공인되지 않은 치료법·시술명 사용 금지',
             description='의학적 객관성이 부족한 공인되지 않은 치료법이나 시술명 사용은 금지됩니다.',
@@ -179,14 +244,16 @@ class Command(BaseCommand):
         ]
         
         for keyword in keywords7:
-            ComplianceKeyword.objects.create(
+            self._upsert(
+                ComplianceKeyword, ('rule', 'keyword'),
                 rule=rule7,
                 keyword=keyword,
                 description=f'의학적 객관성 부족 관련 키워드'
             )
         
         # 8. 치과의료광고 특별 규칙
-        rule8 = ComplianceRule.objects.create(
+        rule8 = self._upsert(
+            ComplianceRule, ('category', 'title'),
             category='치과의료광고 특별규칙',
             title='치과의료광고 심의 의무',
             description='치과의사, 치과의원, 치과병원의 광고는 치과의료광고심의위원회의 사전심의가 필수입니다.',
@@ -205,14 +272,16 @@ class Command(BaseCommand):
         ]
         
         for keyword in keywords8:
-            ComplianceKeyword.objects.create(
+            self._upsert(
+                ComplianceKeyword, ('rule', 'keyword'),
                 rule=rule8,
                 keyword=keyword,
                 description=f'치과의료광고 특별규칙 관련 키워드'
             )
         
         # 9. 치과진료과목 표시 규칙
-        rule9 = ComplianceRule.objects.create(
+        rule9 = self._upsert(
+            ComplianceRule, ('category', 'title'),
             category='치과진료과목 표시',
             title='치과진료과목 정확 표시 의무',
             description='치과진료과목은 의료법 시행규칙 제41조에 따른 공인된 과목만 표시해야 합니다.',
@@ -228,7 +297,8 @@ class Command(BaseCommand):
         ]
         
         for keyword in keywords9:
-            ComplianceKeyword.objects.create(
+            self._upsert(
+                ComplianceKeyword, ('rule', 'keyword'),
                 rule=rule9,
                 keyword=keyword,
                 description=f'치과진료과목 표시 관련 키워드'
@@ -267,7 +337,7 @@ class Command(BaseCommand):
         ]
         
         for expr in recommended_expressions:
-            RecommendedExpression.objects.create(**expr)
+            self._upsert(RecommendedExpression, ('category', 'original_text'), **expr)
         
         # 의료법 정보 추가
         medical_law_infos = [
@@ -919,14 +989,4 @@ Step 05: 심의결과 통보
         ]
         
         for info in medical_law_infos:
-            MedicalLawInfo.objects.create(**info)
-        
-        self.stdout.write(
-            self.style.SUCCESS(
-                f'성공적으로 로드되었습니다:\n'
-                f'- 준수 규칙: {ComplianceRule.objects.count()}개\n'
-                f'- 위반 키워드: {ComplianceKeyword.objects.count()}개\n'
-                f'- 권장 표현: {RecommendedExpression.objects.count()}개\n'
-                f'- 의료법 정보: {MedicalLawInfo.objects.count()}개'
-            )
-        ) 
\ No newline at end of file
+            self._upsert(MedicalLawInfo, ('category', 'title'), **info)
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from compliance_checker.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = ('분석 결과와 위반 구간에서 대시보드/통계용 일별 집계를 다시 계산합니다. '
+            '처음 도입할 때 전체를 한 번 실행하고, 이후에는 최근 며칠만 주기적으로 실행해 보정합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='최근 N일(오늘 포함)만 다시 계산 (기본: 전체)')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['days']:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+
+        analysis_rows, violation_rows = rebuild_rollups(since)
+        scope = f'{since} 이후' if since else '전체'
+        self.stdout.write(self.style.SUCCESS(
+            f'일별 집계 재계산 완료 ({scope}): 분석 집계 {analysis_rows}행, 위반 집계 {violation_rows}행'
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from compliance_checker.reevaluation import reevaluate_analyses
+
+
+class Command(BaseCommand):
+    help = ('완료된 분석의 원문을 현재 규칙 스냅샷으로 다시 검사해 결과가 바뀐 분석을 갱신하고, '
+            '준수 상태가 바뀐 분석을 출력합니다. 기본적으로 이전 규칙 버전으로 분석된 분석만 검사하므로 '
+            '중단 후 다시 실행하면 남은 분석부터 이어서 처리합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help='재분석 워커 프로세스 수 (기본: COMPLIANCE_BATCH_WORKERS 또는 CPU 수)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='한 번에 읽고 저장할 분석 수 (기본: COMPLIANCE_REEVALUATION_BATCH_SIZE)')
+        parser.add_argument('--all', action='store_true',
+                            help='현재 규칙 버전으로 분석된 분석도 다시 검사')
+
+    def handle(self, *args, **options):
+        def progress(summary):
+            self.stdout.write(f"  {summary['processed']}건 검사, {summary['changed']}건 변경, "
+                              f"{summary['failed']}건 실패")
+
+        reevaluation = reevaluate_analyses(
+            workers=options['workers'], batch_size=options['batch_size'],
+            include_current=options['all'], progress=progress
+        )
+        for change in reevaluation.status_changes:
+            self.stdout.write(
+                f"  분석 {change['analysis_id']}: {change['from']} → {change['to']} "
+                f"({change['score_from']}점 → {change['score_to']}점)"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'재평가 완료 (규칙 스냅샷 버전 {reevaluation.snapshot.version}): '
+            f'분석 {reevaluation.processed}건 중 {reevaluation.changed}건 변경, '
+            f'준수 상태 변경 {len(reevaluation.status_changes)}건, 실패 {reevaluation.failed}건'
+        ))
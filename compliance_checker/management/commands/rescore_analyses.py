@@ -0,0 +1,76 @@
+import copy
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from compliance_checker.models import ComplianceAnalysis, ComplianceRule
+from compliance_checker.rollups import record_changes
+from compliance_checker.scoring import rescore_from_spans
+
+SCORE_FIELDS = ['overall_score', 'compliance_status', 'risk_level']
+
+
+class Command(BaseCommand):
+    help = ('저장된 위반 구간과 현재 규칙 가중치로 완료된 분석의 점수, 준수 상태, 위험도를 다시 계산합니다. '
+            '원문은 다시 검사하지 않습니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 읽고 저장할 분석 수')
+        parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 바뀔 분석만 출력')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        # 같은 카테고리·제목의 규칙이 여러 개면 뒤의 규칙이 우선 (SpanResolver 와 동일)
+        rules_by_title = {(rule.category, rule.title): rule for rule in ComplianceRule.objects.all()}
+        queryset = ComplianceAnalysis.objects.filter(status='completed').only(
+            'id', 'created_at', 'input_type', 'status', 'overall_score', 'compliance_status', 'risk_level',
+            'total_characters', 'violation_count', 'high_severity_count', 'medium_severity_count', 'low_severity_count'
+        )
+
+        processed = changed_count = skipped_count = 0
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id).order_by('id')[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            before = {analysis.id: copy.copy(analysis) for analysis in batch}
+            changed, skipped = rescore_from_spans(batch, rules_by_title)
+            for analysis in skipped:
+                self.stdout.write(self.style.WARNING(
+                    f'  분석 {analysis.id}: 현재 규칙으로 찾을 수 없는 위반 구간이 있어 건너뜀 '
+                    f'(reevaluate_analyses 로 원문을 다시 분석하세요)'
+                ))
+            for analysis in changed:
+                if analysis.compliance_status != before[analysis.id].compliance_status:
+                    self.stdout.write(
+                        f'  분석 {analysis.id}: {before[analysis.id].compliance_status} → {analysis.compliance_status} '
+                        f'({analysis.overall_score}점)'
+                    )
+            if changed and not options['dry_run']:
+                self._save([before[analysis.id] for analysis in changed], changed)
+
+            processed += len(batch)
+            changed_count += len(changed)
+            skipped_count += len(skipped)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'재계산 완료: 분석 {processed}건 중 {changed_count}건 변경, {skipped_count}건 건너뜀'
+        ))
+
+    @staticmethod
+    def _save(previous_states, changed):
+        """점수 컬럼과 분석 결과 JSON 의 같은 값을 함께 갱신하고 일별 집계에 변경분 반영
+
+        준수 상태/위험도가 바뀌면 일별 집계의 키도 바뀌므로 이전 값을 빼고 새 값을 더한다.
+        """
+        results = ComplianceAnalysis.objects.only('id', 'analysis_result').in_bulk([a.id for a in changed])
+        for analysis in changed:
+            result = results[analysis.id].analysis_result
+            if isinstance(result, dict):
+                result.update({field: getattr(analysis, field) for field in SCORE_FIELDS})
+            analysis.analysis_result = result
+        with transaction.atomic():
+            record_changes(previous_states, changed)
+            ComplianceAnalysis.objects.bulk_update(changed, SCORE_FIELDS + ['analysis_result'])
@@ -0,0 +1,219 @@
+import re
+from collections import namedtuple
+from typing import Dict, List, Iterable, Tuple
+
+from .normalization import BOUNDARY, PARTICLES, OffsetMap, NormalizedText, fold_case, keyword_key, normalize_korean
+
+# 키워드 매칭 결과 (원본 키워드, 원문 시작 위치, 원문 끝 위치)
+KeywordMatch = namedtuple('KeywordMatch', ['keyword', 'start', 'end'])
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+class KeywordMatcher:
+    """전체 규칙의 키워드를 한 번에 검색하는 다중 키워드 매처
+
+    모든 키워드로 접두사 트라이를 만들고, 트라이를 하나의 정규식 교대(alternation)로
+    컴파일해 키워드가 시작될 수 있는 위치만 한 번의 스캔으로 찾는다. 후보 위치에서는
+    트라이를 따라가며 그 위치에서 시작하는 모든 키워드(겹치는 키워드 포함)를 수집한다.
+
+    normalize 가 True 이면(기본) 텍스트와 키워드를 normalize_korean 정규형으로 비교한다.
+    띄어쓰기 변형('세계최초' / '세계 최초'), 전각 문자와 조합형 자모가 같은 키워드로
+    매칭되고, 여러 어절로 된 키워드는 어절 사이에 조사가 하나 붙어도 매칭된다. 영문/숫자로
+    시작하거나 끝나는 키워드는 더 긴 영문/숫자 단어의 일부('1위' in '11위')로는 매칭하지
+    않는다. 한글 키워드에는 이런 경계 검사를 하지 않는다. 한글은 복합어와 조사가 붙은 형태
+    ('치료후기', '최고급')로 쓰이는 경우가 많아 어절 안의 매칭도 위반 후보로 보는 것이
+    의도된 동작이다. 텍스트 정규형은 find_all 호출당 한 번 만들고 매칭 위치는 원문 위치로 돌려준다.
+
+    normalize 가 False 이면 키워드별 ``re.finditer(re.escape(keyword), re.IGNORECASE)`` 와
+    동일하게 대소문자만 무시한다. 두 경우 모두 키워드마다 겹치지 않는 매칭만 왼쪽부터 반환한다.
+    """
+
+    _END = ''
+    # 트라이에서 어절 경계(조사 0~1개) 노드의 키 (텍스트 문자와 겹치지 않음)
+    _BOUNDARY = None
+
+    def __init__(self, keywords_by_category: Dict[str, Iterable[str]], normalize: bool = True):
+        self.normalize = normalize
+        self.keywords_by_category = {
+            category: [keyword for keyword in keywords if keyword]
+            for category, keywords in keywords_by_category.items()
+        }
+        self._trie = {}
+        self._keys: Dict[str, str] = {}
+        self.max_length = 0
+        for keywords in self.keywords_by_category.values():
+            for keyword in keywords:
+                key = self._keys.get(keyword)
+                if key is None:
+                    key = self._keys[keyword] = keyword_key(keyword) if normalize else fold_case(keyword)
+                if key:
+                    self._add_to_trie(key)
+                self.max_length = max(self.max_length, len(keyword))
+        # 원문에서 매칭 하나가 차지할 수 있는 길이 (정규화 시 공백/조사 변형 여유 포함)
+        self.max_span = self.max_length * 2 if normalize else self.max_length
+        self._pattern = None
+        if self._trie:
+            self._pattern = re.compile('(?=' + self._trie_to_regex(self._trie) + ')')
+
+    def __bool__(self):
+        return self._pattern is not None
+
+    def _add_to_trie(self, key: str):
+        node = self._trie
+        for char in key:
+            node = node.setdefault(self._BOUNDARY if char == BOUNDARY else char, {})
+        node[self._END] = key
+
+    def _trie_to_regex(self, node: Dict) -> str:
+        """트라이를 접두사가 묶인 정규식으로 변환"""
+        branches = []
+        for char in sorted(key for key in node if key not in (self._END, self._BOUNDARY)):
+            branches.append(re.escape(char) + self._trie_to_regex(node[char]))
+        if self._BOUNDARY in node:
+            particles = '|'.join(re.escape(particle) for particle in PARTICLES)
+            branches.append(f'(?:{particles})?' + self._trie_to_regex(node[self._BOUNDARY]))
+        if not branches:
+            return ''
+        if self._END in node:
+            # 현재 위치에서 키워드가 끝날 수도 있으므로 나머지는 선택적
+            return '(?:' + '|'.join(branches) + ')?'
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    def _normalized(self, text: str) -> NormalizedText:
+        if self.normalize:
+            return normalize_korean(text)
+        return NormalizedText(fold_case(text), [OffsetMap([])])
+
+    def _is_word_part(self, text: str, key: str, start: int, end: int) -> bool:
+        """영문/숫자 키워드가 더 긴 영문/숫자 단어 안에서 매칭되었는지 여부
+
+        한글 글자는 단어 문자로 보지 않으므로 한글 어절 안의 매칭은 제외하지 않는다.
+        """
+        return (
+            (start > 0 and _is_word_char(key[0]) and _is_word_char(text[start - 1]))
+            or (end < len(text) and _is_word_char(key[-1]) and _is_word_char(text[end]))
+        )
+
+    def _scan(self, normalized: NormalizedText) -> Dict[str, List[Tuple[int, int]]]:
+        """키워드 키별 원문 (시작 위치, 끝 위치) 목록 (시작 위치 순)"""
+        text = normalized.text
+        hits: Dict[str, Dict[int, int]] = {}
+        text_length = len(text)
+        for candidate in self._pattern.finditer(text):
+            start = candidate.start()
+            stack = [(self._trie, start)]
+            while stack:
+                node, position = stack.pop()
+                boundary = node.get(self._BOUNDARY)
+                if boundary is not None:
+                    stack.append((boundary, position))
+                    stack.extend(
+                        (boundary, position + len(particle))
+                        for particle in PARTICLES if text.startswith(particle, position)
+                    )
+                if position >= text_length:
+                    continue
+                child = node.get(text[position])
+                if child is None:
+                    continue
+                key = child.get(self._END)
+                if key is not None and not (self.normalize and self._is_word_part(text, key, start, position + 1)):
+                    # 조사를 건너뛴 경로가 여럿이면 가장 짧은 매칭
+                    key_hits = hits.setdefault(key, {})
+                    key_hits[start] = min(key_hits.get(start, position + 1), position + 1)
+                stack.append((child, position + 1))
+        return {
+            key: [normalized.original_span(start, end) for start, end in sorted(key_hits.items())]
+            for key, key_hits in hits.items()
+        }
+
+    def _scan_windows(self, text: str, window_size: int) -> Dict[str, List[Tuple[int, int]]]:
+        """텍스트를 window_size 자씩 나눠 검색
+
+        창 경계에 걸친 매칭을 위해 다음 창과 max_span 만큼 겹치고, 정규화 시에는 공백/단어
+        경계 판단을 위해 창 앞 한 글자를 함께 읽는다.
+        """
+        hits = {}
+        overlap = max(0, self.max_span - 1)
+        lookbehind = 1 if self.normalize else 0
+        for window_start in range(0, len(text), window_size):
+            slice_start = max(0, window_start - lookbehind)
+            window = text[slice_start:window_start + window_size + overlap]
+            for key, spans in self._scan(self._normalized(window)).items():
+                # 겹친 구간에서 시작하는 매칭은 다음 창에서 찾는다
+                kept = [
+                    (slice_start + start, slice_start + end) for start, end in spans
+                    if window_start <= slice_start + start < window_start + window_size
+                ]
+                if kept:
+                    hits.setdefault(key, []).extend(kept)
+        return hits
+
+    def key(self, keyword: str) -> str:
+        """키워드의 매칭 키 (정규형)"""
+        key = self._keys.get(keyword)
+        if key is None:
+            key = keyword_key(keyword) if self.normalize else fold_case(keyword)
+        return key
+
+    def find_all(self, text: str, window_size: int = None) -> Dict[str, List[KeywordMatch]]:
+        """텍스트에서 카테고리별 키워드 매칭 검색
+
+        카테고리마다 키워드 목록 순서, 같은 키워드 안에서는 위치 순서로 정렬된다.
+        window_size 가 주어지면 텍스트 전체 사본을 만들지 않고 창 단위로 검색한다.
+        """
+        results = {category: [] for category in self.keywords_by_category}
+        if not text or self._pattern is None:
+            return results
+
+        if window_size and len(text) > window_size:
+            hits = self._scan_windows(text, window_size)
+        else:
+            hits = self._scan(self._normalized(text))
+
+        # 키별로 겹치지 않는 매칭만 남김 (re.finditer 와 동일한 동작)
+        non_overlapping = {}
+        for key, spans in hits.items():
+            kept = []
+            last_end = 0
+            for start, end in spans:
+                if start >= last_end:
+                    kept.append((start, end))
+                    last_end = end
+            non_overlapping[key] = kept
+
+        for category, keywords in self.keywords_by_category.items():
+            results[category] = self.category_matches(
+                keywords, lambda keyword: non_overlapping.get(self._keys[keyword], ())
+            )
+        return results
+
+    def category_matches(self, keywords: List[str], spans_of) -> List[KeywordMatch]:
+        """카테고리 키워드 순서대로 매칭 목록 구성
+
+        정규화로 서로 다른 키워드('세계최초', '세계 최초')가 원문의 같은 구간에 매칭되면
+        앞의 키워드만 남긴다. 키가 같은 중복 키워드는 그대로 둔다.
+        """
+        matches = []
+        claimed: Dict[Tuple[int, int], str] = {}
+        for keyword in keywords:
+            key = self.key(keyword)
+            for start, end in spans_of(keyword):
+                if claimed.setdefault((start, end), key) != key:
+                    continue
+                matches.append(KeywordMatch(keyword, start, end))
+        return matches
+
+    def keywords_matching(self, surface: str) -> List[str]:
+        """원문 조각 전체와 매칭되는 키워드 목록 (저장된 위반 구간의 키워드 복원용)"""
+        return [
+            match.keyword
+            for matches in self.find_all(surface).values()
+            for match in matches
+            if match.start == 0 and match.end == len(surface)
+        ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0004_guidelinedocument_guidelineupdate_compliancecategory_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='analysis_result',
+            field=models.JSONField(blank=True, null=True, verbose_name='전체 분석 결과'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='분석 완료일시'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='error_message',
+            field=models.TextField(blank=True, verbose_name='오류 메시지'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='분석 시작일시'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='status',
+            field=models.CharField(choices=[('pending', '대기 중'), ('running', '분석 중'), ('completed', '완료'), ('failed', '실패')], db_index=True, default='completed', max_length=20, verbose_name='분석 상태'),
+        ),
+        migrations.AlterField(
+            model_name='complianceanalysis',
+            name='compliance_status',
+            field=models.CharField(blank=True, choices=[('적합', '적합'), ('부분적합', '부분적합'), ('부적합', '부적합')], max_length=20, verbose_name='준수 상태'),
+        ),
+        migrations.AlterField(
+            model_name='complianceanalysis',
+            name='input_text',
+            field=models.TextField(blank=True, default='', verbose_name='입력 텍스트'),
+        ),
+        migrations.AlterField(
+            model_name='complianceanalysis',
+            name='overall_score',
+            field=models.IntegerField(default=0, verbose_name='전체 점수'),
+        ),
+        migrations.AlterField(
+            model_name='complianceanalysis',
+            name='risk_level',
+            field=models.CharField(blank=True, choices=[('low', '낮음'), ('medium', '보통'), ('high', '높음')], max_length=20, verbose_name='위험도'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0005_complianceanalysis_analysis_result_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='cache_hits',
+            field=models.PositiveIntegerField(default=0, verbose_name='캐시 적중 횟수'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, verbose_name='콘텐츠 해시'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='last_cache_hit_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='최근 캐시 적중일시'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='rule_version',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='규칙 스냅샷 버전'),
+        ),
+        migrations.AddIndex(
+            model_name='complianceanalysis',
+            index=models.Index(fields=['content_hash', 'rule_version'], name='analysis_cache_key_idx'),
+        ),
+    ]
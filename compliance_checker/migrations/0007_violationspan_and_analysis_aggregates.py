@@ -0,0 +1,67 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0006_complianceanalysis_cache_hits_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='high_severity_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='고위험 위반 수'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='low_severity_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='저위험 위반 수'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='medium_severity_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='중위험 위반 수'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='total_characters',
+            field=models.PositiveIntegerField(default=0, verbose_name='글자 수'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='total_sentences',
+            field=models.PositiveIntegerField(default=0, verbose_name='문장 수'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='total_words',
+            field=models.PositiveIntegerField(default=0, verbose_name='단어 수'),
+        ),
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='violation_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='위반 구간 수'),
+        ),
+        migrations.CreateModel(
+            name='ViolationSpan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(db_index=True, max_length=100, verbose_name='위반 카테고리')),
+                ('start', models.PositiveIntegerField(verbose_name='시작 위치')),
+                ('end', models.PositiveIntegerField(verbose_name='끝 위치')),
+                ('severity', models.CharField(choices=[('high', '고위험'), ('medium', '중위험'), ('low', '저위험')], max_length=20, verbose_name='심각도')),
+                ('analysis', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='violation_spans', to='compliance_checker.complianceanalysis', verbose_name='분석 결과')),
+                ('keyword', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='violation_spans', to='compliance_checker.compliancekeyword', verbose_name='키워드')),
+                ('rule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='violation_spans', to='compliance_checker.compliancerule', verbose_name='규칙')),
+            ],
+            options={
+                'verbose_name': '위반 구간',
+                'verbose_name_plural': '위반 구간들',
+                'ordering': ['analysis', 'id'],
+            },
+        ),
+    ]
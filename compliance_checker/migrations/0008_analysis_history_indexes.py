@@ -0,0 +1,86 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:39
+
+import logging
+
+from django.db import migrations, models, transaction
+
+logger = logging.getLogger(__name__)
+
+TRIGRAM_INDEX = 'analysis_input_text_trgm_idx'
+
+
+def fill_has_ai_improvements(apps, schema_editor):
+    """기존 분석 결과의 AI 개선 방안 여부 채우기 (models.result_has_ai_improvements 와 같은 기준)"""
+    def has_ai_improvements(result):
+        if result.get('ai_improvements'):
+            return True
+        return any(
+            isinstance(violation, dict) and violation.get('ai_improvements')
+            for violation in result.get('violations') or []
+        )
+
+    ComplianceAnalysis = apps.get_model('compliance_checker', 'ComplianceAnalysis')
+    flagged = []
+    analyses = ComplianceAnalysis.objects.filter(analysis_result__isnull=False).only('id', 'analysis_result')
+    for analysis in analyses.iterator(chunk_size=500):
+        if isinstance(analysis.analysis_result, dict) and has_ai_improvements(analysis.analysis_result):
+            flagged.append(analysis.id)
+    for start in range(0, len(flagged), 500):
+        ComplianceAnalysis.objects.filter(id__in=flagged[start:start + 500]).update(has_ai_improvements=True)
+
+
+def create_trigram_index(apps, schema_editor):
+    """PostgreSQL 이면 pg_trgm 으로 본문 부분 문자열 검색 인덱스 생성
+
+    Django 의 icontains 는 UPPER(컬럼) LIKE UPPER(검색어) 로 변환되므로 같은 식에 인덱스를
+    건다. 확장을 만들 권한이 없거나 다른 DB 이면 건너뛰고 기존 순차 검색을 쓴다.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = apps.get_model('compliance_checker', 'ComplianceAnalysis')._meta.db_table
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON {table} USING gin (UPPER(input_text) gin_trgm_ops)'
+            )
+    except Exception as e:
+        logger.warning(f"pg_trgm 인덱스를 만들지 못해 건너뜁니다: {e}")
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRIGRAM_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0007_violationspan_and_analysis_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complianceanalysis',
+            name='has_ai_improvements',
+            field=models.BooleanField(default=False, verbose_name='AI 개선 방안 여부'),
+        ),
+        migrations.AddIndex(
+            model_name='complianceanalysis',
+            index=models.Index(fields=['-created_at'], name='analysis_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complianceanalysis',
+            index=models.Index(fields=['risk_level', '-created_at'], name='analysis_risk_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complianceanalysis',
+            index=models.Index(fields=['compliance_status', '-created_at'], name='analysis_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complianceanalysis',
+            index=models.Index(fields=['input_type', '-created_at'], name='analysis_type_created_idx'),
+        ),
+        migrations.RunPython(fill_has_ai_improvements, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
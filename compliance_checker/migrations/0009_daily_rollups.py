@@ -0,0 +1,58 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0008_analysis_history_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAnalysisRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('input_type', models.CharField(max_length=10, verbose_name='입력 타입')),
+                ('risk_level', models.CharField(max_length=20, verbose_name='위험도')),
+                ('compliance_status', models.CharField(max_length=20, verbose_name='준수 상태')),
+                ('analysis_count', models.PositiveIntegerField(default=0, verbose_name='분석 수')),
+                ('score_sum', models.BigIntegerField(default=0, verbose_name='점수 합계')),
+                ('violation_count', models.PositiveIntegerField(default=0, verbose_name='위반 구간 수')),
+                ('high_severity_count', models.PositiveIntegerField(default=0, verbose_name='고위험 위반 수')),
+                ('medium_severity_count', models.PositiveIntegerField(default=0, verbose_name='중위험 위반 수')),
+                ('low_severity_count', models.PositiveIntegerField(default=0, verbose_name='저위험 위반 수')),
+            ],
+            options={
+                'verbose_name': '일별 분석 집계',
+                'verbose_name_plural': '일별 분석 집계들',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyViolationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('category', models.CharField(max_length=100, verbose_name='위반 카테고리')),
+                ('severity', models.CharField(max_length=20, verbose_name='심각도')),
+                ('violation_count', models.PositiveIntegerField(default=0, verbose_name='위반 구간 수')),
+                ('analysis_count', models.PositiveIntegerField(default=0, verbose_name='위반이 있는 분석 수')),
+            ],
+            options={
+                'verbose_name': '일별 위반 집계',
+                'verbose_name_plural': '일별 위반 집계들',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyviolationrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'category', 'severity'), name='daily_violation_rollup_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyanalysisrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'input_type', 'risk_level', 'compliance_status'), name='daily_analysis_rollup_key'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0009_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='compliancerule',
+            name='density_weight',
+            field=models.FloatField(default=0.0, verbose_name='1,000자당 위반 밀도 차감'),
+        ),
+        migrations.AddField(
+            model_name='compliancerule',
+            name='footer_weight',
+            field=models.FloatField(default=0.0, verbose_name='꼬리말 위반당 추가 차감'),
+        ),
+        migrations.AddField(
+            model_name='compliancerule',
+            name='headline_weight',
+            field=models.FloatField(default=0.0, verbose_name='머리말 위반당 추가 차감'),
+        ),
+        migrations.AddField(
+            model_name='compliancerule',
+            name='match_weight',
+            field=models.FloatField(default=0.0, verbose_name='추가 위반당 차감'),
+        ),
+        migrations.AddField(
+            model_name='compliancerule',
+            name='max_deduction',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='최대 차감'),
+        ),
+        migrations.AddField(
+            model_name='compliancerule',
+            name='score_weight',
+            field=models.FloatField(default=1.0, verbose_name='기본 차감 배수'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0010_rule_scoring_weights'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReevaluationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', '대기 중'), ('running', '실행 중'), ('completed', '완료'), ('failed', '실패')], default='pending', max_length=20, verbose_name='작업 상태')),
+                ('rule_version', models.BigIntegerField(blank=True, null=True, verbose_name='규칙 스냅샷 버전')),
+                ('include_current', models.BooleanField(default=False, verbose_name='현재 버전 분석 포함')),
+                ('processed_count', models.PositiveIntegerField(default=0, verbose_name='검사한 분석 수')),
+                ('changed_count', models.PositiveIntegerField(default=0, verbose_name='결과가 바뀐 분석 수')),
+                ('status_changed_count', models.PositiveIntegerField(default=0, verbose_name='준수 상태가 바뀐 분석 수')),
+                ('failed_count', models.PositiveIntegerField(default=0, verbose_name='실패한 분석 수')),
+                ('status_changes', models.JSONField(default=list, verbose_name='준수 상태 변경 내역')),
+                ('error_message', models.TextField(blank=True, verbose_name='오류 메시지')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작일시')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='완료일시')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+            ],
+            options={
+                'verbose_name': '분석 재평가 작업',
+                'verbose_name_plural': '분석 재평가 작업들',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
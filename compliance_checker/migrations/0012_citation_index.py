@@ -0,0 +1,50 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0011_analysis_reevaluation_runs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CitationSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_type', models.CharField(choices=[('law_file', '법령 파일'), ('guideline', '의료 가이드라인'), ('document', '가이드라인 문서')], max_length=20, verbose_name='원문 유형')),
+                ('source_key', models.CharField(max_length=255, verbose_name='원문 키')),
+                ('title', models.CharField(max_length=255, verbose_name='제목')),
+                ('content_hash', models.CharField(max_length=64, verbose_name='내용 해시')),
+                ('passage_count', models.PositiveIntegerField(default=0, verbose_name='문단 수')),
+                ('indexed_at', models.DateTimeField(auto_now=True, verbose_name='색인일시')),
+            ],
+            options={
+                'verbose_name': '인용 원문',
+                'verbose_name_plural': '인용 원문들',
+                'ordering': ['source_type', 'title'],
+                'unique_together': {('source_type', 'source_key')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CitationPassage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ordinal', models.PositiveIntegerField(verbose_name='문단 순서')),
+                ('start', models.PositiveIntegerField(verbose_name='시작 위치')),
+                ('end', models.PositiveIntegerField(verbose_name='끝 위치')),
+                ('text', models.TextField(verbose_name='문단 내용')),
+                ('length', models.PositiveIntegerField(verbose_name='용어 수')),
+                ('term_counts', models.JSONField(default=dict, verbose_name='용어 빈도')),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='passages', to='compliance_checker.citationsource', verbose_name='원문')),
+            ],
+            options={
+                'verbose_name': '인용 문단',
+                'verbose_name_plural': '인용 문단들',
+                'ordering': ['source', 'ordinal'],
+            },
+        ),
+    ]
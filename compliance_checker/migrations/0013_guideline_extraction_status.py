@@ -0,0 +1,45 @@
+# Generated by Django 4.2.23 on 2026-10-17 04:02
+
+from django.db import migrations, models
+
+
+def mark_existing_extracted(apps, schema_editor):
+    """기존 가이드라인은 업로드 요청 중에 추출을 마쳤으므로 완료로 표시"""
+    MedicalGuideline = apps.get_model('compliance_checker', 'MedicalGuideline')
+    MedicalGuideline.objects.update(extraction_status='completed', extraction_progress=100)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0012_citation_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medicalguideline',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='파일 해시'),
+        ),
+        migrations.AddField(
+            model_name='medicalguideline',
+            name='extracted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='추출 완료일시'),
+        ),
+        migrations.AddField(
+            model_name='medicalguideline',
+            name='extraction_error',
+            field=models.TextField(blank=True, verbose_name='추출 오류'),
+        ),
+        migrations.AddField(
+            model_name='medicalguideline',
+            name='extraction_progress',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='추출 진행률(%)'),
+        ),
+        migrations.AddField(
+            model_name='medicalguideline',
+            name='extraction_status',
+            field=models.CharField(choices=[('pending', '대기 중'), ('running', '추출 중'), ('completed', '완료'), ('failed', '실패')], default='pending', max_length=20, verbose_name='추출 상태'),
+        ),
+        migrations.RunPython(mark_existing_extracted, migrations.RunPython.noop),
+    ]
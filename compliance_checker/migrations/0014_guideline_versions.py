@@ -0,0 +1,90 @@
+# Generated by Django 4.2.23 on 2026-10-17 04:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+# 버전 저장 형식 함수만 사용 (모델은 이 시점의 스키마로 조회)
+from compliance_checker.guideline_versions import content_hash, encode_delta, encode_snapshot
+
+# COMPLIANCE_GUIDELINE_SNAPSHOT_INTERVAL 기본값
+SNAPSHOT_INTERVAL = 20
+
+
+def move_history_to_versions(apps, schema_editor):
+    """업데이트 이력의 전체 내용 사본을 문서별 버전(스냅샷 + 변경 목록)으로 옮기고 사본 비우기"""
+    GuidelineDocument = apps.get_model('compliance_checker', 'GuidelineDocument')
+    GuidelineUpdate = apps.get_model('compliance_checker', 'GuidelineUpdate')
+    GuidelineVersion = apps.get_model('compliance_checker', 'GuidelineVersion')
+
+    for document in GuidelineDocument.objects.all().iterator():
+        versions = []
+
+        def add_version(text, created_at):
+            if versions and versions[-1][0].content_hash == content_hash(text):
+                return versions[-1][0]
+            number = len(versions) + 1
+            payload, is_snapshot = encode_snapshot(text), True
+            if versions and (number - 1) % SNAPSHOT_INTERVAL:
+                delta = encode_delta(versions[-1][1], text)
+                if len(delta) < len(payload):
+                    payload, is_snapshot = delta, False
+            version = GuidelineVersion.objects.create(
+                document_id=document.id, version=number, is_snapshot=is_snapshot, payload=payload,
+                content_hash=content_hash(text), content_length=len(text), created_at=created_at
+            )
+            versions.append((version, text))
+            return version
+
+        for update in GuidelineUpdate.objects.filter(document_id=document.id).order_by('created_at', 'id'):
+            previous_version = None
+            if update.update_type == 'content_update' and update.previous_content:
+                previous_version = add_version(update.previous_content, update.created_at)
+            elif versions:
+                previous_version = versions[-1][0]
+            version = add_version(update.new_content, update.created_at) if update.new_content else previous_version
+            GuidelineUpdate.objects.filter(id=update.id).update(
+                previous_version=previous_version, version=version, previous_content='', new_content=''
+            )
+        add_version(document.content or '', document.updated_at)
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0013_guideline_extraction_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GuidelineVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(verbose_name='버전')),
+                ('is_snapshot', models.BooleanField(default=False, verbose_name='전체 내용 저장 여부')),
+                ('payload', models.BinaryField(verbose_name='저장 데이터')),
+                ('content_hash', models.CharField(max_length=64, verbose_name='내용 해시')),
+                ('content_length', models.PositiveIntegerField(default=0, verbose_name='내용 길이')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='생성일시')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='versions', to='compliance_checker.guidelinedocument', verbose_name='문서')),
+            ],
+            options={
+                'verbose_name': '가이드라인 버전',
+                'verbose_name_plural': '가이드라인 버전들',
+                'ordering': ['document', '-version'],
+                'unique_together': {('document', 'version')},
+            },
+        ),
+        migrations.AddField(
+            model_name='guidelineupdate',
+            name='previous_version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='compliance_checker.guidelineversion', verbose_name='이전 버전'),
+        ),
+        migrations.AddField(
+            model_name='guidelineupdate',
+            name='version',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updates', to='compliance_checker.guidelineversion', verbose_name='새 버전'),
+        ),
+        migrations.RunPython(move_history_to_versions, migrations.RunPython.noop),
+    ]
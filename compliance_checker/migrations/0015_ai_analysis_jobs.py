@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-17 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0014_guideline_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aianalysisresult',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='문서 내용 해시'),
+        ),
+        migrations.AddField(
+            model_name='aianalysisresult',
+            name='error_message',
+            field=models.TextField(blank=True, verbose_name='오류 메시지'),
+        ),
+        migrations.AddField(
+            model_name='aianalysisresult',
+            name='status',
+            field=models.CharField(choices=[('pending', '대기 중'), ('running', '분석 중'), ('completed', '완료'), ('failed', '실패')], default='completed', max_length=20, verbose_name='분석 상태'),
+        ),
+        migrations.AlterField(
+            model_name='aianalysisresult',
+            name='analysis_result',
+            field=models.JSONField(default=dict, verbose_name='분석 결과'),
+        ),
+    ]
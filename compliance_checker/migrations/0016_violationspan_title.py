@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-17 06:10
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_span_titles(apps, schema_editor):
+    """규칙이 남아 있는 기존 위반 구간에 규칙 제목 기록"""
+    ComplianceRule = apps.get_model('compliance_checker', 'ComplianceRule')
+    ViolationSpan = apps.get_model('compliance_checker', 'ViolationSpan')
+    ViolationSpan.objects.filter(rule__isnull=False).update(
+        title=Subquery(ComplianceRule.objects.filter(id=OuterRef('rule_id')).values('title')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0015_ai_analysis_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='violationspan',
+            name='title',
+            field=models.CharField(blank=True, max_length=200, verbose_name='규칙 제목'),
+        ),
+        migrations.RunPython(fill_span_titles, migrations.RunPython.noop),
+    ]
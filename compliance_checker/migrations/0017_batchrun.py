@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-17 04:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0016_violationspan_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', '대기 중'), ('running', '실행 중'), ('completed', '완료'), ('failed', '실패')], default='pending', max_length=20, verbose_name='작업 상태')),
+                ('enable_ai', models.BooleanField(default=False, verbose_name='AI 개선 방안 생성')),
+                ('total_count', models.PositiveIntegerField(default=0, verbose_name='전체 항목 수')),
+                ('processed_count', models.PositiveIntegerField(default=0, verbose_name='처리한 항목 수')),
+                ('completed_count', models.PositiveIntegerField(default=0, verbose_name='분석한 항목 수')),
+                ('failed_count', models.PositiveIntegerField(default=0, verbose_name='실패한 항목 수')),
+                ('analysis_ids', models.JSONField(default=list, verbose_name='생성된 분석 ID')),
+                ('items', models.JSONField(default=list, verbose_name='항목별 결과')),
+                ('error_message', models.TextField(blank=True, verbose_name='오류 메시지')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작일시')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='완료일시')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+            ],
+            options={
+                'verbose_name': '일괄 분석 작업',
+                'verbose_name_plural': '일괄 분석 작업들',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
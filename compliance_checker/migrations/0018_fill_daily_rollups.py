@@ -0,0 +1,50 @@
+# Generated by Django 4.2.23 on 2026-10-17 09:20
+
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_rollups(apps, schema_editor):
+    """기존 분석과 위반 구간으로 일별 집계를 다시 계산 (rollups.rebuild_rollups 와 같은 집계)
+
+    집계 컬럼과 위반 구간이 아직 비어 있는 이전 분석은 backfill_violation_spans 명령이 채우면서
+    바뀐 만큼 집계에 반영한다.
+    """
+    ComplianceAnalysis = apps.get_model('compliance_checker', 'ComplianceAnalysis')
+    ViolationSpan = apps.get_model('compliance_checker', 'ViolationSpan')
+    DailyAnalysisRollup = apps.get_model('compliance_checker', 'DailyAnalysisRollup')
+    DailyViolationRollup = apps.get_model('compliance_checker', 'DailyViolationRollup')
+
+    analysis_rows = ComplianceAnalysis.objects.filter(status='completed') \
+        .annotate(date=TruncDate('created_at')) \
+        .values('date', 'input_type', 'risk_level', 'compliance_status').annotate(
+            analysis_count=Count('id'),
+            score_sum=Sum('overall_score'),
+            violation_count=Sum('violation_count'),
+            high_severity_count=Sum('high_severity_count'),
+            medium_severity_count=Sum('medium_severity_count'),
+            low_severity_count=Sum('low_severity_count')
+        ).order_by()
+    violation_rows = ViolationSpan.objects.filter(analysis__status='completed') \
+        .annotate(date=TruncDate('analysis__created_at')) \
+        .values('date', 'category', 'severity').annotate(
+            violation_count=Count('id'),
+            analysis_count=Count('analysis_id', distinct=True)
+        ).order_by()
+
+    DailyAnalysisRollup.objects.all().delete()
+    DailyViolationRollup.objects.all().delete()
+    DailyAnalysisRollup.objects.bulk_create([DailyAnalysisRollup(**row) for row in analysis_rows], batch_size=500)
+    DailyViolationRollup.objects.bulk_create([DailyViolationRollup(**row) for row in violation_rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0017_batchrun'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_daily_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-17 04:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0018_fill_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medicalguideline',
+            name='extraction_started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='추출 시작일시'),
+        ),
+    ]
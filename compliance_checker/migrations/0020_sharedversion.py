@@ -0,0 +1,25 @@
+# Generated by Django 4.2.23 on 2026-10-17 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance_checker', '0019_medicalguideline_extraction_started_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SharedVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='이름')),
+                ('version', models.BigIntegerField(verbose_name='버전')),
+            ],
+            options={
+                'verbose_name': '공유 버전',
+                'verbose_name_plural': '공유 버전들',
+            },
+        ),
+    ]
@@ -20,6 +20,15 @@ class ComplianceRule(models.Model):
     legal_basis = models.TextField(verbose_name="법적 근거")
     improvement_guide = models.TextField(verbose_name="개선 가이드")
     is_active = models.BooleanField(default=True, verbose_name="활성화 여부")
+    
+    # 점수 계산 가중치 (scoring.WeightedScoringEngine, 기본값이면 심각도별 고정 차감 25/15/10)
+    score_weight = models.FloatField(default=1.0, verbose_name="기본 차감 배수")
+    match_weight = models.FloatField(default=0.0, verbose_name="추가 위반당 차감")
+    density_weight = models.FloatField(default=0.0, verbose_name="1,000자당 위반 밀도 차감")
+    headline_weight = models.FloatField(default=0.0, verbose_name="머리말 위반당 추가 차감")
+    footer_weight = models.FloatField(default=0.0, verbose_name="꼬리말 위반당 추가 차감")
+    max_deduction = models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="최대 차감")
+    
     created_at = models.DateTimeField(default=timezone.now, verbose_name="생성일시")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일시")
     
@@ -108,11 +117,36 @@ class MedicalLawInfo(models.Model):
     def __str__(self):
         return f"{self.get_category_display()} - {self.title}"
 
+# 분석 결과 JSON 에 저장하지 않는 필드 (원문과 위반 구간 행에서 violation_store.hydrate_result 로 다시 만든다)
+UNSTORED_RESULT_FIELDS = ('detailed_violations', 'extracted_text')
+
+def stored_result(result):
+    """분석 결과에서 저장하지 않는 필드를 뺀 사본"""
+    return {key: value for key, value in result.items() if key not in UNSTORED_RESULT_FIELDS}
+
+def result_has_ai_improvements(result) -> bool:
+    """분석 결과에 AI 개선 방안이 있는지 여부 (위반 항목에 붙은 개선 방안 포함)"""
+    if not result:
+        return False
+    if result.get('ai_improvements'):
+        return True
+    return any(
+        isinstance(violation, dict) and violation.get('ai_improvements')
+        for violation in result.get('violations') or []
+    )
+
 class ComplianceAnalysis(models.Model):
     """의료광고법 준수 분석 결과 모델"""
     
+    STATUS_CHOICES = [
+        ('pending', '대기 중'),
+        ('running', '분석 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+    ]
+    
     # 입력 정보
-    input_text = models.TextField(verbose_name="입력 텍스트")
+    input_text = models.TextField(blank=True, default='', verbose_name="입력 텍스트")
     input_type = models.CharField(
         max_length=20, 
         choices=[
@@ -126,9 +160,10 @@ class ComplianceAnalysis(models.Model):
     url = models.URLField(blank=True, null=True, verbose_name="URL")
     
     # 분석 결과
-    overall_score = models.IntegerField(verbose_name="전체 점수")
+    overall_score = models.IntegerField(default=0, verbose_name="전체 점수")
     compliance_status = models.CharField(
         max_length=20,
+        blank=True,
         choices=[
             ('적합', '적합'),
             ('부분적합', '부분적합'),
@@ -138,6 +173,7 @@ class ComplianceAnalysis(models.Model):
     )
     risk_level = models.CharField(
         max_length=20,
+        blank=True,
         choices=[
             ('low', '낮음'),
             ('medium', '보통'),
@@ -149,6 +185,29 @@ class ComplianceAnalysis(models.Model):
     # 위반 항목 (JSON 형태로 저장)
     violations = models.JSONField(default=list, verbose_name="위반 항목")
     recommendations = models.JSONField(default=list, verbose_name="개선 권장사항")
+    analysis_result = models.JSONField(blank=True, null=True, verbose_name="전체 분석 결과")
+    
+    # 분석 작업 상태 (비동기 분석 시 대기 중 → 분석 중 → 완료/실패)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='completed', db_index=True, verbose_name="분석 상태")
+    error_message = models.TextField(blank=True, verbose_name="오류 메시지")
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name="분석 시작일시")
+    completed_at = models.DateTimeField(blank=True, null=True, verbose_name="분석 완료일시")
+    
+    # 결과 캐시 (정규화된 텍스트 해시 + 규칙 스냅샷 버전)
+    content_hash = models.CharField(max_length=64, blank=True, verbose_name="콘텐츠 해시")
+    rule_version = models.BigIntegerField(blank=True, null=True, verbose_name="규칙 스냅샷 버전")
+    cache_hits = models.PositiveIntegerField(default=0, verbose_name="캐시 적중 횟수")
+    last_cache_hit_at = models.DateTimeField(blank=True, null=True, verbose_name="최근 캐시 적중일시")
+    
+    # 집계 값 (결과 페이지/리포트/통계에서 분석 결과 JSON 을 읽지 않도록 저장)
+    violation_count = models.PositiveIntegerField(default=0, verbose_name="위반 구간 수")
+    high_severity_count = models.PositiveIntegerField(default=0, verbose_name="고위험 위반 수")
+    medium_severity_count = models.PositiveIntegerField(default=0, verbose_name="중위험 위반 수")
+    low_severity_count = models.PositiveIntegerField(default=0, verbose_name="저위험 위반 수")
+    total_characters = models.PositiveIntegerField(default=0, verbose_name="글자 수")
+    total_words = models.PositiveIntegerField(default=0, verbose_name="단어 수")
+    total_sentences = models.PositiveIntegerField(default=0, verbose_name="문장 수")
+    has_ai_improvements = models.BooleanField(default=False, verbose_name="AI 개선 방안 여부")
     
     # 메타데이터
     created_at = models.DateTimeField(default=timezone.now, verbose_name="생성일시")
@@ -158,13 +217,269 @@ class ComplianceAnalysis(models.Model):
         verbose_name = "준수 분석 결과"
         verbose_name_plural = "준수 분석 결과들"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['content_hash', 'rule_version'], name='analysis_cache_key_idx'),
+            # 히스토리/대시보드의 최신순 목록과 필터별 최신순 목록
+            models.Index(fields=['-created_at'], name='analysis_created_idx'),
+            models.Index(fields=['risk_level', '-created_at'], name='analysis_risk_created_idx'),
+            models.Index(fields=['compliance_status', '-created_at'], name='analysis_status_created_idx'),
+            models.Index(fields=['input_type', '-created_at'], name='analysis_type_created_idx'),
+        ]
     
     def __str__(self):
+        if self.status != 'completed':
+            return f"{self.get_status_display()} ({self.created_at.strftime('%Y-%m-%d %H:%M')})"
         return f"{self.compliance_status} - {self.overall_score}점 ({self.created_at.strftime('%Y-%m-%d %H:%M')})"
+    
+    @property
+    def is_finished(self):
+        """분석 작업 종료 여부 (완료 또는 실패)"""
+        return self.status in ('completed', 'failed')
+    
+    def apply_result(self, result):
+        """분석기 결과를 반영하고 완료 상태로 변경 (저장은 호출자가 수행)
+
+        상세 위반 정보와 원문은 위반 구간 행, input_text 와 중복되므로 결과 JSON 에 저장하지 않는다.
+        """
+        self.overall_score = result['overall_score']
+        self.compliance_status = result['compliance_status']
+        self.risk_level = result['risk_level']
+        self.violations = result['violations']
+        self.recommendations = result['recommendations']
+        self.analysis_result = stored_result(result)
+        text_analysis = result.get('text_analysis') or {}
+        self.total_characters = text_analysis.get('total_characters', 0)
+        self.total_words = text_analysis.get('total_words', 0)
+        self.total_sentences = text_analysis.get('total_sentences', 0)
+        self.has_ai_improvements = result_has_ai_improvements(result)
+        self.status = 'completed'
+        self.error_message = ''
+        self.completed_at = timezone.now()
+
+class ViolationSpan(models.Model):
+    """분석 결과의 위반 구간 (규칙, 키워드, 원문 위치)
+
+    결과 페이지, 상세 리포트, 통계가 분석 결과 JSON 대신 조회하는 정규화된 행이다.
+    문맥 문자열은 저장하지 않고 필요할 때 원문(input_text)에서 만든다.
+    """
+    
+    analysis = models.ForeignKey(ComplianceAnalysis, on_delete=models.CASCADE, related_name='violation_spans', verbose_name="분석 결과")
+    rule = models.ForeignKey(ComplianceRule, on_delete=models.SET_NULL, blank=True, null=True, related_name='violation_spans', verbose_name="규칙")
+    keyword = models.ForeignKey(ComplianceKeyword, on_delete=models.SET_NULL, blank=True, null=True, related_name='violation_spans', verbose_name="키워드")
+    category = models.CharField(max_length=100, db_index=True, verbose_name="위반 카테고리")
+    # 규칙이 다시 로드되어 rule 이 비어도 현재 규칙을 (카테고리, 제목)으로 찾기 위한 키
+    title = models.CharField(max_length=200, blank=True, verbose_name="규칙 제목")
+    start = models.PositiveIntegerField(verbose_name="시작 위치")
+    end = models.PositiveIntegerField(verbose_name="끝 위치")
+    severity = models.CharField(
+        max_length=20,
+        choices=[
+            ('high', '고위험'),
+            ('medium', '중위험'),
+            ('low', '저위험'),
+        ],
+        verbose_name="심각도"
+    )
+    
+    class Meta:
+        verbose_name = "위반 구간"
+        verbose_name_plural = "위반 구간들"
+        # 저장 순서 = 분석 결과의 상세 위반 순서
+        ordering = ['analysis', 'id']
+    
+    def __str__(self):
+        return f"{self.category} [{self.start}:{self.end}]"
+
+class DailyAnalysisRollup(models.Model):
+    """일별·입력 유형별·위험도별·준수 상태별 완료된 분석 집계
+
+    분석이 저장/삭제될 때 증감하고, rebuild_analysis_rollups 명령이 원본에서 다시 계산한다.
+    대시보드와 통계 API 는 분석 테이블 대신 이 표를 읽는다.
+    """
+
+    date = models.DateField(verbose_name="날짜")
+    input_type = models.CharField(max_length=10, verbose_name="입력 타입")
+    risk_level = models.CharField(max_length=20, verbose_name="위험도")
+    compliance_status = models.CharField(max_length=20, verbose_name="준수 상태")
+    analysis_count = models.PositiveIntegerField(default=0, verbose_name="분석 수")
+    score_sum = models.BigIntegerField(default=0, verbose_name="점수 합계")
+    violation_count = models.PositiveIntegerField(default=0, verbose_name="위반 구간 수")
+    high_severity_count = models.PositiveIntegerField(default=0, verbose_name="고위험 위반 수")
+    medium_severity_count = models.PositiveIntegerField(default=0, verbose_name="중위험 위반 수")
+    low_severity_count = models.PositiveIntegerField(default=0, verbose_name="저위험 위반 수")
+
+    class Meta:
+        verbose_name = "일별 분석 집계"
+        verbose_name_plural = "일별 분석 집계들"
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'input_type', 'risk_level', 'compliance_status'],
+                name='daily_analysis_rollup_key'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.input_type}/{self.risk_level}/{self.compliance_status}: {self.analysis_count}건"
+
+class DailyViolationRollup(models.Model):
+    """일별·위반 카테고리별·심각도별 위반 집계"""
+
+    date = models.DateField(verbose_name="날짜")
+    category = models.CharField(max_length=100, verbose_name="위반 카테고리")
+    severity = models.CharField(max_length=20, verbose_name="심각도")
+    violation_count = models.PositiveIntegerField(default=0, verbose_name="위반 구간 수")
+    analysis_count = models.PositiveIntegerField(default=0, verbose_name="위반이 있는 분석 수")
+
+    class Meta:
+        verbose_name = "일별 위반 집계"
+        verbose_name_plural = "일별 위반 집계들"
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'category', 'severity'], name='daily_violation_rollup_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.category}({self.severity}): {self.violation_count}건"
+
+class ReevaluationRun(models.Model):
+    """저장된 분석을 새 규칙 스냅샷으로 다시 검사한 작업 기록"""
+
+    STATUS_CHOICES = [
+        ('pending', '대기 중'),
+        ('running', '실행 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="작업 상태")
+    rule_version = models.BigIntegerField(blank=True, null=True, verbose_name="규칙 스냅샷 버전")
+    include_current = models.BooleanField(default=False, verbose_name="현재 버전 분석 포함")
+    processed_count = models.PositiveIntegerField(default=0, verbose_name="검사한 분석 수")
+    changed_count = models.PositiveIntegerField(default=0, verbose_name="결과가 바뀐 분석 수")
+    status_changed_count = models.PositiveIntegerField(default=0, verbose_name="준수 상태가 바뀐 분석 수")
+    failed_count = models.PositiveIntegerField(default=0, verbose_name="실패한 분석 수")
+    # [{'analysis_id', 'from', 'to', 'score_from', 'score_to'}, ...]
+    status_changes = models.JSONField(default=list, verbose_name="준수 상태 변경 내역")
+    error_message = models.TextField(blank=True, verbose_name="오류 메시지")
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name="시작일시")
+    completed_at = models.DateTimeField(blank=True, null=True, verbose_name="완료일시")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일시")
+
+    class Meta:
+        verbose_name = "분석 재평가 작업"
+        verbose_name_plural = "분석 재평가 작업들"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"재평가 {self.get_status_display()} - {self.processed_count}건 중 {self.changed_count}건 변경"
+
+class BatchRun(models.Model):
+    """일괄 분석 API 로 접수한 작업 기록 (백그라운드 워커 풀에서 실행)"""
+
+    STATUS_CHOICES = [
+        ('pending', '대기 중'),
+        ('running', '실행 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="작업 상태")
+    enable_ai = models.BooleanField(default=False, verbose_name="AI 개선 방안 생성")
+    total_count = models.PositiveIntegerField(default=0, verbose_name="전체 항목 수")
+    processed_count = models.PositiveIntegerField(default=0, verbose_name="처리한 항목 수")
+    completed_count = models.PositiveIntegerField(default=0, verbose_name="분석한 항목 수")
+    failed_count = models.PositiveIntegerField(default=0, verbose_name="실패한 항목 수")
+    analysis_ids = models.JSONField(default=list, verbose_name="생성된 분석 ID")
+    # [{'analysis_id', 'input_type', 'reference', 'status', 'overall_score', 'risk_level', 'error'}, ...]
+    items = models.JSONField(default=list, verbose_name="항목별 결과")
+    error_message = models.TextField(blank=True, verbose_name="오류 메시지")
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name="시작일시")
+    completed_at = models.DateTimeField(blank=True, null=True, verbose_name="완료일시")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일시")
+
+    class Meta:
+        verbose_name = "일괄 분석 작업"
+        verbose_name_plural = "일괄 분석 작업들"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"일괄 분석 {self.get_status_display()} - {self.total_count}건 중 {self.processed_count}건 처리"
+
+class SharedVersion(models.Model):
+    """여러 워커·호스트가 함께 보는 캐시 무효화 버전 (규칙 스냅샷, 인용 색인)
+
+    컨테이너마다 따로인 파일 캐시 대신 데이터베이스에 두어 다른 호스트와 재배포 후에도
+    같은 버전을 본다. 변경 시 F('version') + 1 로 증가한다 (versions.py 참고).
+    """
+
+    name = models.CharField(max_length=100, unique=True, verbose_name="이름")
+    version = models.BigIntegerField(verbose_name="버전")
+
+    class Meta:
+        verbose_name = "공유 버전"
+        verbose_name_plural = "공유 버전들"
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+class CitationSource(models.Model):
+    """인용 검색 색인에 들어간 원문 (법령 파일, 의료 가이드라인, 가이드라인 문서)"""
+
+    SOURCE_TYPE_CHOICES = [
+        ('law_file', '법령 파일'),
+        ('guideline', '의료 가이드라인'),
+        ('document', '가이드라인 문서'),
+    ]
+
+    source_type = models.CharField(max_length=20, choices=SOURCE_TYPE_CHOICES, verbose_name="원문 유형")
+    # 법령 파일은 파일 이름, 가이드라인/문서는 모델 ID
+    source_key = models.CharField(max_length=255, verbose_name="원문 키")
+    title = models.CharField(max_length=255, verbose_name="제목")
+    content_hash = models.CharField(max_length=64, verbose_name="내용 해시")
+    passage_count = models.PositiveIntegerField(default=0, verbose_name="문단 수")
+    indexed_at = models.DateTimeField(auto_now=True, verbose_name="색인일시")
+
+    class Meta:
+        verbose_name = "인용 원문"
+        verbose_name_plural = "인용 원문들"
+        ordering = ['source_type', 'title']
+        unique_together = ['source_type', 'source_key']
+
+    def __str__(self):
+        return f"{self.get_source_type_display()} - {self.title} ({self.passage_count}개 문단)"
+
+class CitationPassage(models.Model):
+    """인용 검색 단위 문단과 BM25 색인용 용어 빈도"""
+
+    source = models.ForeignKey(CitationSource, on_delete=models.CASCADE, related_name='passages',
+                               verbose_name="원문")
+    ordinal = models.PositiveIntegerField(verbose_name="문단 순서")
+    start = models.PositiveIntegerField(verbose_name="시작 위치")
+    end = models.PositiveIntegerField(verbose_name="끝 위치")
+    text = models.TextField(verbose_name="문단 내용")
+    length = models.PositiveIntegerField(verbose_name="용어 수")
+    # {용어: 문단 안 출현 횟수}
+    term_counts = models.JSONField(default=dict, verbose_name="용어 빈도")
+
+    class Meta:
+        verbose_name = "인용 문단"
+        verbose_name_plural = "인용 문단들"
+        ordering = ['source', 'ordinal']
+
+    def __str__(self):
+        return f"{self.source.title} #{self.ordinal}"
 
 class MedicalGuideline(models.Model):
     """의료법/광고법 가이드라인 문서 모델"""
     
+    EXTRACTION_STATUS_CHOICES = [
+        ('pending', '대기 중'),
+        ('running', '추출 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+    ]
+    
     title = models.CharField(max_length=255, verbose_name="제목")
     category = models.CharField(
         max_length=50,
@@ -193,6 +508,17 @@ class MedicalGuideline(models.Model):
     uploaded_at = models.DateTimeField(default=timezone.now, verbose_name="업로드일시")
     is_active = models.BooleanField(default=True, verbose_name="활성화 여부")
     
+    # 텍스트 추출 작업 상태 (업로드 후 대기 중 → 추출 중 → 완료/실패)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, verbose_name="파일 해시")
+    extraction_status = models.CharField(
+        max_length=20, choices=EXTRACTION_STATUS_CHOICES, default='pending', verbose_name="추출 상태"
+    )
+    extraction_progress = models.PositiveSmallIntegerField(default=0, verbose_name="추출 진행률(%)")
+    extraction_error = models.TextField(blank=True, verbose_name="추출 오류")
+    # 추출 작업이 이 파일 해시를 맡은(running 으로 바꾼) 시각 (제한 시간 초과 판단용)
+    extraction_started_at = models.DateTimeField(blank=True, null=True, verbose_name="추출 시작일시")
+    extracted_at = models.DateTimeField(blank=True, null=True, verbose_name="추출 완료일시")
+    
     class Meta:
         verbose_name = "의료 가이드라인"
         verbose_name_plural = "의료 가이드라인들"
@@ -246,6 +572,32 @@ class GuidelineDocument(models.Model):
     def category_display(self):
         return self.get_category_display()
 
+class GuidelineVersion(models.Model):
+    """가이드라인 문서 내용의 버전
+
+    주기적으로 전체 내용(스냅샷)을 저장하고 그 사이 버전은 직전 버전과의 줄 단위 차이만
+    압축해 저장한다. 내용 복원과 버전 간 비교는 guideline_versions 모듈에서 한다.
+    """
+
+    document = models.ForeignKey('GuidelineDocument', on_delete=models.CASCADE, related_name='versions',
+                                 verbose_name="문서")
+    version = models.PositiveIntegerField(verbose_name="버전")
+    is_snapshot = models.BooleanField(default=False, verbose_name="전체 내용 저장 여부")
+    # 스냅샷은 zlib 압축한 전체 내용, 나머지는 zlib 압축한 직전 버전 대비 줄 단위 변경 목록(JSON)
+    payload = models.BinaryField(verbose_name="저장 데이터")
+    content_hash = models.CharField(max_length=64, verbose_name="내용 해시")
+    content_length = models.PositiveIntegerField(default=0, verbose_name="내용 길이")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="생성일시")
+
+    class Meta:
+        verbose_name = "가이드라인 버전"
+        verbose_name_plural = "가이드라인 버전들"
+        ordering = ['document', '-version']
+        unique_together = ['document', 'version']
+
+    def __str__(self):
+        return f"{self.document_id} v{self.version}{' (스냅샷)' if self.is_snapshot else ''}"
+
 class GuidelineUpdate(models.Model):
     """가이드라인 업데이트 이력 모델"""
     
@@ -260,6 +612,11 @@ class GuidelineUpdate(models.Model):
         ],
         verbose_name="업데이트 유형"
     )
+    # 내용은 버전 저장소에 보관 (아래 두 필드는 버전 저장소 도입 전 이력 호환용으로만 남김)
+    previous_version = models.ForeignKey(GuidelineVersion, on_delete=models.SET_NULL, blank=True, null=True,
+                                         related_name='+', verbose_name="이전 버전")
+    version = models.ForeignKey(GuidelineVersion, on_delete=models.SET_NULL, blank=True, null=True,
+                                related_name='updates', verbose_name="새 버전")
     previous_content = models.TextField(blank=True, verbose_name="이전 내용")
     new_content = models.TextField(blank=True, verbose_name="새 내용")
     update_reason = models.TextField(blank=True, verbose_name="업데이트 사유")
@@ -277,6 +634,13 @@ class GuidelineUpdate(models.Model):
 class AIAnalysisResult(models.Model):
     """AI 분석 결과 모델"""
     
+    STATUS_CHOICES = [
+        ('pending', '대기 중'),
+        ('running', '분석 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+    ]
+    
     document = models.ForeignKey(GuidelineDocument, on_delete=models.CASCADE, related_name='ai_analyses', verbose_name="문서")
     analysis_type = models.CharField(
         max_length=50,
@@ -288,11 +652,16 @@ class AIAnalysisResult(models.Model):
         ],
         verbose_name="분석 유형"
     )
-    analysis_result = models.JSONField(verbose_name="분석 결과")
+    analysis_result = models.JSONField(default=dict, verbose_name="분석 결과")
     ai_model_used = models.CharField(max_length=100, verbose_name="사용된 AI 모델")
     processing_time = models.FloatField(blank=True, null=True, verbose_name="처리 시간(초)")
     created_at = models.DateTimeField(default=timezone.now, verbose_name="분석일시")
     
+    # 분석 작업 상태와 결과 캐시 키 (문서 내용 해시 + 분석 유형 + 모델)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='completed', verbose_name="분석 상태")
+    error_message = models.TextField(blank=True, verbose_name="오류 메시지")
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, verbose_name="문서 내용 해시")
+    
     class Meta:
         verbose_name = "AI 분석 결과"
         verbose_name_plural = "AI 분석 결과들"
@@ -0,0 +1,168 @@
+import re
+import unicodedata
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Optional, Tuple
+
+# 키워드 안의 어절 경계 표시 (정규형 키워드에서만 사용, 이 자리에는 조사가 없거나 하나 올 수 있음)
+BOUNDARY = '\x00'
+
+# 어절 끝 조사 (긴 것부터 비교)
+PARTICLES = (
+    '에서', '에게', '으로', '까지', '부터', '보다', '처럼', '만큼',
+    '은', '는', '이', '가', '을', '를', '의', '에', '로', '와', '과', '도', '만'
+)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+# 한글 음절 사이 공백 (정규형에서 제거)
+_HANGUL_GAP_RE = re.compile(r'(?<=[가-힣])\s+(?=[가-힣])')
+# 한글 음절 사이가 아닌 공백 구간 (정규형에서 공백 하나)
+_WHITESPACE_RUN_RE = re.compile(r'(?<![가-힣\s])\s+|(?<=[가-힣])\s+(?![가-힣\s])')
+# 결합 문자/조합형 중성·종성
+_COMBINING = '\u0300-\u036f\u1160-\u11ff\u3099\u309a'
+# NFKC 로 바뀔 수 있는 결합 단위 (ASCII·완성형 음절이 아닌 문자, 또는 결합 문자가 붙은 문자)
+_NFKC_CANDIDATE_RE = re.compile(
+    rf'(?:[^\x00-\x7f가-힣]|[\x00-\x7f가-힣](?=[{_COMBINING}]))[{_COMBINING}]*', re.DOTALL
+)
+
+
+def fold_case(text: str) -> str:
+    """대소문자 무시 비교용 문자열 생성 (문자 위치는 그대로 유지)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # 'İ' 처럼 소문자 변환 시 길이가 달라지는 문자는 원문 그대로 둔다
+    folded = []
+    for char in text:
+        lower_char = char.lower()
+        folded.append(lower_char if len(lower_char) == 1 else char)
+    return ''.join(folded)
+
+
+def is_hangul_syllable(char: str) -> bool:
+    return '가' <= char <= '힣'
+
+
+class OffsetMap:
+    """정규형 위치 → 변환 전 위치 대응표
+
+    변환 전 텍스트에서 바뀐 구간(원문 시작, 원문 끝, 바뀐 뒤 길이) 목록만 저장한다. 바뀌지
+    않은 글자는 앞선 변경의 길이 차이만큼 옮겨 글자 단위로, 바뀐 구간(합친 공백, NFKC 로
+    바뀐 문자)은 구간 전체로 대응한다. 글자마다 위치를 저장하지 않으므로 대용량 문서에서도
+    변경 수만큼만 메모리를 쓴다.
+    """
+
+    __slots__ = ('_edits', '_shifts', '_canonical_starts', '_canonical_ends')
+
+    def __init__(self, edits: List[Tuple[int, int, int]]):
+        self._edits = edits
+        # 각 변경 앞까지 줄어든 길이 누계
+        self._shifts = list(accumulate((end - start - length for start, end, length in edits), initial=0))
+        self._canonical_starts = [start - shift for (start, _, _), shift in zip(edits, self._shifts)]
+        self._canonical_ends = [
+            canonical_start + length for canonical_start, (_, _, length) in zip(self._canonical_starts, edits)
+        ]
+
+    def span(self, start: int, end: int) -> Tuple[int, int]:
+        """정규형 구간 [start, end) 에 대응하는 변환 전 구간"""
+        return self._position(start, False), self._position(end - 1, True)
+
+    def _position(self, position: int, after: bool) -> int:
+        index = bisect_right(self._canonical_ends, position)
+        if index < len(self._edits) and self._canonical_starts[index] <= position:
+            original_start, original_end, _ = self._edits[index]
+            return original_end if after else original_start
+        return position + self._shifts[index] + (1 if after else 0)
+
+
+class NormalizedText:
+    """텍스트의 정규형과 원문 위치 대응
+
+    정규형은 NFKC 정규화(전각 문자, 호환 자모, 조합형 자모 → 완성형 음절), 대소문자 접기,
+    한글 음절 사이 공백 제거, 나머지 연속 공백을 공백 하나로 합치기를 적용한 문자열이다.
+    '세계최초' 와 '세계 최초' 는 같은 정규형 '세계최초' 가 된다.
+    """
+
+    __slots__ = ('text', '_maps')
+
+    def __init__(self, text: str, maps: List[OffsetMap]):
+        self.text = text
+        # 마지막 변환부터 거꾸로 적용
+        self._maps = maps
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """정규형 구간 [start, end) 의 원문 구간"""
+        for offset_map in self._maps:
+            start, end = offset_map.span(start, end)
+        return start, end
+
+
+def _compose(text: str) -> Tuple[str, Optional[OffsetMap]]:
+    """NFKC 정규화 (이미 정규형이면 대응표 없이 그대로 반환)
+
+    ASCII 와 완성형 한글 음절은 NFKC 로 바뀌지 않으므로 그 밖의 문자(와 결합 문자가 붙은
+    문자)만 결합 단위로 변환한다.
+    """
+    if unicodedata.is_normalized('NFKC', text):
+        return text, None
+
+    edits = []
+    pieces = []
+    position = 0
+    for cluster in _NFKC_CANDIDATE_RE.finditer(text):
+        normalized = unicodedata.normalize('NFKC', cluster.group())
+        if normalized == cluster.group():
+            continue
+        start, end = cluster.span()
+        pieces.append(text[position:start])
+        pieces.append(normalized)
+        edits.append((start, end, len(normalized)))
+        position = end
+    pieces.append(text[position:])
+    return ''.join(pieces), OffsetMap(edits)
+
+
+def _collapse_whitespace(text: str) -> Tuple[str, OffsetMap]:
+    """한글 음절 사이 공백 제거, 나머지 연속 공백은 공백 하나로"""
+    span = re.Match.span
+    gaps = [(start, end, 0) for start, end in map(span, _HANGUL_GAP_RE.finditer(text))]
+    runs = [(start, end, 1) for start, end in map(span, _WHITESPACE_RUN_RE.finditer(text))]
+    return _WHITESPACE_RE.sub(' ', _HANGUL_GAP_RE.sub('', text)), OffsetMap(sorted(gaps + runs))
+
+
+def normalize_korean(text: str) -> NormalizedText:
+    """텍스트의 정규형과 원문 위치 대응 생성 (분석당 한 번)"""
+    composed, compose_map = _compose(text)
+    canonical, whitespace_map = _collapse_whitespace(fold_case(composed))
+    maps = [whitespace_map]
+    if compose_map is not None:
+        maps.append(compose_map)
+    return NormalizedText(canonical, maps)
+
+
+def strip_particle(token: str) -> str:
+    """어절 끝 조사 제거 (조사를 떼어도 두 음절 이상 남는 한글 어절만)"""
+    for particle in PARTICLES:
+        stem = token[:-len(particle)]
+        if token.endswith(particle) and len(stem) >= 2 and all(is_hangul_syllable(char) for char in stem[-2:]):
+            return stem
+    return token
+
+
+def keyword_key(keyword: str) -> str:
+    """키워드의 정규형 (매처 트라이 키)
+
+    텍스트와 같은 정규화를 적용하고, 한글 어절 사이에는 BOUNDARY 를 넣는다. 마지막이
+    아닌 어절의 끝 조사는 떼어 내므로 '부작용이 없는' 은 '부작용 없는', '부작용없는',
+    '부작용이 없는' 과 모두 매칭된다.
+    """
+    tokens = [token for token in (normalize_korean(token).text for token in keyword.split()) if token]
+    key = ''
+    for index, token in enumerate(tokens):
+        if index < len(tokens) - 1:
+            token = strip_particle(token)
+        if key:
+            joined_hangul = is_hangul_syllable(key[-1]) and is_hangul_syllable(token[0])
+            key += BOUNDARY if joined_hangul else ' '
+        key += token
+    return key
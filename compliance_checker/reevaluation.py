@@ -0,0 +1,205 @@
+import copy
+import logging
+from typing import Callable, Dict, List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .batch import _reanalyze_item, analysis_pool, default_workers
+from .incremental import previous_improvements
+from .jobs import submit_job
+from .models import ComplianceAnalysis, ReevaluationRun, ViolationSpan, stored_result
+from .rollups import record_changes
+from .snapshot import get_rule_snapshot
+from .violation_store import create_spans, get_span_resolver, hydrate_result
+
+logger = logging.getLogger(__name__)
+
+# 재분석 결과가 바뀐 분석에서 갱신하는 컬럼
+RESULT_FIELDS = [
+    'overall_score', 'compliance_status', 'risk_level', 'violations', 'recommendations', 'analysis_result',
+    'total_characters', 'total_words', 'total_sentences', 'has_ai_improvements',
+    'violation_count', 'high_severity_count', 'medium_severity_count', 'low_severity_count',
+    'rule_version'
+]
+
+
+def _carry_over_improvements(previous_result: Dict, result: Dict):
+    """이전 결과의 AI 개선 방안 중 새 결과의 상세 위반 앞 3건과 맞는 항목을 옮김
+
+    재평가는 AI 를 호출하지 않으므로 위반 유형·키워드·문맥이 그대로인 개선 방안만 유지한다.
+    """
+    from .ai import improvement_cache_key
+
+    known = previous_improvements(previous_result) if previous_result else {}
+    if not known:
+        return
+    result['ai_improvements'] = [
+        known[key] for key in (
+            improvement_cache_key(violation) for violation in (result.get('detailed_violations') or [])[:3]
+        ) if key in known
+    ]
+
+
+class Reevaluation:
+    """완료된 분석의 원문을 현재 규칙 스냅샷으로 다시 검사하고 바뀐 결과를 저장
+
+    분석 테이블을 ID 순 키셋 페이지로 읽어 페이지마다 프로세스 풀에서 재분석하고,
+    결과가 바뀐 분석만 bulk_update 와 위반 구간 교체로 저장한다. 결과가 같은 분석은
+    규칙 스냅샷 버전만 갱신하므로 중단 후 다시 실행하면 남은 분석부터 이어서 처리한다.
+    """
+
+    def __init__(self, workers: int = None, batch_size: int = None, include_current: bool = False,
+                 progress: Callable[[Dict], None] = None):
+        self.workers = workers or default_workers()
+        self.batch_size = max(1, batch_size or getattr(settings, 'COMPLIANCE_REEVALUATION_BATCH_SIZE', 500))
+        self.include_current = include_current
+        self.progress = progress
+        self.snapshot = get_rule_snapshot()
+        self.resolver = get_span_resolver(self.snapshot)
+        self.processed = 0
+        self.changed = 0
+        self.failed = 0
+        self.status_changes: List[Dict] = []
+
+    def queryset(self):
+        queryset = ComplianceAnalysis.objects.filter(status='completed')
+        if not self.include_current:
+            queryset = queryset.filter(Q(rule_version__isnull=True) | ~Q(rule_version=self.snapshot.version))
+        return queryset.only(
+            'id', 'input_text', 'input_type', 'created_at', 'status', 'overall_score', 'compliance_status',
+            'risk_level', 'analysis_result', 'completed_at',
+            'violation_count', 'high_severity_count', 'medium_severity_count', 'low_severity_count'
+        )
+
+    def run(self) -> 'Reevaluation':
+        logger.info(f"분석 재평가 시작: 규칙 스냅샷 버전 {self.snapshot.version}, 워커 {self.workers}개")
+        queryset = self.queryset()
+        last_id = 0
+        with analysis_pool(self.snapshot, self.workers) as run:
+            while True:
+                page = list(queryset.filter(id__gt=last_id).order_by('id')[:self.batch_size])
+                if not page:
+                    break
+                last_id = page[-1].id
+                items = [{'id': analysis.id, 'text': analysis.input_text, 'input_type': analysis.input_type}
+                         for analysis in page]
+                outcomes = {outcome['id']: outcome for outcome in run(_reanalyze_item, items)}
+                self._save_page(page, outcomes)
+                if self.progress:
+                    self.progress(self.summary())
+
+        logger.info(f"분석 재평가 완료: {self.processed}건 중 {self.changed}건 변경, {self.failed}건 실패")
+        return self
+
+    def _save_page(self, page: List[ComplianceAnalysis], outcomes: Dict[int, Dict]):
+        changed = []
+        previous_states = []
+        unchanged_ids = []
+        for analysis in page:
+            outcome = outcomes.get(analysis.id) or {}
+            result = outcome.get('result')
+            if result is None:
+                self.failed += 1
+                continue
+
+            previous = analysis.analysis_result
+            if previous and previous.get('ai_improvements'):
+                # 개선 방안은 상세 위반 앞 3건과 짝을 지으므로 저장된 위반 구간에서 3건만 만든다
+                _carry_over_improvements(hydrate_result(analysis, previous, detail_limit=3), result)
+            if stored_result(result) == previous:
+                unchanged_ids.append(analysis.id)
+                continue
+
+            before = (analysis.compliance_status, analysis.overall_score)
+            previous_states.append(copy.copy(analysis))
+            completed_at = analysis.completed_at
+            analysis.apply_result(result)
+            # 재평가는 분석 완료 시각을 바꾸지 않음
+            analysis.completed_at = completed_at
+            analysis.rule_version = self.snapshot.version
+            analysis._violation_spans = self.resolver.apply(analysis, analysis.input_text, result)
+            changed.append(analysis)
+            if analysis.compliance_status != before[0]:
+                self.status_changes.append({
+                    'analysis_id': analysis.id,
+                    'from': before[0],
+                    'to': analysis.compliance_status,
+                    'score_from': before[1],
+                    'score_to': analysis.overall_score
+                })
+
+        with transaction.atomic():
+            if unchanged_ids:
+                ComplianceAnalysis.objects.filter(id__in=unchanged_ids).update(rule_version=self.snapshot.version)
+            if changed:
+                # 일별 집계는 바뀐 분석의 이전 값을 빼고 새 값을 더함 (이전 위반 구간은 교체 전에 셈)
+                record_changes(previous_states, changed)
+                ComplianceAnalysis.objects.bulk_update(changed, RESULT_FIELDS, batch_size=100)
+                ViolationSpan.objects.filter(analysis_id__in=[analysis.id for analysis in changed]).delete()
+                create_spans((analysis, analysis._violation_spans) for analysis in changed)
+
+        self.processed += len(page)
+        self.changed += len(changed)
+
+    def summary(self) -> Dict:
+        return {
+            'rule_version': self.snapshot.version,
+            'processed': self.processed,
+            'changed': self.changed,
+            'status_changed': len(self.status_changes),
+            'failed': self.failed
+        }
+
+
+def reevaluate_analyses(workers: int = None, batch_size: int = None, include_current: bool = False,
+                        progress: Callable[[Dict], None] = None) -> Reevaluation:
+    """완료된 분석을 현재 규칙 스냅샷으로 재평가 (동기 실행)"""
+    return Reevaluation(workers, batch_size, include_current, progress).run()
+
+
+def run_reevaluation_job(run_id: int):
+    """재평가 작업 기록(ReevaluationRun)을 실행하고 진행 상황과 결과를 저장"""
+    run = ReevaluationRun.objects.get(id=run_id)
+    run.status = 'running'
+    run.started_at = timezone.now()
+    run.save(update_fields=['status', 'started_at'])
+
+    def progress(summary: Dict):
+        ReevaluationRun.objects.filter(id=run_id).update(
+            rule_version=summary['rule_version'],
+            processed_count=summary['processed'],
+            changed_count=summary['changed'],
+            status_changed_count=summary['status_changed'],
+            failed_count=summary['failed']
+        )
+
+    try:
+        reevaluation = reevaluate_analyses(include_current=run.include_current, progress=progress)
+    except Exception as e:
+        logger.exception(f"분석 재평가 작업 실패 (작업 ID {run_id})")
+        ReevaluationRun.objects.filter(id=run_id).update(
+            status='failed', error_message=str(e), completed_at=timezone.now()
+        )
+        raise
+
+    summary = reevaluation.summary()
+    ReevaluationRun.objects.filter(id=run_id).update(
+        status='completed',
+        rule_version=summary['rule_version'],
+        processed_count=summary['processed'],
+        changed_count=summary['changed'],
+        status_changed_count=summary['status_changed'],
+        failed_count=summary['failed'],
+        status_changes=reevaluation.status_changes,
+        completed_at=timezone.now()
+    )
+
+
+def submit_reevaluation(include_current: bool = False) -> ReevaluationRun:
+    """재평가 작업 기록을 만들고 백그라운드 워커 풀에 제출"""
+    run = ReevaluationRun.objects.create(include_current=include_current)
+    transaction.on_commit(lambda: submit_job(run_reevaluation_job, run.id))
+    return run
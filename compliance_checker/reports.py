@@ -0,0 +1,323 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from .models import ComplianceAnalysis
+
+logger = logging.getLogger(__name__)
+
+# 레이아웃이나 문구를 바꾸면 올려서 이전에 만든 리포트 캐시를 무효화한다
+REPORT_TEMPLATE_VERSION = 1
+
+REPORT_DIR = 'reports'
+
+# COMPLIANCE_REPORT_FONT_PATH 가 없을 때 찾아보는 한글 글꼴 (TTF/OTF)
+# Dockerfile/nixpacks.toml 은 fonts-nanum 패키지로 첫 번째 경로에 설치한다
+FONT_CANDIDATES = [
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/nanum/NanumGothic.ttf',
+    '/Library/Fonts/NanumGothic.ttf',
+    os.path.join(str(settings.BASE_DIR), 'fonts', 'NanumGothic.ttf'),
+]
+
+SEVERITY_LABELS = {'high': '고위험', 'medium': '중위험', 'low': '저위험'}
+RISK_LABELS = {'high': '높음', 'medium': '보통', 'low': '낮음'}
+INPUT_TYPE_LABELS = {'text': '텍스트', 'file': '파일', 'url': 'URL'}
+
+# 글자 크기, 줄 높이, 글자색 (RGB)
+STYLES = {
+    'title': (18, 10, (33, 37, 41)),
+    'heading': (13, 8, (13, 110, 253)),
+    'label': (10, 6, (73, 80, 87)),
+    'body': (10, 6, (33, 37, 41)),
+    'small': (8, 5, (108, 117, 125)),
+}
+
+
+def resolve_font_path() -> Optional[str]:
+    """리포트에 포함할 한글 글꼴 경로 (없으면 None)"""
+    configured = getattr(settings, 'COMPLIANCE_REPORT_FONT_PATH', '')
+    if configured:
+        if os.path.exists(configured):
+            return configured
+        logger.warning(f"리포트 글꼴 파일이 없습니다: {configured}")
+    return next((path for path in FONT_CANDIDATES if os.path.exists(path)), None)
+
+
+def _font_fingerprint(font_path: Optional[str]) -> str:
+    if not font_path:
+        return 'core'
+    stat = os.stat(font_path)
+    return f"{os.path.basename(font_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def report_key(analysis: ComplianceAnalysis, font_path: Optional[str] = None) -> str:
+    """리포트 내용을 결정하는 값들의 해시 (같으면 같은 PDF)"""
+    payload = json.dumps([
+        REPORT_TEMPLATE_VERSION,
+        _font_fingerprint(font_path),
+        analysis.id,
+        analysis.content_hash,
+        analysis.rule_version,
+        analysis.completed_at.isoformat() if analysis.completed_at else None,
+        analysis.overall_score,
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def report_path(key: str) -> str:
+    return f"{REPORT_DIR}/{key[:2]}/{key}.pdf"
+
+
+def build_report_context(analysis: ComplianceAnalysis) -> Dict:
+    """저장된 분석 결과에서 리포트에 쓸 값만 추린 사전"""
+    from .violation_store import span_contexts
+
+    detail_limit = getattr(settings, 'COMPLIANCE_REPORT_DETAIL_LIMIT', 100)
+    spans = list(analysis.violation_spans.select_related('keyword')[:detail_limit])
+    contexts = span_contexts(analysis.input_text, spans)
+    ai_improvements = ComplianceAnalysis.objects.filter(id=analysis.id).values_list(
+        'analysis_result__ai_improvements', flat=True
+    ).first() or []
+
+    return {
+        'analysis_id': analysis.id,
+        'analysis_date': analysis.created_at.strftime('%Y년 %m월 %d일 %H:%M'),
+        'input_type': INPUT_TYPE_LABELS.get(analysis.input_type, analysis.input_type),
+        'source': analysis.url or analysis.file_name or '',
+        'overall_score': analysis.overall_score,
+        'compliance_status': analysis.compliance_status,
+        'risk_level': RISK_LABELS.get(analysis.risk_level, analysis.risk_level),
+        'violation_count': analysis.violation_count,
+        'severity_counts': [
+            (SEVERITY_LABELS['high'], analysis.high_severity_count),
+            (SEVERITY_LABELS['medium'], analysis.medium_severity_count),
+            (SEVERITY_LABELS['low'], analysis.low_severity_count),
+        ],
+        'violations': [
+            {
+                'title': f"{violation.get('category', '')} - {violation.get('title', '')}",
+                'severity': SEVERITY_LABELS.get(violation.get('severity'), violation.get('severity', '')),
+                'count': violation.get('count', 1),
+                'legal_basis': violation.get('legal_basis', ''),
+                'penalty': violation.get('penalty', ''),
+            }
+            for violation in analysis.violations or [] if isinstance(violation, dict)
+        ],
+        'details': [
+            {
+                'keyword': span.keyword.keyword if span.keyword else analysis.input_text[span.start:span.end],
+                'category': span.category,
+                'severity': SEVERITY_LABELS.get(span.severity, span.severity),
+                'context': context,
+            }
+            for span, context in zip(spans, contexts)
+        ],
+        'omitted_details': max(0, analysis.violation_count - len(spans)),
+        'recommendations': [
+            {
+                'title': f"{recommendation.get('category', '')} - {recommendation.get('title', '')}",
+                'guide': recommendation.get('guide', ''),
+                'fixes': [fix for fix in recommendation.get('suggested_fixes') or [] if isinstance(fix, str)],
+            }
+            for recommendation in analysis.recommendations or [] if isinstance(recommendation, dict)
+        ],
+        'ai_improvements': [
+            {
+                'title': f"{improvement.get('violation_category', '')} - '{improvement.get('violation_keyword', '')}'",
+                'sentence': (improvement.get('suggestions') or {}).get('improved_sentence', ''),
+                'notes': (improvement.get('suggestions') or {}).get('legal_compliance_notes', ''),
+            }
+            for improvement in ai_improvements if isinstance(improvement, dict)
+        ],
+    }
+
+
+class ReportRenderer:
+    """분석 리포트 PDF 렌더러 (fpdf2)
+
+    한글 글꼴(TTF/OTF)을 문서에 포함하며, fpdf2 가 실제로 쓴 글자만 남기도록 서브셋한다.
+    글꼴을 찾지 못하면 기본 글꼴로 만들고 표현할 수 없는 글자는 '?' 로 바꾼다.
+    """
+
+    def __init__(self, font_path: Optional[str] = None):
+        self.font_path = font_path
+
+    def _new_document(self, title: str):
+        from fpdf import FPDF
+
+        pdf = FPDF(format='A4')
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.set_title(title)
+        if self.font_path:
+            pdf.add_font('report', '', self.font_path)
+            self._family = 'report'
+        else:
+            # 기본 글꼴은 한글을 표시할 수 없어 한글이 모두 '?' 로 바뀐다
+            logger.error("리포트용 한글 글꼴을 찾을 수 없어 PDF 의 한글이 '?' 로 표시됩니다. "
+                         "fonts-nanum 을 설치하거나 COMPLIANCE_REPORT_FONT_PATH 를 설정하세요.")
+            self._family = 'helvetica'
+        pdf.add_page()
+        return pdf
+
+    def _text(self, text) -> str:
+        text = str(text or '')
+        if self.font_path:
+            return text
+        return text.encode('latin-1', 'replace').decode('latin-1')
+
+    def _write(self, pdf, style: str, text, indent: float = 0):
+        from fpdf.enums import XPos, YPos
+
+        size, line_height, color = STYLES[style]
+        pdf.set_font(self._family, size=size)
+        pdf.set_text_color(*color)
+        pdf.set_x(pdf.l_margin + indent)
+        pdf.multi_cell(pdf.epw - indent, line_height, self._text(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def _heading(self, pdf, text: str):
+        pdf.ln(4)
+        self._write(pdf, 'heading', text)
+        pdf.set_draw_color(*STYLES['heading'][2])
+        pdf.line(pdf.l_margin, pdf.get_y(), pdf.l_margin + pdf.epw, pdf.get_y())
+        pdf.ln(2)
+
+    def _summary(self, pdf, context: Dict):
+        self._heading(pdf, '검토 요약')
+        self._write(pdf, 'body', f"준수 점수: {context['overall_score']}/100")
+        self._write(pdf, 'body', f"준수 상태: {context['compliance_status']}    위험도: {context['risk_level']}")
+        severity = ', '.join(f"{label} {count}건" for label, count in context['severity_counts'])
+        self._write(pdf, 'body', f"위반 구간: {context['violation_count']}건 ({severity})")
+
+    def _violations(self, pdf, context: Dict):
+        self._heading(pdf, f"위반 항목 ({len(context['violations'])}건)")
+        if not context['violations']:
+            self._write(pdf, 'body', '위반 항목이 없습니다.')
+        for violation in context['violations']:
+            self._write(pdf, 'label', f"{violation['title']} [{violation['severity']}, {violation['count']}회]")
+            if violation['legal_basis']:
+                self._write(pdf, 'body', f"법적 근거: {violation['legal_basis']}", indent=4)
+            if violation['penalty']:
+                self._write(pdf, 'body', f"처벌: {violation['penalty']}", indent=4)
+
+    def _details(self, pdf, context: Dict):
+        if not context['details']:
+            return
+        self._heading(pdf, '위반 위치')
+        for detail in context['details']:
+            self._write(pdf, 'label', f"'{detail['keyword']}' - {detail['category']} [{detail['severity']}]")
+            self._write(pdf, 'body', detail['context'], indent=4)
+        if context['omitted_details']:
+            self._write(pdf, 'small', f"외 {context['omitted_details']}건은 결과 페이지에서 확인하세요.")
+
+    def _recommendations(self, pdf, context: Dict):
+        self._heading(pdf, f"개선 권장사항 ({len(context['recommendations'])}건)")
+        for recommendation in context['recommendations']:
+            self._write(pdf, 'label', recommendation['title'])
+            if recommendation['guide']:
+                self._write(pdf, 'body', recommendation['guide'], indent=4)
+            for fix in recommendation['fixes']:
+                self._write(pdf, 'body', f"- {fix}", indent=8)
+
+    def _ai_improvements(self, pdf, context: Dict):
+        if not context['ai_improvements']:
+            return
+        self._heading(pdf, 'AI 개선 방안')
+        for improvement in context['ai_improvements']:
+            self._write(pdf, 'label', improvement['title'])
+            if improvement['sentence']:
+                self._write(pdf, 'body', f"개선 문장: {improvement['sentence']}", indent=4)
+            if improvement['notes']:
+                self._write(pdf, 'small', improvement['notes'], indent=4)
+
+    # 리포트 구성 순서 (제목 다음)
+    SECTIONS = ('_summary', '_violations', '_details', '_recommendations', '_ai_improvements')
+
+    def render(self, context: Dict, creation_date=None) -> bytes:
+        title = '의료광고법 준수 검토 리포트'
+        pdf = self._new_document(title)
+        if creation_date:
+            # 같은 내용이면 같은 파일이 되도록 생성 시각을 분석 완료 시각으로 고정
+            pdf.set_creation_date(creation_date)
+        self._write(pdf, 'title', title)
+        self._write(pdf, 'small', f"분석 ID {context['analysis_id']} | 분석일시: {context['analysis_date']} | "
+                                  f"입력 유형: {context['input_type']}")
+        if context['source']:
+            self._write(pdf, 'small', f"출처: {context['source']}")
+
+        for section in self.SECTIONS:
+            getattr(self, section)(pdf, context)
+
+        pdf.ln(6)
+        self._write(pdf, 'small', '본 리포트는 2025년 의료법 및 의료광고법 기준으로 생성되었습니다.')
+        return bytes(pdf.output())
+
+
+def render_report(analysis: ComplianceAnalysis, font_path: Optional[str] = None) -> bytes:
+    return ReportRenderer(font_path).render(build_report_context(analysis), analysis.completed_at)
+
+
+def _store_report(analysis_id: int, key: str, font_path: Optional[str]) -> str:
+    path = report_path(key)
+    if not default_storage.exists(path):
+        analysis = ComplianceAnalysis.objects.get(id=analysis_id)
+        default_storage.save(path, ContentFile(render_report(analysis, font_path)))
+        logger.info(f"리포트 생성: 분석 ID {analysis_id} → {path}")
+    return path
+
+
+# 생성 중인 리포트 (같은 리포트를 동시에 여러 번 만들지 않도록)
+_pending: Dict[str, Future] = {}
+_pending_lock = threading.Lock()
+
+
+def _submit_report(analysis_id: int, key: str, font_path: Optional[str]) -> Future:
+    from .jobs import submit_job
+
+    with _pending_lock:
+        future = _pending.get(key)
+        if future is None:
+            future = submit_job(_store_report, analysis_id, key, font_path)
+            if not future.done():
+                _pending[key] = future
+                future.add_done_callback(lambda _: _discard_pending(key))
+    return future
+
+
+def _discard_pending(key: str):
+    with _pending_lock:
+        _pending.pop(key, None)
+
+
+def get_report(analysis: ComplianceAnalysis) -> Dict:
+    """분석 리포트 조회 (없으면 생성)
+
+    이미 만든 리포트는 저장소에서 바로 돌려준다. 위반 구간이
+    COMPLIANCE_REPORT_BACKGROUND_THRESHOLD 이상이면 백그라운드 작업으로 만들고
+    'pending' 상태를 돌려준다.
+
+    Returns:
+        {'status': 'ready', 'path': 저장 경로} 또는 {'status': 'pending'}
+    """
+    font_path = resolve_font_path()
+    key = report_key(analysis, font_path)
+    path = report_path(key)
+    if default_storage.exists(path):
+        return {'status': 'ready', 'path': path}
+
+    threshold = getattr(settings, 'COMPLIANCE_REPORT_BACKGROUND_THRESHOLD', 200)
+    if threshold and analysis.violation_count >= threshold:
+        future = _submit_report(analysis.id, key, font_path)
+        if not future.done():
+            return {'status': 'pending'}
+        return {'status': 'ready', 'path': future.result()}
+
+    return {'status': 'ready', 'path': _store_report(analysis.id, key, font_path)}
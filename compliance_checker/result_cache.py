@@ -0,0 +1,158 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ComplianceAnalysis
+from .rollups import record_analyses
+from .violation_store import SpanResolver, get_span_resolver, hydrate_result, store_violation_spans
+
+logger = logging.getLogger(__name__)
+
+# 캐시 적중 결과 (원본 분석 ID, 상세 위반 정보를 채운 분석 결과)
+CachedResult = namedtuple('CachedResult', ['analysis_id', 'result'])
+
+# 캐시 키 형식 버전 (공백을 정리해 만들던 이전 키와 겹치지 않도록 해시 입력에 포함)
+CACHE_KEY_VERSION = 2
+
+
+def compute_content_hash(text: str, source_type: str = 'text') -> str:
+    """입력 텍스트 그대로와 입력 유형의 SHA-256 해시
+
+    캐시 적중 시 저장된 결과의 위반 위치·문맥·원문을 그대로 돌려주므로 공백이나 유니코드
+    정규형만 달라도 글자 위치가 바뀌는 텍스트는 같은 키로 보지 않는다.
+    """
+    payload = f"v{CACHE_KEY_VERSION}\n{source_type}\n{text or ''}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultLRU:
+    """프로세스 내 분석 결과 LRU 캐시
+
+    키는 (콘텐츠 해시, 규칙 스냅샷 버전) 이므로 규칙이 바뀌면 이전 항목은 더 이상
+    조회되지 않고 자연스럽게 밀려난다.
+    """
+
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int]) -> Optional[CachedResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple[str, int], entry: CachedResult):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_result_lru = ResultLRU(getattr(settings, 'COMPLIANCE_RESULT_CACHE_SIZE', 128))
+
+
+def get_result_lru() -> ResultLRU:
+    return _result_lru
+
+
+def record_cache_hit(analysis_id: int):
+    """원본 분석의 캐시 적중 횟수 기록"""
+    ComplianceAnalysis.objects.filter(id=analysis_id).update(
+        cache_hits=F('cache_hits') + 1,
+        last_cache_hit_at=timezone.now()
+    )
+
+
+def lookup_result(text: str, source_type: str, rule_version: int) -> Optional[CachedResult]:
+    """같은 텍스트·규칙 버전으로 완료된 분석 결과 조회 (LRU → DB 순)"""
+    key = (compute_content_hash(text, source_type), rule_version)
+    cached = _result_lru.get(key)
+    if cached is None:
+        analysis = ComplianceAnalysis.objects.filter(
+            content_hash=key[0],
+            rule_version=rule_version,
+            status='completed',
+            analysis_result__isnull=False
+        ).order_by('-created_at').only('id', 'input_text', 'analysis_result').first()
+        if analysis is None:
+            return None
+        cached = CachedResult(analysis.id, hydrate_result(analysis))
+        _result_lru.put(key, cached)
+
+    record_cache_hit(cached.analysis_id)
+    logger.debug(f"분석 결과 캐시 적중: 분석 ID {cached.analysis_id}")
+    return cached
+
+
+def remember_result(analysis: ComplianceAnalysis, result: Dict):
+    """완료된 분석 결과(분석기가 돌려준 전체 결과)를 LRU 에 등록"""
+    if analysis.content_hash and analysis.rule_version is not None and result:
+        _result_lru.put(
+            (analysis.content_hash, analysis.rule_version),
+            CachedResult(analysis.id, result)
+        )
+
+
+def analyze_with_cache(text: str, source_type: str = 'text') -> Tuple[Dict, int, Optional[CachedResult]]:
+    """캐시를 먼저 확인하고 없으면 분석 실행
+
+    Returns:
+        (분석 결과, 사용한 규칙 스냅샷 버전, 캐시 적중 정보 또는 None)
+    """
+    from .analyzer import ComplianceAnalyzer
+
+    analyzer = ComplianceAnalyzer()
+    rule_version = analyzer.snapshot.version
+    cached = lookup_result(text, source_type, rule_version)
+    if cached is not None:
+        return cached.result, rule_version, cached
+    return analyzer.analyze(text, source_type), rule_version, None
+
+
+def prepare_analysis(analysis: ComplianceAnalysis, text: str, result: Dict, rule_version: int,
+                     resolver: SpanResolver = None) -> ComplianceAnalysis:
+    """분석 결과, 캐시 키, 위반 집계 반영 (저장은 호출자가 수행)
+
+    저장할 위반 구간은 analysis._violation_spans 에 담아 두고, 호출자가 분석을 저장한 뒤
+    함께 저장한다. resolver 가 없으면 공유 규칙 스냅샷으로 만든 것을 사용한다.
+    """
+    analysis.input_text = text
+    analysis.content_hash = compute_content_hash(text, analysis.input_type)
+    analysis.rule_version = rule_version
+    analysis.apply_result(result)
+    analysis._violation_spans = (resolver or get_span_resolver()).apply(analysis, text, result)
+    return analysis
+
+
+def save_analysis(analysis: ComplianceAnalysis, text: str, result: Dict, rule_version: int) -> ComplianceAnalysis:
+    """분석 결과, 캐시 키, 위반 구간을 저장하고 일별 집계와 LRU 에 반영
+
+    분석, 위반 구간, 일별 집계는 한 트랜잭션으로 저장한다.
+    """
+    prepare_analysis(analysis, text, result, rule_version)
+    with transaction.atomic():
+        analysis.save()
+        store_violation_spans(analysis, analysis._violation_spans)
+        record_analyses([analysis])
+    remember_result(analysis, result)
+    return analysis
@@ -0,0 +1,143 @@
+import datetime
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ComplianceAnalysis, DailyAnalysisRollup, DailyViolationRollup, ViolationSpan
+
+ANALYSIS_KEY_FIELDS = ('date', 'input_type', 'risk_level', 'compliance_status')
+VIOLATION_KEY_FIELDS = ('date', 'category', 'severity')
+
+
+def _span_counts(analyses: List[ComplianceAnalysis]) -> Dict[int, Counter]:
+    """분석별 (카테고리, 심각도)별 위반 구간 수
+
+    저장 전 구간(_violation_spans)이 있으면 그것을 쓰고, 나머지는 한 번의 쿼리로 데이터베이스에서 센다.
+    """
+    counts: Dict[int, Counter] = {}
+    stored_ids = []
+    for analysis in analyses:
+        spans = getattr(analysis, '_violation_spans', None)
+        if spans is not None:
+            counts[analysis.id] = Counter((span.category, span.severity) for span in spans)
+        else:
+            stored_ids.append(analysis.id)
+    if stored_ids:
+        span_rows = ViolationSpan.objects.filter(analysis_id__in=stored_ids) \
+            .values('analysis_id', 'category', 'severity').annotate(count=Count('id')).order_by()
+        for row in span_rows:
+            counts.setdefault(row['analysis_id'], Counter())[(row['category'], row['severity'])] = row['count']
+    return counts
+
+
+def _collect_deltas(analyses: Iterable[ComplianceAnalysis], sign: int) -> Tuple[Dict, Dict]:
+    analysis_deltas: Dict[tuple, Counter] = {}
+    violation_deltas: Dict[tuple, Counter] = {}
+    analyses = [analysis for analysis in analyses if analysis.status == 'completed']
+    span_counts = _span_counts(analyses)
+    for analysis in analyses:
+        date = timezone.localdate(analysis.created_at)
+        key = (date, analysis.input_type, analysis.risk_level, analysis.compliance_status)
+        analysis_deltas.setdefault(key, Counter()).update({
+            'analysis_count': sign,
+            'score_sum': sign * analysis.overall_score,
+            'violation_count': sign * analysis.violation_count,
+            'high_severity_count': sign * analysis.high_severity_count,
+            'medium_severity_count': sign * analysis.medium_severity_count,
+            'low_severity_count': sign * analysis.low_severity_count,
+        })
+        for (category, severity), count in span_counts.get(analysis.id, Counter()).items():
+            violation_deltas.setdefault((date, category, severity), Counter()).update({
+                'violation_count': sign * count,
+                'analysis_count': sign,
+            })
+    return analysis_deltas, violation_deltas
+
+
+def _apply_deltas(model, key_fields: Tuple[str, ...], deltas: Dict[tuple, Counter]):
+    """키별 집계 행을 만들고 값을 증감 (동시 저장에도 F() 로 더하므로 유실 없음)"""
+    for key, values in deltas.items():
+        if not any(values.values()):
+            continue
+        row, _ = model.objects.get_or_create(**dict(zip(key_fields, key)))
+        model.objects.filter(pk=row.pk).update(
+            **{field: F(field) + value for field, value in values.items() if value}
+        )
+
+
+def record_analyses(analyses: Iterable[ComplianceAnalysis], sign: int = 1):
+    """완료된 분석을 일별 집계에 반영 (sign=-1 이면 삭제 반영)
+
+    분석과 위반 구간이 저장된 뒤(삭제라면 삭제 전) 호출한다.
+    """
+    analysis_deltas, violation_deltas = _collect_deltas(analyses, sign)
+    with transaction.atomic():
+        _apply_deltas(DailyAnalysisRollup, ANALYSIS_KEY_FIELDS, analysis_deltas)
+        _apply_deltas(DailyViolationRollup, VIOLATION_KEY_FIELDS, violation_deltas)
+
+
+def record_changes(before: Iterable[ComplianceAnalysis], after: Iterable[ComplianceAnalysis]):
+    """저장된 분석의 값이 바뀐 것을 일별 집계에 반영 (바뀌기 전 값을 빼고 새 값을 더함)
+
+    before 는 바뀌기 전 분석의 사본, after 는 새 값의 분석이다. before 의 위반 구간은
+    데이터베이스에서 세므로 위반 구간을 교체하기 전에 호출한다. 해당 키의 행만 F() 로
+    증감하므로 집계 행을 지우고 다시 만드는 rebuild_rollups 와 달리 동시에 저장되는
+    분석의 record_analyses 와 함께 실행해도 유실되지 않는다.
+    """
+    analysis_deltas, violation_deltas = _collect_deltas(before, -1)
+    for deltas, added in zip((analysis_deltas, violation_deltas), _collect_deltas(after, 1)):
+        for key, values in added.items():
+            deltas.setdefault(key, Counter()).update(values)
+    with transaction.atomic():
+        _apply_deltas(DailyAnalysisRollup, ANALYSIS_KEY_FIELDS, analysis_deltas)
+        _apply_deltas(DailyViolationRollup, VIOLATION_KEY_FIELDS, violation_deltas)
+
+
+def rebuild_rollups(since: datetime.date = None) -> Tuple[int, int]:
+    """원본 분석/위반 구간에서 일별 집계를 다시 계산 (since 가 있으면 그 날짜부터)
+
+    집계 행을 지우고 다시 만드는 동안 저장되는 분석의 증감은 유실될 수 있으므로
+    분석 저장이 없을 때 rebuild_analysis_rollups 명령으로 실행한다. 재평가/재계산은
+    record_changes 로 바뀐 분석만 반영한다.
+
+    Returns:
+        (분석 집계 행 수, 위반 집계 행 수)
+    """
+    analyses = ComplianceAnalysis.objects.filter(status='completed')
+    spans = ViolationSpan.objects.filter(analysis__status='completed')
+    analysis_rollups = DailyAnalysisRollup.objects.all()
+    violation_rollups = DailyViolationRollup.objects.all()
+    if since:
+        start = timezone.make_aware(datetime.datetime.combine(since, datetime.time.min))
+        analyses = analyses.filter(created_at__gte=start)
+        spans = spans.filter(analysis__created_at__gte=start)
+        analysis_rollups = analysis_rollups.filter(date__gte=since)
+        violation_rollups = violation_rollups.filter(date__gte=since)
+
+    analysis_rows = analyses.annotate(date=TruncDate('created_at')).values(*ANALYSIS_KEY_FIELDS).annotate(
+        analysis_count=Count('id'),
+        score_sum=Sum('overall_score'),
+        violation_count=Sum('violation_count'),
+        high_severity_count=Sum('high_severity_count'),
+        medium_severity_count=Sum('medium_severity_count'),
+        low_severity_count=Sum('low_severity_count')
+    ).order_by()
+    violation_rows = spans.annotate(date=TruncDate('analysis__created_at')).values(*VIOLATION_KEY_FIELDS).annotate(
+        violation_count=Count('id'),
+        analysis_count=Count('analysis_id', distinct=True)
+    ).order_by()
+
+    with transaction.atomic():
+        analysis_rollups.delete()
+        violation_rollups.delete()
+        created_analysis = DailyAnalysisRollup.objects.bulk_create(
+            [DailyAnalysisRollup(**row) for row in analysis_rows], batch_size=500
+        )
+        created_violation = DailyViolationRollup.objects.bulk_create(
+            [DailyViolationRollup(**row) for row in violation_rows], batch_size=500
+        )
+    return len(created_analysis), len(created_violation)
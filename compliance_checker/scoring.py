@@ -0,0 +1,151 @@
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .models import ComplianceRule
+
+# 심각도별 기본 차감 점수
+SEVERITY_DEDUCTIONS = {'high': 25, 'medium': 15, 'low': 10}
+
+
+def verdict(score: int) -> Tuple[str, str]:
+    """점수의 (준수 상태, 위험도)"""
+    if score >= 80:
+        return '적합', 'low'
+    elif score >= 60:
+        return '부분적합', 'medium'
+    return '부적합', 'high'
+
+
+class RuleHits:
+    """규칙 하나의 위반 위치 집계 (위반 수, 머리말/꼬리말 위반 수)"""
+
+    __slots__ = ('count', 'headline', 'footer')
+
+    def __init__(self):
+        self.count = 0
+        self.headline = 0
+        self.footer = 0
+
+
+class WeightedScoringEngine:
+    """규칙별 가중치로 위반 차감 점수를 계산하는 점수 엔진
+
+    규칙별 차감 = 심각도 기본 차감 × score_weight
+                + match_weight × (위반 수 - 1)
+                + density_weight × 1,000자당 위반 수
+                + headline_weight × 머리말 위반 수 + footer_weight × 꼬리말 위반 수
+    를 반올림하고 max_deduction 으로 제한한다. 규칙 가중치가 기본값이면 위반한 규칙마다
+    심각도별 25/15/10 점을 차감한다. 입력은 (규칙, 위반 시작 위치) 목록과 텍스트 길이뿐이므로
+    저장된 위반 구간만으로 원문을 다시 검사하지 않고 재계산할 수 있다.
+    """
+
+    def __init__(self, headline_chars: int = None, footer_chars: int = None):
+        self.headline_chars = headline_chars if headline_chars is not None else \
+            getattr(settings, 'COMPLIANCE_SCORING_HEADLINE_CHARS', 200)
+        self.footer_chars = footer_chars if footer_chars is not None else \
+            getattr(settings, 'COMPLIANCE_SCORING_FOOTER_CHARS', 200)
+
+    def collect(self, positions: Iterable[Tuple[int, int]], text_length: int) -> Dict[int, RuleHits]:
+        """(규칙 ID, 시작 위치) 목록을 한 번 훑어 규칙별 위반 위치 집계"""
+        footer_start = max(self.headline_chars, text_length - self.footer_chars)
+        hits: Dict[int, RuleHits] = {}
+        for rule_id, start in positions:
+            rule_hits = hits.get(rule_id)
+            if rule_hits is None:
+                rule_hits = hits[rule_id] = RuleHits()
+            rule_hits.count += 1
+            if start < self.headline_chars:
+                rule_hits.headline += 1
+            elif start >= footer_start:
+                rule_hits.footer += 1
+        return hits
+
+    def rule_deduction(self, rule: ComplianceRule, hits: RuleHits, text_length: int) -> int:
+        """위반한 규칙 하나의 차감 점수"""
+        deduction = SEVERITY_DEDUCTIONS.get(rule.severity, SEVERITY_DEDUCTIONS['low']) * rule.score_weight
+        deduction += rule.match_weight * (hits.count - 1)
+        if text_length:
+            deduction += rule.density_weight * hits.count * 1000 / text_length
+        deduction += rule.headline_weight * hits.headline + rule.footer_weight * hits.footer
+        deduction = max(0, math.floor(deduction + 0.5))
+        if rule.max_deduction is not None:
+            deduction = min(deduction, rule.max_deduction)
+        return deduction
+
+    def score(self, rules: Sequence[ComplianceRule], positions: Iterable[Tuple[int, int]],
+              text_length: int) -> int:
+        """100 점에서 위반한 규칙들의 차감 점수를 뺀 점수 (0 미만일 수 있음)
+
+        Args:
+            rules: 점수에 반영할 규칙 (위반이 없는 규칙은 무시)
+            positions: (규칙 ID, 위반 시작 위치) 목록
+            text_length: 텍스트 길이 (밀도와 꼬리말 범위 계산)
+        """
+        hits = self.collect(positions, text_length)
+        return 100 - sum(
+            self.rule_deduction(rule, hits[rule.id], text_length)
+            for rule in rules if rule.id in hits
+        )
+
+
+_engine: Optional[WeightedScoringEngine] = None
+
+
+def get_scoring_engine() -> WeightedScoringEngine:
+    """COMPLIANCE_SCORING_ENGINE 설정의 점수 엔진 (프로세스당 하나)"""
+    global _engine
+    if _engine is None:
+        engine_path = getattr(settings, 'COMPLIANCE_SCORING_ENGINE', None)
+        _engine = import_string(engine_path)() if engine_path else WeightedScoringEngine()
+    return _engine
+
+
+def set_scoring_engine(engine: WeightedScoringEngine = None):
+    """점수 엔진 교체 (테스트용, None 이면 다음 조회 시 설정으로 새로 생성)"""
+    global _engine
+    _engine = engine
+
+
+def rescore_from_spans(analyses: List, rules_by_title: Dict[Tuple[str, str], ComplianceRule],
+                       engine: WeightedScoringEngine = None) -> Tuple[List, List]:
+    """저장된 위반 구간으로 분석들의 점수/준수 상태/위험도를 다시 계산
+
+    원문은 읽지 않으며 위반 구간 테이블을 분석 ID 순으로 한 번 조회한다. 규칙은 구간의
+    (카테고리, 제목)으로 찾으므로 규칙이 다시 로드되어 ID 가 바뀌어도 같은 규칙으로 계산한다.
+    현재 규칙으로 찾을 수 없는 구간이 있는 분석은 위반이 사라진 것처럼 계산하지 않고 건너뛴다.
+    (값이 바뀐 분석, 건너뛴 분석) 을 반환한다 (저장은 호출자가 수행).
+    """
+    from .models import ViolationSpan
+
+    engine = engine or get_scoring_engine()
+    positions: Dict[int, List[Tuple[int, int]]] = {analysis.id: [] for analysis in analyses}
+    rules: Dict[int, Dict[int, ComplianceRule]] = {analysis.id: {} for analysis in analyses}
+    unresolved = set()
+    span_rows = ViolationSpan.objects.filter(analysis_id__in=list(positions)) \
+        .order_by('analysis_id', 'id').values_list('analysis_id', 'category', 'title', 'start')
+    for analysis_id, category, title, start in span_rows:
+        rule = rules_by_title.get((category, title))
+        if rule is None:
+            unresolved.add(analysis_id)
+            continue
+        positions[analysis_id].append((rule.id, start))
+        rules[analysis_id].setdefault(rule.id, rule)
+
+    changed, skipped = [], []
+    for analysis in analyses:
+        if analysis.id in unresolved:
+            skipped.append(analysis)
+            continue
+        score = engine.score(list(rules[analysis.id].values()), positions[analysis.id], analysis.total_characters)
+        compliance_status, risk_level = verdict(score)
+        score = max(0, score)
+        if (score, compliance_status, risk_level) != (analysis.overall_score, analysis.compliance_status,
+                                                      analysis.risk_level):
+            analysis.overall_score = score
+            analysis.compliance_status = compliance_status
+            analysis.risk_level = risk_level
+            changed.append(analysis)
+    return changed, skipped
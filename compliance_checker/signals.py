@@ -0,0 +1,34 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import ComplianceRule, ComplianceKeyword, RecommendedExpression, MedicalGuideline, GuidelineDocument
+from .snapshot import bump_rule_snapshot_version
+
+
+@receiver(post_save, sender=ComplianceRule)
+@receiver(post_delete, sender=ComplianceRule)
+@receiver(post_save, sender=ComplianceKeyword)
+@receiver(post_delete, sender=ComplianceKeyword)
+@receiver(post_save, sender=RecommendedExpression)
+@receiver(post_delete, sender=RecommendedExpression)
+def invalidate_rule_snapshot(sender, **kwargs):
+    """규칙/키워드/권장 표현 변경 시 규칙 스냅샷 버전 갱신"""
+    bump_rule_snapshot_version()
+
+
+@receiver(post_save, sender=MedicalGuideline)
+@receiver(post_delete, sender=MedicalGuideline)
+@receiver(post_save, sender=GuidelineDocument)
+@receiver(post_delete, sender=GuidelineDocument)
+def reindex_citation_source(sender, instance, **kwargs):
+    """가이드라인/가이드라인 문서 저장·삭제 시 커밋 후 백그라운드에서 인용 색인 갱신
+
+    색인 작업은 저장된 내용을 다시 읽으므로 내용이 바뀌지 않은 저장은 해시 비교로 건너뛴다.
+    """
+    from .citations import index_guideline, index_guideline_document
+    from .jobs import submit_job
+
+    index_func = index_guideline if sender is MedicalGuideline else index_guideline_document
+    object_id = instance.pk
+    transaction.on_commit(lambda: submit_job(index_func, object_id))
@@ -0,0 +1,136 @@
+import logging
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+
+from .matcher import KeywordMatcher, fold_case
+from .models import ComplianceRule, ComplianceKeyword, RecommendedExpression
+from .versions import bump_shared_version, get_shared_version
+
+logger = logging.getLogger(__name__)
+
+# 규칙 스냅샷 공유 버전 이름 (규칙/키워드/권장 표현 변경 시 갱신)
+RULE_SNAPSHOT_VERSION_KEY = 'compliance_checker:rule_snapshot_version'
+
+
+class RuleSnapshot:
+    """활성 규칙, 키워드, 권장 표현과 컴파일된 매처를 담은 불변 스냅샷
+
+    워커 프로세스 안에서 요청 간에 공유되므로 생성 후에는 수정하지 않는다.
+    """
+
+    __slots__ = ('version', 'rules', 'keywords', 'recommended_expressions', 'keyword_ids', 'matcher')
+
+    def __init__(self, version: int, rules: List[ComplianceRule], keywords: Dict[str, List[str]],
+                 recommended_expressions: List[Dict], keyword_ids: Dict[Tuple[int, str], int] = None):
+        self.version = version
+        self.rules = tuple(rules)
+        self.keywords = MappingProxyType({
+            category: tuple(category_keywords) for category, category_keywords in keywords.items()
+        })
+        self.recommended_expressions = tuple(recommended_expressions)
+        # (규칙 ID, 정규화한 키워드) → 키워드 ID (위반 구간 저장용)
+        self.keyword_ids = MappingProxyType(dict(keyword_ids or {}))
+        self.matcher = KeywordMatcher(self.keywords)
+
+    def __repr__(self):
+        return f"<RuleSnapshot v{self.version}: 규칙 {len(self.rules)}개>"
+
+    def to_payload(self) -> tuple:
+        """다른 프로세스로 보낼 수 있는 기본 자료형 데이터로 변환 (매처는 받는 쪽에서 다시 컴파일)"""
+        rules = [
+            {field.attname: getattr(rule, field.attname) for field in rule._meta.concrete_fields}
+            for rule in self.rules
+        ]
+        keywords = {category: list(category_keywords) for category, category_keywords in self.keywords.items()}
+        keyword_ids = [[rule_id, keyword, keyword_id] for (rule_id, keyword), keyword_id in self.keyword_ids.items()]
+        return self.version, rules, keywords, list(self.recommended_expressions), keyword_ids
+
+    @classmethod
+    def from_payload(cls, payload: tuple) -> 'RuleSnapshot':
+        """to_payload() 결과로 스냅샷 복원 (데이터베이스 조회 없음)"""
+        version, rules, keywords, recommended_expressions, keyword_ids = payload
+        return cls(
+            version, [ComplianceRule(**fields) for fields in rules], keywords, recommended_expressions,
+            {(rule_id, keyword): keyword_id for rule_id, keyword, keyword_id in keyword_ids}
+        )
+
+
+def _load_rules_from_db() -> List[ComplianceRule]:
+    """데이터베이스에서 활성 규칙 로드"""
+    return list(ComplianceRule.objects.filter(is_active=True))
+
+
+def _load_keywords_from_db(rules: List[ComplianceRule]) -> Tuple[Dict[str, List[str]], Dict[Tuple[int, str], int]]:
+    """데이터베이스에서 규칙별 활성 키워드를 한 번의 쿼리로 로드
+
+    Returns:
+        (카테고리별 키워드, (규칙 ID, 정규화한 키워드) → 키워드 ID)
+    """
+    keywords_by_rule = {}
+    keyword_ids = {}
+    keyword_rows = ComplianceKeyword.objects.filter(
+        rule__in=[rule.id for rule in rules],
+        is_active=True
+    ).order_by('rule_id', 'keyword').values_list('id', 'rule_id', 'keyword')
+    for keyword_id, rule_id, keyword in keyword_rows:
+        keywords_by_rule.setdefault(rule_id, []).append(keyword)
+        keyword_ids[(rule_id, fold_case(keyword))] = keyword_id
+
+    # 같은 카테고리의 규칙이 여러 개면 뒤의 규칙이 우선 (기존 동작과 동일)
+    keywords_dict = {}
+    for rule in rules:
+        keywords_dict[rule.category] = keywords_by_rule.get(rule.id, [])
+    return keywords_dict, keyword_ids
+
+
+def _load_recommended_expressions_from_db() -> List[Dict]:
+    """데이터베이스에서 권장 표현 로드"""
+    try:
+        return list(RecommendedExpression.objects.filter(is_active=True).values())
+    except Exception:
+        return []
+
+
+def load_rule_snapshot(version: int = 0) -> RuleSnapshot:
+    """데이터베이스에서 새 규칙 스냅샷 생성"""
+    rules = _load_rules_from_db()
+    try:
+        keywords, keyword_ids = _load_keywords_from_db(rules)
+    except Exception as e:
+        logger.warning(f"키워드 로드 실패: {e}")
+        keywords, keyword_ids = {}, {}
+    snapshot = RuleSnapshot(version, rules, keywords, _load_recommended_expressions_from_db(), keyword_ids)
+    logger.debug(f"규칙 스냅샷 로드: 버전 {version}, 규칙 {len(snapshot.rules)}개, "
+                 f"키워드 {sum(len(k) for k in snapshot.keywords.values())}개")
+    return snapshot
+
+
+def get_rule_snapshot_version() -> int:
+    """현재 규칙 스냅샷 버전 조회 (데이터베이스의 공유 버전 기준)"""
+    return get_shared_version(RULE_SNAPSHOT_VERSION_KEY)
+
+
+def bump_rule_snapshot_version() -> int:
+    """규칙 변경 시 스냅샷 버전 갱신"""
+    return bump_shared_version(RULE_SNAPSHOT_VERSION_KEY)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_rule_snapshot() -> RuleSnapshot:
+    """워커 프로세스에서 공유하는 규칙 스냅샷 조회
+
+    버전이 바뀐 경우에만 데이터베이스에서 다시 로드한다.
+    """
+    global _snapshot
+    version = get_rule_snapshot_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = load_rule_snapshot(version)
+        return _snapshot
@@ -1,3 +1,1049 @@
-from django.test import TestCase
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import skipUnless
 
-# Create your tests here.
+import PyPDF2
+import docx
+import requests
+from fontTools.ttLib import TTFont
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db.models import F
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .ai import FakeAnthropicClient, set_ai_client
+from .analyzer import ComplianceAnalyzer
+from .benchmark import build_pdf, compare_golden, load_golden, load_manifest, run_benchmark
+from .browser_pool import BrowserPool, set_browser_pool
+from .citations import get_citation_index
+from .extraction import iter_file_text
+from .features import AD_INDICATORS, TextFeatures
+from .http_client import HttpCache, fetch
+from .matcher import KeywordMatcher
+from .reevaluation import reevaluate_analyses, submit_reevaluation
+from .models import (
+    AIAnalysisResult, CitationSource, ComplianceAnalysis, ComplianceRule, ComplianceKeyword, DailyAnalysisRollup,
+    DailyViolationRollup, GuidelineDocument, GuidelineUpdate, GuidelineVersion, MedicalGuideline, SharedVersion,
+    ViolationSpan
+)
+from .reports import render_report, resolve_font_path
+from .result_cache import get_result_lru
+from .scoring import set_scoring_engine
+from .snapshot import RULE_SNAPSHOT_VERSION_KEY, get_rule_snapshot, get_rule_snapshot_version
+from .text_index import TextIndex
+from .utils import TextExtractor, WebTextExtractor, extract_text_from_file
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# 환경에 ANTHROPIC_API_KEY 가 있어도 모듈 전체에서 실제 Claude API 를 호출하지 않음
+# (AI 응답이 필요한 테스트는 FakeAnthropicClient 를 주입)
+_ai_disabled = override_settings(COMPLIANCE_AI_ENABLED=False)
+
+
+def setUpModule():
+    _ai_disabled.enable()
+    set_ai_client(None)
+
+
+def tearDownModule():
+    _ai_disabled.disable()
+
+
+class KeywordMatcherTestCase(SimpleTestCase):
+    def test_matches_per_keyword_regex(self):
+        """키워드별 re.finditer 결과와 동일한 매칭 반환"""
+        keywords = {
+            '과장·절대적 표현': ['최고', '최고급', '최고 수준', 'BEST'],
+            '환자체험담·후기': ['후기', '치료 후기', '후기'],
+        }
+        text = "최고급 시설, 최고 수준의 치료 후기! best 후기후기 최고최고"
+        matcher = KeywordMatcher(keywords)
+        result = matcher.find_all(text)
+
+        for category, category_keywords in keywords.items():
+            expected = []
+            for keyword in category_keywords:
+                pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+                expected.extend((keyword, m.start(), m.end()) for m in pattern.finditer(text))
+            self.assertEqual([tuple(m) for m in result[category]], expected)
+
+    def test_empty_text(self):
+        """빈 텍스트는 카테고리별 빈 목록 반환"""
+        matcher = KeywordMatcher({'비교광고': ['다른 병원보다']})
+        self.assertEqual(matcher.find_all(''), {'비교광고': []})
+
+    def test_normalized_variants_map_to_original_offsets(self):
+        """띄어쓰기·조사·전각 변형도 매칭하고 원문 위치를 반환, 영문/숫자 단어 안은 제외"""
+        matcher = KeywordMatcher({'과장': ['세계최초', '세계 최초', '부작용 없는', '1위', 'BEST']})
+        text = "세계  최초 시술! 부작용이 없는 치료 11위 １위 bestseller"
+        matches = matcher.find_all(text)['과장']
+
+        self.assertEqual(
+            [(match.keyword, text[match.start:match.end]) for match in matches],
+            [('세계최초', '세계  최초'), ('부작용 없는', '부작용이 없는'), ('1위', '１위')]
+        )
+        # 한글은 어절 안(복합어)의 매칭도 위반 후보로 유지
+        self.assertEqual([tuple(m) for m in KeywordMatcher({'후기': ['후기']}).find_all('치료후기 공유')['후기']],
+                         [('후기', 2, 4)])
+        # 어휘 통계용 매처는 원문 그대로 비교
+        self.assertEqual(KeywordMatcher({'과장': ['세계최초']}, normalize=False).find_all(text), {'과장': []})
+
+
+class TextIndexTestCase(SimpleTestCase):
+    def test_locations(self):
+        """줄/열, 문단 번호, 단락 컨텍스트 계산"""
+        text = "첫 문단 첫 줄\n첫 문단 둘째 줄\n\n둘째 문단. 최고의 치료"
+        index = TextIndex(text)
+        position = text.index('최고')
+
+        self.assertEqual(index.line_and_column(position), (4, 8))
+        self.assertEqual(index.paragraph_number(position), 2)
+        self.assertEqual(index.paragraph_context(position), '둘째 문단. 최고의 치료')
+        self.assertEqual(index.paragraph_context(0), '첫 문단 첫 줄\n첫 문단 둘째 줄')
+
+
+class TextFeaturesTestCase(SimpleTestCase):
+    def test_single_pass_counts(self):
+        """단어/문장 수와 어휘 등장 여부를 한 번에 계산"""
+        text = "최고의 치료를 약속합니다. 상담 예약은 전화로! 이벤트 진행 중"
+        features = TextFeatures(text)
+
+        self.assertEqual(features.total_words, len(text.split()))
+        self.assertEqual(features.total_sentences, len(re.split(r'[.!?]+', text)))
+        self.assertEqual(features.tone, 'promotional')
+        self.assertEqual(features.medical_terms, ['치료'])
+        self.assertEqual(features.advertising_elements, ['연락처 정보', '진료 정보'])
+        self.assertEqual(features.keyword_stats('치료'), (1, text.index('치료')))
+        event = text.index('이벤트')
+        self.assertTrue(features.has_any_within(AD_INDICATORS, event - 10, event + 3))
+        self.assertFalse(features.has_any_within(AD_INDICATORS, 0, event + 2))
+
+
+class FileExtractionTestCase(SimpleTestCase):
+    def test_docx_paragraphs_streamed_in_order(self):
+        """Word 문서는 문단 단위로 순서대로 추출"""
+        document = docx.Document()
+        for paragraph in ('첫 문단', '둘째 문단', '셋째 문단'):
+            document.add_paragraph(paragraph)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        upload = SimpleUploadedFile('brochure.docx', buffer.getvalue())
+
+        self.assertEqual(list(iter_file_text(upload)), ['첫 문단\n', '둘째 문단\n', '셋째 문단\n'])
+        self.assertEqual(extract_text_from_file(upload), '첫 문단\n둘째 문단\n셋째 문단')
+
+    @override_settings(COMPLIANCE_PDF_MAX_PAGES=3, COMPLIANCE_UPLOAD_MAX_BYTES=1024 * 1024)
+    def test_page_and_byte_limits(self):
+        """PDF 페이지 수 제한을 넘는 페이지는 건너뛰고, 크기 제한을 넘는 파일은 거부"""
+        writer = PyPDF2.PdfWriter()
+        for _ in range(5):
+            writer.add_blank_page(width=72, height=72)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        self.assertEqual(len(list(iter_file_text(SimpleUploadedFile('many.pdf', buffer.getvalue())))), 3)
+
+        with self.assertRaises(ValueError):
+            extract_text_from_file(SimpleUploadedFile('large.txt', b'a' * (1024 * 1024 + 1)))
+
+    def test_txt_read_in_blocks(self):
+        """텍스트 파일은 블록 단위로 디코딩 (블록 경계에 걸린 CP949 한글도 보존)"""
+        text = '의료광고 심의 안내\n' * 20000
+        chunks = list(iter_file_text(SimpleUploadedFile('notice.txt', text.encode('cp949'))))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), text)
+
+
+class _ETagHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = '<html><body>최고의 치료</body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpCacheTestCase(SimpleTestCase):
+    def test_revalidates_with_etag(self):
+        """ETag 가 있는 응답은 디스크에 저장하고 304 응답 시 저장된 본문 사용"""
+        server = HTTPServer(('127.0.0.1', 0), _ETagHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f'http://127.0.0.1:{server.server_port}/post'
+
+        with tempfile.TemporaryDirectory() as cache_dir, self.settings(COMPLIANCE_HTTP_CACHE_DIR=cache_dir):
+            first = fetch(url)
+            second = fetch(url)
+
+        self.assertEqual(_ETagHandler.requests_seen, [None, '"v1"'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertIn('최고의 치료', second.text)
+
+    def test_prunes_least_recently_used(self):
+        """전체 크기 제한을 넘으면 최근에 읽지 않은 항목부터 삭제"""
+        def response(body):
+            stored = requests.Response()
+            stored.status_code = 200
+            stored.headers['ETag'] = '"v1"'
+            stored._content = body
+            return stored
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            http_cache = HttpCache(cache_dir, max_total_bytes=2500, prune_every=1)
+            http_cache.store('https://a.example/', response(b'a' * 1000))
+            http_cache.store('https://b.example/', response(b'b' * 1000))
+            self.assertIsNotNone(http_cache.load('https://a.example/'))
+            http_cache.store('https://c.example/', response(b'c' * 1000))
+
+            self.assertIsNotNone(http_cache.load('https://a.example/'))
+            self.assertIsNone(http_cache.load('https://b.example/'))
+            self.assertIsNotNone(http_cache.load('https://c.example/'))
+
+
+class StubWebDriver:
+    """Selenium WebDriver 대용 로컬 스텁"""
+    created = 0
+
+    def __init__(self):
+        StubWebDriver.created += 1
+        self.visited = []
+        self.quit_called = False
+        self.page_load_timeout = None
+        self.switch_to = SimpleNamespace(default_content=lambda: None)
+
+    @property
+    def current_url(self):
+        if self.quit_called:
+            raise RuntimeError('세션 종료됨')
+        return self.visited[-1] if self.visited else 'about:blank'
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+
+    def get(self, url):
+        if 'crash' in url:
+            raise RuntimeError('브라우저 중단')
+        self.visited.append(url)
+
+    def find_element(self, by, value):
+        return SimpleNamespace(text=f' {self.visited[-1]} 본문 ')
+
+    def find_elements(self, by, value):
+        return []
+
+    def quit(self):
+        self.quit_called = True
+
+
+class BrowserPoolTestCase(SimpleTestCase):
+    def setUp(self):
+        StubWebDriver.created = 0
+        self.pool = BrowserPool(driver_factory=StubWebDriver, max_sessions=1, max_pages_per_session=2,
+                                page_load_timeout=5, acquire_timeout=1)
+        set_browser_pool(self.pool)
+        self.addCleanup(set_browser_pool, None)
+
+    def test_sessions_reused_and_recycled(self):
+        """세션은 재사용하고, 페이지 수 제한이나 오류 시 새로 생성"""
+        self.assertEqual(WebTextExtractor._extract_with_selenium('https://a.test/1'), 'https://a.test/1 본문')
+        self.assertEqual(WebTextExtractor._extract_with_selenium('https://a.test/2'), 'https://a.test/2 본문')
+        self.assertEqual(StubWebDriver.created, 1)
+        self.assertEqual(self.pool.idle_count(), 0)  # 2페이지 처리 후 종료
+
+        with self.assertRaises(RuntimeError):
+            WebTextExtractor._extract_with_selenium('https://a.test/crash')
+        self.assertEqual(self.pool.idle_count(), 0)
+
+        with self.pool.session() as driver:
+            self.assertEqual(driver.page_load_timeout, 5)
+            with self.assertRaises(TimeoutError):
+                with self.pool.session():
+                    pass
+        self.assertEqual(StubWebDriver.created, 3)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RuleSnapshotTestCase(TestCase):
+    def setUp(self):
+        self.rule = ComplianceRule.objects.create(
+            category='비교광고',
+            title='비교광고 금지',
+            description='다른 의료기관과의 비교광고는 금지됩니다.',
+            severity='high',
+            penalty='1년 이하 징역 또는 1,000만원 이하 벌금',
+            legal_basis='의료법 제27조 제3항 제2호',
+            improvement_guide='비교 표현 삭제'
+        )
+        ComplianceKeyword.objects.create(rule=self.rule, keyword='다른 병원보다')
+
+    def test_snapshot_shared_until_rules_change(self):
+        """규칙 변경 전까지 스냅샷을 재사용하고 변경 시 다시 로드"""
+        snapshot = get_rule_snapshot()
+        with self.assertNumQueries(0):
+            analyzer = ComplianceAnalyzer()
+        self.assertIs(analyzer.snapshot, snapshot)
+
+        ComplianceKeyword.objects.create(rule=self.rule, keyword='타 병원 대비')
+        refreshed = get_rule_snapshot()
+        self.assertIsNot(refreshed, snapshot)
+        self.assertEqual(refreshed.keywords['비교광고'], ('다른 병원보다', '타 병원 대비'))
+
+    def test_version_shared_through_database(self):
+        """스냅샷 버전은 호스트별 캐시가 아닌 데이터베이스에 있어 캐시가 비거나 다른 호스트가 바꿔도 맞음"""
+        version = get_rule_snapshot_version()
+        with self.settings(COMPLIANCE_SHARED_VERSION_TTL=0):
+            cache.clear()
+            self.assertEqual(get_rule_snapshot_version(), version)
+            # 다른 호스트의 규칙 변경
+            SharedVersion.objects.filter(name=RULE_SNAPSHOT_VERSION_KEY).update(version=F('version') + 1)
+            self.assertEqual(get_rule_snapshot().version, version + 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, COMPLIANCE_JOBS_EAGER=True)
+class AnalysisJobTestCase(TestCase):
+    def test_async_text_analysis(self):
+        """비동기 모드 분석 요청은 작업 ID를 반환하고 상태 API로 결과 조회"""
+        response = self.client.post(
+            '/api/analyze/text/',
+            data=json.dumps({'text': '정기 검진을 권장합니다.', 'async': True}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 202)
+        payload = response.json()
+        self.assertEqual(payload['status'], 'pending')
+
+        status = self.client.get(payload['status_url']).json()
+        self.assertEqual(status['status'], 'completed')
+        self.assertEqual(status['result']['overall_score'], 100)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ResultCacheTestCase(TestCase):
+    def setUp(self):
+        get_result_lru().clear()
+        self.rule = ComplianceRule.objects.create(
+            category='비교광고',
+            title='비교광고 금지',
+            description='다른 의료기관과의 비교광고는 금지됩니다.',
+            severity='high',
+            penalty='1년 이하 징역 또는 1,000만원 이하 벌금',
+            legal_basis='의료법 제27조 제3항 제2호',
+            improvement_guide='비교 표현 삭제'
+        )
+        ComplianceKeyword.objects.create(rule=self.rule, keyword='다른 병원보다')
+
+    def _analyze(self, text):
+        return self.client.post(
+            '/api/analyze/text/', data=json.dumps({'text': text}), content_type='application/json'
+        ).json()
+
+    def test_repeated_text_reuses_result_until_rules_change(self):
+        """같은 텍스트는 저장된 결과를 재사용하고 규칙 변경 시 다시 분석"""
+        first = self._analyze('다른 병원보다 빠른 회복')
+        second = self._analyze('다른 병원보다 빠른 회복')
+        self.assertTrue(second['cached'])
+        self.assertEqual(second['analysis_id'], first['analysis_id'])
+        self.assertEqual(second['result'], first['result'])
+        self.assertEqual(ComplianceAnalysis.objects.get(id=first['analysis_id']).cache_hits, 1)
+
+        # 프로세스 LRU 가 비어도 DB 에서 조회 (상세 위반 정보는 위반 구간과 원문으로 다시 만듦)
+        get_result_lru().clear()
+        from_db = self._analyze('다른 병원보다 빠른 회복')
+        self.assertTrue(from_db['cached'])
+        self.assertEqual(from_db['result'], first['result'])
+
+        # 공백만 다른 텍스트는 위반 위치가 달라지므로 재사용하지 않음
+        self._analyze('정말 다른 병원보다 빠른 회복')
+        spaced = self._analyze('정말\n\n다른 병원보다  빠른 회복')
+        self.assertNotIn('cached', spaced)
+        self.assertEqual(spaced['result']['detailed_violations'][0]['position'], 4)
+
+        ComplianceKeyword.objects.create(rule=self.rule, keyword='빠른 회복')
+        third = self._analyze('다른 병원보다 빠른 회복')
+        self.assertNotIn('cached', third)
+        self.assertNotEqual(third['analysis_id'], first['analysis_id'])
+
+
+class ChunkedAnalysisTestCase(TestCase):
+    def setUp(self):
+        get_result_lru().clear()
+        rule = ComplianceRule.objects.create(
+            category='비교광고', title='비교광고 금지', description='비교광고',
+            severity='high', penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+        )
+        ComplianceKeyword.objects.create(rule=rule, keyword='다른 병원보다')
+
+    @override_settings(COMPLIANCE_CHUNKED_ANALYSIS_THRESHOLD=1000, COMPLIANCE_CHUNKED_WINDOW_SIZE=64)
+    def test_large_text_stores_spans(self):
+        """긴 텍스트는 위반 구간만 저장하고 상세 정보는 요청 시 원문에서 생성"""
+        text = ("진료 안내입니다. " * 100 + "다른 병원보다 빠릅니다. " * 5).strip()
+        response = self.client.post(
+            '/api/analyze/text/', data=json.dumps({'text': text}), content_type='application/json'
+        ).json()
+        result = response['result']
+        self.assertEqual(result['analysis_mode'], 'chunked')
+        self.assertNotIn('extracted_text', result)
+        self.assertEqual(len(result['violation_spans']), 5)
+
+        expected = ComplianceAnalyzer(enable_ai=False).analyze_text(text)
+        self.assertEqual(result['overall_score'], expected['overall_score'])
+        page = self.client.get(
+            f"/api/analysis/{response['analysis_id']}/violations/", {'offset': 1, 'limit': 2}
+        ).json()
+        self.assertEqual(page['total'], 5)
+        self.assertEqual(page['violations'], expected['detailed_violations'][1:3])
+
+        # 규칙이 다시 만들어져 ID 가 바뀌어도 구간의 (카테고리, 제목)으로 규칙을 찾음
+        self.assertEqual(result['violation_rules'], [['비교광고', '비교광고 금지']])
+        ComplianceRule.objects.all().delete()
+        self.setUp()
+        page = self.client.get(
+            f"/api/analysis/{response['analysis_id']}/violations/", {'offset': 1, 'limit': 2}
+        ).json()
+        self.assertEqual([violation['position'] for violation in page['violations']],
+                         [violation['position'] for violation in expected['detailed_violations'][1:3]])
+
+
+class ViolationSpanTestCase(TestCase):
+    def setUp(self):
+        get_result_lru().clear()
+        for category, keyword, severity in (('비교광고', '다른 병원보다', 'high'), ('과장·절대적 표현', '최고', 'medium')):
+            rule = ComplianceRule.objects.create(
+                category=category, title=f'{category} 금지', description=category,
+                severity=severity, penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+            )
+            ComplianceKeyword.objects.create(rule=rule, keyword=keyword)
+
+    def test_spans_and_aggregates_stored_and_backfilled(self):
+        """위반 구간과 집계 컬럼을 저장하고, 상세 리포트는 저장된 구간으로 구성"""
+        text = "다른 병원보다 빠릅니다. 최고의 의료진. 다른 병원보다 저렴합니다."
+        response = self.client.post(
+            '/api/analyze/text/', data=json.dumps({'text': text}), content_type='application/json'
+        ).json()
+        analysis = ComplianceAnalysis.objects.get(id=response['analysis_id'])
+        detailed = response['result']['detailed_violations']
+        spans = list(analysis.violation_spans.select_related('keyword'))
+        self.assertEqual(
+            [(span.category, span.keyword.keyword, span.start, span.severity) for span in spans],
+            [(v['category'], v['keyword'], v['position'], v['severity']) for v in detailed]
+        )
+        self.assertEqual((analysis.violation_count, analysis.high_severity_count, analysis.medium_severity_count),
+                         (3, 2, 1))
+        self.assertEqual(analysis.total_characters, len(text))
+
+        report = self.client.get(f'/api/analysis/{analysis.id}/detailed-report/').json()
+        self.assertEqual([v['context'] for v in report['violation_details']], [v['context'] for v in detailed])
+
+        # 상세 위반 정보와 원문은 저장하지 않고 결과 페이지에서 위반 구간과 원문으로 다시 만듦
+        self.assertNotIn('detailed_violations', analysis.analysis_result)
+        self.assertNotIn('extracted_text', analysis.analysis_result)
+        page = self.client.get(reverse('show_result', args=[analysis.id]))
+        self.assertEqual(
+            [(v['position'], v['context']) for v in page.context['result']['detailed_violations']],
+            [(v['position'], v['context']) for v in detailed]
+        )
+        self.assertEqual(page.context['result']['extracted_text'], text)
+
+        # 이 기능 이전에 저장된 분석처럼 (결과 JSON 에 상세 위반 정보 포함) 만든 뒤 채우기
+        ViolationSpan.objects.all().delete()
+        ComplianceAnalysis.objects.update(violation_count=0, high_severity_count=0, medium_severity_count=0,
+                                          total_characters=0, analysis_result=response['result'])
+        # 일별 집계 마이그레이션은 채우기 전의 분석으로 집계를 만들고, 채우기가 바뀐 만큼 반영
+        import_module('compliance_checker.migrations.0018_fill_daily_rollups').fill_daily_rollups(apps, None)
+        self.assertFalse(DailyViolationRollup.objects.exists())
+        call_command('backfill_violation_spans', stdout=io.StringIO())
+        analysis.refresh_from_db()
+        self.assertEqual((analysis.violation_count, analysis.high_severity_count), (3, 2))
+        self.assertEqual(analysis.violation_spans.count(), 3)
+        self.assertNotIn('detailed_violations', analysis.analysis_result)
+        self.assertEqual(DailyAnalysisRollup.objects.get().violation_count, 3)
+        self.assertEqual(
+            sorted(DailyViolationRollup.objects.values_list('category', 'violation_count', 'analysis_count')),
+            [('과장·절대적 표현', 1, 1), ('비교광고', 2, 1)]
+        )
+
+
+class HistoryTestCase(TestCase):
+    def test_counts_and_ai_flag_from_columns(self):
+        """히스토리는 저장된 AI 개선 방안 여부와 한 번의 집계 쿼리로 건수를 표시"""
+        for index, status in enumerate(['적합', '부분적합', '부적합', '부적합']):
+            analysis = ComplianceAnalysis(input_type='text')
+            analysis.apply_result({
+                'overall_score': 90 - index * 20, 'compliance_status': status, 'risk_level': 'low',
+                'violations': [], 'recommendations': [],
+                'ai_improvements': [{'improved_text': '개선'}] if index == 0 else []
+            })
+            analysis.input_text = f'광고 문구 {index}'
+            analysis.save()
+
+        response = self.client.get('/history/', {'search': '문구'})
+        self.assertEqual(
+            [response.context[key] for key in ('total_count', 'compliant_count', 'partial_count', 'non_compliant_count')],
+            [4, 1, 1, 2]
+        )
+        flags = {analysis.compliance_status: analysis.has_ai_improvements for analysis in response.context['analyses']}
+        self.assertEqual(flags, {'적합': True, '부분적합': False, '부적합': False})
+
+
+class DailyRollupTestCase(TestCase):
+    def setUp(self):
+        get_result_lru().clear()
+        rule = ComplianceRule.objects.create(
+            category='비교광고', title='비교광고 금지', description='비교광고',
+            severity='high', penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+        )
+        ComplianceKeyword.objects.create(rule=rule, keyword='다른 병원보다')
+
+    @staticmethod
+    def rollup_rows():
+        return (
+            sorted(DailyAnalysisRollup.objects.exclude(analysis_count=0).values_list(
+                'date', 'input_type', 'risk_level', 'compliance_status', 'analysis_count', 'score_sum',
+                'violation_count', 'high_severity_count'
+            )),
+            sorted(DailyViolationRollup.objects.exclude(violation_count=0).values_list(
+                'date', 'category', 'severity', 'violation_count', 'analysis_count'
+            )),
+        )
+
+    def test_rollups_follow_inserts_and_deletes(self):
+        """일별 집계는 저장/삭제 때 증감하고 원본에서 다시 계산한 값과 같다"""
+        ids = []
+        for text in ('다른 병원보다 빠릅니다. 다른 병원보다 쌉니다.', '정기 검진을 권장합니다.', '다른 병원보다 친절합니다.'):
+            ids.append(self.client.post(
+                '/api/analyze/text/', data=json.dumps({'text': text}), content_type='application/json'
+            ).json()['analysis_id'])
+        self.client.delete(f'/api/analysis/{ids[2]}/delete/')
+
+        stats = self.client.get('/api/statistics/').json()
+        self.assertEqual(sum(row['count'] for row in stats['daily_stats']), 2)
+        self.assertEqual(stats['category_stats'], [
+            {'category': '비교광고', 'severity': 'high', 'count': 2, 'analysis_count': 1}
+        ])
+
+        # 재계산으로 준수 상태가 바뀐 분석은 이전 집계 키에서 빠지고 새 키에 더해짐
+        ComplianceRule.objects.update(match_weight=30)
+        call_command('rescore_analyses', stdout=io.StringIO())
+        self.assertEqual(DailyAnalysisRollup.objects.get(compliance_status='부적합').score_sum, 45)
+
+        incremental = self.rollup_rows()
+        call_command('rebuild_analysis_rollups', stdout=io.StringIO())
+        self.assertEqual(self.rollup_rows(), incremental)
+
+
+@override_settings(COMPLIANCE_JOBS_EAGER=True)
+class PdfReportTestCase(TestCase):
+    def setUp(self):
+        get_result_lru().clear()
+        rule = ComplianceRule.objects.create(
+            category='비교광고', title='비교광고 금지', description='비교광고',
+            severity='high', penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+        )
+        ComplianceKeyword.objects.create(rule=rule, keyword='다른 병원보다')
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = self.settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root.name
+
+    def stored_reports(self):
+        return sorted(name for _, _, files in os.walk(self.media_root) for name in files)
+
+    def test_report_rendered_once_and_cached(self):
+        """PDF 리포트는 처음 한 번 만들고 이후에는 저장된 파일을 내려준다"""
+        analysis_id = self.client.post(
+            '/api/analyze/text/', data=json.dumps({'text': '다른 병원보다 빠릅니다.'}), content_type='application/json'
+        ).json()['analysis_id']
+
+        first = self.client.get(f'/api/export/pdf/{analysis_id}/')
+        self.assertEqual(first['Content-Type'], 'application/pdf')
+        content = b''.join(first.streaming_content)
+        self.assertTrue(content.startswith(b'%PDF'))
+        self.assertEqual(len(self.stored_reports()), 1)
+
+        second = self.client.get(f'/api/export/pdf/{analysis_id}/')
+        self.assertEqual(b''.join(second.streaming_content), content)
+        self.assertEqual(len(self.stored_reports()), 1)
+
+        # 위반 구간이 많은 리포트는 백그라운드 작업으로 생성 (테스트에서는 즉시 실행)
+        with self.settings(COMPLIANCE_REPORT_BACKGROUND_THRESHOLD=1):
+            ComplianceAnalysis.objects.filter(id=analysis_id).update(overall_score=70)
+            response = self.client.get(f'/api/export/pdf/{analysis_id}/')
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+        self.assertEqual(len(self.stored_reports()), 2)
+
+    def _analysis(self):
+        return ComplianceAnalysis.objects.get(id=self.client.post(
+            '/api/analyze/text/', data=json.dumps({'text': '다른 병원보다 빠릅니다.'}), content_type='application/json'
+        ).json()['analysis_id'])
+
+    def test_missing_korean_font_logged(self):
+        """한글 글꼴 없이 만든 리포트는 한글이 깨지므로 오류를 기록"""
+        with self.assertLogs('compliance_checker.reports', 'ERROR'):
+            render_report(self._analysis(), None)
+
+    @skipUnless(resolve_font_path(), '한글 글꼴이 설치되지 않음 (fonts-nanum)')
+    def test_korean_font_embedded(self):
+        """설치된 한글 글꼴은 한글 글리프를 포함하고 PDF 에 TTF 로 포함됨"""
+        font_path = resolve_font_path()
+        self.assertIn(ord('한'), TTFont(font_path).getBestCmap())
+        self.assertIn(b'/FontFile2', render_report(self._analysis(), font_path))
+
+
+@override_settings(COMPLIANCE_SCORING_HEADLINE_CHARS=20, COMPLIANCE_SCORING_FOOTER_CHARS=20)
+class ScoringTestCase(TestCase):
+    def setUp(self):
+        get_result_lru().clear()
+        set_scoring_engine(None)
+        self.addCleanup(set_scoring_engine, None)
+        self.rule = ComplianceRule.objects.create(
+            category='비교광고', title='비교광고 금지', description='비교광고',
+            severity='high', penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+        )
+        ComplianceKeyword.objects.create(rule=self.rule, keyword='다른 병원보다')
+        self.text = '다른 병원보다 빠릅니다. ' + '진료 안내입니다. ' * 10 + '다른 병원보다 쌉니다. 다른 병원보다 친절합니다.'
+
+    def test_rule_weights_and_rescoring_from_spans(self):
+        """기본 가중치는 규칙당 고정 차감, 바뀐 가중치는 저장된 위반 구간으로 재계산"""
+        response = self.client.post(
+            '/api/analyze/text/', data=json.dumps({'text': self.text}), content_type='application/json'
+        ).json()
+        self.assertEqual(response['result']['overall_score'], 75)
+
+        # 추가 위반 2건 × 5 + 머리말 1건 × 2 + 꼬리말 1건 × -1
+        self.rule.match_weight, self.rule.headline_weight, self.rule.footer_weight = 5, 2, -1
+        self.rule.save()
+        call_command('rescore_analyses', stdout=io.StringIO())
+        analysis = ComplianceAnalysis.objects.get(id=response['analysis_id'])
+        self.assertEqual((analysis.overall_score, analysis.compliance_status), (64, '부분적합'))
+        self.assertEqual(analysis.analysis_result['overall_score'], 64)
+
+        # 원문을 다시 분석해도 같은 점수
+        self.assertEqual(ComplianceAnalyzer(get_rule_snapshot(), enable_ai=False).analyze_text(self.text)['overall_score'], 64)
+
+    def test_rule_reload_keeps_spans_scorable(self):
+        """규칙을 다시 로드해도 ID 가 유지되고, 재계산은 (카테고리, 제목)으로 규칙을 찾으며 못 찾으면 건너뜀"""
+        call_command('load_compliance_rules', stdout=io.StringIO())
+        rule_ids = set(ComplianceRule.objects.filter(is_active=True).values_list('id', flat=True))
+        analysis_id = self.client.post(
+            '/api/analyze/text/', data=json.dumps({'text': '최고의 시술, 다른 병원보다 빠릅니다.'}),
+            content_type='application/json'
+        ).json()['analysis_id']
+        analysis = ComplianceAnalysis.objects.get(id=analysis_id)
+        self.assertLess(analysis.overall_score, 100)
+
+        call_command('load_compliance_rules', stdout=io.StringIO())
+        self.assertEqual(set(ComplianceRule.objects.filter(is_active=True).values_list('id', flat=True)), rule_ids)
+        self.assertFalse(ViolationSpan.objects.filter(analysis_id=analysis_id, rule__isnull=True).exists())
+        self.rule.refresh_from_db()
+        self.assertFalse(self.rule.is_active)
+
+        # 규칙 연결이 끊긴 구간도 (카테고리, 제목)으로 같은 규칙을 찾아 점수 유지
+        ViolationSpan.objects.filter(analysis_id=analysis_id).update(rule=None)
+        call_command('rescore_analyses', stdout=io.StringIO())
+        self.assertEqual(ComplianceAnalysis.objects.get(id=analysis_id).overall_score, analysis.overall_score)
+
+        ViolationSpan.objects.filter(analysis_id=analysis_id).update(title='삭제된 규칙')
+        output = io.StringIO()
+        call_command('rescore_analyses', stdout=output)
+        self.assertIn('1건 건너뜀', output.getvalue())
+        self.assertEqual(ComplianceAnalysis.objects.get(id=analysis_id).overall_score, analysis.overall_score)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, COMPLIANCE_JOBS_EAGER=True, COMPLIANCE_BATCH_WORKERS=1)
+class BatchAnalysisTestCase(TestCase):
+    def setUp(self):
+        rule = ComplianceRule.objects.create(
+            category='비교광고', title='비교광고 금지', description='비교광고 금지',
+            severity='high', penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+        )
+        ComplianceKeyword.objects.create(rule=rule, keyword='다른 병원보다')
+
+    def test_batch_endpoint_bulk_inserts(self):
+        """일괄 분석 API는 작업으로 접수해 항목별 결과를 저장하고 잘못된 항목은 실패로 기록"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/analyze/batch/', data=json.dumps({'items': [
+                {'text': '다른 병원보다 빠른 회복', 'id': 'ad-1'},
+                {'text': '정기 검진을 권장합니다.', 'id': 'ad-2'},
+                {'path': '/etc/passwd'},
+            ]}), content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        payload = self.client.get(response.json()['status_url']).json()
+        self.assertEqual(payload['status'], 'completed')
+
+        self.assertEqual((payload['total'], payload['completed'], payload['failed']), (3, 2, 1))
+        self.assertEqual([item['reference'] for item in payload['items']][:2], ['ad-1', 'ad-2'])
+        analyses = ComplianceAnalysis.objects.in_bulk(payload['analysis_ids'])
+        self.assertEqual(analyses[payload['analysis_ids'][0]].violations[0]['category'], '비교광고')
+        self.assertEqual(analyses[payload['analysis_ids'][1]].overall_score, 100)
+        self.assertEqual(analyses[payload['analysis_ids'][2]].status, 'failed')
+
+    def test_batch_zip_upload_read_by_worker(self):
+        """업로드한 zip 은 저장소에 보관했다가 작업이 다시 읽고 끝나면 삭제"""
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zip_file:
+            zip_file.writestr('ads/a.txt', '다른 병원보다 빠른 회복')
+            zip_file.writestr('ads/b.txt', '정기 검진을 권장합니다.')
+        with self.settings(MEDIA_ROOT=media_root.name), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/analyze/batch/', {
+                'file': SimpleUploadedFile('ads.zip', archive.getvalue())
+            })
+        payload = self.client.get(response.json()['status_url']).json()
+
+        self.assertEqual((payload['status'], payload['completed']), ('completed', 2))
+        self.assertEqual([item['reference'] for item in payload['items']], ['ads/a.txt', 'ads/b.txt'])
+        self.assertEqual(os.listdir(os.path.join(media_root.name, 'batch_uploads')), [])
+
+
+@override_settings(CACHES=LOCMEM_CACHES, COMPLIANCE_JOBS_EAGER=True, COMPLIANCE_BATCH_WORKERS=1)
+class ReevaluationTestCase(TestCase):
+    def setUp(self):
+        get_result_lru().clear()
+        rule = ComplianceRule.objects.create(
+            category='비교광고', title='비교광고 금지', description='비교광고 금지',
+            severity='high', penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+        )
+        ComplianceKeyword.objects.create(rule=rule, keyword='다른 병원보다')
+
+    def test_rule_change_reevaluates_stored_analyses(self):
+        """규칙 변경 후 재평가 작업은 저장된 분석을 새 규칙으로 갱신하고 준수 상태 변경을 기록"""
+        with self.captureOnCommitCallbacks(execute=True):
+            status_url = self.client.post('/api/analyze/batch/', data=json.dumps({'items': [
+                {'text': '다른 병원보다 빠른 회복'}, {'text': '정기 검진을 권장합니다.'},
+            ]}), content_type='application/json').json()['status_url']
+        ids = self.client.get(status_url).json()['analysis_ids']
+
+        rule = ComplianceRule.objects.create(
+            category='과장 표현', title='과장 표현 금지', description='과장 표현 금지',
+            severity='high', penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+        )
+        ComplianceKeyword.objects.create(rule=rule, keyword='빠른 회복')
+        with self.captureOnCommitCallbacks(execute=True):
+            run = submit_reevaluation()
+
+        run.refresh_from_db()
+        # 새 규칙의 체크리스트 항목이 추가되므로 두 분석 모두 결과가 바뀌지만 준수 상태는 하나만 바뀜
+        self.assertEqual((run.status, run.processed_count, run.changed_count), ('completed', 2, 2))
+        self.assertEqual(run.status_changes, [
+            {'analysis_id': ids[0], 'from': '부분적합', 'to': '부적합', 'score_from': 75, 'score_to': 50}
+        ])
+        analyses = ComplianceAnalysis.objects.in_bulk(ids)
+        self.assertEqual(analyses[ids[0]].violation_spans.count(), 2)
+        self.assertEqual({analysis.rule_version for analysis in analyses.values()}, {run.rule_version})
+        self.assertEqual(
+            DailyAnalysisRollup.objects.get(compliance_status='부적합').score_sum, 50
+        )
+        self.assertFalse(DailyAnalysisRollup.objects.filter(compliance_status='부분적합', analysis_count__gt=0).exists())
+
+        # 모두 현재 버전이면 다시 실행해도 검사할 분석이 없음
+        self.assertEqual(reevaluate_analyses().processed, 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, COMPLIANCE_AI_BATCH_SIZE=2)
+class AIEnrichmentTestCase(TestCase):
+    def setUp(self):
+        self.client_stub = FakeAnthropicClient()
+        set_ai_client(self.client_stub)
+        self.addCleanup(set_ai_client, None)
+        for category, keyword in (('비교광고', '다른 병원보다'), ('과장·절대적 표현', '최고'),
+                                  ('환자체험담·후기', '치료 후기')):
+            rule = ComplianceRule.objects.create(
+                category=category, title=f'{category} 금지', description=category,
+                severity='high', penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+            )
+            ComplianceKeyword.objects.create(rule=rule, keyword=keyword)
+
+    def test_batched_and_memoized_improvements(self):
+        """위반 항목을 묶어 요청하고 같은 위반은 캐시된 응답 재사용"""
+        text = "다른 병원보다 저렴합니다.\n\n최고의 의료진.\n\n생생한 치료 후기를 확인하세요."
+        result = ComplianceAnalyzer().analyze_text(text)
+        self.assertEqual(len(result['ai_improvements']), 3)
+        self.assertEqual(len(self.client_stub.calls), 2)
+        self.assertEqual(result['ai_improvements'][0]['suggestions']['improved_keyword'], '대체 표현')
+
+        ComplianceAnalyzer().analyze_text(text)
+        self.assertEqual(len(self.client_stub.calls), 2)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class IncrementalAnalysisTestCase(TestCase):
+    def setUp(self):
+        get_result_lru().clear()
+        self.client_stub = FakeAnthropicClient()
+        set_ai_client(self.client_stub)
+        self.addCleanup(set_ai_client, None)
+        for category, keyword in (('비교광고', '다른 병원보다'), ('과장·절대적 표현', '최고'),
+                                  ('환자체험담·후기', '치료 후기')):
+            rule = ComplianceRule.objects.create(
+                category=category, title=f'{category} 금지', description=category,
+                severity='high', penalty='벌금', legal_basis='의료법 제56조', improvement_guide='삭제'
+            )
+            ComplianceKeyword.objects.create(rule=rule, keyword=keyword)
+
+    def test_edit_reuses_unchanged_violations(self):
+        """수정된 문장만 다시 검사하고 AI 는 새 위반 항목에만 호출"""
+        filler = "진료 시간은 평일 오전 9시부터입니다. " * 20
+        original = f"다른 병원보다 저렴합니다.\n\n{filler}{filler}\n\n최고의 의료진."
+        first = self.client.post(
+            '/api/analyze/text/', data=json.dumps({'text': original}), content_type='application/json'
+        ).json()
+        self.assertEqual(len(self.client_stub.calls), 2)
+
+        edited = f"다른 병원보다 저렴합니다.\n\n{filler}생생한 치료 후기를 확인하세요. {filler}\n\n최고의 의료진."
+        response = self.client.post(
+            '/api/analyze/incremental/',
+            data=json.dumps({'previous_analysis_id': first['analysis_id'], 'text': edited}),
+            content_type='application/json'
+        ).json()
+        self.assertEqual(response['incremental']['mode'], 'incremental')
+        self.assertEqual(response['incremental']['changed_ranges'], 1)
+        self.assertEqual(len(self.client_stub.calls), 3)
+
+        full = ComplianceAnalyzer(enable_ai=False).analyze_text(edited)
+        self.assertEqual(response['result']['detailed_violations'], full['detailed_violations'])
+        self.assertEqual(len(response['result']['ai_improvements']), 3)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, COMPLIANCE_JOBS_EAGER=True, COMPLIANCE_CITATION_LAW_FILES={})
+class CitationIndexTestCase(TestCase):
+    def setUp(self):
+        get_result_lru().clear()
+        rule = ComplianceRule.objects.create(
+            category='비교광고', title='비교광고 금지', description='비교광고 금지',
+            severity='high', penalty='벌금', legal_basis='의료법 제56조 제2항 제4호', improvement_guide='삭제'
+        )
+        ComplianceKeyword.objects.create(rule=rule, keyword='다른 병원보다')
+
+    def test_violations_cite_indexed_guideline_passages(self):
+        """가이드라인 문서 저장/수정/삭제가 색인에 반영되고 위반마다 근거 문단이 붙음"""
+        with self.captureOnCommitCallbacks(execute=True):
+            document = GuidelineDocument.objects.create(
+                title='비교광고 심의기준', category='guidelines',
+                content='# 비교광고\n\n다른 의료기관과 비교하는 광고는 의료법 제56조 제2항 제4호에 따라 금지됩니다.'
+                        '\n\n# 수수료\n\n' + '광고 심의 수수료는 1면당 11만원입니다. ' * 20
+            )
+            GuidelineDocument.objects.create(title='시행일 안내', category='notices', content='2025년 1월 시행')
+        self.assertEqual(CitationSource.objects.get(source_key=str(document.id)).passage_count, 2)
+
+        analysis_id = self.client.post(
+            '/api/analyze/text/', data=json.dumps({'text': '다른 병원보다 저렴합니다.'}), content_type='application/json'
+        ).json()['analysis_id']
+        violation = self.client.get(f'/api/analysis/{analysis_id}/violations/').json()['violations'][0]
+        self.assertEqual(violation['citations'][0]['source_title'], '비교광고 심의기준')
+        self.assertIn('비교하는 광고', violation['citations'][0]['text'])
+
+        # 내용이 같은 저장은 색인을 다시 만들지 않음
+        index = get_citation_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            document.save()
+        self.assertIs(get_citation_index(), index)
+        with self.captureOnCommitCallbacks(execute=True):
+            document.delete()
+        self.assertIsNot(get_citation_index(), index)
+        self.assertEqual(get_citation_index().search('비교광고'), [])
+
+
+@override_settings(CACHES=LOCMEM_CACHES, COMPLIANCE_JOBS_EAGER=True, COMPLIANCE_CITATION_LAW_FILES={})
+class GuidelineUploadTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = self.settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+
+    def upload(self, name, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/guidelines/upload/', {
+                'file': SimpleUploadedFile(name, content), 'title': name
+            }).json()
+        return MedicalGuideline.objects.get(id=response['guideline_id'])
+
+    def test_extraction_queued_and_shared_by_identical_files(self):
+        """업로드 후 백그라운드에서 추출하고 같은 파일은 저장 파일과 추출 결과를 공유"""
+        content = '비교광고 심의기준\n\n다른 의료기관과 비교하는 광고는 금지됩니다.'.encode('utf-8')
+        first = self.upload('기준.txt', content)
+        self.assertEqual((first.extraction_status, first.extraction_progress), ('completed', 100))
+        self.assertIn('비교하는 광고', first.extracted_text)
+        self.assertEqual(CitationSource.objects.filter(source_type='guideline').count(), 1)
+
+        second = self.upload('기준 사본.txt', content)
+        self.assertEqual(second.extraction_status, 'completed')
+        self.assertEqual((second.file.name, second.extracted_text), (first.file.name, first.extracted_text))
+
+        self.client.logout()
+        anonymous = self.client.post('/api/guidelines/upload/', {'file': SimpleUploadedFile('a.txt', content)})
+        self.assertEqual(anonymous.status_code, 302)
+        self.assertEqual(MedicalGuideline.objects.count(), 2)
+        self.client.force_login(User.objects.get(username='staff'))
+
+        broken = self.upload('손상.pdf', b'not a pdf')
+        self.assertEqual(broken.extraction_status, 'failed')
+        self.assertTrue(broken.extraction_error)
+        detail = self.client.get(f'/api/guidelines/{broken.id}/').json()['guideline']
+        self.assertEqual(detail['extraction_status'], 'failed')
+
+    def test_extraction_claimed_in_database(self):
+        """다른 워커가 추출 중인 파일은 기다리고, 제한 시간이 지난 추출은 실패 처리 후 다시 맡음"""
+        content = '비교광고 심의기준'.encode('utf-8')
+        first = self.upload('기준.txt', content)
+        # 다른 워커 프로세스가 같은 파일을 추출하는 중
+        MedicalGuideline.objects.filter(id=first.id).update(
+            extraction_status='running', extraction_started_at=timezone.now(), extracted_text=''
+        )
+        waiting = self.upload('기준 사본.txt', content)
+        self.assertEqual(waiting.extraction_status, 'pending')
+        detail = self.client.get(f'/api/guidelines/{waiting.id}/').json()['guideline']
+        self.assertEqual(detail['extraction_status'], 'pending')
+
+        # 그 워커가 끝내지 못하고 제한 시간이 지나면 기다리던 행과 함께 실패 처리
+        long_ago = timezone.now() - timedelta(hours=1)
+        MedicalGuideline.objects.filter(id=first.id).update(extraction_started_at=long_ago)
+        MedicalGuideline.objects.filter(id=waiting.id).update(uploaded_at=long_ago)
+        detail = self.client.get(f'/api/guidelines/{waiting.id}/').json()['guideline']
+        self.assertEqual(detail['extraction_status'], 'failed')
+        self.assertEqual(MedicalGuideline.objects.get(id=first.id).extraction_status, 'failed')
+
+        self.assertEqual(self.upload('기준 재업로드.txt', content).extraction_status, 'completed')
+
+
+@override_settings(CACHES=LOCMEM_CACHES, COMPLIANCE_GUIDELINE_SNAPSHOT_INTERVAL=3)
+class GuidelineVersionTestCase(TestCase):
+    def test_history_stored_as_deltas_and_reconstructed(self):
+        """편집은 변경 목록으로 저장되고 모든 과거 버전을 복원·비교할 수 있음"""
+        lines = [f'{index}. 의료광고 심의기준 조항 {index} 의 내용입니다.' for index in range(300)]
+        document_id = self.client.post('/api/guideline-documents/', data=json.dumps({
+            'title': '심의기준', 'category': 'guidelines', 'content': '\n'.join(lines)
+        }), content_type='application/json').json()['document_id']
+
+        contents = ['\n'.join(lines)]
+        for edit in range(5):
+            lines[edit * 50] = f'개정된 조항 {edit}'
+            contents.append('\n'.join(lines))
+            self.client.post(f'/api/guideline-documents/{document_id}/update/', data=json.dumps({
+                'content': contents[-1], 'update_reason': f'개정 {edit}'
+            }), content_type='application/json')
+
+        versions = list(GuidelineVersion.objects.filter(document_id=document_id).order_by('version'))
+        self.assertEqual([version.is_snapshot for version in versions], [True, False, False, True, False, False])
+        self.assertLess(len(versions[1].payload), len(versions[0].payload) // 10)
+
+        cache.clear()
+        for number, content in enumerate(contents, 1):
+            response = self.client.get(f'/api/guideline-documents/{document_id}/versions/{number}/').json()
+            self.assertEqual(response['content'], content)
+
+        update = GuidelineUpdate.objects.filter(document_id=document_id, update_type='content_update').earliest('id')
+        detail = self.client.get(f'/api/guideline-updates/{update.id}/').json()['update']
+        self.assertEqual((detail['previous_version'], detail['version']), (1, 2))
+        self.assertEqual((detail['added_lines'], detail['removed_lines']), (1, 1))
+        self.assertIn('+개정된 조항 0', detail['changes'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES, COMPLIANCE_JOBS_EAGER=True, COMPLIANCE_AI_GUIDELINE_CHUNK_CHARS=1000,
+                   COMPLIANCE_AI_REQUESTS_PER_MINUTE=0)
+class GuidelineAIAnalysisTestCase(TestCase):
+    def setUp(self):
+        def responder(prompt):
+            part = re.search(r'(\d+)번째 부분', prompt).group(1)
+            return json.dumps({
+                'summary': f'{part}부 요약',
+                'key_points': ['비교광고 금지', f'{part}부 핵심'],
+                'recommendations': ['심의 절차 준수'],
+                'risk_level': 'high' if part == '2' else 'low',
+                'compliance_score': 60 if part == '2' else 90
+            }, ensure_ascii=False)
+
+        self.client_stub = FakeAnthropicClient(responder)
+        set_ai_client(self.client_stub)
+        self.addCleanup(set_ai_client, None)
+        paragraph = '다른 의료기관과 비교하는 광고와 치료 경험담을 이용한 광고는 금지됩니다. ' * 10
+        self.document = GuidelineDocument.objects.create(
+            title='심의기준', category='guidelines', content='\n\n'.join([paragraph] * 6)
+        )
+
+    def analyze(self, document_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f'/api/guideline-documents/{document_id}/analyze/', data=json.dumps({
+                'analysis_type': 'compliance_check'
+            }), content_type='application/json')
+
+    def test_chunked_analysis_merged_and_cached(self):
+        """긴 문서는 작업으로 조각별 요청 후 합치고, 같은 내용의 재요청은 API 키 없이도 저장된 결과 사용"""
+        response = self.analyze(self.document.id)
+        self.assertEqual(response.status_code, 202)
+        response = response.json()
+        status = self.client.get(response['status_url']).json()['result']
+        self.assertEqual(status['status'], 'completed')
+        calls = len(self.client_stub.calls)
+        result = status['analysis_result']
+        self.assertEqual((result['chunks'], result['failed_chunks']), (calls, 0))
+        self.assertGreater(calls, 1)
+        self.assertEqual(result['risk_level'], 'high')
+        self.assertLess(result['compliance_score'], 90)
+        self.assertEqual(result['key_points'][0], '비교광고 금지')
+        self.assertEqual(result['recommendations'], ['심의 절차 준수'])
+
+        analysis = AIAnalysisResult.objects.get(id=response['analysis_id'])
+        self.assertEqual(analysis.status, 'completed')
+        self.assertGreater(analysis.processing_time, 0)
+
+        set_ai_client(None)
+        copy = GuidelineDocument.objects.create(title='사본', category='guidelines', content=self.document.content)
+        for document_id in (self.document.id, copy.id):
+            cached = self.analyze(document_id).json()
+            self.assertTrue(cached['cached'])
+            self.assertEqual(cached['result'], result)
+        self.assertEqual(len(self.client_stub.calls), calls)
+
+        # 저장된 결과가 없는 문서만 API 설정이 필요
+        other = GuidelineDocument.objects.create(title='다른 문서', category='guidelines', content='새 내용')
+        self.assertEqual(self.analyze(other.id).status_code, 400)
+
+
+class BenchmarkTestCase(SimpleTestCase):
+    def test_corpus_matches_golden_offline(self):
+        """저장된 코퍼스 판정이 골든 결과와 같고 측정값이 채워짐 (느린 대용량 PDF 항목은 제외)"""
+        case_ids = [case['id'] for case in load_manifest() if case['kind'] != 'pdf']
+        benchmark = run_benchmark(repeat=1, warmup=0, case_ids=case_ids)
+        self.assertEqual(compare_golden(benchmark, load_golden()), [])
+        for report in benchmark['cases']:
+            self.assertGreater(report['documents_per_second'], 0)
+            self.assertGreater(report['peak_memory_kb'], 0)
+            self.assertIn('analyze', report['stages_ms'])
+
+        pages = ['최고의 의료진\n다른 병원보다 저렴', 'Page 2 후기']
+        self.assertEqual(TextExtractor.extract_from_pdf(build_pdf(pages)), '최고의 의료진\n다른 병원보다 저렴\n\nPage 2 후기')
@@ -0,0 +1,86 @@
+import re
+from bisect import bisect_left, bisect_right
+from typing import Tuple
+
+
+class TextIndex:
+    """줄/문단/문장 경계 오프셋 인덱스
+
+    분석 한 번에 한 번만 만들고, 위반 위치마다 텍스트를 다시 나누거나 한 글자씩
+    훑는 대신 정렬된 오프셋 목록을 이분 탐색해 위치 정보를 계산한다.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.length = len(text)
+
+        newlines = [m.start() for m in re.finditer('\n', text)]
+        # 줄 끝 오프셋 (text.split('\n') 의 각 줄 끝)
+        self.line_starts = [0] + [position + 1 for position in newlines]
+        self.line_ends = newlines + [self.length]
+
+        # text.split('\n\n') 기준 문단 경계 (구분자 2글자 포함)
+        separators = [m.start() for m in re.finditer('\n\n', text)]
+        self.paragraph_limits = [position + 2 for position in separators] + [self.length + 2]
+
+        # 빈 줄("\n\n")이 시작되는 모든 위치 (겹치는 위치 포함)
+        self.blank_lines = [
+            position for position in newlines
+            if position + 1 < self.length and text[position + 1] == '\n'
+        ]
+
+        # 문장 경계 ('.' 위치)
+        self.sentence_breaks = [m.start() for m in re.finditer(r'\.', text)]
+
+    def line_and_column(self, position: int) -> Tuple[int, int]:
+        """줄 번호와 열 번호 (1부터 시작)"""
+        index = bisect_left(self.line_ends, position)
+        if index >= len(self.line_ends):
+            return len(self.line_ends), 1
+        return index + 1, position - self.line_starts[index] + 1
+
+    def line_number(self, position: int) -> int:
+        """줄 번호 (1부터 시작)"""
+        return self.line_and_column(position)[0]
+
+    def paragraph_number(self, position: int) -> int:
+        """문단 번호 (1부터 시작)"""
+        index = bisect_left(self.paragraph_limits, position)
+        return min(index, len(self.paragraph_limits) - 1) + 1
+
+    def paragraph_bounds(self, position: int) -> Tuple[int, int]:
+        """위치를 감싸는 빈 줄 사이 구간의 시작/끝 오프셋"""
+        before = bisect_right(self.blank_lines, position - 2) - 1
+        start = self.blank_lines[before] + 2 if before >= 0 else 0
+        after = bisect_left(self.blank_lines, position)
+        end = self.blank_lines[after] if after < len(self.blank_lines) else self.length
+        return start, end
+
+    def paragraph_context(self, position: int) -> str:
+        """위치가 속한 단락 텍스트"""
+        start, end = self.paragraph_bounds(position)
+        return self.text[start:end].strip()
+
+    def sentence_bounds(self, start: int, end: int, pivot: int) -> Tuple[int, int]:
+        """[start, end) 구간에서 pivot 을 감싸는 문장 범위 (start 기준 상대 오프셋)
+
+        pivot 이전 마지막 '.' 다음부터 pivot 이후 첫 '.' 직전까지이며,
+        '.' 이 없으면 구간의 처음/끝을 사용한다.
+        """
+        before = bisect_left(self.sentence_breaks, min(pivot, end)) - 1
+        if before >= 0 and self.sentence_breaks[before] >= start:
+            sentence_start = self.sentence_breaks[before] - start + 1
+        else:
+            sentence_start = 0
+        after = bisect_left(self.sentence_breaks, pivot)
+        if after < len(self.sentence_breaks) and self.sentence_breaks[after] < end:
+            sentence_end = self.sentence_breaks[after] - start
+        else:
+            sentence_end = end - start
+        return sentence_start, sentence_end
+
+    def position_percentage(self, position: int) -> float:
+        """전체 텍스트에서의 위치 비율 (%)"""
+        if not self.length:
+            return 0.0
+        return (position / self.length) * 100
@@ -1,3 +1,4 @@
+from django.contrib.admin.views.decorators import staff_member_required
 from django.urls import path
 from . import views
 
@@ -23,19 +24,34 @@ urlpatterns = [
     path('api/analyze/text/', views.analyze_text, name='analyze_text'),
     path('api/analyze/url/', views.analyze_url, name='analyze_url'),
     path('api/analyze/file/', views.analyze_file, name='analyze_file'),
+    path('api/analyze/batch/', views.analyze_batch, name='analyze_batch'),
+    path('api/analyze/batch/<int:batch_id>/status/', views.get_batch_status, name='get_batch_status'),
+    path('api/analyze/incremental/', views.analyze_text_incremental, name='analyze_text_incremental'),
     path('api/analysis/<int:analysis_id>/', views.get_analysis_result, name='get_analysis_result'),
+    path('api/analysis/<int:analysis_id>/status/', views.get_analysis_status, name='get_analysis_status'),
+    path('api/analysis/<int:analysis_id>/violations/', views.get_analysis_violations, name='get_analysis_violations'),
     path('api/analysis/<int:analysis_id>/delete/', views.delete_analysis, name='delete_analysis'),
     path('api/analysis/<int:analysis_id>/detailed-report/', views.get_detailed_report, name='detailed_report'),
+    path('api/statistics/', views.get_statistics, name='get_statistics'),
     path('api/export/pdf/<int:analysis_id>/', views.export_pdf_report, name='export_pdf_report'),
     path('api/ai-analysis/<int:analysis_id>/', views.get_ai_analysis_result, name='get_ai_analysis_result'),
     path('api/violation-improvements/', views.get_violation_improvements, name='get_violation_improvements'),
     path('api/rewrite-text/', views.rewrite_text_with_ai, name='rewrite_text_with_ai'),
     
+    # 의료 가이드라인 파일 API (관리자 화면과 같은 스태프 계정만 사용)
+    path('api/guidelines/upload/', staff_member_required(views.upload_guideline), name='upload_guideline'),
+    path('api/guidelines/<int:guideline_id>/', staff_member_required(views.get_guideline), name='get_guideline'),
+    path('api/guidelines/<int:guideline_id>/download/', staff_member_required(views.download_guideline),
+         name='download_guideline'),
+    path('api/guidelines/<int:guideline_id>/delete/', staff_member_required(views.delete_guideline),
+         name='delete_guideline'),
+    
     # 가이드라인 관리 API
     path('api/guideline-documents/', views.create_guideline_document, name='create_guideline_document'),
     path('api/guideline-documents/<int:document_id>/', views.get_guideline_document, name='get_guideline_document'),
     path('api/guideline-documents/<int:document_id>/update/', views.update_guideline_document, name='update_guideline_document'),
     path('api/guideline-documents/<int:document_id>/delete/', views.delete_guideline_document, name='delete_guideline_document'),
+    path('api/guideline-documents/<int:document_id>/versions/<int:version>/', views.get_guideline_document_version, name='get_guideline_document_version'),
     path('api/guideline-documents/<int:document_id>/analyze/', views.analyze_with_ai, name='analyze_with_ai'),
     path('api/guideline-updates/<int:update_id>/', views.get_guideline_update_detail, name='get_guideline_update_detail'),
 ] 
\ No newline at end of file
@@ -1,9 +1,4 @@
-import PyPDF2
-import docx
-import requests
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -11,27 +6,42 @@ from django.utils import timezone
 import io
 import re
 import logging
+from .extraction import iter_docx_text, iter_file_text, iter_pdf_text, iter_txt_text, join_text
+from .browser_pool import get_browser_pool
+from .http_client import fetch, fetch_all
 
 logger = logging.getLogger(__name__)
 
 def extract_text_from_file(uploaded_file):
-    """업로드된 파일에서 텍스트 추출"""
+    """업로드된 파일에서 텍스트 추출
+
+    파일 전체를 메모리로 읽지 않고 임시 업로드 파일(또는 스트림)에서 페이지/문단 단위로 추출한다.
+    """
     try:
-        file_content = uploaded_file.read()
-        file_name = uploaded_file.name.lower()
-        
-        if file_name.endswith('.pdf'):
-            return TextExtractor.extract_from_pdf(file_content)
-        elif file_name.endswith(('.docx', '.doc')):
-            return TextExtractor.extract_from_docx(file_content)
-        elif file_name.endswith('.txt'):
-            return TextExtractor.extract_from_txt(file_content)
-        else:
-            raise ValueError('지원하지 않는 파일 형식입니다. (PDF, Word, 텍스트 파일만 지원)')
+        return join_text(iter_file_text(uploaded_file))
     except Exception as e:
         logger.error(f"파일 텍스트 추출 실패: {e}")
         raise ValueError(f"파일에서 텍스트를 추출할 수 없습니다: {str(e)}")
 
+def extract_text_from_url(url, simple_mode=False):
+    """URL에서 분석용 텍스트 추출 (공백 정리 및 최소 길이 확인 포함)"""
+    text = WebTextExtractor.extract_from_url(url, simple_mode=simple_mode)
+    
+    logger.info(f"URL: {url}")
+    logger.info(f"추출된 텍스트 길이: {len(text) if text else 0}")
+    logger.info(f"추출된 텍스트 미리보기: {text[:200] if text else 'None'}...")
+    
+    if not text:
+        raise ValueError('웹페이지에서 텍스트를 추출할 수 없습니다. 다른 URL을 시도해보세요.')
+    
+    # 텍스트 정리
+    text = re.sub(r'\s+', ' ', text).strip()
+    
+    if len(text) < 10:
+        raise ValueError('웹페이지에서 의미있는 텍스트를 추출할 수 없습니다. 다른 URL을 시도해보세요.')
+    
+    return text
+
 class TextExtractor:
     """텍스트 추출 클래스"""
     
@@ -39,13 +49,7 @@ class TextExtractor:
     def extract_from_pdf(file_content):
         """PDF에서 텍스트 추출"""
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            text = ""
-            
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text.strip()
+            return join_text(iter_pdf_text(io.BytesIO(file_content)))
         except Exception as e:
             logger.error(f"PDF 텍스트 추출 실패: {e}")
             raise ValueError("PDF에서 텍스트를 추출할 수 없습니다. 이미지 기반 PDF이거나 보호된 파일일 수 있습니다.")
@@ -54,13 +58,7 @@ class TextExtractor:
     def extract_from_docx(file_content):
         """Word 문서에서 텍스트 추출"""
         try:
-            doc = docx.Document(io.BytesIO(file_content))
-            text = ""
-            
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            return text.strip()
+            return join_text(iter_docx_text(io.BytesIO(file_content)))
         except Exception as e:
             logger.error(f"Word 텍스트 추출 실패: {e}")
             raise ValueError("Word 문서에서 텍스트를 추출할 수 없습니다.")
@@ -68,17 +66,8 @@ class TextExtractor:
     @staticmethod
     def extract_from_txt(file_content):
         """텍스트 파일에서 텍스트 추출"""
-        try:
-            # UTF-8로 디코딩 시도
-            text = file_content.decode('utf-8')
-            return text.strip()
-        except UnicodeDecodeError:
-            try:
-                # CP949로 디코딩 시도 (한글 Windows)
-                text = file_content.decode('cp949')
-                return text.strip()
-            except UnicodeDecodeError:
-                raise ValueError("텍스트 파일의 인코딩을 인식할 수 없습니다.")
+        # UTF-8, 실패 시 CP949(한글 Windows)로 디코딩
+        return join_text(iter_txt_text(io.BytesIO(file_content)))
 
 class WebTextExtractor:
     """웹 페이지에서 텍스트 추출 클래스"""
@@ -104,10 +93,8 @@ class WebTextExtractor:
     def _extract_simple_text(url):
         """자바스크립트 무시, body 전체 + 주요 블록 태그 + meta/title/og:description까지 최대한 텍스트 복사"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=15)
+            # 공유 세션(keep-alive, 재시도) + 디스크 캐시 사용
+            response = fetch(url, timeout=15)
             response.raise_for_status()
             
             # 응답이 HTML인지 확인
@@ -205,94 +192,87 @@ class WebTextExtractor:
     def _extract_with_requests(url):
         """requests를 사용한 텍스트 추출"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
+            # 공유 세션(keep-alive, 재시도) + 디스크 캐시 사용
+            response = fetch(url, timeout=10)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # iframe이 있는지 확인
-            iframes = soup.find_all('iframe')
-            if iframes:
-                logger.info(f"iframe 발견: {len(iframes)}개")
-                return WebTextExtractor._extract_from_iframes(iframes, url)
-            
-            # 불필요한 요소 제거
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # 특정 웹사이트별 특별 처리
-            if 'blog.naver.com' in url:
-                return WebTextExtractor._extract_naver_blog(soup)
-            elif 'facebook.com' in url:
-                return WebTextExtractor._extract_facebook(soup)
-            elif 'instagram.com' in url:
-                return WebTextExtractor._extract_instagram(soup)
-            elif 'youtube.com' in url or 'youtu.be' in url:
-                return WebTextExtractor._extract_youtube(soup)
-            elif 'tistory.com' in url:
-                return WebTextExtractor._extract_tistory(soup)
-            elif 'brunch.co.kr' in url:
-                return WebTextExtractor._extract_brunch(soup)
-            elif 'medium.com' in url:
-                return WebTextExtractor._extract_medium(soup)
-            else:
-                return WebTextExtractor._extract_general_content(soup)
+            return WebTextExtractor.extract_from_html(response.content, url)
                 
         except Exception as e:
             logger.warning(f"requests 추출 실패: {e}")
             return None
     
+    @staticmethod
+    def extract_from_html(content, url):
+        """받아온(또는 저장된) HTML 에서 사이트별 규칙으로 본문 추출 (url 은 사이트 판별과 iframe 주소 계산용)"""
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # iframe이 있는지 확인
+        iframes = soup.find_all('iframe')
+        if iframes:
+            logger.info(f"iframe 발견: {len(iframes)}개")
+            return WebTextExtractor._extract_from_iframes(iframes, url)
+        
+        # 불필요한 요소 제거
+        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
+            element.decompose()
+        
+        # 특정 웹사이트별 특별 처리
+        if 'blog.naver.com' in url:
+            return WebTextExtractor._extract_naver_blog(soup)
+        elif 'facebook.com' in url:
+            return WebTextExtractor._extract_facebook(soup)
+        elif 'instagram.com' in url:
+            return WebTextExtractor._extract_instagram(soup)
+        elif 'youtube.com' in url or 'youtu.be' in url:
+            return WebTextExtractor._extract_youtube(soup)
+        elif 'tistory.com' in url:
+            return WebTextExtractor._extract_tistory(soup)
+        elif 'brunch.co.kr' in url:
+            return WebTextExtractor._extract_brunch(soup)
+        elif 'medium.com' in url:
+            return WebTextExtractor._extract_medium(soup)
+        else:
+            return WebTextExtractor._extract_general_content(soup)
+    
     @staticmethod
     def _extract_with_selenium(url):
-        """Selenium을 사용한 텍스트 추출 (JavaScript 렌더링 필요)"""
+        """Selenium을 사용한 텍스트 추출 (JavaScript 렌더링 필요)
+
+        URL마다 브라우저를 새로 띄우지 않고 공유 브라우저 풀의 세션을 빌려 사용한다.
+        """
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.get(url)
-            
-            # 페이지 로딩 대기
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # iframe이 있는지 확인
-            iframes = driver.find_elements(By.TAG_NAME, "iframe")
-            if iframes:
-                logger.info(f"Selenium에서 iframe 발견: {len(iframes)}개")
-                text = WebTextExtractor._extract_from_iframes_selenium(driver, iframes, url)
-                if text:
-                    driver.quit()
-                    return text.strip()
-            
-            # 특정 웹사이트별 특별 처리 (Selenium)
-            if 'blog.naver.com' in url:
-                text = WebTextExtractor._extract_naver_blog_selenium(driver)
-            elif 'instagram.com' in url:
-                text = WebTextExtractor._extract_instagram_selenium(driver)
-            elif 'youtube.com' in url or 'youtu.be' in url:
-                text = WebTextExtractor._extract_youtube_selenium(driver)
-            elif 'tistory.com' in url:
-                text = WebTextExtractor._extract_tistory_selenium(driver)
-            else:
-                text = driver.find_element(By.TAG_NAME, "body").text
-            
-            driver.quit()
-            return text.strip()
+            with get_browser_pool().session() as driver:
+                driver.get(url)
+                
+                # 페이지 로딩 대기
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+                
+                # iframe이 있는지 확인
+                iframes = driver.find_elements(By.TAG_NAME, "iframe")
+                if iframes:
+                    logger.info(f"Selenium에서 iframe 발견: {len(iframes)}개")
+                    text = WebTextExtractor._extract_from_iframes_selenium(driver, iframes, url)
+                    if text:
+                        return text.strip()
+                
+                # 특정 웹사이트별 특별 처리 (Selenium)
+                if 'blog.naver.com' in url:
+                    text = WebTextExtractor._extract_naver_blog_selenium(driver)
+                elif 'instagram.com' in url:
+                    text = WebTextExtractor._extract_instagram_selenium(driver)
+                elif 'youtube.com' in url or 'youtu.be' in url:
+                    text = WebTextExtractor._extract_youtube_selenium(driver)
+                elif 'tistory.com' in url:
+                    text = WebTextExtractor._extract_tistory_selenium(driver)
+                else:
+                    text = driver.find_element(By.TAG_NAME, "body").text
+                
+                return text.strip()
             
         except Exception as e:
             logger.error(f"Selenium 추출 실패: {e}")
-            if 'driver' in locals():
-                driver.quit()
             raise
     
     @staticmethod
@@ -615,36 +595,30 @@ class WebTextExtractor:
     
     @staticmethod
     def _extract_from_iframes(iframes, base_url):
-        """iframe에서 텍스트 추출"""
-        all_text = []
+        """iframe에서 텍스트 추출 (iframe 문서는 동시에 요청)"""
+        from urllib.parse import urljoin
         
+        iframe_requests = []
         for iframe in iframes:
+            # iframe의 src 속성 가져오기
+            src = iframe.get('src')
+            if not src:
+                continue
+            
+            # 상대 URL을 절대 URL로 변환
+            if src.startswith('//'):
+                src = 'https:' + src
+            elif not src.startswith('http'):
+                src = urljoin(base_url, src)
+            
+            logger.info(f"iframe src 추출 시도: {src}")
+            iframe_requests.append({'url': src, 'headers': {'Referer': base_url}, 'timeout': 10})
+        
+        all_text = []
+        for response in fetch_all(iframe_requests):
             try:
-                # iframe의 src 속성 가져오기
-                src = iframe.get('src')
-                if not src:
-                    continue
-                
-                # 상대 URL을 절대 URL로 변환
-                if src.startswith('//'):
-                    src = 'https:' + src
-                elif src.startswith('/'):
-                    from urllib.parse import urljoin
-                    src = urljoin(base_url, src)
-                elif not src.startswith('http'):
-                    from urllib.parse import urljoin
-                    src = urljoin(base_url, src)
-                
-                logger.info(f"iframe src 추출 시도: {src}")
-                
-                # iframe 내용 가져오기
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Referer': base_url
-                }
-                
-                response = requests.get(src, headers=headers, timeout=10)
-                response.raise_for_status()
+                if isinstance(response, Exception):
+                    raise response
                 
                 iframe_soup = BeautifulSoup(response.content, 'html.parser')
                 
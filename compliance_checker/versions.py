@@ -0,0 +1,54 @@
+import threading
+import time
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import SharedVersion
+
+# 이름 → (버전, 조회 시각) 프로세스 내 사본 (요청마다 데이터베이스를 조회하지 않도록)
+_local_versions: Dict[str, Tuple[int, float]] = {}
+_local_lock = threading.Lock()
+
+
+def _remember(name: str, version: int) -> int:
+    with _local_lock:
+        _local_versions[name] = (version, time.monotonic())
+    return version
+
+
+def _read_or_create(name: str) -> int:
+    version = SharedVersion.objects.filter(name=name).values_list('version', flat=True).first()
+    if version is not None:
+        return version
+    # 처음 만드는 버전은 현재 시각(ns)으로 시작해 이전에 쓰던 버전 값과 겹치지 않게 한다
+    try:
+        with transaction.atomic():
+            return SharedVersion.objects.create(name=name, version=time.time_ns()).version
+    except IntegrityError:
+        return SharedVersion.objects.values_list('version', flat=True).get(name=name)
+
+
+def get_shared_version(name: str) -> int:
+    """공유 버전 조회
+
+    COMPLIANCE_SHARED_VERSION_TTL 초 동안은 프로세스 안의 사본을 쓰므로 다른 호스트의 변경은
+    그 시간 안에 반영된다. 같은 프로세스의 변경(bump_shared_version)은 바로 반영된다.
+    """
+    ttl = getattr(settings, 'COMPLIANCE_SHARED_VERSION_TTL', 1.0)
+    local = _local_versions.get(name)
+    if local is not None and time.monotonic() - local[1] < ttl:
+        return local[0]
+    return _remember(name, _read_or_create(name))
+
+
+def bump_shared_version(name: str) -> int:
+    """공유 버전을 1 증가 (동시에 증가시켜도 F() 로 더하므로 유실 없음)"""
+    with transaction.atomic():
+        if not SharedVersion.objects.filter(name=name).update(version=F('version') + 1):
+            _read_or_create(name)
+            SharedVersion.objects.filter(name=name).update(version=F('version') + 1)
+        version = SharedVersion.objects.values_list('version', flat=True).get(name=name)
+    return _remember(name, version)
@@ -1,32 +1,43 @@
 import json
+from django.conf import settings
+from django.core.files.storage import default_storage
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse, HttpResponse
+from django.http import FileResponse, JsonResponse, HttpResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
-from django.db.models import Count, Avg
+from django.db import transaction
+from django.db.models import Count, Avg, Q, Sum
 from django.core.paginator import Paginator
 from .models import (
     ComplianceAnalysis, MedicalGuideline, ComplianceRule, MedicalLawInfo,
-    GuidelineDocument, GuidelineUpdate, AIAnalysisResult, ComplianceCategory
+    GuidelineDocument, GuidelineUpdate, GuidelineVersion, AIAnalysisResult, ComplianceCategory,
+    DailyAnalysisRollup, DailyViolationRollup, BatchRun
 )
-from .utils import TextExtractor, WebTextExtractor, extract_text_from_file
-from .analyzer import ComplianceAnalyzer
+from .utils import WebTextExtractor, extract_text_from_file, extract_text_from_url
+from .analyzer import ComplianceAnalyzer, keyed_violation_spans
+from .citations import attach_citations
+from .batch import iter_corpus_items, normalize_item, submit_batch
+from .incremental import reanalyze
+from .jobs import submit_analysis_job, expire_stale_analysis
+from .guideline_versions import record_version, update_changes, version_content, version_diff
+from .guideline_ai import ANALYSIS_INSTRUCTIONS, reuse_guideline_analysis, submit_guideline_analysis
+from .guideline_uploads import expire_stale_extraction, register_guideline_upload
+from .result_cache import analyze_with_cache, lookup_result, save_analysis
+from .reports import get_report
+from .rollups import record_analyses
+from .snapshot import get_rule_snapshot
+from .violation_store import hydrate_result, span_contexts, span_violations
 import logging
 from datetime import datetime, timedelta
 import requests
 from bs4 import BeautifulSoup
 import re
 import os
-from anthropic import Anthropic
+import tempfile
 from typing import List, Dict
-
-# Claude API 설정 - .env 파일 또는 시스템 환경변수에서 로드
-ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
-print(f"[DEBUG] ANTHROPIC_API_KEY 설정 상태: {'설정됨' if ANTHROPIC_API_KEY else '설정되지 않음'}")
-if ANTHROPIC_API_KEY:
-    print(f"[DEBUG] API 키 시작 부분: {ANTHROPIC_API_KEY[:20]}...")
-anthropic = Anthropic(api_key=ANTHROPIC_API_KEY) if ANTHROPIC_API_KEY else None
+from .ai import ANTHROPIC_API_KEY, complete, generate_improvements, get_ai_client, parse_json_response
 
 # import openai  # 실제 OpenAI API 사용 시 주석 해제
 
@@ -46,7 +57,6 @@ def test_view(request):
 
 def health_check(request):
     """헬스체크 엔드포인트"""
-    from django.conf import settings
     return JsonResponse({
         'status': 'healthy',
         'message': '서버가 정상 작동 중입니다',
@@ -59,18 +69,27 @@ def health_check(request):
 def dashboard(request):
     """대시보드 페이지"""
     # 최근 30일 통계
-    thirty_days_ago = timezone.now() - timedelta(days=30)
+    thirty_days_ago = timezone.localdate() - timedelta(days=30)
     
-    # 분석 통계
-    total_analyses = ComplianceAnalysis.objects.count()
-    recent_analyses = ComplianceAnalysis.objects.filter(created_at__gte=thirty_days_ago).count()
-    avg_score = ComplianceAnalysis.objects.aggregate(avg_score=Avg('overall_score'))['avg_score'] or 0
+    # 분석 통계 (일별 집계 표에서 조건부 집계 한 번의 쿼리)
+    totals = DailyAnalysisRollup.objects.aggregate(
+        total=Sum('analysis_count'),
+        recent=Sum('analysis_count', filter=Q(date__gt=thirty_days_ago)),
+        score_sum=Sum('score_sum')
+    )
+    total_analyses = totals['total'] or 0
+    recent_analyses = totals['recent'] or 0
+    avg_score = (totals['score_sum'] or 0) / total_analyses if total_analyses else 0
     
     # 위험도별 통계
-    risk_stats = ComplianceAnalysis.objects.values('risk_level').annotate(count=Count('id'))
+    risk_stats = DailyAnalysisRollup.objects.values('risk_level').annotate(
+        count=Sum('analysis_count')
+    ).order_by('risk_level')
     
     # 최근 분석 결과
-    recent_results = ComplianceAnalysis.objects.order_by('-created_at')[:10]
+    recent_results = ComplianceAnalysis.objects.defer(
+        'input_text', 'analysis_result', 'recommendations'
+    ).order_by('-created_at')[:10]
     
     # 가이드라인 통계
     total_guidelines = MedicalGuideline.objects.filter(is_active=True).count()
@@ -88,7 +107,10 @@ def dashboard(request):
 
 def history(request):
     """분석 히스토리 페이지"""
-    analyses = ComplianceAnalysis.objects.order_by('-created_at')
+    # 목록에 쓰지 않는 본문/결과 JSON 은 읽지 않는다
+    analyses = ComplianceAnalysis.objects.defer(
+        'input_text', 'analysis_result', 'recommendations'
+    ).order_by('-created_at')
     
     # 필터링
     status_filter = request.GET.get('status', '')
@@ -116,25 +138,24 @@ def history(request):
             quarter_ago = timezone.now() - timedelta(days=90)
             analyses = analyses.filter(created_at__gte=quarter_ago)
     if search:
+        # PostgreSQL 에서는 pg_trgm 인덱스(UPPER(input_text))를 사용 (마이그레이션 0008)
         analyses = analyses.filter(input_text__icontains=search)
     
-    # 각 분석에 AI 개선 방안 정보 추가
-    for analysis in analyses:
-        analysis.has_ai_improvements = False
-        if analysis.violations:
-            for violation in analysis.violations:
-                if isinstance(violation, dict) and 'ai_improvements' in violation and violation['ai_improvements']:
-                    analysis.has_ai_improvements = True
-                    break
-    
-    # 통계
-    total_count = analyses.count()
-    compliant_count = analyses.filter(compliance_status='적합').count()
-    partial_count = analyses.filter(compliance_status='부분적합').count()
-    non_compliant_count = analyses.filter(compliance_status='부적합').count()
+    # 통계 (조건부 집계 한 번의 쿼리)
+    counts = analyses.order_by().aggregate(
+        total=Count('id'),
+        compliant=Count('id', filter=Q(compliance_status='적합')),
+        partial=Count('id', filter=Q(compliance_status='부분적합')),
+        non_compliant=Count('id', filter=Q(compliance_status='부적합'))
+    )
+    total_count = counts['total']
+    compliant_count = counts['compliant']
+    partial_count = counts['partial']
+    non_compliant_count = counts['non_compliant']
     
-    # 페이지네이션
+    # 페이지네이션 (전체 건수는 위 집계 값을 사용)
     paginator = Paginator(analyses, 20)
+    paginator.count = total_count
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
@@ -245,6 +266,32 @@ def review_process_info(request):
         'law_infos': law_infos
     })
 
+def _is_async_request(value):
+    """비동기(작업) 모드 요청 여부 확인"""
+    if value is None:
+        return getattr(settings, 'COMPLIANCE_ASYNC_ANALYSIS', False)
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+def _job_accepted_response(analysis):
+    """비동기 분석 작업 접수 응답"""
+    return JsonResponse({
+        'success': True,
+        'analysis_id': analysis.id,
+        'status': analysis.status,
+        'status_url': reverse('get_analysis_status', args=[analysis.id])
+    }, status=202)
+
+def _cached_result_response(cached):
+    """캐시 적중 시 저장된 분석 결과 응답"""
+    return JsonResponse({
+        'success': True,
+        'analysis_id': cached.analysis_id,
+        'result': cached.result,
+        'cached': True
+    })
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def analyze_text(request):
@@ -258,19 +305,28 @@ def analyze_text(request):
                 'error': '텍스트를 입력해주세요.'
             }, status=400)
         
-        # 분석 실행
-        analyzer = ComplianceAnalyzer()
-        result = analyzer.analyze_text(text, 'text')
+        # 비동기 모드: 캐시에 없을 때만 작업을 등록하고 즉시 응답
+        if _is_async_request(data.get('async')):
+            cached = lookup_result(text, 'text', get_rule_snapshot().version)
+            if cached is not None:
+                return _cached_result_response(cached)
+            analysis = ComplianceAnalysis.objects.create(
+                input_text=text,
+                input_type='text',
+                status='pending'
+            )
+            submit_analysis_job(analysis)
+            return _job_accepted_response(analysis)
+        
+        # 분석 실행 (같은 텍스트·규칙 버전의 결과가 있으면 재사용)
+        result, rule_version, cached = analyze_with_cache(text, 'text')
+        if cached is not None:
+            return _cached_result_response(cached)
         
         # 결과 저장
-        analysis = ComplianceAnalysis.objects.create(
-            input_text=text,
-            input_type='text',
-            overall_score=result['overall_score'],
-            compliance_status=result['compliance_status'],
-            risk_level=result['risk_level'],
-            violations=result['violations'],
-            recommendations=result['recommendations']
+        analysis = save_analysis(
+            ComplianceAnalysis(input_type='text'),
+            text, result, rule_version
         )
         
         return JsonResponse({
@@ -296,6 +352,17 @@ def analyze_file(request):
         
         uploaded_file = request.FILES['file']
         
+        # 비동기 모드: 업로드 파일을 저장하고 추출/분석은 워커에서 수행
+        if _is_async_request(request.POST.get('async')):
+            upload_path = default_storage.save(f'analysis_uploads/{uploaded_file.name}', uploaded_file)
+            analysis = ComplianceAnalysis.objects.create(
+                input_type='file',
+                file_name=uploaded_file.name,
+                status='pending'
+            )
+            submit_analysis_job(analysis, upload_path=upload_path)
+            return _job_accepted_response(analysis)
+        
         # 파일 텍스트 추출
         try:
             text = extract_text_from_file(uploaded_file)
@@ -309,20 +376,15 @@ def analyze_file(request):
                 'error': '파일에서 텍스트를 추출할 수 없습니다.'
             }, status=400)
         
-        # 분석 실행
-        analyzer = ComplianceAnalyzer()
-        result = analyzer.analyze_text(text, 'file')
+        # 분석 실행 (같은 텍스트·규칙 버전의 결과가 있으면 재사용)
+        result, rule_version, cached = analyze_with_cache(text, 'file')
+        if cached is not None:
+            return _cached_result_response(cached)
         
         # 결과 저장
-        analysis = ComplianceAnalysis.objects.create(
-            input_text=text,  # 전체 텍스트 저장 (1000자 제한 제거)
-            input_type='file',
-            file_name=uploaded_file.name,
-            overall_score=result['overall_score'],
-            compliance_status=result['compliance_status'],
-            risk_level=result['risk_level'],
-            violations=result['violations'],
-            recommendations=result['recommendations']
+        analysis = save_analysis(
+            ComplianceAnalysis(input_type='file', file_name=uploaded_file.name),
+            text, result, rule_version
         )
         
         return JsonResponse({
@@ -350,48 +412,34 @@ def analyze_url(request):
                 'error': 'URL을 입력해주세요.'
             }, status=400)
         
+        # 비동기 모드: 스크래핑과 분석을 워커에서 수행
+        if _is_async_request(data.get('async')):
+            analysis = ComplianceAnalysis.objects.create(
+                input_type='url',
+                url=url,
+                status='pending'
+            )
+            submit_analysis_job(analysis, simple_mode=simple_mode)
+            return _job_accepted_response(analysis)
+        
         # URL에서 텍스트 추출 (개선된 스크래핑)
         try:
-            text = WebTextExtractor.extract_from_url(url, simple_mode=simple_mode)
-            
-            # 디버깅을 위한 로깅
-            logger.info(f"URL: {url}")
-            logger.info(f"추출된 텍스트 길이: {len(text) if text else 0}")
-            logger.info(f"추출된 텍스트 미리보기: {text[:200] if text else 'None'}...")
-            
-            if not text:
-                return JsonResponse({
-                    'error': '웹페이지에서 텍스트를 추출할 수 없습니다. 다른 URL을 시도해보세요.'
-                }, status=400)
-            
-            # 텍스트 정리
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            if len(text.strip()) < 10:
-                return JsonResponse({
-                    'error': '웹페이지에서 의미있는 텍스트를 추출할 수 없습니다. 다른 URL을 시도해보세요.'
-                }, status=400)
-            
+            text = extract_text_from_url(url, simple_mode=simple_mode)
         except Exception as e:
             logger.error(f"URL 텍스트 추출 실패: {url} - {e}")
             return JsonResponse({
-                'error': f'URL에서 텍스트를 추출할 수 없습니다: {str(e)}'
+                'error': str(e)
             }, status=400)
         
-        # 분석 실행
-        analyzer = ComplianceAnalyzer()
-        result = analyzer.analyze_text(text, 'url')
+        # 분석 실행 (같은 텍스트·규칙 버전의 결과가 있으면 재사용)
+        result, rule_version, cached = analyze_with_cache(text, 'url')
+        if cached is not None:
+            return _cached_result_response(cached)
         
         # 결과 저장
-        analysis = ComplianceAnalysis.objects.create(
-            input_text=text,  # 전체 텍스트 저장 (1000자 제한 제거)
-            input_type='url',
-            url=url,
-            overall_score=result['overall_score'],
-            compliance_status=result['compliance_status'],
-            risk_level=result['risk_level'],
-            violations=result['violations'],
-            recommendations=result['recommendations']
+        analysis = save_analysis(
+            ComplianceAnalysis(input_type='url', url=url),
+            text, result, rule_version
         )
         
         return JsonResponse({
@@ -405,6 +453,176 @@ def analyze_url(request):
             'error': f'분석 중 오류가 발생했습니다: {str(e)}'
         }, status=500)
 
+@csrf_exempt
+@require_http_methods(["POST"])
+def analyze_text_incremental(request):
+    """수정된 텍스트 재분석 API
+
+    이전 분석 ID와 수정된 텍스트를 받아 바뀐 문장 주변만 다시 검사하고, 바뀌지 않은
+    위반 항목과 AI 개선 방안은 이전 결과를 재사용한다.
+    """
+    try:
+        data = json.loads(request.body)
+        text = data.get('text', '').strip()
+        previous_id = data.get('previous_analysis_id')
+        
+        if not text or not previous_id:
+            return JsonResponse({
+                'error': '이전 분석 ID와 텍스트를 입력해주세요.'
+            }, status=400)
+        
+        previous = ComplianceAnalysis.objects.filter(id=previous_id).first()
+        if previous is None:
+            return JsonResponse({
+                'error': '이전 분석 결과를 찾을 수 없습니다.'
+            }, status=404)
+        
+        cached = lookup_result(text, 'text', get_rule_snapshot().version)
+        if cached is not None:
+            return _cached_result_response(cached)
+        
+        result, rule_version, stats = reanalyze(previous, text, 'text')
+        analysis = save_analysis(
+            ComplianceAnalysis(input_type='text'),
+            text, result, rule_version
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'analysis_id': analysis.id,
+            'previous_analysis_id': previous.id,
+            'result': result,
+            'incremental': stats
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'error': f'분석 중 오류가 발생했습니다: {str(e)}'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def analyze_batch(request):
+    """일괄 분석 API
+
+    JSON 본문의 items([{"text": ...} 또는 {"url": ...}]) 또는 업로드한 JSONL/zip 파일의
+    항목을 확인한 뒤 백그라운드 작업으로 분석한다. URL 추출과 항목 수 때문에 요청 제한
+    시간을 넘길 수 있으므로 작업 ID 를 바로 돌려주고 결과는 status_url 로 조회한다.
+    """
+    try:
+        max_items = getattr(settings, 'COMPLIANCE_BATCH_MAX_ITEMS', 500)
+        with tempfile.TemporaryDirectory() as upload_dir:
+            if 'file' in request.FILES:
+                uploaded_file = request.FILES['file']
+                upload_name = os.path.basename(uploaded_file.name) or 'batch'
+                upload_path = os.path.join(upload_dir, upload_name)
+                with open(upload_path, 'wb') as destination:
+                    for chunk in uploaded_file.chunks():
+                        destination.write(chunk)
+                enable_ai = request.POST.get('ai', '').lower() in ('1', 'true', 'yes', 'on')
+                # 업로드한 JSONL 에서는 서버 파일 경로 항목을 허용하지 않음
+                items = list(iter_corpus_items(upload_path, allow_paths=False))
+            else:
+                data = json.loads(request.body)
+                enable_ai = bool(data.get('ai', False))
+                items = []
+                for raw_item in data.get('items', []):
+                    try:
+                        items.append(normalize_item(raw_item, allow_paths=False))
+                    except ValueError as e:
+                        items.append({'input_type': 'text', 'error': f'잘못된 항목: {e}'})
+        
+        if not items:
+            return JsonResponse({
+                'error': '분석할 항목이 없습니다.'
+            }, status=400)
+        if len(items) > max_items:
+            return JsonResponse({
+                'error': f'한 번에 최대 {max_items}건까지 분석할 수 있습니다. 대량 분석은 analyze_corpus 명령을 사용해주세요.'
+            }, status=400)
+        
+        if 'file' in request.FILES:
+            # zip 항목은 파일 안의 경로를 가리키므로 워커가 다시 읽도록 업로드 파일을 저장
+            run = submit_batch(len(items), enable_ai,
+                               upload_path=default_storage.save(f'batch_uploads/{upload_name}', uploaded_file))
+        else:
+            run = submit_batch(len(items), enable_ai, items=items)
+        
+        return JsonResponse({
+            'success': True,
+            'batch_id': run.id,
+            'status': run.status,
+            'total': run.total_count,
+            'status_url': reverse('get_batch_status', args=[run.id])
+        }, status=202)
+        
+    except ValueError as e:
+        return JsonResponse({
+            'error': str(e)
+        }, status=400)
+    except Exception as e:
+        logger.error(f"일괄 분석 오류: {e}")
+        return JsonResponse({
+            'error': f'일괄 분석 중 오류가 발생했습니다: {str(e)}'
+        }, status=500)
+
+@require_http_methods(["GET"])
+def get_batch_status(request, batch_id):
+    """일괄 분석 작업 상태 조회 API (완료되면 항목별 결과 포함)"""
+    run = get_object_or_404(BatchRun, id=batch_id)
+    response = {
+        'success': True,
+        'batch_id': run.id,
+        'status': run.status,
+        'total': run.total_count,
+        'processed': run.processed_count
+    }
+    if run.status == 'completed':
+        response.update(
+            completed=run.completed_count,
+            failed=run.failed_count,
+            analysis_ids=run.analysis_ids,
+            items=run.items
+        )
+    elif run.status == 'failed':
+        response['error'] = run.error_message
+    return JsonResponse(response)
+
+@require_http_methods(["GET"])
+def get_analysis_status(request, analysis_id):
+    """분석 작업 상태 조회 API (비동기 분석 폴링용)"""
+    try:
+        analysis = ComplianceAnalysis.objects.get(id=analysis_id)
+        expire_stale_analysis(analysis)
+        
+        response = {
+            'success': True,
+            'analysis_id': analysis.id,
+            'status': analysis.status,
+            'status_display': analysis.get_status_display(),
+            'created_at': analysis.created_at.isoformat(),
+            'started_at': analysis.started_at.isoformat() if analysis.started_at else None,
+            'completed_at': analysis.completed_at.isoformat() if analysis.completed_at else None,
+        }
+        if analysis.status == 'completed':
+            response['result'] = hydrate_result(analysis) if analysis.analysis_result else {
+                'overall_score': analysis.overall_score,
+                'compliance_status': analysis.compliance_status,
+                'risk_level': analysis.risk_level,
+                'violations': analysis.violations,
+                'recommendations': analysis.recommendations
+            }
+        elif analysis.status == 'failed':
+            response['error'] = analysis.error_message
+        
+        return JsonResponse(response)
+        
+    except ComplianceAnalysis.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'error': '분석 결과를 찾을 수 없습니다.'
+        }, status=404)
+
 @require_http_methods(["GET"])
 def show_result(request, analysis_id):
     """분석 결과 페이지"""
@@ -413,7 +631,10 @@ def show_result(request, analysis_id):
         
         # 분석 결과 데이터 가져오기
         if hasattr(analysis, 'analysis_result') and analysis.analysis_result:
-            result = analysis.analysis_result
+            # 상세 위반 정보는 저장된 위반 구간과 원문에서 만든다 (청크 분석 결과는 앞쪽 구간만)
+            chunked = 'violation_spans' in analysis.analysis_result
+            detail_limit = getattr(settings, 'COMPLIANCE_CHUNKED_DETAIL_LIMIT', 100) if chunked else None
+            result = hydrate_result(analysis, detail_limit=detail_limit)
         else:
             # 기존 데이터 구조로부터 결과 재구성
             result = {
@@ -422,14 +643,14 @@ def show_result(request, analysis_id):
                 'risk_level': analysis.risk_level,
                 'violations': analysis.violations or [],
                 'recommendations': analysis.recommendations or [],
-                'detailed_violations': getattr(analysis, 'detailed_violations', []),
-                'compliance_checklist': getattr(analysis, 'compliance_checklist', []),
-                'review_guidance': getattr(analysis, 'review_guidance', {}),
+                'detailed_violations': [],
+                'compliance_checklist': [],
+                'review_guidance': {},
                 'extracted_text': analysis.input_text, # 전체 텍스트로 설정
                 'text_analysis': {
-                    'total_characters': len(analysis.input_text),
-                    'total_words': len(analysis.input_text.split()),
-                    'total_sentences': len(analysis.input_text.split('.')),
+                    'total_characters': analysis.total_characters,
+                    'total_words': analysis.total_words,
+                    'total_sentences': analysis.total_sentences,
                     'text_quality': 'medium'
                 },
                 'legal_analysis': {
@@ -440,9 +661,9 @@ def show_result(request, analysis_id):
                 'summary_report': {
                     'executive_summary': {
                         'total_violations': len(analysis.violations or []),
-                        'high_severity': 0,
-                        'medium_severity': 0,
-                        'low_severity': 0,
+                        'high_severity': analysis.high_severity_count,
+                        'medium_severity': analysis.medium_severity_count,
+                        'low_severity': analysis.low_severity_count,
                         'compliance_score': analysis.overall_score,
                         'risk_assessment': analysis.risk_level
                     },
@@ -452,6 +673,9 @@ def show_result(request, analysis_id):
                 }
             }
         
+        # 위반마다 근거 문단 검색 (색인이 바뀌어도 항상 현재 색인 기준)
+        result['detailed_violations'] = attach_citations(result.get('detailed_violations') or [])
+        
         return render(request, 'compliance_checker/result.html', {
             'result': result,
             'analysis': analysis
@@ -511,7 +735,52 @@ def get_analysis_result(request, analysis_id):
             'error': f'분석 결과 조회 중 오류가 발생했습니다: {str(e)}'
         })
 
-@csrf_exempt
+@require_http_methods(["GET"])
+def get_analysis_violations(request, analysis_id):
+    """상세 위반 정보 페이지 조회 API (?offset=0&limit=50)
+
+    청크 분석 결과는 저장된 위반 구간에서 요청한 범위만 원문 문맥을 붙여 만든다.
+    """
+    try:
+        analysis = ComplianceAnalysis.objects.get(id=analysis_id)
+        offset = max(0, int(request.GET.get('offset', 0)))
+        limit = min(max(1, int(request.GET.get('limit', 50))), 500)
+        result = analysis.analysis_result or {}
+        
+        if 'violation_spans' in result:
+            total = len(result['violation_spans'])
+            violations = ComplianceAnalyzer(enable_ai=False).expand_violation_spans(
+                analysis.input_text, keyed_violation_spans(result, offset, offset + limit)
+            )
+        elif 'detailed_violations' in result:
+            # 상세 위반 정보를 결과 JSON 에 저장하던 이전 분석
+            detailed_violations = result['detailed_violations'] or []
+            total = len(detailed_violations)
+            violations = detailed_violations[offset:offset + limit]
+        else:
+            total = analysis.violation_count
+            violations = span_violations(analysis, offset, offset + limit)
+        
+        return JsonResponse({
+            'success': True,
+            'analysis_id': analysis.id,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'violations': attach_citations(violations)
+        })
+        
+    except ComplianceAnalysis.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'error': '분석 결과를 찾을 수 없습니다.'
+        }, status=404)
+    except ValueError:
+        return JsonResponse({
+            'success': False,
+            'error': 'offset, limit 은 정수여야 합니다.'
+        }, status=400)
+
 @require_http_methods(["POST"])
 def upload_guideline(request):
     """의료 가이드라인 문서 업로드 API"""
@@ -527,52 +796,21 @@ def upload_guideline(request):
         category = request.POST.get('category', 'guidelines')
         description = request.POST.get('description', '')
         
-        # 파일 타입 확인
-        file_name = uploaded_file.name.lower()
-        if file_name.endswith('.pdf'):
-            doc_type = 'pdf'
-        elif file_name.endswith(('.docx', '.doc')):
-            doc_type = 'doc'
-        elif file_name.endswith('.txt'):
-            doc_type = 'txt'
-        else:
+        # 파일을 저장하고 텍스트 추출은 백그라운드에서 수행 (같은 파일은 추출 결과 공유)
+        try:
+            guideline = register_guideline_upload(uploaded_file, title, category, description)
+        except ValueError as e:
             return JsonResponse({
                 'success': False,
-                'error': '지원하지 않는 파일 형식입니다.'
+                'error': str(e)
             })
         
-        # 텍스트 추출 시도
-        extracted_text = ""
-        try:
-            file_content = uploaded_file.read()
-            if doc_type == 'pdf':
-                extracted_text = TextExtractor.extract_from_pdf(file_content)
-            elif doc_type == 'doc':
-                extracted_text = TextExtractor.extract_from_docx(file_content)
-            elif doc_type == 'txt':
-                extracted_text = TextExtractor.extract_from_txt(file_content)
-        except Exception as e:
-            logger.warning(f"가이드라인 텍스트 추출 실패: {e}")
-            # 텍스트 추출 실패해도 업로드는 허용
-        
-        # 파일 포인터를 처음으로 되돌림
-        uploaded_file.seek(0)
-        
-        # DB에 저장
-        guideline = MedicalGuideline.objects.create(
-            title=title,
-            category=category,
-            description=description,
-            document_type=doc_type,
-            file=uploaded_file,
-            extracted_text=extracted_text
-        )
-        
         return JsonResponse({
             'success': True,
             'guideline_id': guideline.id,
             'title': guideline.title,
-            'extracted_text': extracted_text
+            'extraction_status': guideline.extraction_status,
+            'extracted_text': guideline.extracted_text
         })
         
     except Exception as e:
@@ -587,6 +825,7 @@ def get_guideline(request, guideline_id):
     """가이드라인 상세 조회 API"""
     try:
         guideline = MedicalGuideline.objects.get(id=guideline_id)
+        expire_stale_extraction(guideline)
         
         return JsonResponse({
             'success': True,
@@ -600,6 +839,9 @@ def get_guideline(request, guideline_id):
                 'file_name': guideline.file.name if guideline.file else '',
                 'file_size_display': f"{guideline.file.size / 1024 / 1024:.2f} MB" if guideline.file else '0 MB',
                 'uploaded_at': guideline.uploaded_at.isoformat(),
+                'extraction_status': guideline.extraction_status,
+                'extraction_progress': guideline.extraction_progress,
+                'extraction_error': guideline.extraction_error,
                 'extracted_text': guideline.extracted_text[:1000] + '...' if len(guideline.extracted_text) > 1000 else guideline.extracted_text
             }
         })
@@ -644,7 +886,6 @@ def download_guideline(request, guideline_id):
             'error': f'가이드라인 다운로드 중 오류가 발생했습니다: {str(e)}'
         })
 
-@csrf_exempt
 @require_http_methods(["DELETE"])
 def delete_guideline(request, guideline_id):
     """가이드라인 삭제 API"""
@@ -675,7 +916,9 @@ def delete_analysis(request, analysis_id):
     """분석 결과 삭제 API"""
     try:
         analysis = ComplianceAnalysis.objects.get(id=analysis_id)
-        analysis.delete()
+        with transaction.atomic():
+            record_analyses([analysis], sign=-1)
+            analysis.delete()
         
         return JsonResponse({
             'success': True,
@@ -696,58 +939,36 @@ def delete_analysis(request, analysis_id):
 
 @require_http_methods(["GET"])
 def export_pdf_report(request, analysis_id):
-    """PDF 리포트 생성 및 다운로드"""
+    """PDF 리포트 생성 및 다운로드
+
+    같은 분석의 리포트는 한 번만 만들고 저장소에서 바로 내려준다. 위반 구간이 많은
+    리포트는 백그라운드에서 만들며, 그동안은 202 응답을 돌려주므로 같은 주소를 다시 요청한다.
+    """
     try:
-        analysis = ComplianceAnalysis.objects.get(id=analysis_id)
+        analysis = ComplianceAnalysis.objects.defer(
+            'input_text', 'analysis_result', 'violations', 'recommendations'
+        ).get(id=analysis_id)
+        if analysis.status != 'completed':
+            return JsonResponse({
+                'success': False,
+                'error': '완료된 분석만 리포트를 만들 수 있습니다.',
+                'status': analysis.status
+            }, status=409)
         
-        # 간단한 HTML 리포트 생성 (실제로는 reportlab 등 사용)
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>의료광고법 준수 검토 리포트</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                .header {{ text-align: center; border-bottom: 2px solid #333; padding-bottom: 20px; }}
-                .score {{ font-size: 24px; font-weight: bold; margin: 20px 0; }}
-                .violation {{ background: #ffe6e6; padding: 10px; margin: 10px 0; border-left: 4px solid #ff0000; }}
-                .recommendation {{ background: #e6ffe6; padding: 10px; margin: 10px 0; border-left: 4px solid #00ff00; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>의료광고법 준수 검토 리포트</h1>
-                <p>분석일시: {analysis.created_at.strftime('%Y년 %m월 %d일 %H:%M')}</p>
-            </div>
-            
-            <div class="score">
-                준수 점수: {analysis.overall_score}/100
-                <br>
-                상태: {analysis.compliance_status}
-                <br>
-                위험도: {analysis.risk_level}
-            </div>
-            
-            <h2>위반 항목 ({len(analysis.violations)}건)</h2>
-            {''.join([f'<div class="violation"><strong>{v["type"]}</strong><br>{v["description"]}</div>' for v in analysis.violations])}
-            
-            <h2>개선 권장사항 ({len(analysis.recommendations)}건)</h2>
-            {''.join([f'<div class="recommendation"><strong>원문:</strong> {r["original"]}<br><strong>개선안:</strong> {r["improved"]}</div>' for r in analysis.recommendations])}
-            
-            <div style="margin-top: 40px; padding-top: 20px; border-top: 1px solid #ccc;">
-                <p><small>본 리포트는 2025년 의료법 및 의료광고법 기준으로 생성되었습니다.</small></p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="의료광고법-검토결과-{analysis_id}.pdf"'
-        
-        # 실제 PDF 생성은 reportlab 등을 사용해야 하지만, 여기서는 HTML을 반환
-        response.write(html_content.encode('utf-8'))
-        return response
+        report = get_report(analysis)
+        if report['status'] == 'pending':
+            return JsonResponse({
+                'success': True,
+                'status': 'pending',
+                'message': '리포트를 생성하고 있습니다. 잠시 후 다시 요청해주세요.'
+            }, status=202)
+        
+        return FileResponse(
+            default_storage.open(report['path'], 'rb'),
+            as_attachment=True,
+            filename=f'의료광고법-검토결과-{analysis_id}.pdf',
+            content_type='application/pdf'
+        )
         
     except ComplianceAnalysis.DoesNotExist:
         return JsonResponse({
@@ -765,27 +986,54 @@ def export_pdf_report(request, analysis_id):
 def get_statistics(request):
     """통계 데이터 API"""
     try:
-        # 최근 30일 통계
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        # 일별 분석 수
-        daily_stats = ComplianceAnalysis.objects.filter(
-            created_at__gte=thirty_days_ago
-        ).extra(
-            select={'date': 'date(created_at)'}
-        ).values('date').annotate(count=Count('id')).order_by('date')
+        # 최근 30일 통계 (일별 집계 표만 읽으므로 분석 이력 크기와 무관)
+        thirty_days_ago = timezone.localdate() - timedelta(days=30)
+        rollups = DailyAnalysisRollup.objects.order_by()
+        
+        # 일별 분석 수와 평균 점수
+        daily_stats = [
+            {
+                'date': row['date'],
+                'count': row['count'],
+                'avg_score': round(row['score_sum'] / row['count'], 1) if row['count'] else 0
+            }
+            for row in rollups.filter(date__gt=thirty_days_ago).values('date').annotate(
+                count=Sum('analysis_count'), score_sum=Sum('score_sum')
+            ).order_by('date')
+        ]
         
         # 위험도별 통계
-        risk_stats = ComplianceAnalysis.objects.values('risk_level').annotate(count=Count('id'))
+        risk_stats = rollups.values('risk_level').annotate(count=Sum('analysis_count')).order_by('risk_level')
         
         # 준수 상태별 통계
-        status_stats = ComplianceAnalysis.objects.values('compliance_status').annotate(count=Count('id'))
+        status_stats = rollups.values('compliance_status').annotate(
+            count=Sum('analysis_count')
+        ).order_by('compliance_status')
+        
+        # 입력 유형별 통계
+        type_stats = rollups.values('input_type').annotate(count=Sum('analysis_count')).order_by('input_type')
+        
+        # 위반 카테고리별 통계
+        category_stats = DailyViolationRollup.objects.values('category', 'severity').annotate(
+            count=Sum('violation_count'),
+            analysis_count=Sum('analysis_count')
+        ).order_by('-count')
+        
+        # 심각도별 위반 수
+        severity_stats = rollups.aggregate(
+            high=Sum('high_severity_count'),
+            medium=Sum('medium_severity_count'),
+            low=Sum('low_severity_count')
+        )
         
         return JsonResponse({
             'success': True,
-            'daily_stats': list(daily_stats),
+            'daily_stats': daily_stats,
             'risk_stats': list(risk_stats),
             'status_stats': list(status_stats),
+            'type_stats': list(type_stats),
+            'category_stats': list(category_stats),
+            'severity_stats': {key: value or 0 for key, value in severity_stats.items()},
         })
         
     except Exception as e:
@@ -798,21 +1046,38 @@ def get_statistics(request):
 def get_detailed_report(request, analysis_id):
     """상세 리포트 API"""
     try:
-        analysis = get_object_or_404(ComplianceAnalysis, id=analysis_id)
-        
-        # 상세 위반 정보가 없는 경우 기본값 설정
-        if not hasattr(analysis, 'detailed_violations') or not analysis.detailed_violations:
-            analysis.detailed_violations = []
-        
-        if not hasattr(analysis, 'compliance_checklist') or not analysis.compliance_checklist:
-            analysis.compliance_checklist = []
-        
-        if not hasattr(analysis, 'review_guidance') or not analysis.review_guidance:
-            analysis.review_guidance = {}
+        # 분석 결과 JSON 은 체크리스트와 심의 안내 키만 읽는다
+        analysis = get_object_or_404(
+            ComplianceAnalysis.objects.defer('analysis_result', 'violations', 'recommendations'),
+            id=analysis_id
+        )
+        extras = ComplianceAnalysis.objects.filter(id=analysis.id).values(
+            'analysis_result__compliance_checklist', 'analysis_result__review_guidance'
+        ).first()
+        compliance_checklist = extras['analysis_result__compliance_checklist'] or []
+        review_guidance = extras['analysis_result__review_guidance'] or {}
+        
+        # 저장된 위반 구간에서 상세 위반 정보 구성 (문맥은 원문에서 생성)
+        spans = list(analysis.violation_spans.select_related('rule', 'keyword'))
+        contexts = span_contexts(analysis.input_text, spans)
+        detailed_violations = []
+        for span, context in zip(spans, contexts):
+            rule = span.rule
+            detailed_violations.append({
+                'category': span.category,
+                'title': rule.title if rule else span.category,
+                'keyword': span.keyword.keyword if span.keyword else analysis.input_text[span.start:span.end],
+                'context': context,
+                'severity': span.severity,
+                'penalty': rule.penalty if rule else '',
+                'legal_basis': rule.legal_basis if rule else '',
+                'improvement_guide': rule.improvement_guide if rule else ''
+            })
+        detailed_violations = attach_citations(detailed_violations)
         
         # 위반 항목별 우선순위 및 상세 정보 생성
         violation_details = []
-        for violation in analysis.detailed_violations:
+        for violation in detailed_violations:
             # 위험도에 따른 우선순위 결정
             if violation['severity'] == 'high':
                 priority = '긴급'
@@ -846,6 +1111,7 @@ def get_detailed_report(request, analysis_id):
                 'risk_score': risk_score,
                 'penalty': violation['penalty'],
                 'legal_basis': violation['legal_basis'],
+                'citations': violation.get('citations', []),
                 'improvement_guide': violation['improvement_guide']
             })
         
@@ -921,8 +1187,8 @@ def get_detailed_report(request, analysis_id):
             'total_estimated_fine': total_estimated_fine,
             'legal_impact': legal_impact,
             'recommended_actions': recommended_actions,
-            'compliance_checklist': analysis.compliance_checklist,
-            'review_guidance': analysis.review_guidance
+            'compliance_checklist': compliance_checklist,
+            'review_guidance': review_guidance
         }
         
         return JsonResponse(detailed_report)
@@ -1226,11 +1492,11 @@ def create_guideline_document(request):
             order=data.get('order', 0)
         )
         
-        # 업데이트 이력 생성
+        # 업데이트 이력 생성 (내용은 버전 저장소에 보관)
         GuidelineUpdate.objects.create(
             document=document,
             update_type='new_document',
-            new_content=data.get('content'),
+            version=record_version(document),
             update_reason='새 문서 생성',
             updated_by=data.get('updated_by', '시스템')
         )
@@ -1254,8 +1520,8 @@ def update_guideline_document(request, document_id):
         document = get_object_or_404(GuidelineDocument, id=document_id)
         data = json.loads(request.body)
         
-        # 이전 내용 저장
-        previous_content = document.content
+        # 이전 내용의 버전 (다른 경로로 바뀐 내용이면 새 버전으로 기록)
+        previous_version = record_version(document)
         
         # 문서 업데이트
         document.title = data.get('title', document.title)
@@ -1267,12 +1533,12 @@ def update_guideline_document(request, document_id):
         document.order = data.get('order', document.order)
         document.save()
         
-        # 업데이트 이력 생성
+        # 업데이트 이력 생성 (내용은 버전 저장소에 보관)
         GuidelineUpdate.objects.create(
             document=document,
             update_type='content_update',
-            previous_content=previous_content,
-            new_content=data.get('content'),
+            previous_version=previous_version,
+            version=record_version(document),
             update_reason=data.get('update_reason', '내용 업데이트'),
             updated_by=data.get('updated_by', '시스템')
         )
@@ -1314,7 +1580,8 @@ def get_guideline_document(request, document_id):
                 'created_at': document.created_at.isoformat(),
                 'updated_at': document.updated_at.isoformat(),
             },
-            'updates': list(updates.values('update_type', 'update_reason', 'updated_by', 'created_at')),
+            'updates': list(updates.values('id', 'update_type', 'update_reason', 'updated_by', 'created_at',
+                                           'version__version')),
             'ai_analyses': list(ai_analyses.values('analysis_type', 'ai_model_used', 'processing_time', 'created_at'))
         })
         
@@ -1323,98 +1590,80 @@ def get_guideline_document(request, document_id):
             'error': f'문서 조회 중 오류가 발생했습니다: {str(e)}'
         }, status=500)
 
+@require_http_methods(["GET"])
+def get_guideline_document_version(request, document_id, version):
+    """가이드라인 문서의 과거 버전 내용 조회 (?compare=<버전> 이면 그 버전과의 비교 포함)"""
+    try:
+        versions = GuidelineVersion.objects.filter(document_id=document_id).defer('payload')
+        target = get_object_or_404(versions, version=version)
+        response = {
+            'success': True,
+            'document_id': document_id,
+            'version': target.version,
+            'created_at': target.created_at.isoformat(),
+            'content': version_content(target.id)
+        }
+        if request.GET.get('compare'):
+            base = get_object_or_404(versions, version=int(request.GET['compare']))
+            response['diff'] = version_diff(base.id, target.id)
+        return JsonResponse(response)
+        
+    except ValueError:
+        return JsonResponse({
+            'success': False,
+            'error': 'compare 는 버전 번호여야 합니다.'
+        }, status=400)
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def analyze_with_ai(request, document_id):
-    """AI를 이용한 가이드라인 분석"""
+    """AI를 이용한 가이드라인 분석
+
+    같은 내용·분석 유형의 분석이 있으면 다시 요청하지 않는다. 새 분석은 조각마다 Claude API 를
+    호출하므로 백그라운드 워커 풀에 맡기고 상태 조회 URL 을 반환한다.
+    """
     try:
         document = get_object_or_404(GuidelineDocument, id=document_id)
         data = json.loads(request.body)
         analysis_type = data.get('analysis_type', 'content_analysis')
         
-        # OpenAI API 키 설정 (실제 환경에서는 환경변수로 관리)
-        # openai.api_key = "your-api-key"
-        
-        # 분석 프롬프트 생성
-        prompts = {
-            'content_analysis': f"""
-            다음 의료법/광고법 가이드라인 문서를 분석해주세요:
-            
-            제목: {document.title}
-            카테고리: {document.category_display}
-            내용: {document.content}
-            
-            다음 항목들을 분석해주세요:
-            1. 주요 내용 요약
-            2. 핵심 포인트
-            3. 의료진이 주의해야 할 사항
-            4. 광고 시 준수해야 할 규칙
-            5. 위반 시 예상되는 처벌
-            """,
-            'compliance_check': f"""
-            다음 가이드라인 문서의 준수성을 검토해주세요:
-            
-            제목: {document.title}
-            내용: {document.content}
-            
-            다음 항목들을 검토해주세요:
-            1. 현재 의료광고법과의 일치성
-            2. 잠재적 위반 요소
-            3. 준수 난이도 평가
-            4. 개선이 필요한 부분
-            5. 권장사항
-            """,
-            'risk_assessment': f"""
-            다음 가이드라인 문서의 위험도를 평가해주세요:
-            
-            제목: {document.title}
-            내용: {document.content}
-            
-            다음 항목들을 평가해주세요:
-            1. 전체 위험도 (낮음/보통/높음)
-            2. 주요 위험 요소
-            3. 위험 발생 가능성
-            4. 위험 발생 시 영향도
-            5. 위험 완화 방안
-            """,
-            'improvement_suggestions': f"""
-            다음 가이드라인 문서의 개선 방안을 제안해주세요:
-            
-            제목: {document.title}
-            내용: {document.content}
-            
-            다음 항목들을 제안해주세요:
-            1. 내용 개선 방안
-            2. 구조 개선 방안
-            3. 가독성 향상 방안
-            4. 실용성 개선 방안
-            5. 최신 법령 반영 방안
-            """
-        }
+        if analysis_type not in ANALYSIS_INSTRUCTIONS:
+            return JsonResponse({
+                'success': False,
+                'error': '지원하지 않는 분석 유형입니다.'
+            }, status=400)
         
-        # AI 분석 실행 (실제 OpenAI API 호출 대신 시뮬레이션)
-        analysis_result = {
-            'analysis_type': analysis_type,
-            'summary': f'{document.title}에 대한 {analysis_type} 분석 결과입니다.',
-            'key_points': ['주요 포인트 1', '주요 포인트 2', '주요 포인트 3'],
-            'recommendations': ['권장사항 1', '권장사항 2', '권장사항 3'],
-            'risk_level': 'medium',
-            'compliance_score': 85
-        }
+        ai_result = reuse_guideline_analysis(document, analysis_type)
+        cached = ai_result is not None
+        if not cached:
+            # 저장된 결과가 없어 새로 분석할 때만 Claude API 가 필요
+            if not get_ai_client():
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Claude API가 설정되지 않았습니다.'
+                }, status=400)
+            ai_result = submit_guideline_analysis(document, analysis_type)
         
-        # AI 분석 결과 저장
-        ai_result = AIAnalysisResult.objects.create(
-            document=document,
-            analysis_type=analysis_type,
-            analysis_result=analysis_result,
-            ai_model_used='GPT-4 (시뮬레이션)',
-            processing_time=2.5
-        )
+        if ai_result.status in ('pending', 'running'):
+            return JsonResponse({
+                'success': True,
+                'analysis_id': ai_result.id,
+                'status': ai_result.status,
+                'status_url': reverse('get_ai_analysis_result', args=[ai_result.id])
+            }, status=202)
+        if ai_result.status == 'failed':
+            return JsonResponse({
+                'success': False,
+                'analysis_id': ai_result.id,
+                'error': f'AI 분석 중 오류가 발생했습니다: {ai_result.error_message}'
+            }, status=502)
         
         return JsonResponse({
             'success': True,
             'analysis_id': ai_result.id,
-            'result': analysis_result
+            'cached': cached,
+            'processing_time': ai_result.processing_time,
+            'result': ai_result.analysis_result
         })
         
     except Exception as e:
@@ -1497,8 +1746,9 @@ def get_ai_analysis_result(request, analysis_id):
                 'ai_model_used': analysis.ai_model_used,
                 'processing_time': analysis.processing_time,
                 'created_at': analysis.created_at.isoformat(),
+                'status': analysis.status,
+                'error_message': analysis.error_message,
                 'analysis_result': analysis.analysis_result,
-                'result': analysis.result,
                 'document': {
                     'id': analysis.document.id,
                     'title': analysis.document.title,
@@ -1523,7 +1773,8 @@ def get_ai_analysis_result(request, analysis_id):
 def get_guideline_update_detail(request, update_id):
     """가이드라인 업데이트 상세 조회 API"""
     try:
-        update = GuidelineUpdate.objects.get(id=update_id)
+        update = GuidelineUpdate.objects.select_related('document').get(id=update_id)
+        changes = update_changes(update)
         
         return JsonResponse({
             'success': True,
@@ -1534,7 +1785,11 @@ def get_guideline_update_detail(request, update_id):
                 'updated_by': update.updated_by,
                 'created_at': update.created_at.isoformat(),
                 'update_reason': update.update_reason,
-                'changes': update.changes,
+                'changes': changes['diff'],
+                'previous_version': changes['from_version'],
+                'version': changes['to_version'],
+                'added_lines': changes['added_lines'],
+                'removed_lines': changes['removed_lines'],
                 'document': {
                     'id': update.document.id,
                     'title': update.document.title,
@@ -1557,7 +1812,7 @@ def get_guideline_update_detail(request, update_id):
 
 def get_ai_improvement_suggestions(violation_data, original_text):
     """Claude API를 사용하여 위반 항목에 대한 개선 방안 생성"""
-    if not anthropic:
+    if not get_ai_client():
         return {
             'success': False,
             'error': 'Claude API가 설정되지 않았습니다.',
@@ -1565,92 +1820,19 @@ def get_ai_improvement_suggestions(violation_data, original_text):
         }
     
     try:
-        # 위반 정보 구성
-        violation_info = {
-            'category': violation_data.get('category', ''),
-            'keyword': violation_data.get('keyword', ''),
-            'context': violation_data.get('context', ''),
-            'legal_basis': violation_data.get('legal_basis', ''),
-            'penalty': violation_data.get('penalty', '')
-        }
-        
-        # Claude API 요청 프롬프트 구성
-        prompt = f"""
-당신은 의료광고법 준수 전문가입니다. 다음 위반 항목에 대해 구체적이고 실용적인 개선 방안을 제시해주세요.
-
-**위반 정보:**
-- 위반 유형: {violation_info['category']}
-- 발견된 키워드: {violation_info['keyword']}
-- 위반 문맥: "{violation_info['context']}"
-- 법적 근거: {violation_info['legal_basis']}
-- 처벌 내용: {violation_info['penalty']}
-
-**원본 텍스트 (관련 부분):**
-{original_text[:1000]}...
-
-**요청사항:**
-1. 위반 키워드를 적절한 대체 표현으로 변경하는 구체적인 제안
-2. 문맥을 고려한 전체 문장 개선 방안
-3. 의료광고법을 준수하면서도 효과적인 표현 방법
-4. 추가 주의사항이나 권장사항
-
-다음 JSON 형식으로 응답해주세요:
-{{
-    "improved_keyword": "대체 키워드",
-    "improved_sentence": "개선된 문장",
-    "alternative_expressions": ["대안 표현 1", "대안 표현 2"],
-    "additional_recommendations": ["추가 권장사항 1", "추가 권장사항 2"],
-    "legal_compliance_notes": "법적 준수 관련 참고사항"
-}}
-"""
-        
-        # Claude API 호출
-        response = anthropic.messages.create(
-            model="claude-3-sonnet-20240229",
-            max_tokens=1000,
-            temperature=0.3,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
-        
-        # 응답 파싱
-        content = response.content[0].text
-        
-        # JSON 추출 시도
-        try:
-            # JSON 부분만 추출
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = content[json_start:json_end]
-                suggestions = json.loads(json_str)
-            else:
-                # JSON이 없으면 텍스트를 파싱
-                suggestions = {
-                    'improved_keyword': '대체 표현',
-                    'improved_sentence': content,
-                    'alternative_expressions': [],
-                    'additional_recommendations': [],
-                    'legal_compliance_notes': 'AI가 제안한 개선 방안입니다.'
-                }
-        except json.JSONDecodeError:
-            # JSON 파싱 실패 시 텍스트 그대로 사용
-            suggestions = {
-                'improved_keyword': '대체 표현',
-                'improved_sentence': content,
-                'alternative_expressions': [],
-                'additional_recommendations': [],
-                'legal_compliance_notes': 'AI가 제안한 개선 방안입니다.'
+        # 분석 시 생성된 개선 방안과 같은 캐시를 사용 (위반 유형, 키워드, 문맥 기준)
+        improvement = generate_improvements([violation_data], original_text)[0]
+        if improvement is None:
+            return {
+                'success': False,
+                'error': 'AI 개선 방안 생성 중 오류가 발생했습니다: 응답 시간이 초과되었거나 요청에 실패했습니다.',
+                'suggestions': []
             }
         
         return {
             'success': True,
-            'suggestions': suggestions,
-            'raw_response': content
+            'suggestions': improvement['suggestions'],
+            'raw_response': improvement['raw_response']
         }
         
     except Exception as e:
@@ -1703,7 +1885,7 @@ def rewrite_text_with_ai(request):
                 'error': '원본 텍스트가 필요합니다.'
             }, status=400)
         
-        if not anthropic:
+        if not get_ai_client():
             return JsonResponse({
                 'success': False,
                 'error': 'Claude API가 설정되지 않았습니다.',
@@ -1786,48 +1968,17 @@ def rewrite_text_using_ai(original_text: str, violations: List[Dict]) -> Dict:
 }
 """
         
-        # Claude API 호출
-        response = anthropic.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=4000,
-            temperature=0.2,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
-        
-        # 응답 파싱
-        content = response.content[0].text
+        # Claude API 호출 (공유 클라이언트, 동시 호출 수/제한 시간 적용)
+        content = complete(prompt, model="claude-3-haiku-20240307", max_tokens=4000, temperature=0.2)
         
-        # JSON 추출 시도
-        try:
-            # JSON 부분만 추출
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            if json_start != -1 and json_end != 0:
-                json_str = content[json_start:json_end]
-                result = json.loads(json_str)
-            else:
-                # JSON이 없으면 기본 구조로 생성
-                result = {
-                    'rewritten_text': content,
-                    'changes_made': [],
-                    'compliance_notes': 'AI가 제안한 수정된 텍스트입니다.',
-                    'word_count': len(content.split()),
-                    'estimated_compliance_score': 85
-                }
-        except json.JSONDecodeError:
-            # JSON 파싱 실패 시 기본 구조로 생성
-            result = {
-                'rewritten_text': content,
-                'changes_made': [],
-                'compliance_notes': 'AI가 제안한 수정된 텍스트입니다.',
-                'word_count': len(content.split()),
-                'estimated_compliance_score': 85
-            }
+        # JSON 추출 시도 (실패 시 기본 구조로 생성)
+        result = parse_json_response(content, {
+            'rewritten_text': content,
+            'changes_made': [],
+            'compliance_notes': 'AI가 제안한 수정된 텍스트입니다.',
+            'word_count': len(content.split()),
+            'estimated_compliance_score': 85
+        })
         
         # 수정된 부분만 추출 (수정 사항만 복사용)
         modified_parts_only = extract_modified_parts_only(result.get('changes_made', []))
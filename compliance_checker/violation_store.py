@@ -0,0 +1,166 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+
+from .analyzer import ComplianceAnalyzer, keyed_violation_spans
+from .matcher import KeywordMatch, KeywordMatcher, fold_case
+from .models import ComplianceAnalysis, ComplianceKeyword, ComplianceRule, ViolationSpan
+from .snapshot import RuleSnapshot, get_rule_snapshot
+from .text_index import TextIndex
+
+SEVERITIES = ('high', 'medium', 'low')
+
+
+class SpanResolver:
+    """분석 결과의 위반 정보를 ViolationSpan 행으로 변환
+
+    snapshot 을 주면 그 스냅샷의 규칙과 키워드 ID 로 변환하므로 데이터베이스를 조회하지 않는다
+    (방금 그 스냅샷으로 분석한 결과용, get_span_resolver 참고). 없으면 이전 규칙으로 만든 결과도
+    찾을 수 있도록 삭제·비활성화된 규칙을 포함한 전체 규칙과 키워드를 생성 시 한 번에 읽는다.
+    """
+
+    def __init__(self, snapshot: RuleSnapshot = None):
+        self.snapshot = snapshot
+        if snapshot is not None:
+            rules = list(snapshot.rules)
+            keyword_rows = [(keyword_id, rule_id, keyword) for (rule_id, keyword), keyword_id in snapshot.keyword_ids.items()]
+        else:
+            rules = list(ComplianceRule.objects.all())
+            keyword_rows = ComplianceKeyword.objects.values_list('id', 'rule_id', 'keyword')
+        self.rules_by_id = {rule.id: rule for rule in rules}
+        # 같은 카테고리·제목의 규칙이 여러 개면 뒤의 규칙이 우선 (스냅샷과 동일)
+        self.rules_by_title = {(rule.category, rule.title): rule for rule in rules}
+        self.keywords_by_rule: Dict[int, List[str]] = {}
+        self.keyword_ids = {}
+        for keyword_id, rule_id, keyword in keyword_rows:
+            self.keywords_by_rule.setdefault(rule_id, []).append(keyword)
+            self.keyword_ids[(rule_id, fold_case(keyword))] = keyword_id
+        self._matcher = None
+
+    def _matched_keyword(self, rule_id: int, surface: str) -> str:
+        """청크 분석 위반 구간의 원문 조각과 매칭되는 규칙 키워드 (없으면 원문 조각)"""
+        if (rule_id, fold_case(surface)) in self.keyword_ids:
+            return surface
+        if self._matcher is None:
+            self._matcher = KeywordMatcher(self.keywords_by_rule)
+        keywords = self._matcher.find_all(surface).get(rule_id, [])
+        return next((match.keyword for match in keywords if match.start == 0 and match.end == len(surface)), surface)
+
+    def rows(self, text: str, result: Dict) -> List[Tuple]:
+        """(rule_id, keyword_id, category, title, start, end, severity) 목록 (상세 위반 순서)"""
+        rows = []
+        if 'violation_spans' in result:
+            # 청크 분석 결과: (시작 위치, 길이, (카테고리, 제목)), 이전 결과는 규칙 ID
+            for offset, length, rule_key in keyed_violation_spans(result):
+                if isinstance(rule_key, int):
+                    rule = self.rules_by_id.get(rule_key)
+                    category, title = (rule.category, rule.title) if rule else ('', '')
+                else:
+                    category, title = rule_key
+                    rule = self.rules_by_title.get(rule_key)
+                keyword = fold_case(self._matched_keyword(rule.id, text[offset:offset + length])) if rule else ''
+                rows.append((
+                    rule.id if rule else None,
+                    self.keyword_ids.get((rule.id, keyword)) if rule else None,
+                    category, title,
+                    offset, offset + length,
+                    rule.severity if rule else 'low'
+                ))
+            return rows
+
+        for violation in result.get('detailed_violations') or []:
+            rule = self.rules_by_title.get((violation.get('category'), violation.get('title')))
+            keyword = violation.get('keyword', '')
+            start = violation.get('position', 0)
+            rows.append((
+                rule.id if rule else None,
+                self.keyword_ids.get((rule.id, fold_case(keyword))) if rule else None,
+                violation.get('category', ''),
+                violation.get('title', ''),
+                start, start + len(violation.get('matched_text', keyword)),
+                violation.get('severity', 'low')
+            ))
+        return rows
+
+    def apply(self, analysis: ComplianceAnalysis, text: str, result: Dict) -> List[ViolationSpan]:
+        """분석의 집계 컬럼을 설정하고 저장 전 ViolationSpan 목록 반환 (analysis_id 는 저장 후 설정)"""
+        rows = self.rows(text, result)
+        counts = {severity: 0 for severity in SEVERITIES}
+        for row in rows:
+            counts[row[6]] = counts.get(row[6], 0) + 1
+        analysis.violation_count = len(rows)
+        analysis.high_severity_count = counts['high']
+        analysis.medium_severity_count = counts['medium']
+        analysis.low_severity_count = counts['low']
+        return [
+            ViolationSpan(rule_id=rule_id, keyword_id=keyword_id, category=category, title=title,
+                          start=start, end=end, severity=severity)
+            for rule_id, keyword_id, category, title, start, end, severity in rows
+        ]
+
+
+_snapshot_resolver = None
+
+
+def get_span_resolver(snapshot: RuleSnapshot = None) -> SpanResolver:
+    """규칙 스냅샷으로 만든 SpanResolver (스냅샷이 바뀔 때만 다시 만들며 데이터베이스를 조회하지 않음)"""
+    global _snapshot_resolver
+    snapshot = snapshot or get_rule_snapshot()
+    resolver = _snapshot_resolver
+    if resolver is None or resolver.snapshot is not snapshot:
+        resolver = _snapshot_resolver = SpanResolver(snapshot)
+    return resolver
+
+
+def create_spans(pairs: Iterable[Tuple[ComplianceAnalysis, List[ViolationSpan]]], batch_size: int = 1000):
+    """저장된 분석과 ViolationSpan 목록 쌍을 받아 위반 구간을 일괄 저장"""
+    spans = []
+    for analysis, analysis_spans in pairs:
+        for span in analysis_spans:
+            span.analysis_id = analysis.id
+            spans.append(span)
+    if spans:
+        ViolationSpan.objects.bulk_create(spans, batch_size=batch_size)
+
+
+def store_violation_spans(analysis: ComplianceAnalysis, spans: List[ViolationSpan]):
+    """분석의 기존 위반 구간을 새 목록으로 교체"""
+    with transaction.atomic():
+        ViolationSpan.objects.filter(analysis_id=analysis.id).delete()
+        create_spans([(analysis, spans)])
+
+
+def span_violations(analysis: ComplianceAnalysis, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+    """분석의 위반 구간 행[start:stop] 을 원문에서 분석 결과의 상세 위반 정보 형식으로 변환"""
+    rows = analysis.violation_spans.values_list('start', 'end', 'category', 'title')[start:stop]
+    spans = [(span_start, span_end - span_start, (category, title)) for span_start, span_end, category, title in rows]
+    if not spans:
+        return []
+    return ComplianceAnalyzer(enable_ai=False).expand_violation_spans(analysis.input_text, spans)
+
+
+def hydrate_result(analysis: ComplianceAnalysis, result: Dict = None, detail_limit: int = None) -> Dict:
+    """저장된 분석 결과에 저장하지 않은 상세 위반 정보와 원문을 채운 사본
+
+    상세 위반 정보는 위반 구간 행과 원문에서 다시 만든다. 청크 분석 결과는 원문이 크므로
+    detail_limit 을 줄 때만 앞쪽 detail_limit 건과 원문을 채우고, 그 외에는 그대로 돌려준다.
+    """
+    result = dict(analysis.analysis_result if result is None else result)
+    if 'violation_spans' in result and not detail_limit:
+        return result
+    if 'detailed_violations' not in result:
+        result['detailed_violations'] = span_violations(analysis, stop=detail_limit)
+    result.setdefault('extracted_text', analysis.input_text)
+    return result
+
+
+def span_contexts(text: str, spans: List[ViolationSpan]) -> List[str]:
+    """위반 구간별 문장 단위 문맥 (분석 결과의 'context' 와 같은 값을 원문에서 생성)"""
+    if not spans:
+        return []
+    analyzer = ComplianceAnalyzer(enable_ai=False)
+    text_index = TextIndex(text)
+    return [
+        analyzer._match_context(text, text_index, KeywordMatch(text[span.start:span.end], span.start, span.end))[1]
+        for span in spans
+    ]
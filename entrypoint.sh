@@ -11,6 +11,10 @@ python manage.py migrate
 echo "📋 의료광고법 규칙 로드 중..."
 python manage.py load_compliance_rules
 
+# 이전 분석의 위반 구간과 일별 집계 채우기 (채울 분석이 없으면 바로 끝남)
+echo "📊 위반 구간/일별 집계 채우는 중..."
+python manage.py backfill_violation_spans
+
 # 가이드라인 문서 로드
 echo "📚 가이드라인 문서 로드 중..."
 python manage.py load_guideline_documents
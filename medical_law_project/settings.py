@@ -89,6 +89,109 @@ if os.getenv('DATABASE_URL'):
         conn_health_checks=True,
     )
 
+# Cache 설정
+# AI 개선 방안 등 워커 프로세스 간에 재사용하는 값을 위해 파일 기반 캐시 사용
+# (호스트마다 따로이고 재배포 시 사라지므로 무효화 버전처럼 정확성에 필요한 값은 두지 않음)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('DJANGO_CACHE_DIR', str(BASE_DIR / '.django_cache')),
+    }
+}
+
+# 규칙 스냅샷/인용 색인 버전은 호스트마다 따로인 캐시가 아니라 데이터베이스(SharedVersion)에 두고,
+# 각 프로세스는 이 시간(초) 동안만 조회 결과를 재사용한다 (다른 호스트의 규칙 변경 반영 지연 상한)
+COMPLIANCE_SHARED_VERSION_TTL = float(os.getenv('COMPLIANCE_SHARED_VERSION_TTL', '1'))
+
+# URL 텍스트 추출용 HTTP 설정
+# 공유 세션 커넥션 풀 크기, 재시도 횟수/백오프, iframe 동시 요청 수,
+# ETag/Last-Modified 기반 디스크 캐시 위치(빈 값이면 사용 안 함)와 저장할 최대 본문 크기,
+# 캐시 전체 최대 크기(넘으면 오래 쓰지 않은 항목부터 삭제)와 정리 주기(저장 횟수)
+COMPLIANCE_HTTP_POOL_SIZE = int(os.getenv('COMPLIANCE_HTTP_POOL_SIZE', '20'))
+COMPLIANCE_HTTP_RETRIES = int(os.getenv('COMPLIANCE_HTTP_RETRIES', '3'))
+COMPLIANCE_HTTP_BACKOFF = float(os.getenv('COMPLIANCE_HTTP_BACKOFF', '0.5'))
+COMPLIANCE_HTTP_CONCURRENCY = int(os.getenv('COMPLIANCE_HTTP_CONCURRENCY', '4'))
+COMPLIANCE_HTTP_CACHE_DIR = os.getenv('COMPLIANCE_HTTP_CACHE_DIR', str(BASE_DIR / '.http_cache'))
+COMPLIANCE_HTTP_CACHE_MAX_BYTES = int(os.getenv('COMPLIANCE_HTTP_CACHE_MAX_BYTES', str(5 * 1024 * 1024)))
+COMPLIANCE_HTTP_CACHE_MAX_TOTAL_BYTES = int(os.getenv('COMPLIANCE_HTTP_CACHE_MAX_TOTAL_BYTES', str(200 * 1024 * 1024)))
+COMPLIANCE_HTTP_CACHE_PRUNE_EVERY = int(os.getenv('COMPLIANCE_HTTP_CACHE_PRUNE_EVERY', '100'))
+
+# Selenium 브라우저 풀 설정 (JavaScript 렌더링이 필요한 페이지용)
+# 최대 동시 세션 수, 세션당 처리 페이지 수(초과 시 재생성), 페이지 로드/세션 대기 제한 시간(초)
+COMPLIANCE_BROWSER_MAX_SESSIONS = int(os.getenv('COMPLIANCE_BROWSER_MAX_SESSIONS', '2'))
+COMPLIANCE_BROWSER_MAX_PAGES = int(os.getenv('COMPLIANCE_BROWSER_MAX_PAGES', '50'))
+COMPLIANCE_BROWSER_PAGE_LOAD_TIMEOUT = int(os.getenv('COMPLIANCE_BROWSER_PAGE_LOAD_TIMEOUT', '20'))
+COMPLIANCE_BROWSER_ACQUIRE_TIMEOUT = int(os.getenv('COMPLIANCE_BROWSER_ACQUIRE_TIMEOUT', '60'))
+COMPLIANCE_BROWSER_DRIVER_FACTORY = None  # 예: 'myapp.drivers.remote_driver' (기본: 헤드리스 Chrome)
+
+# 분석 작업 설정
+# 비동기 모드(async) 요청은 백그라운드 워커 풀에서 추출/분석/AI 개선 방안 생성을 수행
+COMPLIANCE_ASYNC_ANALYSIS = os.getenv('COMPLIANCE_ASYNC_ANALYSIS', 'False').lower() == 'true'
+COMPLIANCE_JOB_WORKERS = int(os.getenv('COMPLIANCE_JOB_WORKERS', '4'))
+COMPLIANCE_JOB_TIMEOUT = int(os.getenv('COMPLIANCE_JOB_TIMEOUT', '600'))  # 초
+COMPLIANCE_JOBS_EAGER = False
+
+# 일괄 분석 설정 (워커 프로세스 수: 0 이면 CPU 수, API 한 번에 받을 최대 항목 수)
+COMPLIANCE_BATCH_WORKERS = int(os.getenv('COMPLIANCE_BATCH_WORKERS', '0'))
+COMPLIANCE_BATCH_MAX_ITEMS = int(os.getenv('COMPLIANCE_BATCH_MAX_ITEMS', '500'))
+# 규칙 변경 후 저장된 분석 재평가 시 한 페이지로 읽어 재분석/저장하는 분석 수 (워커 수는 COMPLIANCE_BATCH_WORKERS)
+COMPLIANCE_REEVALUATION_BATCH_SIZE = int(os.getenv('COMPLIANCE_REEVALUATION_BATCH_SIZE', '500'))
+
+# 분석 결과 캐시 (정규화 텍스트 해시 + 규칙 스냅샷 버전 기준, 프로세스 내 LRU 항목 수)
+COMPLIANCE_RESULT_CACHE_SIZE = int(os.getenv('COMPLIANCE_RESULT_CACHE_SIZE', '128'))
+
+# 대용량 문서 청크 분석 (이 글자 수를 넘으면 위반 구간만 저장, 0 이면 사용 안 함)
+# 키워드 검색 창 크기(글자), 결과 페이지에서 상세 정보를 만들 최대 위반 구간 수
+COMPLIANCE_CHUNKED_ANALYSIS_THRESHOLD = int(os.getenv('COMPLIANCE_CHUNKED_ANALYSIS_THRESHOLD', '500000'))
+COMPLIANCE_CHUNKED_WINDOW_SIZE = int(os.getenv('COMPLIANCE_CHUNKED_WINDOW_SIZE', str(64 * 1024)))
+COMPLIANCE_CHUNKED_DETAIL_LIMIT = int(os.getenv('COMPLIANCE_CHUNKED_DETAIL_LIMIT', '100'))
+
+# 업로드 파일 텍스트 추출 제한
+# 최대 파일 크기(바이트), 최대 PDF 페이지 수, PDF 추출 프로세스 수, 프로세스 작업당 페이지 수
+COMPLIANCE_UPLOAD_MAX_BYTES = int(os.getenv('COMPLIANCE_UPLOAD_MAX_BYTES', str(20 * 1024 * 1024)))
+COMPLIANCE_PDF_MAX_PAGES = int(os.getenv('COMPLIANCE_PDF_MAX_PAGES', '300'))
+COMPLIANCE_PDF_WORKERS = int(os.getenv('COMPLIANCE_PDF_WORKERS', '2'))
+COMPLIANCE_PDF_PAGES_PER_TASK = int(os.getenv('COMPLIANCE_PDF_PAGES_PER_TASK', '16'))
+
+# AI 호출 설정
+# API 키가 있어도 Claude API 를 쓰지 않으려면 COMPLIANCE_AI_ENABLED=false
+COMPLIANCE_AI_ENABLED = os.getenv('COMPLIANCE_AI_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+# 동시 호출 수, 호출 제한 시간(초), 한 번의 요청에 묶을 위반 항목 수, 응답 캐시 유지 시간(초), 분당 요청 수
+COMPLIANCE_AI_MAX_CONCURRENCY = int(os.getenv('COMPLIANCE_AI_MAX_CONCURRENCY', '4'))
+COMPLIANCE_AI_TIMEOUT = float(os.getenv('COMPLIANCE_AI_TIMEOUT', '30'))
+COMPLIANCE_AI_BATCH_SIZE = int(os.getenv('COMPLIANCE_AI_BATCH_SIZE', '1'))
+COMPLIANCE_AI_CACHE_TIMEOUT = int(os.getenv('COMPLIANCE_AI_CACHE_TIMEOUT', str(60 * 60 * 24)))
+COMPLIANCE_AI_REQUESTS_PER_MINUTE = int(os.getenv('COMPLIANCE_AI_REQUESTS_PER_MINUTE', '50'))  # 0 이면 제한 없음
+# 가이드라인 AI 분석 시 문서를 나누는 글자 수 (조각별로 동시에 분석한 뒤 결과를 합침)
+COMPLIANCE_AI_GUIDELINE_CHUNK_CHARS = int(os.getenv('COMPLIANCE_AI_GUIDELINE_CHUNK_CHARS', '12000'))
+
+# 점수 계산 설정
+# 점수 엔진 클래스 경로(비우면 scoring.WeightedScoringEngine), 머리말/꼬리말로 보는 앞뒤 글자 수
+COMPLIANCE_SCORING_ENGINE = None
+COMPLIANCE_SCORING_HEADLINE_CHARS = int(os.getenv('COMPLIANCE_SCORING_HEADLINE_CHARS', '200'))
+COMPLIANCE_SCORING_FOOTER_CHARS = int(os.getenv('COMPLIANCE_SCORING_FOOTER_CHARS', '200'))
+
+# PDF 리포트 설정
+# 포함할 한글 글꼴(TTF/OTF, 비우면 NanumGothic 기본 설치 경로 검색), 위반 위치를 싣는 최대 구간 수,
+# 백그라운드에서 생성할 위반 구간 수 기준(0 이면 항상 요청 중에 생성)
+COMPLIANCE_REPORT_FONT_PATH = os.getenv('COMPLIANCE_REPORT_FONT_PATH', '')
+COMPLIANCE_REPORT_DETAIL_LIMIT = int(os.getenv('COMPLIANCE_REPORT_DETAIL_LIMIT', '100'))
+COMPLIANCE_REPORT_BACKGROUND_THRESHOLD = int(os.getenv('COMPLIANCE_REPORT_BACKGROUND_THRESHOLD', '200'))
+
+# 인용 검색 설정
+# 위반마다 붙이는 근거 문단 수, 질의 결과 LRU 크기, 색인할 법령 텍스트 파일({제목: 경로})
+COMPLIANCE_CITATION_LIMIT = int(os.getenv('COMPLIANCE_CITATION_LIMIT', '3'))
+COMPLIANCE_CITATION_CACHE_SIZE = int(os.getenv('COMPLIANCE_CITATION_CACHE_SIZE', '1024'))
+COMPLIANCE_CITATION_LAW_FILES = {
+    '대한의사협회 의료광고 심의 안내': BASE_DIR / 'law' / 'law.txt',
+    '대한치과의사협회 의료광고 심의 안내': BASE_DIR / 'law' / 'dental.txt',
+}
+
+# 가이드라인 문서 버전 저장 설정
+# 전체 내용을 저장하는 버전 간격(그 사이는 직전 버전 대비 변경 목록), 복원한 내용/비교 결과 캐시 시간(초)
+COMPLIANCE_GUIDELINE_SNAPSHOT_INTERVAL = int(os.getenv('COMPLIANCE_GUIDELINE_SNAPSHOT_INTERVAL', '20'))
+COMPLIANCE_GUIDELINE_VERSION_CACHE_TIMEOUT = int(os.getenv('COMPLIANCE_GUIDELINE_VERSION_CACHE_TIMEOUT', str(60 * 60 * 24)))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {